@@ -0,0 +1,65 @@
+# -*- coding: UTF-8 -*-
+
+# Porpose: Contains test cases for the abr_utils.py object.
+# Rev: 19.Oct.2026
+
+import sys
+import os.path
+import unittest
+
+PATH = os.path.realpath(os.path.abspath(__file__))
+sys.path.insert(0, os.path.dirname(os.path.dirname(PATH)))
+
+try:
+    from videomass.vdms_utils.abr_utils import (LADDER,
+                                                parse_ladder,
+                                                fit_ladder,
+                                                abr_args,
+                                                )
+except ImportError as error:
+    sys.exit(error)
+
+
+class TestABRLadder(unittest.TestCase):
+    """Test case for the ABR ladder helpers."""
+
+    def test_parse(self):
+        self.assertEqual(parse_ladder(LADDER)[0], (1080, '5000k'))
+        self.assertEqual(parse_ladder('361:1M, 720:2800K'),
+                         [(720, '2800k'), (360, '1m')])
+        with self.assertRaises(ValueError):
+            parse_ladder('720p:2800k')
+
+    def test_fit(self):
+        ladder = parse_ladder(LADDER)
+        self.assertEqual(fit_ladder(ladder, 720), ladder[1:])
+        self.assertEqual(fit_ladder(ladder, 240), ladder[-1:])
+
+    def test_hls(self):
+        args, dest = abr_args([(720, '2800k'), (360, '800k')], 'out',
+                              codec='libx264', preset='fast', audio='128k',
+                              segment=4, package='HLS')
+        self.assertIn('split=2[s0][s1];[s0]scale=-2:720[v0];'
+                      '[s1]scale=-2:360[v1]', args)
+        self.assertIn('-bufsize:v:1 1600k', args)
+        self.assertIn('n_forced*4', args)
+        self.assertIn('"v:0,agroup:aud v:1,agroup:aud a:0,agroup:aud"', args)
+        self.assertEqual(dest, os.path.join('out', 'stream_%v.m3u8'))
+
+    def test_dash(self):
+        args, dest = abr_args([(360, '800k')], 'out', codec='libx264',
+                              preset='fast', audio=None, segment=4,
+                              package='HLS + DASH')
+        self.assertIn('-f dash', args)
+        self.assertIn('"id=0,streams=v"', args)
+        self.assertIn('-hls_playlist 1', args)
+        self.assertNotIn('-map 0:a', args)
+        self.assertEqual(dest, os.path.join('out', 'manifest.mpd'))
+
+
+def main():
+    unittest.main()
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,73 @@
+# -*- coding: UTF-8 -*-
+
+# Porpose: Contains test cases for the archive_utils.py object.
+# Rev: 19.Oct.2026
+
+import sys
+import os.path
+import tempfile
+import unittest
+
+PATH = os.path.realpath(os.path.abspath(__file__))
+sys.path.insert(0, os.path.dirname(os.path.dirname(PATH)))
+
+try:
+    from videomass.vdms_utils.archive_utils import (make_archive_id,
+                                                    youtube_archive_id,
+                                                    DownloadArchive,
+                                                    )
+except ImportError as error:
+    sys.exit(error)
+
+
+class TestDownloadArchive(unittest.TestCase):
+    """Test case for the download archive."""
+
+    def setUp(self):
+        self.tmp = tempfile.TemporaryDirectory()
+        self.fname = os.path.join(self.tmp.name, 'archive.txt')
+
+    def tearDown(self):
+        self.tmp.cleanup()
+
+    def test_archive_id(self):
+        self.assertEqual(make_archive_id('Youtube', 'x'), 'youtube x')
+        for url in ('https://www.youtube.com/watch?v=dQw4w9WgXcQ',
+                    'https://m.youtube.com/watch?t=1&v=dQw4w9WgXcQ',
+                    'https://youtu.be/dQw4w9WgXcQ?si=abc',
+                    'https://www.youtube.com/shorts/dQw4w9WgXcQ'):
+            self.assertEqual(youtube_archive_id(url), 'youtube dQw4w9WgXcQ')
+        self.assertIsNone(youtube_archive_id('https://www.youtube.com/'
+                                             'playlist?list=PLx'))
+        self.assertIsNone(youtube_archive_id('https://vimeo.com/1234'))
+
+    def test_lookup(self):
+        archive = DownloadArchive(self.fname)
+        self.assertNotIn('youtube a', archive)
+        archive.add('youtube a')
+        archive.add('youtube a')
+        with open(self.fname, 'a', encoding='utf-8') as fobj:
+            fobj.write('vimeo 1\nvimeo 2')  # as yt-dlp, the last unfinished
+        self.assertIn('vimeo 1', archive)
+        self.assertNotIn('vimeo 2', archive)
+        with open(self.fname, 'a', encoding='utf-8') as fobj:
+            fobj.write('\n')
+        self.assertEqual(archive.getlist(),
+                         ['youtube a', 'vimeo 1', 'vimeo 2'])
+
+    def test_remove(self):
+        archive = DownloadArchive(self.fname)
+        for entry in ('youtube a', 'youtube b', 'youtube c'):
+            archive.add(entry)
+        self.assertEqual(archive.remove(['youtube b', 'youtube z']), 1)
+        self.assertEqual(archive.remove([]), 0)
+        self.assertEqual(len(archive), 2)
+        self.assertNotIn('youtube b', DownloadArchive(self.fname))
+
+
+def main():
+    unittest.main()
+
+
+if __name__ == '__main__':
+    main()
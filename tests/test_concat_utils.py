@@ -0,0 +1,67 @@
+# -*- coding: UTF-8 -*-
+
+# Porpose: Contains test cases for the concat_utils.py object.
+# Rev: 19.Oct.2026
+
+import sys
+import os.path
+import unittest
+
+PATH = os.path.realpath(os.path.abspath(__file__))
+sys.path.insert(0, os.path.dirname(os.path.dirname(PATH)))
+
+try:
+    from videomass.vdms_utils.concat_utils import (media_signature,
+                                                   plan_concat,
+                                                   normalize_args,
+                                                   )
+except ImportError as error:
+    sys.exit(error)
+
+
+def probe(vcodec='h264', size=(1920, 1080), acodec='aac', rate='48000'):
+    """Returns a minimal FFprobe data"""
+    streams = []
+    if vcodec:
+        streams.append({'codec_type': 'video', 'codec_name': vcodec,
+                        'width': size[0], 'height': size[1],
+                        'pix_fmt': 'yuv420p', 'r_frame_rate': '25/1'})
+    if acodec:
+        streams.append({'codec_type': 'audio', 'codec_name': acodec,
+                        'sample_rate': rate, 'channels': 2})
+    return {'streams': streams, 'format': {'filename': 'f'}}
+
+
+class TestConcatPlanner(unittest.TestCase):
+    """Test case for the concatenation planner."""
+
+    def test_signature(self):
+        self.assertEqual(media_signature(probe()),
+                         (('video', 'h264', '1920x1080'),
+                          ('audio', 'aac', '48000')))
+
+    def test_plan(self):
+        data = [probe(size=(1280, 720)), probe(), probe(),
+                probe(acodec='mp3'), probe()]
+        self.assertEqual(plan_concat(data), (1, [0, 3]))
+        self.assertEqual(plan_concat([probe(), probe()]), (0, []))
+        # on a tie the earliest format wins
+        self.assertEqual(plan_concat([probe(vcodec='hevc'), probe()]),
+                         (0, [1]))
+
+    def test_normalize(self):
+        args = normalize_args(probe(), probe(size=(1280, 720)))
+        self.assertIn('-map 0:v:0 -c:v:0 libx264', args)
+        self.assertIn('pad=1920:1080:', args)
+        self.assertIn('-map 0:a:0 -c:a:0 aac -b:a:0 192k', args)
+        self.assertIn('-ar:a:0 48000 -ac:a:0 2', args)
+        self.assertIsNone(normalize_args(probe(), probe(acodec=None)))
+        self.assertIsNone(normalize_args(probe(vcodec='prores'), probe()))
+
+
+def main():
+    unittest.main()
+
+
+if __name__ == '__main__':
+    main()
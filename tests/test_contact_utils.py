@@ -0,0 +1,62 @@
+# -*- coding: UTF-8 -*-
+
+# Porpose: Contains test cases for the contact_utils.py object.
+# Rev: 19.Oct.2026
+
+import sys
+import os.path
+import unittest
+
+PATH = os.path.realpath(os.path.abspath(__file__))
+sys.path.insert(0, os.path.dirname(os.path.dirname(PATH)))
+
+try:
+    from videomass.vdms_utils.contact_utils import (tile_positions,
+                                                    mosaic_graph,
+                                                    sheet_names,
+                                                    index_page,
+                                                    )
+except ImportError as error:
+    sys.exit(error)
+
+
+class TestContactSheets(unittest.TestCase):
+    """Test case for the contact sheet helpers."""
+
+    def test_positions(self):
+        self.assertEqual(tile_positions(40000, 4), [5.0, 15.0, 25.0, 35.0])
+
+    def test_graph(self):
+        graph = mosaic_graph(2, 'scale=320:-1', '2x1')
+        self.assertEqual(graph,
+                         '[0:v]trim=end_frame=1,setpts=PTS-STARTPTS,'
+                         'scale=320:-1[v0];[1:v]trim=end_frame=1,'
+                         'setpts=PTS-STARTPTS,scale=320:-1[v1];'
+                         '[v0][v1]concat=n=2:v=1:a=0,tile=2x1[sheet]')
+
+    def test_names(self):
+        self.assertEqual(sheet_names(['/a/clip.mp4', '/b/Clip.mkv',
+                                      '/c/other.mov'], 'png'),
+                         ['clip.png', 'Clip_2.png', 'other.png'])
+
+    def test_index(self):
+        page = index_page('Sheets', [('/a/<b>.mp4', 'b.png', '00:01:00'),
+                                     ('/a/c.mp4', None, 'error')])
+        self.assertIn('<img src="b.png"', page)
+        self.assertIn('&lt;b&gt;.mp4', page)
+        self.assertIn('class="failed"', page)
+
+    def test_index_quoted(self):
+        page = index_page('Sheets', [('/a/#1 50%?.mp4', '#1 50%?.png',
+                                      '00:01:00')])
+        self.assertIn('<a href="%231%2050%25%3F.png">', page)
+        self.assertIn('<img src="%231%2050%25%3F.png"', page)
+        self.assertIn('<figcaption>/a/#1 50%?.mp4<br>', page)
+
+
+def main():
+    unittest.main()
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,102 @@
+# -*- coding: UTF-8 -*-
+
+# Porpose: Contains test cases for the crf_utils.py object.
+# Rev: 19.Oct.2026
+
+import sys
+import os.path
+import tempfile
+import unittest
+
+PATH = os.path.realpath(os.path.abspath(__file__))
+sys.path.insert(0, os.path.dirname(os.path.dirname(PATH)))
+
+try:
+    from videomass.vdms_utils.crf_utils import (has_crf,
+                                                set_crf,
+                                                crf_candidates,
+                                                narrow_crf_range,
+                                                crf_cachekey,
+                                                load_crf_cache,
+                                                save_crf_cache,
+                                                )
+except ImportError as error:
+    sys.exit(error)
+
+
+class TestCrfArgs(unittest.TestCase):
+    """Test case for the CRF option handling."""
+
+    def test_set_crf(self):
+        args = ['-c:v libx264 -crf 23 -preset medium', '']
+        self.assertTrue(has_crf(args))
+        self.assertEqual(set_crf(args, 27),
+                         ['-c:v libx264 -crf 27 -preset medium', ''])
+
+    def test_no_crf(self):
+        args = ['-c:v libx264 -b:v 6000k -x264-params "pass=1"']
+        self.assertFalse(has_crf(args))
+        self.assertEqual(set_crf(args, 20), args)
+
+
+class TestCrfSearch(unittest.TestCase):
+    """Test case for the search steps."""
+
+    def test_candidates(self):
+        self.assertEqual(crf_candidates(0, 51, 2), [17, 34])
+        self.assertEqual(crf_candidates(10, 11, 2), [10, 11])
+        self.assertEqual(crf_candidates(30, 30, 2), [30])
+        self.assertEqual(crf_candidates(31, 30, 2), [])
+
+    def test_narrow(self):
+        self.assertEqual(narrow_crf_range(0, 51, {17: 0.99, 34: 0.95},
+                                          0.98), (18, 33, 17))
+        self.assertEqual(narrow_crf_range(0, 51, {17: 0.97, 34: 0.95},
+                                          0.98), (0, 16, None))
+        self.assertEqual(narrow_crf_range(0, 51, {17: 0.99, 34: 0.985},
+                                          0.98), (35, 51, 34))
+
+    def test_converges(self):
+        def ssim(crf):  # decreasing quality model
+            return 1 - crf / 500
+
+        low, high, found = 0, 63, None
+        while low <= high:
+            cands = crf_candidates(low, high, 2)
+            low, high, best = narrow_crf_range(low, high,
+                                               {c: ssim(c) for c in cands},
+                                               0.95)
+            found = best if best is not None else found
+        self.assertEqual(found, 25)
+
+    def test_failed_probe(self):
+        # a failed probe must not narrow the range down to the
+        # lowest CRF as if the target was not reached
+        with self.assertRaises(ValueError):
+            narrow_crf_range(0, 51, {17: 0.99, 34: None}, 0.98)
+        with self.assertRaises(ValueError):
+            narrow_crf_range(0, 51, {17: None, 34: 0.95}, 0.98)
+
+
+class TestCrfCache(unittest.TestCase):
+    """Test case for the results cache."""
+
+    def test_cache(self):
+        key1 = crf_cachekey('-c:v libx264', 0.98)
+        key2 = crf_cachekey('-c:v libx265', 0.98)
+        self.assertNotEqual(key1, key2)
+        with tempfile.TemporaryDirectory() as tmp:
+            cache = os.path.join(tmp, 'file.json')
+            self.assertIsNone(load_crf_cache(cache, key1))
+            save_crf_cache(cache, key1, 24, 0.981)
+            save_crf_cache(cache, key2, 26, 0.980)
+            self.assertEqual(load_crf_cache(cache, key1), (24, 0.981))
+            self.assertEqual(load_crf_cache(cache, key2), (26, 0.980))
+
+
+def main():
+    unittest.main()
+
+
+if __name__ == '__main__':
+    main()
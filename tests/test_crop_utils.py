@@ -0,0 +1,91 @@
+# -*- coding: UTF-8 -*-
+
+# Porpose: Contains test cases for the crop_utils.py object.
+# Rev: 19.Oct.2026
+
+import sys
+import os.path
+import tempfile
+import unittest
+
+PATH = os.path.realpath(os.path.abspath(__file__))
+sys.path.insert(0, os.path.dirname(os.path.dirname(PATH)))
+
+try:
+    from videomass.vdms_utils.crop_utils import (parse_cropdetect,
+                                                 crop_consensus,
+                                                 sample_positions,
+                                                 insert_crop_filter,
+                                                 load_crop_cache,
+                                                 save_crop_cache,
+                                                 )
+except ImportError as error:
+    sys.exit(error)
+
+
+class TestCropDetection(unittest.TestCase):
+    """Test case for parsing and consensus of detected areas."""
+
+    def test_parse_last_area(self):
+        output = ('[Parsed_cropdetect_0 @ 0x1] x1:0 x2:1919 y1:140 y2:939 '
+                  'w:1920 h:800 x:0 y:140 pts:1 t:0.04 crop=1920:800:0:140\n'
+                  '[Parsed_cropdetect_0 @ 0x1] x1:0 x2:1919 y1:138 y2:941 '
+                  'w:1920 h:804 x:0 y:138 pts:2 t:0.08 crop=1920:804:0:138\n')
+        self.assertEqual(parse_cropdetect(output), (1920, 804, 0, 138))
+        self.assertIsNone(parse_cropdetect('no video stream'))
+
+    def test_consensus(self):
+        rects = [(1920, 800, 0, 140), None, (1920, 800, 0, 140),
+                 (1280, 536, 320, 272)]
+        self.assertEqual(crop_consensus(rects), (1920, 800, 0, 140))
+        # ties are broken in favor of the largest area
+        self.assertEqual(crop_consensus([(640, 480, 0, 0), (720, 480, 0, 0)]),
+                         (720, 480, 0, 0))
+        self.assertIsNone(crop_consensus([None, None]))
+
+    def test_sample_positions(self):
+        self.assertEqual(sample_positions(22000, 4, 2),
+                         [2.5, 7.5, 12.5, 17.5])
+        self.assertEqual(sample_positions(3000, 6, 2), [0.0])
+
+
+class TestInsertCropFilter(unittest.TestCase):
+    """Test case for the insert_crop_filter function."""
+
+    def test_insert(self):
+        rect = (1920, 800, 0, 140)
+        args = ['-c:v libx264 -vf yadif,scale=1280:-1 -c:a aac',
+                '-filter:v vidstabdetect=shakiness=5 -an -f null',
+                '-c:v libx264 -c:a copy',
+                '-c:v copy -c:a aac',
+                '-vn -c:a libmp3lame',
+                '',
+                ]
+        self.assertEqual(insert_crop_filter(args, rect),
+                         ['-c:v libx264 -vf crop=w=1920:h=800:x=0:y=140,'
+                          'yadif,scale=1280:-1 -c:a aac',
+                          '-filter:v crop=w=1920:h=800:x=0:y=140,'
+                          'vidstabdetect=shakiness=5 -an -f null',
+                          '-c:v libx264 -c:a copy '
+                          '-vf crop=w=1920:h=800:x=0:y=140',
+                          '-c:v copy -c:a aac',
+                          '-vn -c:a libmp3lame',
+                          '',
+                          ])
+
+    def test_cache(self):
+        with tempfile.TemporaryDirectory() as tmp:
+            fname = os.path.join(tmp, 'crop.json')
+            self.assertIsNone(load_crop_cache(fname, 'windows=6'))
+            save_crop_cache(fname, 'windows=6', (1920, 800, 0, 140))
+            self.assertEqual(load_crop_cache(fname, 'windows=6'),
+                             (1920, 800, 0, 140))
+            self.assertIsNone(load_crop_cache(fname, 'windows=8'))
+
+
+def main():
+    unittest.main()
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,49 @@
+# -*- coding: UTF-8 -*-
+
+# Porpose: Contains test cases for the estimate_utils.py object.
+# Rev: 19.Oct.2026
+
+import sys
+import os.path
+import unittest
+
+PATH = os.path.realpath(os.path.abspath(__file__))
+sys.path.insert(0, os.path.dirname(os.path.dirname(PATH)))
+
+try:
+    from videomass.vdms_utils.estimate_utils import (pick_subset,
+                                                     extrapolate,
+                                                     format_estimate,
+                                                     )
+except ImportError as error:
+    sys.exit(error)
+
+
+class TestEstimate(unittest.TestCase):
+    """Test case for the batch estimates."""
+
+    def test_subset(self):
+        self.assertEqual(pick_subset([1000, 0, 2000], 3), [0, 2])
+        self.assertEqual(pick_subset([1000] * 9, 3), [1, 4, 7])
+        self.assertEqual(pick_subset([], 3), [])
+
+    def test_extrapolate(self):
+        samples = [(4, 400000, 2.0), (4, 600000, 2.0), (0, 100, 1.0)]
+        est = extrapolate(samples, [60000, 120000])
+        self.assertEqual(est['size'], 180 * 125000)
+        self.assertAlmostEqual(est['time'], 90.0)
+        est = extrapolate(samples, [60000, 120000], concurrency=2)
+        self.assertAlmostEqual(est['time'], 45.0)
+        self.assertIsNone(extrapolate([], [60000]))
+
+    def test_format(self):
+        self.assertEqual(format_estimate({'size': 1048576, 'time': 3661.4}),
+                         '~1.00MiB, ~01:01:01')
+
+
+def main():
+    unittest.main()
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,59 @@
+# -*- coding: UTF-8 -*-
+
+# Porpose: Contains test cases for the gif_utils.py object.
+# Rev: 19.Oct.2026
+
+import sys
+import os.path
+import tempfile
+import unittest
+
+PATH = os.path.realpath(os.path.abspath(__file__))
+sys.path.insert(0, os.path.dirname(os.path.dirname(PATH)))
+
+try:
+    from videomass.vdms_utils.gif_utils import (gif_filters,
+                                                palette_cachename,
+                                                gif_graph,
+                                                gif_graph_cached,
+                                                )
+except ImportError as error:
+    sys.exit(error)
+
+
+class TestGif(unittest.TestCase):
+    """Test case for the GIF export helpers."""
+
+    def test_filters(self):
+        self.assertEqual(gif_filters(10, 'scale=w=320:h=-1'),
+                         'fps=10,scale=w=320:h=-1:flags=lanczos')
+        self.assertEqual(gif_filters(10, 'scale=w=320:h=-1', 'setsar=1'),
+                         'fps=10,scale=w=320:h=-1:flags=lanczos,setsar=1')
+
+    def test_cachename(self):
+        with tempfile.TemporaryDirectory() as tmpdir:
+            first = palette_cachename(tmpdir, 'abc', '', 'fps=10')
+            self.assertEqual(os.path.dirname(first),
+                             os.path.join(tmpdir, 'palettes'))
+            self.assertTrue(os.path.basename(first).startswith('abc_'))
+            self.assertEqual(first, palette_cachename(tmpdir, 'abc', '',
+                                                      'fps=10'))
+            self.assertNotEqual(first, palette_cachename(tmpdir, 'abc', '',
+                                                         'fps=5'))
+
+    def test_graphs(self):
+        self.assertEqual(gif_graph('fps=10', 'bayer'),
+                         '[0:v]fps=10,split=2[a][b];[a]palettegen[pal];'
+                         '[b]fifo[b];[b][pal]paletteuse=dither=bayer[gif]')
+        self.assertIn('palettegen,split=2[pal][palette]',
+                      gif_graph('fps=10', 'bayer', palette=True))
+        self.assertEqual(gif_graph_cached('fps=10', 'none'),
+                         '[0:v]fps=10[x];[x][1:v]paletteuse=dither=none[gif]')
+
+
+def main():
+    unittest.main()
+
+
+if __name__ == '__main__':
+    main()
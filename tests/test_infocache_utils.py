@@ -0,0 +1,80 @@
+# -*- coding: UTF-8 -*-
+
+# Porpose: Contains test cases for the infocache_utils.py object.
+# Rev: 19.Oct.2026
+
+import sys
+import os.path
+import time
+import tempfile
+import unittest
+
+PATH = os.path.realpath(os.path.abspath(__file__))
+sys.path.insert(0, os.path.dirname(os.path.dirname(PATH)))
+
+try:
+    from videomass.vdms_utils.infocache_utils import (normalize_url,
+                                                      info_cachekey,
+                                                      info_cachename,
+                                                      load_info,
+                                                      save_info,
+                                                      clear_info_cache,
+                                                      )
+except ImportError as error:
+    sys.exit(error)
+
+
+class TestInfoCache(unittest.TestCase):
+    """Test case for the yt-dlp metadata cache."""
+
+    def setUp(self):
+        self.tmp = tempfile.TemporaryDirectory()
+
+    def tearDown(self):
+        self.tmp.cleanup()
+
+    def test_normalize(self):
+        self.assertEqual(normalize_url('  HTTPS://WWW.YouTube.com/watch?'
+                                       'v=abc&utm_source=x&feature=share#t'),
+                         'https://www.youtube.com/watch?v=abc')
+        self.assertEqual(normalize_url('https://a.org/p/?b=2&a=1'),
+                         'https://a.org/p?a=1&b=2')
+
+    def test_cachekey(self):
+        url = 'https://a.org/watch?v=1'
+        key = info_cachekey(url, {'noplaylist': True, 'proxy': ''})
+        self.assertEqual(key, info_cachekey(url + '&si=x',
+                                            {'noplaylist': True,
+                                             'format': 'best'}))
+        self.assertNotEqual(key, info_cachekey(url, {'noplaylist': False}))
+        self.assertNotEqual(key, info_cachekey(url, {'noplaylist': True,
+                                                     'proxy': 'p'}))
+
+    def test_load_save(self):
+        name = info_cachename(self.tmp.name, 'key')
+        self.assertIsNone(load_info(name, 60))
+        save_info(name, {'id': 'x'}, 1000000)
+        self.assertEqual(load_info(name, 60), {'id': 'x'})
+        self.assertIsNone(load_info(name, 0))  # disabled, removed
+        self.assertFalse(os.path.exists(name))
+        save_info(name, {'id': 'x'}, 1000000)
+        self.assertIsNone(load_info(name, 60, now=time.time() + 120))
+
+    def test_size_limit(self):
+        old = info_cachename(self.tmp.name, 'old')
+        save_info(old, {'data': 'x' * 100}, 1000000)
+        os.utime(old, (time.time() - 10, time.time() - 10))
+        new = info_cachename(self.tmp.name, 'new')
+        save_info(new, {'data': 'x' * 100}, 150)
+        self.assertFalse(os.path.exists(old))
+        self.assertTrue(os.path.exists(new))
+        self.assertEqual(clear_info_cache(self.tmp.name), 1)
+        self.assertFalse(os.path.exists(new))
+
+
+def main():
+    unittest.main()
+
+
+if __name__ == '__main__':
+    main()
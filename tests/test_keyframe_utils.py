@@ -0,0 +1,83 @@
+# -*- coding: UTF-8 -*-
+
+# Porpose: Contains test cases for the keyframe_utils.py object.
+# Rev: 19.Oct.2026
+
+import sys
+import os.path
+import tempfile
+import unittest
+
+PATH = os.path.realpath(os.path.abspath(__file__))
+sys.path.insert(0, os.path.dirname(os.path.dirname(PATH)))
+
+try:
+    from videomass.vdms_utils.keyframe_utils import (parse_keyframes,
+                                                     parse_scenes,
+                                                     write_index,
+                                                     KeyframeIndex,
+                                                     )
+except ImportError as error:
+    sys.exit(error)
+
+
+class TestParsing(unittest.TestCase):
+    """Test case for the ffprobe/ffmpeg output parsing."""
+
+    def test_parse_keyframes(self):
+        output = ('0.000000,K__\n0.040000,___\n4.004000,K__\n'
+                  '2.002000,K_D\nN/A,K__\n3.000000,__\n')
+        self.assertEqual(list(parse_keyframes(output)), [0, 2002, 4004])
+
+    def test_parse_scenes(self):
+        output = ('[Parsed_metadata_2 @ 0x5] frame:0    pts:120   '
+                  'pts_time:5.005\n'
+                  '[Parsed_metadata_2 @ 0x5] lavfi.scene_score=0.451200\n'
+                  '[Parsed_metadata_2 @ 0x5] frame:1    pts:300   '
+                  'pts_time:12.5\n'
+                  '[Parsed_metadata_2 @ 0x5] lavfi.scene_score=0.900000\n')
+        times, scores = parse_scenes(output)
+        self.assertEqual(list(times), [5005, 12500])
+        self.assertAlmostEqual(scores[0], 0.4512, places=4)
+
+
+class TestKeyframeIndex(unittest.TestCase):
+    """Test case for the KeyframeIndex class."""
+
+    def setUp(self):
+        self.tmpdir = tempfile.TemporaryDirectory()
+        self.fname = os.path.join(self.tmpdir.name, 'source.kfi')
+        write_index(self.fname, [0, 2002, 4004, 6006], [3000], [0.5])
+
+    def tearDown(self):
+        self.tmpdir.cleanup()
+
+    def test_keyframes_queries(self):
+        index = KeyframeIndex(self.fname)
+        self.assertEqual(index.nearest_keyframe(2900), 2002)
+        self.assertEqual(index.nearest_keyframe(3100), 4004)
+        self.assertEqual(index.previous_keyframe(4004), 4004)
+        self.assertEqual(index.previous_keyframe(4003), 2002)
+        self.assertEqual(index.next_keyframe(4005), 6006)
+        self.assertIsNone(index.next_keyframe(7000))
+        self.assertIsNone(index.previous_keyframe(-1))
+
+    def test_scenes_queries(self):
+        index = KeyframeIndex(self.fname)
+        self.assertEqual(index.nearest_scene(10000), 3000)
+        self.assertEqual(index.scene_score(3000), 0.5)
+        self.assertIsNone(index.scene_score(3001))
+
+    def test_invalid_file(self):
+        with open(self.fname, 'wb') as findex:
+            findex.write(b'not an index file')
+        with self.assertRaises(ValueError):
+            KeyframeIndex(self.fname)
+
+
+def main():
+    unittest.main()
+
+
+if __name__ == '__main__':
+    main()
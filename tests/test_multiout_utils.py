@@ -0,0 +1,62 @@
+# -*- coding: UTF-8 -*-
+
+# Porpose: Contains test cases for the multiout_utils.py object.
+# Rev: 19.Oct.2026
+
+import sys
+import os.path
+import unittest
+
+PATH = os.path.realpath(os.path.abspath(__file__))
+sys.path.insert(0, os.path.dirname(os.path.dirname(PATH)))
+
+try:
+    from videomass.vdms_utils.multiout_utils import (group_outputs,
+                                                     multi_output_args,
+                                                     )
+except ImportError as error:
+    sys.exit(error)
+
+
+def item(source, dest, kind='One pass', **kwa):
+    """Returns a minimal conversion item"""
+    data = {'type': kind, 'source': source, 'destination': dest,
+            'args': ['-c:v libx264', ''], 'start-time': '', 'end-time': ''}
+    data.update(kwa)
+    return data
+
+
+class TestMultiOutput(unittest.TestCase):
+    """Test case for the multiple outputs grouping."""
+
+    def test_groups(self):
+        items = [item('a.mp4', '1.mp4'), item('b.mp4', '2.mp4'),
+                 item('a.mp4', '3.mkv'), item('a.mp4', '4.mp4',
+                                              kind='Two pass'),
+                 item('a.mp4', '5.opus', **{'end-time': '-t 00:01:00'}),
+                 item('b.mp4', '6.mp4', autocrop=True),
+                 item('b.mp4', '7.webm')]
+        self.assertEqual(group_outputs(items),
+                         [[0, 2], [1, 6], [3], [4], [5]])
+
+    def test_args(self):
+        items = [item('a.mp4', '1.mp4', **{'end-time': '-t 10'}),
+                 item('a.mp4', '2.opus', args=['-vn -c:a libopus', ''],
+                      volume='-af volume=2')]
+        self.assertEqual(multi_output_args(items).split(),
+                         ['-t', '10', '-c:v', 'libx264', '"1.mp4"', '-vn',
+                          '-c:a', 'libopus', '-af', 'volume=2', '"2.opus"'])
+
+    def test_quoted_args(self):
+        vf = '-vf "drawtext=text=\'a   b\'" -metadata title="x  y"'
+        items = [item('a.mp4', '1.mp4', args=[f'-c:v libx264 {vf}', '']),
+                 item('a.mp4', '2.mp4')]
+        self.assertIn(f'-c:v libx264 {vf} ', multi_output_args(items))
+
+
+def main():
+    unittest.main()
+
+
+if __name__ == '__main__':
+    main()
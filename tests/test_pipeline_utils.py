@@ -0,0 +1,119 @@
+# -*- coding: UTF-8 -*-
+
+# Porpose: Contains test cases for the pipeline_utils.py object.
+# Rev: 19.Oct.2026
+
+import sys
+import os.path
+import json
+import tempfile
+import unittest
+
+PATH = os.path.realpath(os.path.abspath(__file__))
+sys.path.insert(0, os.path.dirname(os.path.dirname(PATH)))
+
+try:
+    from videomass.vdms_utils.pipeline_utils import (preset_profiles,
+                                                     find_profile,
+                                                     profile_args,
+                                                     is_supported,
+                                                     pipeline_destination,
+                                                     probe_duration,
+                                                     pipeline_item,
+                                                     PIPELINE_SUFFIX,
+                                                     can_stream,
+                                                     can_stream_profile,
+                                                     needs_merge,
+                                                     info_filename,
+                                                     stream_command,
+                                                     )
+except ImportError as error:
+    sys.exit(error)
+
+PROFILE = {"Name": "MP3", "Description": "", "First_pass": "-vn  -c:a "
+           "libmp3lame", "Second_pass": "", "Supported_list": "",
+           "Output_extension": "mp3", "Preinput_1": "", "Preinput_2": ""}
+
+
+class TestPipeline(unittest.TestCase):
+    """Test case for the conversion of the downloads."""
+
+    def test_profiles(self):
+        with tempfile.TemporaryDirectory() as tmp:
+            name = os.path.join(tmp, 'Audio.json')
+            self.assertEqual(preset_profiles(name), [])
+            with open(name, 'w', encoding='utf-8') as fln:
+                json.dump([PROFILE], fln)
+            profiles = preset_profiles(name)
+        self.assertEqual(find_profile(profiles, 'MP3'), PROFILE)
+        self.assertIsNone(find_profile(profiles, 'AAC'))
+
+    def test_profile_args(self):
+        args = profile_args('Audio', PROFILE)
+        self.assertEqual(args['type'], 'One pass')
+        self.assertEqual(args['args'], ['-vn -c:a libmp3lame', ''])
+        self.assertEqual(args['preset name'], 'Presets Manager - Audio')
+        self.assertEqual(args['extension'], 'mp3')
+        item = pipeline_item(args, '/a/b.webm', '/a/b.mp3', 1000)
+        self.assertEqual((item['source'], item['duration']),
+                         ('/a/b.webm', 1000))
+        self.assertNotIn('source', args)
+        args = profile_args('Audio', dict(PROFILE, Output_extension='copy',
+                                          Second_pass='-c copy'))
+        self.assertEqual((args['type'], args['extension']), ('Two pass', ''))
+
+    def test_supported(self):
+        self.assertTrue(is_supported('', '/a/b.webm'))
+        self.assertTrue(is_supported('mp4, webm', '/a/b.webm'))
+        self.assertFalse(is_supported('mp4,mkv', '/a/b.webm'))
+
+    def test_destination(self):
+        self.assertEqual(pipeline_destination('/a/b.webm', 'mp3', '/c'),
+                         os.path.join('/c', 'b.mp3'))
+        self.assertEqual(pipeline_destination('/a/b.webm', 'mp3', None, '_x'),
+                         os.path.join('/a', 'b_x.mp3'))
+        self.assertEqual(pipeline_destination('/a/b.webm', '', None),
+                         os.path.join('/a', f'b{PIPELINE_SUFFIX}.webm'))
+
+    def test_duration(self):
+        self.assertEqual(probe_duration({'format': {'duration': '1.5'}}),
+                         1500)
+        self.assertEqual(probe_duration({'format': {}}), 0)
+        self.assertEqual(probe_duration(None), 0)
+
+
+class TestStream(unittest.TestCase):
+    """Test case for the downloads piped into ffmpeg."""
+
+    def test_can_stream(self):
+        data = {'noplaylist': True, 'extractaudio': False,
+                'postprocessors': [], 'writesubtitles': False,
+                'writethumbnail': False}
+        self.assertTrue(can_stream(data))
+        self.assertFalse(can_stream(dict(data, noplaylist=False)))
+        self.assertFalse(can_stream(dict(data, extractaudio=True)))
+        self.assertFalse(can_stream(dict(data, postprocessors=[{}])))
+        args = profile_args('Audio', PROFILE)
+        self.assertTrue(can_stream_profile(args))
+        self.assertFalse(can_stream_profile(dict(args, type='Two pass')))
+        self.assertFalse(can_stream_profile(dict(args, extension='')))
+
+    def test_info(self):
+        self.assertTrue(needs_merge({'requested_formats': [{}, {}]}))
+        self.assertFalse(needs_merge({'format_id': '18'}))
+        self.assertEqual(info_filename({'_filename': 'a.mp4'}), 'a.mp4')
+        self.assertEqual(info_filename({}), '')
+
+    def test_command(self):
+        args = profile_args('Audio', PROFILE)
+        self.assertEqual(stream_command('ffmpeg', '-y', args, '/a/b.mp3'),
+                         '"ffmpeg" -y  -i pipe:0 -vn -c:a libmp3lame '
+                         '"/a/b.mp3"')
+
+
+def main():
+    unittest.main()
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,96 @@
+# -*- coding: UTF-8 -*-
+
+# Porpose: Contains test cases for the progress_utils.py object.
+# Rev: 19.Oct.2026
+
+import sys
+import os.path
+import unittest
+
+PATH = os.path.realpath(os.path.abspath(__file__))
+sys.path.insert(0, os.path.dirname(os.path.dirname(PATH)))
+
+try:
+    from videomass.vdms_utils.progress_utils import (ProgressThrottle,
+                                                     DownloadProgress,
+                                                     PROGRESS_TEMPLATE,
+                                                     format_eta,
+                                                     )
+    from test_ratelimit_utils import Clock
+except ImportError as error:
+    sys.exit(error)
+
+
+class TestProgressThrottle(unittest.TestCase):
+    """Test case for the throttling of the progress."""
+
+    def setUp(self):
+        self.clock = Clock()
+        self.throttle = ProgressThrottle(0.25, self.clock)
+
+    def test_update(self):
+        self.assertEqual(self.throttle.update(0, 'a'), 'a')
+        self.assertIsNone(self.throttle.update(0, 'b'))
+        self.assertEqual(self.throttle.update(1, 'x'), 'x')  # other key
+        self.clock.now = 0.1
+        self.assertIsNone(self.throttle.update(0, 'c'))
+        self.clock.now = 0.3
+        self.assertEqual(self.throttle.update(0, 'd'), 'd')
+        self.assertIsNone(self.throttle.flush(0))
+
+    def test_flush(self):
+        self.throttle.update(0, 'a')
+        self.throttle.update(0, 'b')
+        self.assertEqual(self.throttle.flush(0), 'b')
+        self.assertIsNone(self.throttle.flush(0))
+        self.assertEqual(self.throttle.update(0, 'c'), 'c')  # shown at once
+
+
+class TestDownloadProgress(unittest.TestCase):
+    """Test case for the progress record of the downloads."""
+
+    def test_from_line(self):
+        line = ('[videomass-progress] {"status": "downloading", '
+                '"downloaded_bytes": 1048576, "total_bytes": null, '
+                '"total_bytes_estimate": 10485760, "speed": 1048576.0, '
+                '"eta": 9, "fragment_index": 3, "fragment_count": 20}\n')
+        progress = DownloadProgress.from_line(line)
+        self.assertEqual(progress, DownloadProgress(downloaded=1048576,
+                                                    total=10485760,
+                                                    estimated=True,
+                                                    speed=1048576.0,
+                                                    eta=9, fragment=3,
+                                                    fragments=20))
+        self.assertEqual(progress.columns(),
+                         {'percent': '10.0%', 'size': '~10.00MiB',
+                          'speed': '1.00MiB/s', 'eta': '00:09'})
+        self.assertIsNone(DownloadProgress.from_line('[download] 10%'))
+        self.assertIsNone(DownloadProgress.from_line('[videomass-progress] '
+                                                     'NA'))
+        self.assertIn('%(progress.{status,', PROGRESS_TEMPLATE)
+
+    def test_from_dict(self):
+        hook = {'status': 'downloading', 'downloaded_bytes': 5,
+                'total_bytes': 10, 'speed': None, 'eta': None,
+                '_percent_str': '\x1b[0;94m 50.0%\x1b[0m'}
+        progress = DownloadProgress.from_dict(hook)
+        self.assertEqual(progress.columns(),
+                         {'percent': '50.0%', 'size': '10.00B',
+                          'speed': 'N/A', 'eta': 'N/A'})
+        frags = DownloadProgress(fragment=5, fragments=20)
+        self.assertEqual(frags.columns()['percent'], '25.0%')
+        self.assertEqual(DownloadProgress(status='finished').percent(), 100)
+        self.assertIsNone(DownloadProgress().percent())
+
+    def test_format_eta(self):
+        self.assertEqual(format_eta(9), '00:09')
+        self.assertEqual(format_eta(3725), '1:02:05')
+        self.assertEqual(format_eta(None), 'N/A')
+
+
+def main():
+    unittest.main()
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,98 @@
+# -*- coding: UTF-8 -*-
+
+# Porpose: Contains test cases for the quality_utils.py object.
+# Rev: 19.Oct.2026
+
+import sys
+import os.path
+import tempfile
+import unittest
+
+PATH = os.path.realpath(os.path.abspath(__file__))
+sys.path.insert(0, os.path.dirname(os.path.dirname(PATH)))
+
+try:
+    from videomass.vdms_utils.quality_utils import (quality_filtergraph,
+                                                    video_filters,
+                                                    is_retimed,
+                                                    quality_command,
+                                                    parse_quality,
+                                                    format_report,
+                                                    report_to_csv,
+                                                    )
+    from videomass.vdms_utils.crop_utils import insert_crop_filter
+except ImportError as error:
+    sys.exit(error)
+
+
+class TestQualityUtils(unittest.TestCase):
+    """Test case for the quality verification helpers."""
+
+    def test_filtergraph(self):
+        graph = quality_filtergraph()
+        self.assertNotIn('select', graph)
+        self.assertTrue(graph.endswith('[d0][r0]ssim;[d1][r1]psnr'))
+        graph = quality_filtergraph(5, vmaf=True)
+        self.assertIn('select=not(mod(n\\,5))', graph)
+        self.assertIn('split=3', graph)
+        self.assertTrue(graph.endswith('[d2][r2]libvmaf'))
+        graph = quality_filtergraph(reffilters='scale=640:-2')
+        self.assertIn('[1:v]scale=640:-2,setpts=PTS-STARTPTS', graph)
+
+    def test_video_filters(self):
+        self.assertEqual(video_filters('-c:v libx264 -vf "yadif,scale=-2:720"'
+                                       ' -crf 23'), 'yadif,scale=-2:720')
+        self.assertEqual(video_filters('-filter:v transpose=1 -an'),
+                         'transpose=1')
+        self.assertEqual(video_filters('-c:v libx264 -crf 23'), '')
+        self.assertFalse(is_retimed('-vf "yadif=0:-1:0,transpose=1"'))
+        self.assertTrue(is_retimed('-vf "yadif=1:-1:0"'))
+        self.assertTrue(is_retimed('-vf "crop=10:10:0:0,fps=25"'))
+        self.assertTrue(is_retimed('-c:v libx264 -r 25'))
+
+    def test_command(self):
+        args = insert_crop_filter(['-c:v libx264 -crf 23 -vf scale=-2:720',
+                                   ''], (1920, 800, 0, 140))
+        kwa = {'args': args, 'source': 'in.mkv', 'destination': 'out.mkv',
+               'start-time': '', 'end-time': ''}
+        cmd = quality_command('ffmpeg', kwa)
+        self.assertIn('-i "out.mkv"', cmd)
+        self.assertIn('[1:v]crop=w=1920:h=800:x=0:y=140,scale=-2:720,'
+                      'setpts=PTS-STARTPTS', cmd)
+        kwa['args'] = [f'{args[0]} -r 24', '']
+        self.assertIsNone(quality_command('ffmpeg', kwa))
+
+    def test_parse(self):
+        output = ('[Parsed_ssim_6 @ 0x1] SSIM Y:0.990 (20.0) U:0.99 (21.0) '
+                  'V:0.99 (21.0) All:0.991234 (20.5)\n'
+                  '[Parsed_psnr_7 @ 0x1] PSNR y:44.1 u:46.0 v:46.2 '
+                  'average:44.823 min:40.1 max:51.0\n')
+        self.assertEqual(parse_quality(output),
+                         {'ssim': 0.991234, 'psnr': 44.823, 'vmaf': None})
+        output = ('PSNR y:inf u:inf v:inf average:inf min:inf max:inf\n'
+                  '[libvmaf @ 0x2] VMAF score: 97.428\n')
+        scores = parse_quality(output)
+        self.assertEqual(scores['psnr'], float('inf'))
+        self.assertEqual(scores['vmaf'], 97.428)
+
+    def test_report(self):
+        report = [{'destination': '/tmp/out.mkv', 'size': 1024,
+                   'enctime': 3.5, 'ssim': 0.98, 'psnr': 41.2,
+                   'vmaf': None, 'status': 'OK'}]
+        table = format_report(report).splitlines()
+        self.assertEqual(table[1],
+                         'out.mkv | 1024 | 3.50 | 0.9800 | 41.20 | N/A | OK')
+        with tempfile.TemporaryDirectory() as tmp:
+            fname = os.path.join(tmp, 'report.csv')
+            report_to_csv(report, fname)
+            with open(fname, encoding='utf-8') as fcsv:
+                lines = fcsv.read().splitlines()
+        self.assertEqual(lines[1], '/tmp/out.mkv,1024,3.5,0.98,41.2,,OK')
+
+
+def main():
+    unittest.main()
+
+
+if __name__ == '__main__':
+    main()
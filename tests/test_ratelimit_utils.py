@@ -0,0 +1,88 @@
+# -*- coding: UTF-8 -*-
+
+# Porpose: Contains test cases for the ratelimit_utils.py object.
+# Rev: 19.Oct.2026
+
+import sys
+import os.path
+import time
+import unittest
+
+PATH = os.path.realpath(os.path.abspath(__file__))
+sys.path.insert(0, os.path.dirname(os.path.dirname(PATH)))
+
+try:
+    from videomass.vdms_utils.ratelimit_utils import (parse_schedule,
+                                                      scheduled_rate,
+                                                      TokenBucket,
+                                                      BandwidthScheduler,
+                                                      )
+except ImportError as error:
+    sys.exit(error)
+
+
+class Clock:
+    """A fake monotonic clock"""
+    def __init__(self):
+        self.now = 0.0
+
+    def __call__(self):
+        return self.now
+
+
+class TestSchedule(unittest.TestCase):
+    """Test case for the time-of-day schedules."""
+
+    def test_parse(self):
+        self.assertEqual(parse_schedule('08:00-18:30=500, 23:00-6:00=0,'),
+                         [(480, 1110, 512000), (1380, 360, 0)])
+        self.assertEqual(parse_schedule(''), [])
+        for wrong in ('8-18=500', '08:00-18:00', '25:00-01:00=1'):
+            with self.assertRaises(ValueError):
+                parse_schedule(wrong)
+
+    def test_rate(self):
+        sched = parse_schedule('08:00-18:00=100, 23:00-06:00=0')
+        self.assertEqual(scheduled_rate(sched, 7, 8 * 60), 102400)
+        self.assertEqual(scheduled_rate(sched, 7, 18 * 60), 7)
+        self.assertEqual(scheduled_rate(sched, 7, 2 * 60), 0)
+        self.assertEqual(scheduled_rate(sched, 7, 23 * 60 + 59), 0)
+
+
+class TestBandwidth(unittest.TestCase):
+    """Test case for the token bucket and the scheduler."""
+
+    def test_bucket(self):
+        clock = Clock()
+        bucket = TokenBucket(1000, clock)
+        self.assertEqual(bucket.reserve(1000), 0.0)
+        self.assertEqual(bucket.reserve(500), 0.5)
+        clock.now = 1.5
+        self.assertEqual(bucket.reserve(500), 0.0)
+        bucket.set_rate(0)
+        self.assertEqual(bucket.reserve(10 ** 9), 0.0)
+
+    def test_shares(self):
+        clock = Clock()
+        noon = time.struct_time((2026, 1, 1, 12, 0, 0, 0, 1, -1))
+        sched = BandwidthScheduler(clock, lambda: noon)
+        sched.configure(3000, [])
+        sched.join('a', 1.0)
+        self.assertEqual(sched.share('a'), 3000)
+        sched.join('b', 2.0)
+        self.assertEqual((sched.share('a'), sched.share('b')), (1000, 2000))
+        clock.now = 1.0
+        self.assertEqual(sched.reserve('a', 2000), 1.0)
+        sched.configure(0, parse_schedule('11:00-13:00=6'))
+        self.assertEqual(sched.share('b'), 4096)
+        sched.leave('a')
+        self.assertEqual(sched.share('b'), 6144)
+        self.assertEqual(sched.reserve('z', 100), 0.0)
+
+
+def main():
+    unittest.main()
+
+
+if __name__ == '__main__':
+    main()
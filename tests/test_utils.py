@@ -5,6 +5,7 @@
 
 import sys
 import os.path
+import tempfile
 import unittest
 
 PATH = os.path.realpath(os.path.abspath(__file__))
@@ -15,6 +16,9 @@ try:
                                             to_bytes,
                                             time_to_integer,
                                             integer_to_time,
+                                            media_fingerprint,
+                                            ffconcat_list,
+                                            frame_ranges,
                                             )
 except ImportError as error:
     sys.exit(error)
@@ -99,6 +103,56 @@ class TestTimeHuman(unittest.TestCase):
                                          mills=False), '02:30:50')
 
 
+class TestMediaFingerprint(unittest.TestCase):
+    """ Test case for the media_fingerprint function"""
+
+    def test_fingerprint_changes(self):
+        with tempfile.TemporaryDirectory() as tmpdir:
+            fname = os.path.join(tmpdir, 'media.mkv')
+            with open(fname, 'wb') as media:
+                media.write(b'0000')
+            first = media_fingerprint(fname)
+            self.assertEqual(first, media_fingerprint(fname))
+            with open(fname, 'ab') as media:
+                media.write(b'1111')
+            self.assertNotEqual(first, media_fingerprint(fname))
+
+    def test_missing_file(self):
+        with self.assertRaises(OSError):
+            media_fingerprint('/not/existing/media.mkv')
+
+
+class TestFFconcatList(unittest.TestCase):
+    """Test case for the ffconcat_list function."""
+
+    def test_list(self):
+        files = [os.path.abspath('a.jpg'), os.path.abspath("it's.png")]
+        text = ffconcat_list(files, [2, 3.5]).splitlines()
+        self.assertEqual(text[0], 'ffconcat version 1.0')
+        self.assertEqual(text[1], f"file '{files[0]}'")
+        self.assertEqual(text[2], 'duration 2')
+        self.assertIn("it'\\''s.png'", text[3])
+        self.assertEqual(text[4], 'duration 3.5')
+        self.assertEqual(text[5], text[3])
+        self.assertEqual(ffconcat_list([], []), 'ffconcat version 1.0\n')
+
+
+class TestFrameRanges(unittest.TestCase):
+    """Test case for the frame_ranges function."""
+
+    def test_ranges(self):
+        ranges = frame_ranges(10000, 60000, 2, 4)  # 120 frames
+        self.assertEqual(len(ranges), 4)
+        self.assertEqual(ranges[0], (10.0, 15.5, 30, 1))
+        self.assertEqual(ranges[1], (25.0, 15.5, 30, 31))
+        self.assertEqual(ranges[3], (55.0, 15.0, None, 91))
+
+    def test_few_frames(self):
+        self.assertEqual(frame_ranges(0, 2000, 1, 8),
+                         [(0.0, 2.0, 1, 1), (1.0, 1.0, None, 2)])
+        self.assertEqual(frame_ranges(0, 500, 1, 8), [(0.0, 0.5, None, 1)])
+
+
 def main():
     unittest.main()
 
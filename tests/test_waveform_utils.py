@@ -0,0 +1,70 @@
+# -*- coding: UTF-8 -*-
+
+# Porpose: Contains test cases for the waveform_utils.py object.
+# Rev: 19.Oct.2026
+
+import sys
+import os.path
+import tempfile
+import unittest
+from array import array
+
+PATH = os.path.realpath(os.path.abspath(__file__))
+sys.path.insert(0, os.path.dirname(os.path.dirname(PATH)))
+
+try:
+    from videomass.vdms_utils.waveform_utils import (pcm_to_peaks,
+                                                     write_peaks,
+                                                     PeaksFile,
+                                                     )
+except ImportError as error:
+    sys.exit(error)
+
+
+class TestPcmToPeaks(unittest.TestCase):
+    """Test case for the pcm_to_peaks function."""
+
+    def test_min_max_pairs(self):
+        pcm = array('h', [0, 5, -3, 7, 1, -9, 2, 2, 4]).tobytes()
+        self.assertEqual(list(pcm_to_peaks(pcm, 4)), [-3, 7, -9, 2, 4, 4])
+
+    def test_empty_pcm(self):
+        self.assertEqual(list(pcm_to_peaks(b'', 80)), [])
+
+
+class TestPeaksFile(unittest.TestCase):
+    """Test case for the PeaksFile class."""
+
+    def setUp(self):
+        self.tmpdir = tempfile.TemporaryDirectory()
+        self.fname = os.path.join(self.tmpdir.name, 'source.peaks')
+        # one pair per second, four seconds
+        write_peaks(self.fname, [-1, 1, -4, 2, -2, 8, -3, 3], rate=1)
+
+    def tearDown(self):
+        self.tmpdir.cleanup()
+
+    def test_columns_whole_source(self):
+        with PeaksFile(self.fname) as peaks:
+            self.assertEqual(peaks.count, 4)
+            self.assertEqual(peaks.columns(2), [(-4, 2), (-3, 8)])
+            self.assertEqual(peaks.columns(1), [(-4, 8)])
+
+    def test_columns_zoomed(self):
+        with PeaksFile(self.fname) as peaks:
+            self.assertEqual(peaks.columns(2, 1000, 3000), [(-4, 2), (-2, 8)])
+            self.assertEqual(len(peaks.columns(900)), 900)
+
+    def test_invalid_file(self):
+        with open(self.fname, 'wb') as fpeaks:
+            fpeaks.write(b'not a peaks file')
+        with self.assertRaises(ValueError):
+            PeaksFile(self.fname)
+
+
+def main():
+    unittest.main()
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,101 @@
+# -*- coding: UTF-8 -*-
+
+# Porpose: Contains test cases for the ydl_extractinfo.py object.
+# Rev: 19.Oct.2026
+
+import sys
+import os.path
+import time
+import unittest
+from unittest import mock
+
+PATH = os.path.realpath(os.path.abspath(__file__))
+sys.path.insert(0, os.path.dirname(os.path.dirname(PATH)))
+
+try:
+    import wx
+    from pubsub import pub
+except ImportError as error:
+    sys.exit(error)
+
+else:
+    APP = wx.App(False)
+    APP.appset = {'yt_dlp': False,  # extract_info is replaced by the tests
+                  'ytdlp-info-cache-ttl': 0,
+                  'ytdlp-info-cache-size': 100,
+                  'cachedir': '',
+                  }
+    from videomass.vdms_ytdlp import ydl_extractinfo
+
+
+def fake_extract(url, kwargs):
+    """
+    Replaces `ydl_extractinfo.extract_info`, the first
+    URLs take longer so that the results arrive reversed.
+    """
+    time.sleep(0.02 * (5 - int(url[-1])))
+    if url.endswith('3'):
+        return None, f'Unsupported URL: {url}'
+    return {'id': url[-1], 'title': url}, None
+
+
+class TestInfoPool(unittest.TestCase):
+    """Test case for the concurrent metadata extraction."""
+
+    def setUp(self):
+        self.results, self.ends = [], []
+        pub.subscribe(self.on_result, "INFO_RESULT_EVT")
+        pub.subscribe(self.on_end, "INFO_END_EVT")
+        patches = (mock.patch.object(ydl_extractinfo, 'extract_info',
+                                     side_effect=fake_extract),
+                   mock.patch.object(ydl_extractinfo, 'load_cached_info',
+                                     return_value=None),
+                   mock.patch.object(ydl_extractinfo.wx, 'CallAfter',
+                                     side_effect=lambda func, *args, **kw:
+                                     func(*args, **kw)),
+                   )
+        for patch in patches:
+            patch.start()
+            self.addCleanup(patch.stop)
+
+    def tearDown(self):
+        pub.unsubAll("INFO_RESULT_EVT")
+        pub.unsubAll("INFO_END_EVT")
+
+    def on_result(self, thread, index, url, meta, error):
+        self.results.append((index, url, meta, error))
+
+    def on_end(self, thread):
+        self.ends.append(thread)
+
+    def test_routing(self):
+        urls = [f'https://example.com/v{n}' for n in range(1, 5)]
+        thread = ydl_extractinfo.YdlInfoPool(urls, {}, 'test')
+        thread.join()
+        self.assertEqual(self.ends, [thread])
+        self.assertEqual(sorted(res[0] for res in self.results),
+                         [0, 1, 2, 3])
+        self.assertNotEqual([res[0] for res in self.results], [0, 1, 2, 3])
+        for index, url, meta, error in self.results:
+            self.assertEqual(url, urls[index])
+            if index == 2:
+                self.assertIsNone(meta)
+                self.assertEqual(error, f'Unsupported URL: {urls[2]}')
+            else:
+                self.assertEqual(meta['title'], urls[index])
+                self.assertIsNone(error)
+
+    def test_stop(self):
+        thread = ydl_extractinfo.YdlInfoPool(['https://example.com/v1'],
+                                             {}, 'test')
+        thread.stop()
+        thread.join()
+        self.assertEqual(self.ends, [])
+
+
+def main():
+    unittest.main()
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,114 @@
+# -*- coding: UTF-8 -*-
+
+# Porpose: Contains test cases for the ytdlp_utils.py object.
+# Rev: 19.Oct.2026
+
+import sys
+import os.path
+import unittest
+
+PATH = os.path.realpath(os.path.abspath(__file__))
+sys.path.insert(0, os.path.dirname(os.path.dirname(PATH)))
+
+try:
+    from videomass.vdms_utils.ytdlp_utils import (pool_size,
+                                                  MAX_DOWNLOADS,
+                                                  is_playlist_url,
+                                                  flat_entry,
+                                                  media_formats,
+                                                  format_indexes,
+                                                  parse_indexes,
+                                                  output_filename,
+                                                  is_new_item,
+                                                  )
+except ImportError as error:
+    sys.exit(error)
+
+
+class TestDownloadPool(unittest.TestCase):
+    """Test case for the concurrent downloads helpers."""
+
+    def test_pool_size(self):
+        self.assertEqual(pool_size(3, 10), 3)
+        self.assertEqual(pool_size(3, 2), 2)
+        self.assertEqual(pool_size(0, 5), 1)
+        self.assertEqual(pool_size('4', 5), 4)
+        self.assertEqual(pool_size(None, 5), 1)
+        self.assertEqual(pool_size(100, 500), MAX_DOWNLOADS)
+
+
+class TestPlaylist(unittest.TestCase):
+    """Test case for the playlist expansion helpers."""
+
+    def test_playlist_url(self):
+        self.assertTrue(is_playlist_url('https://a.org/playlist?list=x'))
+        self.assertTrue(is_playlist_url('https://a.org/channel/UCx'))
+        self.assertFalse(is_playlist_url('https://a.org/watch?v=x'))
+
+    def test_flat_entry(self):
+        self.assertEqual(flat_entry({'id': 'x', 'url': 'u',
+                                     'duration': 61.0}),
+                         {'id': 'x', 'title': 'u', 'url': 'u',
+                          'duration': 61.0})
+        self.assertIsNone(flat_entry({'duration': 'n/a'})['duration'])
+        self.assertEqual(flat_entry({}), {'id': '', 'title': '', 'url': '',
+                                          'duration': None})
+
+    def test_indexes(self):
+        self.assertEqual(format_indexes([7, 1, 3, 2, 10, 11, 2]),
+                         '1-3,7,10-11')
+        self.assertEqual(format_indexes([]), '')
+        self.assertEqual(parse_indexes('1-3, 7,11-10'),
+                         {1, 2, 3, 7, 10, 11})
+        self.assertEqual(parse_indexes(''), set())
+        self.assertEqual(parse_indexes('1,a'), set())
+
+
+class TestFormatCodes(unittest.TestCase):
+    """Test case for the detection of the format codes."""
+
+    def test_formats(self):
+        formats = [{'format_id': '18'}, {'format_id': '22'}]
+        self.assertEqual(media_formats({'formats': formats}), formats)
+        single = {'format_id': '0', 'url': 'u'}
+        self.assertEqual(media_formats(single), [single])
+
+    def test_unsupported(self):
+        self.assertEqual(media_formats({'formats': []}), [])
+        self.assertEqual(media_formats({'formats': None}), [])
+        self.assertEqual(media_formats({'formats': [{'url': 'u'}]}), [])
+        self.assertEqual(media_formats({'title': 'generic page'}), [])
+
+
+class TestOutputFile(unittest.TestCase):
+    """Test case for the downloaded files of the executable."""
+
+    def test_output_filename(self):
+        self.assertEqual(output_filename('[download] Destination: /a/b.mp4'),
+                         '/a/b.mp4')
+        self.assertEqual(output_filename('[Merger] Merging formats into '
+                                         '"/a/b c.mkv"\n'), '/a/b c.mkv')
+        self.assertEqual(output_filename('[ExtractAudio] Destination: b.mp3'),
+                         'b.mp3')
+        self.assertEqual(output_filename('[VideoRemuxer] Remuxing video from '
+                                         'webm to mp4; Destination: b.mp4'),
+                         'b.mp4')
+        self.assertEqual(output_filename('[MoveFiles] Moving file "t/b.mp4" '
+                                         'to "/a/b.mp4"'), '/a/b.mp4')
+        self.assertEqual(output_filename('[download] /a/b.mp4 has already '
+                                         'been downloaded'), '/a/b.mp4')
+        self.assertIsNone(output_filename('[download] Destination: b.en.vtt'))
+        self.assertIsNone(output_filename('[download]  50.0% of 1.00MiB'))
+
+    def test_new_item(self):
+        self.assertTrue(is_new_item('[info] abc: Downloading 1 format(s): '
+                                    '137+140'))
+        self.assertFalse(is_new_item('[info] Writing video subtitles to: x'))
+
+
+def main():
+    unittest.main()
+
+
+if __name__ == '__main__':
+    main()
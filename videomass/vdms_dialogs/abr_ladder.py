@@ -0,0 +1,161 @@
+# -*- coding: UTF-8 -*-
+"""
+Name: abr_ladder.py
+Porpose: Settings of the adaptive bitrate streaming packages
+Compatibility: Python3, wxPython Phoenix
+Author: Gianluca Pernigotto <jeanlucperni@gmail.com>
+Copyleft - 2024 Gianluca Pernigotto <jeanlucperni@gmail.com>
+license: GPL3
+Rev: Oct.19.2026
+Code checker: flake8, pylint
+
+This file is part of Videomass.
+
+   Videomass is free software: you can redistribute it and/or modify
+   it under the terms of the GNU General Public License as published by
+   the Free Software Foundation, either version 3 of the License, or
+   (at your option) any later version.
+
+   Videomass is distributed in the hope that it will be useful,
+   but WITHOUT ANY WARRANTY; without even the implied warranty of
+   MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+   GNU General Public License for more details.
+
+   You should have received a copy of the GNU General Public License
+   along with Videomass.  If not, see <http://www.gnu.org/licenses/>.
+"""
+import wx
+from videomass.vdms_utils.abr_utils import LADDER, PACKAGES, parse_ladder
+
+
+class ABRLadder(wx.Dialog):
+    """
+    Sets the ABR ladder (the renditions), the encoder and
+    the packaging of the HLS/DASH streaming packages.
+    See ``main_frame.py`` -> ``on_streaming_package`` method
+    for how to use this class.
+    """
+    CODECS = ('libx264', 'libx265')
+    PRESETS = ('ultrafast', 'superfast', 'veryfast', 'faster', 'fast',
+               'medium', 'slow', 'slower', 'veryslow')
+
+    def __init__(self, parent):
+        """
+        self.ladder: the parsed ladder, set on OK
+        """
+        self.ladder = None
+        wx.Dialog.__init__(self, parent, -1, style=wx.DEFAULT_DIALOG_STYLE)
+
+        sizer_base = wx.BoxSizer(wx.VERTICAL)
+        sbox = wx.StaticBoxSizer(wx.StaticBox(self, wx.ID_ANY, ("")),
+                                 wx.VERTICAL)
+        sizer_base.Add(sbox, 1, wx.ALL | wx.EXPAND, 5)
+        lbl_ladder = wx.StaticText(self, label=_('Renditions (height:bitrate, '
+                                                 '...)'))
+        sbox.Add(lbl_ladder, 0, wx.ALL, 5)
+        self.txt_ladder = wx.TextCtrl(self, wx.ID_ANY, LADDER,
+                                      size=(400, -1))
+        sbox.Add(self.txt_ladder, 0, wx.ALL | wx.EXPAND, 5)
+        grid = wx.FlexGridSizer(cols=2, rows=5, vgap=0, hgap=0)
+        sbox.Add(grid, 0)
+        lbl_codec = wx.StaticText(self, label=_('Video encoder'))
+        grid.Add(lbl_codec, 0, wx.ALL | wx.ALIGN_CENTER_VERTICAL, 5)
+        self.cmbx_codec = wx.ComboBox(self, wx.ID_ANY,
+                                      choices=ABRLadder.CODECS,
+                                      size=(160, -1),
+                                      style=wx.CB_DROPDOWN | wx.CB_READONLY,
+                                      )
+        self.cmbx_codec.SetSelection(0)
+        grid.Add(self.cmbx_codec, 0, wx.ALL, 5)
+        lbl_preset = wx.StaticText(self, label=_('Encoder preset'))
+        grid.Add(lbl_preset, 0, wx.ALL | wx.ALIGN_CENTER_VERTICAL, 5)
+        self.cmbx_preset = wx.ComboBox(self, wx.ID_ANY,
+                                       choices=ABRLadder.PRESETS,
+                                       size=(160, -1),
+                                       style=wx.CB_DROPDOWN | wx.CB_READONLY,
+                                       )
+        self.cmbx_preset.SetSelection(4)
+        grid.Add(self.cmbx_preset, 0, wx.ALL, 5)
+        lbl_audio = wx.StaticText(self, label=_('Audio bitrate (AAC)'))
+        grid.Add(lbl_audio, 0, wx.ALL | wx.ALIGN_CENTER_VERTICAL, 5)
+        self.cmbx_audio = wx.ComboBox(self, wx.ID_ANY,
+                                      choices=('96k', '128k', '160k', '192k'),
+                                      size=(160, -1),
+                                      style=wx.CB_DROPDOWN | wx.CB_READONLY,
+                                      )
+        self.cmbx_audio.SetSelection(1)
+        grid.Add(self.cmbx_audio, 0, wx.ALL, 5)
+        lbl_seg = wx.StaticText(self, label=_('Segment duration (seconds)'))
+        grid.Add(lbl_seg, 0, wx.ALL | wx.ALIGN_CENTER_VERTICAL, 5)
+        self.spin_seg = wx.SpinCtrl(self, wx.ID_ANY, "4", min=1, max=20,
+                                    size=(160, -1))
+        grid.Add(self.spin_seg, 0, wx.ALL, 5)
+        lbl_pkg = wx.StaticText(self, label=_('Packaging'))
+        grid.Add(lbl_pkg, 0, wx.ALL | wx.ALIGN_CENTER_VERTICAL, 5)
+        self.cmbx_pkg = wx.ComboBox(self, wx.ID_ANY,
+                                    choices=PACKAGES,
+                                    size=(160, -1),
+                                    style=wx.CB_DROPDOWN | wx.CB_READONLY,
+                                    )
+        self.cmbx_pkg.SetSelection(0)
+        grid.Add(self.cmbx_pkg, 0, wx.ALL, 5)
+        # confirm buttons:
+        btn_close = wx.Button(self, wx.ID_CANCEL, "")
+        self.btn_ok = wx.Button(self, wx.ID_OK)
+        gridexit = wx.BoxSizer(wx.HORIZONTAL)
+        gridexit.Add(btn_close, 0)
+        gridexit.Add(self.btn_ok, 1, wx.LEFT, 5)
+        sizer_base.Add(gridexit, 0, wx.ALL | wx.EXPAND, 5)
+        # tooltips:
+        tip = (_('Comma separated list of renditions, each one as height '
+                 'and video bitrate, e.g. 720:2800k. Renditions higher '
+                 'than the source are skipped.'))
+        self.txt_ladder.SetToolTip(tip)
+        tip = (_('All the renditions have keyframes at the start of each '
+                 'segment, so that players can switch between them.'))
+        self.spin_seg.SetToolTip(tip)
+        tip = (_('HLS + DASH writes a DASH package with HLS playlists of '
+                 'the same segments.'))
+        self.cmbx_pkg.SetToolTip(tip)
+        # final settings:
+        self.SetTitle(_("Streaming package (HLS/DASH)"))
+        self.SetSizer(sizer_base)
+        sizer_base.Fit(self)
+        self.Layout()
+        # ----------------------Binding (EVT)--------------------------#
+        self.Bind(wx.EVT_BUTTON, self.on_close, btn_close)
+        self.Bind(wx.EVT_BUTTON, self.on_ok, self.btn_ok)
+    # ------------------------------------------------------------------#
+
+    def on_close(self, event):
+        """
+        Close this dialog without saving anything
+        """
+        event.Skip()
+    # ------------------------------------------------------------------#
+
+    def on_ok(self, event):
+        """
+        Checks the ladder before closing
+        """
+        try:
+            self.ladder = parse_ladder(self.txt_ladder.GetValue())
+        except ValueError as err:
+            wx.MessageBox(str(err), _('Videomass - Error!'),
+                          wx.ICON_ERROR, self)
+            return
+        event.Skip()
+    # ------------------------------------------------------------------#
+
+    def getvalue(self):
+        """
+        This method return values via a getvalue() interface by
+        the caller. See the caller for more infos and usage.
+        """
+        return {'ladder': self.ladder,
+                'codec': self.cmbx_codec.GetValue(),
+                'preset': self.cmbx_preset.GetValue(),
+                'audio': self.cmbx_audio.GetValue(),
+                'segment': self.spin_seg.GetValue(),
+                'package': self.cmbx_pkg.GetValue(),
+                }
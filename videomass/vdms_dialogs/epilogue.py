@@ -6,7 +6,7 @@ Compatibility: Python3, wxPython Phoenix
 Author: Gianluca Pernigotto <jeanlucperni@gmail.com>
 Copyleft - 2024 Gianluca Pernigotto <jeanlucperni@gmail.com>
 license: GPL3
-Rev: July.17.2022
+Rev: Oct.19.2026
 Code checker: flake8, pylint
 
 This file is part of Videomass.
@@ -28,11 +28,18 @@ This file is part of Videomass.
 import os
 import wx
 import wx.lib.scrolledpanel as scrolled
+from pubsub import pub
+from videomass.vdms_threads.estimator import BatchEstimator
+from videomass.vdms_utils.estimate_utils import format_estimate
 
 
 class Formula(wx.Dialog):
     """
     Show a dialog box before run process.
+    If the optional `estimate` keyword argument is given (the
+    list of data dict of the batch, see `ffmpeg.FFmpeg`), the
+    output size and encoding time can be estimated before
+    running the batch (see `estimator.BatchEstimator`).
     """
     def __init__(self, parent, *args, **kwargs):
 
@@ -41,6 +48,8 @@ class Formula(wx.Dialog):
         colorscheme = self.appdata['colorscheme']
         self.movetotrash = args[1]
         self.emptylist = args[2]
+        self.batchlist = kwargs.get('estimate')
+        self.estimator = None
 
         wx.Dialog.__init__(self, parent, -1,
                            style=wx.DEFAULT_DIALOG_STYLE
@@ -71,6 +80,21 @@ class Formula(wx.Dialog):
         panelscroll.SetAutoLayout(1)
         panelscroll.SetupScrolling()
 
+        if self.batchlist:
+            sizerest = wx.BoxSizer(wx.HORIZONTAL)
+            sizbase.Add(sizerest, 0, wx.EXPAND)
+            self.btn_estimate = wx.Button(self, wx.ID_ANY,
+                                          _("Estimate size and time"))
+            tip = (_('Encodes a few seconds from some positions of a '
+                     'subset of files with the current settings and '
+                     'estimates the total output size and encoding time.'))
+            self.btn_estimate.SetToolTip(tip)
+            sizerest.Add(self.btn_estimate, 0, wx.ALL, 5)
+            self.lbl_estimate = wx.StaticText(self, wx.ID_ANY, '')
+            sizerest.Add(self.lbl_estimate, 1, wx.ALL
+                         | wx.ALIGN_CENTER_VERTICAL, 5)
+            self.Bind(wx.EVT_BUTTON, self.on_estimate, self.btn_estimate)
+
         lab = (_('When finished, once the operations '
                  'have been completed successfully:'))
         lbl = wx.StaticText(self, label=lab)
@@ -136,11 +160,55 @@ class Formula(wx.Dialog):
             self.emptylist = False
     # --------------------------------------------------------------------#
 
+    def on_estimate(self, event):
+        """
+        Starts or stops the estimate of the batch
+        """
+        if self.estimator:
+            self.stop_estimate()
+            self.lbl_estimate.SetLabel(_('Estimate canceled'))
+            return
+        pub.subscribe(self.estimate_update, "ESTIMATE_EVT")
+        self.estimator = BatchEstimator(self.batchlist)
+        self.btn_estimate.SetLabel(_("Stop estimate"))
+        self.lbl_estimate.SetLabel(_('Sampling...'))
+        self.Layout()
+    # --------------------------------------------------------------------#
+
+    def estimate_update(self, msg, estimate, end):
+        """
+        Receives the progress messages and the result
+        from the "ESTIMATE_EVT" pub/sub topic.
+        """
+        if not self.estimator:
+            return
+        if estimate:
+            msg = _('Estimated output size and time: {0}'
+                    ).format(format_estimate(estimate))
+        self.lbl_estimate.SetLabel(msg)
+        if end:
+            self.stop_estimate()
+        self.Layout()
+    # --------------------------------------------------------------------#
+
+    def stop_estimate(self):
+        """
+        Stops the estimator if it is running
+        """
+        if not self.estimator:
+            return
+        pub.unsubscribe(self.estimate_update, "ESTIMATE_EVT")
+        self.estimator.stop()
+        self.estimator = None
+        self.btn_estimate.SetLabel(_("Estimate size and time"))
+    # --------------------------------------------------------------------#
+
     def on_cancel(self, event):
         """
         exit from formula dialog
         """
         # self.Destroy()
+        self.stop_estimate()
         event.Skip()
 
     def on_ok(self, event):
@@ -148,6 +216,7 @@ class Formula(wx.Dialog):
         get confirmation to proceed
         """
         # self.Destroy()
+        self.stop_estimate()
         event.Skip()
 
     def getvalue(self):
@@ -30,6 +30,8 @@ import wx.lib.statbmp
 import wx.lib.colourselect as csel
 from pubsub import pub
 from videomass.vdms_threads.generic_task import FFmpegGenericTask
+from videomass.vdms_threads.cropdetect import CropDetectThread
+from videomass.vdms_dialogs.widget_utils import PopupDialog
 from videomass.vdms_utils.utils import time_to_integer
 from videomass.vdms_utils.utils import integer_to_time
 from videomass.vdms_utils.utils import clockset
@@ -211,6 +213,7 @@ class Crop(wx.Dialog):
         self.h_scaled = round((self.height / self.width) * toscale)
         self.w_scaled = round((self.width / self.height) * self.h_scaled)
         self.filename = kwa['filename']  # selected filename on file list
+        self.duration = kwa['duration']  # HH:MM:SS.ms duration string
         name = os.path.splitext(os.path.basename(self.filename))[0]
         self.frame = os.path.join(f'{Crop.TMPSRC}', f'{name}.png')  # image
         self.fileclock = os.path.join(Crop.TMPROOT, f'{name}.clock')
@@ -300,6 +303,14 @@ class Crop(wx.Dialog):
         boxctrl.Add(self.spin_y, 0, wx.CENTRE)
         label_Y = wx.StaticText(self, wx.ID_ANY, ("Y"))
         boxctrl.Add(label_Y, 0, wx.BOTTOM | wx.CENTRE, 5)
+        boxauto = wx.StaticBox(self, wx.ID_ANY, (_("Automatic detection")))
+        sizerauto = wx.StaticBoxSizer(boxauto, wx.HORIZONTAL)
+        sizerBase.Add(sizerauto, 0, wx.ALL | wx.EXPAND, 5)
+        self.btn_detect = wx.Button(self, wx.ID_ANY, _("Detect"))
+        sizerauto.Add(self.btn_detect, 0, wx.ALL | wx.CENTRE, 5)
+        self.ckbx_auto = wx.CheckBox(self, wx.ID_ANY,
+                                     _("Detect on each file when encoding"))
+        sizerauto.Add(self.ckbx_auto, 0, wx.ALL | wx.CENTRE, 5)
         # bottom layout for buttons
         gridBtn = wx.GridSizer(1, 2, 0, 0)
         gridexit = wx.BoxSizer(wx.HORIZONTAL)
@@ -340,6 +351,13 @@ class Crop(wx.Dialog):
         self.spin_x.SetToolTip(_('Move horizontally (set to -1 to center '
                                  'the horizontal axis)'))
         self.spin_h.SetToolTip(_('Crop to height'))
+        self.btn_detect.SetToolTip(_('Detects the black borders of this '
+                                     'video by analyzing a few short '
+                                     'segments spread across the file'))
+        self.ckbx_auto.SetToolTip(_('The black borders are detected '
+                                    'separately on each file of the '
+                                    'list before encoding, the cropping '
+                                    'area set here is not used'))
 
         # ----------------------Binding (EVT)------------------------#
         self.Bind(wx.EVT_SPINCTRL, self.onWidth, self.spin_w)
@@ -349,6 +367,8 @@ class Crop(wx.Dialog):
         self.Bind(wx.EVT_BUTTON, self.onCentre, self.btn_centre)
         self.Bind(wx.EVT_COMMAND_SCROLL, self.on_Seek, self.sld_time)
         self.Bind(wx.EVT_BUTTON, self.make_frame_from_file, self.btn_load)
+        self.Bind(wx.EVT_BUTTON, self.on_detect, self.btn_detect)
+        self.Bind(wx.EVT_CHECKBOX, self.on_auto, self.ckbx_auto)
 
         self.Bind(wx.EVT_BUTTON, self.on_close, btn_close)
         self.Bind(wx.EVT_BUTTON, self.on_ok, btn_ok)
@@ -362,6 +382,11 @@ class Crop(wx.Dialog):
 
         if args[0]:  # fcrop previusly values
             self.default(args[0], args[1])
+        if kwa.get('autocrop'):
+            self.ckbx_auto.SetValue(True)
+            self.btn_color.SetValue(args[1])
+            self.bob.oncolor(None, color=args[1])
+            self.on_auto(None)
     # ------------------------------------------------------------------#
 
     def default(self, fcrop, colorcrop):
@@ -503,6 +528,49 @@ class Crop(wx.Dialog):
         self.onDrawing()
     # ------------------------------------------------------------------#
 
+    def on_detect(self, event):
+        """
+        Detects the black borders of the current video
+        and sets the cropping area accordingly.
+        """
+        logfile = make_log_template('cropdetect.log', Crop.LOGDIR, mode="w")
+        thread = CropDetectThread(self.filename,
+                                  time_to_integer(self.duration),
+                                  logfile,
+                                  )
+        dlgload = PopupDialog(self,
+                              _("Videomass - Loading..."),
+                              _("Wait....\nDetecting black borders."),
+                              thread,
+                              )
+        dlgload.ShowModal()
+        thread.join()  # wait end thread
+        dlgload.Destroy()
+        if thread.status:
+            wx.MessageBox(f'{thread.status}', _('Videomass - Error!'),
+                          wx.ICON_ERROR, self)
+            return
+        if not thread.data:
+            return
+        width, height, x_axis, y_axis = thread.data
+        self.spin_w.SetValue(width)
+        self.spin_h.SetValue(height)
+        self.spin_x.SetValue(x_axis)
+        self.spin_y.SetValue(y_axis)
+        self.onDrawing()
+    # ------------------------------------------------------------------#
+
+    def on_auto(self, event):
+        """
+        Enables or disables the crop detection on each file,
+        the manual cropping area is disabled when enabled.
+        """
+        enable = not self.ckbx_auto.GetValue()
+        for ctrl in (self.spin_w, self.spin_h, self.spin_x,
+                     self.spin_y, self.btn_centre):
+            ctrl.Enable(enable)
+    # ------------------------------------------------------------------#
+
     def on_reset(self, event):
         """
         Reset all control values
@@ -515,6 +583,8 @@ class Crop(wx.Dialog):
         self.spin_x.SetValue(0)
         self.spin_h.SetValue(0)
         self.spin_y.SetValue(0)
+        self.ckbx_auto.SetValue(False)
+        self.on_auto(None)
         self.onDrawing()
     # ------------------------------------------------------------------#
 
@@ -538,7 +608,12 @@ class Crop(wx.Dialog):
         from the caller. See the caller for more info and usage.
         Note: -1 for X and Y coordinates means center, which are
         no longer supported by the FFmpeg syntax.
+        Returns a tuple (crop, color, autocrop) where `crop` is an
+        empty string if `autocrop` is True, None if nothing is set.
         """
+        if self.ckbx_auto.GetValue():
+            return '', self.btn_color.GetValue(), True
+
         width = self.spin_w.GetValue()
         height = self.spin_h.GetValue()
         x_axis = self.spin_x.GetValue()
@@ -560,6 +635,6 @@ class Crop(wx.Dialog):
             val = f'w={width}:h={height}:{horiz_pos}{vert_pos}'
             crop = val[:len(val) - 1]  # remove last ':' string
             color = self.btn_color.GetValue()
-            return crop, color
+            return crop, color, False
 
         return None
@@ -182,6 +182,32 @@ class SetUp(wx.Dialog):
         sizerFFmpeg.Add(gridFFplay, 0, wx.EXPAND)
         gridFFplay.Add(self.txtctrl_ffplay, 1, wx.ALL, 5)
         gridFFplay.Add(self.btn_ffplay, 0, wx.RIGHT | wx.CENTER, 5)
+        sizerFFmpeg.Add((0, 20))
+        labindex = wx.StaticText(tabTwo, wx.ID_ANY, _('Media analysis'))
+        sizerFFmpeg.Add(labindex, 0, wx.ALL | wx.EXPAND, 5)
+        msg = _("Index the keyframes of imported videos in the background")
+        self.ckbx_keyindex = wx.CheckBox(tabTwo, wx.ID_ANY, (msg))
+        sizerFFmpeg.Add(self.ckbx_keyindex, 0, wx.LEFT | wx.TOP, 5)
+        msg = _("Also detect scene changes (slower)")
+        self.ckbx_sceneindex = wx.CheckBox(tabTwo, wx.ID_ANY, (msg))
+        sizerFFmpeg.Add(self.ckbx_sceneindex, 0, wx.LEFT | wx.TOP, 5)
+        msg = _("Verify the quality of the outputs after encoding "
+                "(SSIM/PSNR)")
+        self.ckbx_verify = wx.CheckBox(tabTwo, wx.ID_ANY, (msg))
+        sizerFFmpeg.Add(self.ckbx_verify, 0, wx.LEFT | wx.TOP, 5)
+        sizerverify = wx.BoxSizer(wx.HORIZONTAL)
+        sizerFFmpeg.Add(sizerverify, 0)
+        self.labsubsample = wx.StaticText(tabTwo, wx.ID_ANY,
+                                          _('Analyze one frame every:'))
+        sizerverify.Add(self.labsubsample, 0, wx.LEFT | wx.CENTER, 5)
+        self.spin_subsample = wx.SpinCtrl(tabTwo, wx.ID_ANY, "1",
+                                          min=1, max=100, size=(-1, -1),
+                                          style=wx.SP_ARROW_KEYS,
+                                          )
+        sizerverify.Add(self.spin_subsample, 0, wx.ALL | wx.CENTER, 5)
+        msg = _("Also use VMAF when available (slower)")
+        self.ckbx_vmaf = wx.CheckBox(tabTwo, wx.ID_ANY, (msg))
+        sizerverify.Add(self.ckbx_vmaf, 0, wx.LEFT | wx.CENTER, 10)
         tabTwo.SetSizer(sizerFFmpeg)
         notebook.AddPage(tabTwo, _("FFmpeg"))
 
@@ -550,6 +576,12 @@ class SetUp(wx.Dialog):
         self.Bind(wx.EVT_CHECKBOX, self.exit_warn, self.ckbx_exitconfirm)
         self.Bind(wx.EVT_CHECKBOX, self.clear_Cache, self.ckbx_cacheclr)
         self.Bind(wx.EVT_CHECKBOX, self.clear_logs, self.ckbx_logclr)
+        self.Bind(wx.EVT_CHECKBOX, self.on_keyframe_index,
+                  self.ckbx_keyindex)
+        self.Bind(wx.EVT_CHECKBOX, self.on_scene_index, self.ckbx_sceneindex)
+        self.Bind(wx.EVT_CHECKBOX, self.on_verify, self.ckbx_verify)
+        self.Bind(wx.EVT_SPINCTRL, self.on_subsample, self.spin_subsample)
+        self.Bind(wx.EVT_CHECKBOX, self.on_vmaf, self.ckbx_vmaf)
         self.Bind(wx.EVT_TEXT, self.on_char_encoding, self.txtctrl_charenc)
         self.Bind(wx.EVT_BUTTON, self.on_help, btn_help)
         self.Bind(wx.EVT_BUTTON, self.on_cancel, btn_cancel)
@@ -572,6 +604,13 @@ class SetUp(wx.Dialog):
         self.ckbx_cacheclr.SetValue(self.appdata['clearcache'])
         self.ckbx_exitconfirm.SetValue(self.appdata['warnexiting'])
         self.ckbx_logclr.SetValue(self.appdata['clearlogfiles'])
+        self.ckbx_keyindex.SetValue(self.appdata['keyframe_index'])
+        self.ckbx_sceneindex.SetValue(self.appdata['scene_index'])
+        self.ckbx_sceneindex.Enable(self.appdata['keyframe_index'])
+        self.ckbx_verify.SetValue(self.appdata['verify_quality'])
+        self.spin_subsample.SetValue(self.appdata['verify_subsample'])
+        self.ckbx_vmaf.SetValue(self.appdata['verify_vmaf'])
+        self.on_verify(None)
         self.ckbx_trash.SetValue(self.settings['move_file_to_trash'])
         self.ckbx_ytdlp.SetValue(self.settings['enable-ytdlp'])
         self.ckbx_ytexe.SetValue(self.settings['ytdlp-useexec'])
@@ -1040,6 +1079,44 @@ class SetUp(wx.Dialog):
         self.settings['clearlogfiles'] = self.ckbx_logclr.GetValue()
     # --------------------------------------------------------------------#
 
+    def on_keyframe_index(self, event):
+        """
+        if checked, index the keyframes of the imported videos
+        """
+        self.settings['keyframe_index'] = self.ckbx_keyindex.GetValue()
+        self.ckbx_sceneindex.Enable(self.ckbx_keyindex.GetValue())
+    # --------------------------------------------------------------------#
+
+    def on_scene_index(self, event):
+        """
+        if checked, detect scene changes while indexing keyframes
+        """
+        self.settings['scene_index'] = self.ckbx_sceneindex.GetValue()
+    # --------------------------------------------------------------------#
+
+    def on_verify(self, event):
+        """
+        if checked, verify the quality of the outputs after encoding
+        """
+        self.settings['verify_quality'] = self.ckbx_verify.GetValue()
+        for ctrl in (self.labsubsample, self.spin_subsample, self.ckbx_vmaf):
+            ctrl.Enable(self.ckbx_verify.GetValue())
+    # --------------------------------------------------------------------#
+
+    def on_subsample(self, event):
+        """
+        Sets the frames subsampling for the quality verification
+        """
+        self.settings['verify_subsample'] = self.spin_subsample.GetValue()
+    # --------------------------------------------------------------------#
+
+    def on_vmaf(self, event):
+        """
+        if checked, use libvmaf for the quality verification
+        """
+        self.settings['verify_vmaf'] = self.ckbx_vmaf.GetValue()
+    # --------------------------------------------------------------------#
+
     def on_char_encoding(self, event):
         """
         TextCtrl event to set character encoding
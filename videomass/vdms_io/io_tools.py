@@ -6,7 +6,7 @@ Compatibility: Python3, wxPython4 Phoenix
 Author: Gianluca Pernigotto <jeanlucperni@gmail.com>
 Copyleft - 2024 Gianluca Pernigotto <jeanlucperni@gmail.com>
 license: GPL3
-Rev: Apr.20.2024
+Rev: Oct.19.2026
 Code checker: flake8, pylint
 
 This file is part of Videomass.
@@ -36,13 +36,17 @@ from videomass.vdms_threads.check_bin import (ff_conf,
                                               )
 from videomass.vdms_utils.utils import open_default_application
 from videomass.vdms_dialogs.widget_utils import PopupDialog
-from videomass.vdms_ytdlp.ydl_extractinfo import YdlExtractInfo
+from videomass.vdms_ytdlp.ydl_extractinfo import (YdlExtractInfo,
+                                                   load_cached_info,
+                                                   )
 
 
 def youtubedl_getstatistics(url, kwargs, parent=None):
     """
     Call `YdlExtractInfo` thread to extract data info.
     During this process a wait pop-up dialog is shown.
+    Metadata found in the metadata cache are returned
+    without extracting them again.
 
     Returns a generator.
 
@@ -52,6 +56,10 @@ def youtubedl_getstatistics(url, kwargs, parent=None):
         data = thread.data
         yield data
     """
+    meta = load_cached_info(url, kwargs)
+    if meta:
+        yield meta, None
+        return
     thread = YdlExtractInfo(url, kwargs)
     dlgload = PopupDialog(parent,
                           _("Videomass - Loading..."),
@@ -6,7 +6,7 @@ Compatibility: Python3, wxPython Phoenix
 Author: Gianluca Pernigotto <jeanlucperni@gmail.com>
 Copyleft - 2024 Gianluca Pernigotto <jeanlucperni@gmail.com>
 license: GPL3
-Rev: June.24.2024
+Rev: Oct.19.2026
 Code checker: flake8, pylint
 
 This file is part of Videomass.
@@ -42,6 +42,7 @@ from videomass.vdms_dialogs.ffmpeg_conf import FFmpegConf
 from videomass.vdms_dialogs.ffmpeg_codecs import FFmpegCodecs
 from videomass.vdms_dialogs.ffmpeg_formats import FFmpegFormats
 from videomass.vdms_dialogs.queuedlg import QueueManager
+from videomass.vdms_dialogs.abr_ladder import ABRLadder
 from videomass.vdms_ytdlp.main_ytdlp import MainYtdl
 from videomass.vdms_dialogs.mediainfo import MediaStreams
 from videomass.vdms_dialogs.showlogs import ShowLogs
@@ -61,6 +62,16 @@ from videomass.vdms_sys.about_app import VERSION
 from videomass.vdms_sys.settings_manager import ConfigManager
 from videomass.vdms_sys.argparser import info_this_platform
 from videomass.vdms_utils.utils import copydir_recursively
+from videomass.vdms_utils.utils import update_timeseq_duration
+from videomass.vdms_utils.abr_utils import fit_ladder, abr_args
+from videomass.vdms_utils.presets_manager_utils import json_data
+from videomass.vdms_utils.pipeline_utils import (find_profile,
+                                                 profile_args,
+                                                 is_supported,
+                                                 pipeline_destination,
+                                                 pipeline_item,
+                                                 PIPELINE_LOG,
+                                                 )
 from videomass.vdms_threads.shutdown import shutdown_system
 
 
@@ -105,6 +116,7 @@ class MainFrame(wx.Frame):
         self.emptylist = self.appdata['move_file_to_trash']  # boolean
         self.queuelist = None  # list data to process queue
         self.removequeue = True  # Remove items queue when finished
+        self.pipeline = None  # (args, supported) to convert the downloads
         self.mediastreams = False
         self.showlogs = False
         self.helptopic = False
@@ -198,6 +210,7 @@ class MainFrame(wx.Frame):
         pub.subscribe(self.check_modeless_window, "DESTROY_ORPHANED_WINDOWS")
         pub.subscribe(self.process_terminated, "PROCESS TERMINATED")
         pub.subscribe(self.end_queue_processing, "QUEUE PROCESS SUCCESSFULLY")
+        pub.subscribe(self.pipeline_add, "PIPELINE_ADD_EVT")
 
         # this block need to initilizes queue.backup on startup
         fque = os.path.join(self.appdata["confdir"], 'queue.backup')
@@ -440,6 +453,7 @@ class MainFrame(wx.Frame):
         Permanent exit from the application.
         Do not use this method directly.
         """
+        self.fileDnDTarget.stop_indexer()
         self.Destroy()
     # ------------------------------------------------------------------#
 
@@ -532,6 +546,11 @@ class MainFrame(wx.Frame):
                  _("Get the latest presets from {0}").format(prstpage))
         self.prstdownload = toolsButton.Append(wx.ID_ANY, dscrp[0], dscrp[1])
         toolsButton.AppendSeparator()
+        dscrp = (_("Streaming package (HLS/DASH)"),
+                 _("Encode the imported video files to adaptive bitrate "
+                   "HLS/DASH streaming packages"))
+        self.abrpackage = toolsButton.Append(wx.ID_ANY, dscrp[0], dscrp[1])
+        toolsButton.AppendSeparator()
         dscrp = (_("Work notes\tCtrl+N"),
                  _("Read and write useful notes and reminders."))
         notepad = toolsButton.Append(wx.ID_ANY, dscrp[0], dscrp[1])
@@ -664,6 +683,7 @@ class MainFrame(wx.Frame):
         self.Bind(wx.EVT_MENU, self.find_topics, searchtopic)
         self.Bind(wx.EVT_MENU, self.prst_downloader, self.prstdownload)
         self.Bind(wx.EVT_MENU, self.prst_checkversion, self.prstcheck)
+        self.Bind(wx.EVT_MENU, self.on_streaming_package, self.abrpackage)
         self.Bind(wx.EVT_MENU, self.reminder, notepad)
         # ---- VIEW ----
         self.Bind(wx.EVT_MENU, self.get_ffmpeg_conf, checkconf)
@@ -890,6 +910,66 @@ class MainFrame(wx.Frame):
         return
     # -------------------------------------------------------------------#
 
+    def on_streaming_package(self, event):
+        """
+        Encodes each imported video file to an adaptive bitrate
+        streaming package (see `abr_utils.abr_args`) by a single
+        process decoding the source once, using the one pass
+        conversion of `ffmpeg.FFmpeg`.
+        """
+        files = []
+        for num, data in enumerate(self.data_files or []):
+            video = [s for s in data.get('streams', [])
+                     if s.get('codec_type') == 'video'
+                     and not s.get('disposition', {}).get('attached_pic')]
+            if video:
+                audio = [s for s in data['streams']
+                         if s.get('codec_type') == 'audio']
+                files.append((num, int(video[0].get('height', 0)),
+                              bool(audio)))
+        if not files:
+            wx.MessageBox(_('There are no video files to process'),
+                          'Videomass', wx.ICON_INFORMATION, self)
+            return
+
+        with ABRLadder(self) as dlg:
+            if dlg.ShowModal() != wx.ID_OK:
+                return
+            opts = dlg.getvalue()
+
+        dur, ss, et = update_timeseq_duration(self.time_seq, self.duration)
+        datalist, outputdir = [], self.appdata['outputdir']
+        for num, height, hasaudio in files:
+            source = self.file_src[num]
+            if self.appdata['outputdir_asinput']:
+                outputdir = os.path.dirname(source)
+            outdir = os.path.join(outputdir, f'{self.outputnames[num]}_stream')
+            args, dest = abr_args(fit_ladder(opts['ladder'], height), outdir,
+                                  codec=opts['codec'],
+                                  preset=opts['preset'],
+                                  audio=opts['audio'] if hasaudio else None,
+                                  segment=opts['segment'],
+                                  package=opts['package'],
+                                  )
+            try:
+                os.makedirs(outdir, mode=0o777, exist_ok=True)
+            except OSError as err:
+                wx.MessageBox(f"{err}", _('Videomass - Error!'),
+                              wx.ICON_ERROR, self)
+                return
+            datalist.append({'type': 'One pass', 'source': source,
+                             'destination': dest, 'args': [args, ''],
+                             'duration': dur[num], 'start-time': ss,
+                             'end-time': et, 'abr': True,
+                             'logname': 'Streaming Package.log',
+                             'preset name': 'Streaming package',
+                             })
+        self.switch_to_processing('One pass',
+                                  'Streaming Package.log',
+                                  datalist=datalist
+                                  )
+    # ------------------------------------------------------------------#
+
     def reminder(self, event):
         """
         Call `io_tools.openpath` to open a 'user_memos.txt' file
@@ -1586,6 +1666,79 @@ class MainFrame(wx.Frame):
             self.toolbar.EnableTool(37, True)
     # ------------------------------------------------------------------#
 
+    def pipeline_open(self, preset, profile):
+        """
+        Starts converting the downloads of the YouTube Downloader
+        with the `profile` name of the `preset` name as soon as
+        they finish (see `pipeline_add`), until `pipeline_close`
+        is called. Returns True if started, False otherwise.
+        """
+        if self.ProcessPanel.thread_type:
+            wx.MessageBox(_('The downloads will not be converted, '
+                            'another process is running.'),
+                          'Videomass', wx.ICON_WARNING, self)
+            return False
+        prstfile = os.path.join(self.appdata['confdir'], 'presets',
+                                f'{preset}.json')
+        profiles = json_data(prstfile)
+        if profiles == 'error':
+            return False
+        prof = find_profile(profiles, profile)
+        if not prof:
+            wx.MessageBox(_('The downloads will not be converted, '
+                            'profile "{0}" not found in the preset '
+                            '"{1}".').format(profile, preset),
+                          'Videomass', wx.ICON_WARNING, self)
+            return False
+        self.pipeline = (profile_args(preset, prof),
+                         prof.get('Supported_list', ''))
+        self.switch_to_processing('Queue Processing',
+                                  PIPELINE_LOG,
+                                  datalist=[],
+                                  feeding=True,
+                                  )
+        return True
+    # ------------------------------------------------------------------#
+
+    def pipeline_add(self, filename, duration):
+        """
+        Appends the `filename` download, of `duration`
+        milliseconds, to the conversions started by
+        `pipeline_open`. This method is called using
+        pub/sub protocol (see `ydl_downloader.hand_off`).
+        """
+        if not self.pipeline or not self.ProcessPanel.thread_type:
+            return
+        args, supported = self.pipeline
+        if not is_supported(supported, filename):
+            pub.sendMessage("UPDATE_EVT",
+                            output=f'\n[VIDEOMASS]: Not converted, format '
+                                   f'not supported by the profile: '
+                                   f'"{filename}"\n',
+                            duration=0,
+                            status=0,
+                            )
+            return
+        if self.appdata['outputdir_asinput']:
+            outputdir = None
+        else:
+            outputdir = self.appdata['outputdir']
+        dest = pipeline_destination(filename, args['extension'], outputdir,
+                                    self.appdata['filesuffix'])
+        self.ProcessPanel.thread_type.append(pipeline_item(args, filename,
+                                                           dest, duration))
+    # ------------------------------------------------------------------#
+
+    def pipeline_close(self):
+        """
+        No more downloads to convert, the conversions
+        end once those already appended are done.
+        """
+        if self.pipeline and self.ProcessPanel.thread_type:
+            self.ProcessPanel.thread_type.close()
+        self.pipeline = None
+    # ------------------------------------------------------------------#
+
     def on_add_to_queue(self, event):
         """
         Append data of selected file to queue
@@ -1628,11 +1781,13 @@ class MainFrame(wx.Frame):
         self.queue_tool_counter()
     # ------------------------------------------------------------------#
 
-    def switch_to_processing(self, *args, datalist=None):
+    def switch_to_processing(self, *args, datalist=None, feeding=False):
         """
         This method is called by start methods of any
         topic. It call `ProcessPanel.topic_thread`
         method assigning the corresponding thread.
+        With `feeding`, the queue is processed while
+        it is filled (see `pipeline_open`).
         """
         self.SetTitle(_('Videomass - FFmpeg Message Monitoring'))
         self.ChooseTopic.Hide()
@@ -1650,6 +1805,7 @@ class MainFrame(wx.Frame):
             self.openmedia.Enable(False)
             self.loadqueue.Enable(False)
             self.setupItem.Enable(False)
+            self.abrpackage.Enable(False)
             if self.rename.IsEnabled():
                 self.rename.Enable(False)
             if self.rename_batch.IsEnabled():
@@ -1660,7 +1816,8 @@ class MainFrame(wx.Frame):
             self.menu_go_items((1, 1, 1, 1, 1, 1, 1, 0))  # Go menu items
             [self.toolbar.EnableTool(x, False) for x in (4, 8, 36)]
             [self.toolbar.EnableTool(x, True) for x in (3, 5, 6, 7, 35)]
-        self.ProcessPanel.topic_thread(args, datalist, self.topicname)
+        self.ProcessPanel.topic_thread(args, datalist, self.topicname,
+                                       feeding=feeding)
         self.Layout()
     # ------------------------------------------------------------------#
 
@@ -1707,10 +1864,12 @@ class MainFrame(wx.Frame):
         Process report terminated. This method is called using
         pub/sub protocol. see `long_processing_task.end_proc()`)
         """
+        self.pipeline = None
         self.menu_go_items((1, 1, 1, 1, 1, 1, 1, 0))  # Go menu items
         self.openmedia.Enable(False)
         self.loadqueue.Enable(False)
         self.setupItem.Enable(True)
+        self.abrpackage.Enable(True)
 
         [self.toolbar.EnableTool(x, True) for x in (3, 5, 7)]
         self.toolbar.EnableTool(8, False)
@@ -24,11 +24,21 @@ This file is part of Videomass.
    You should have received a copy of the GNU General Public License
    along with Videomass.  If not, see <http://www.gnu.org/licenses/>.
 """
+from collections import OrderedDict
 import wx
 import wx.adv
 from pubsub import pub
 from videomass.vdms_utils.utils import integer_to_time
 from videomass.vdms_utils.utils import time_to_integer
+from videomass.vdms_utils.utils import media_fingerprint
+from videomass.vdms_utils.waveform_utils import (PeaksFile,
+                                                 peaks_cachename,
+                                                 )
+from videomass.vdms_threads.filmstrip import (FilmstripThread,
+                                              filmstrip_cachename,
+                                              load_filmstrip,
+                                              )
+from videomass.vdms_threads.waveform import WaveformThread
 
 
 class Time_Selector(wx.Dialog):
@@ -156,12 +166,18 @@ class Float_TL(wx.MiniFrame):
     DELIMITER_COLOR = '#009DCB'  # Azure for margin selection
     TEXT_PEN_COLOR = '#020D0F'  # black for draw lines
     DURATION_START = '#E95420'  # Light orange for duration/start indicators
+    TRACK_BKGRD = '#1b0413'  # dark background for the filmstrip track
+    WAVEFORM = '#52EE7D'  # light green for the audio waveform
 
     # ruler and panel specifications constants
     RW = 900  # ruler width
     RM = 0  # ruler margin
     PW = 906  # panel width
     PH = 60  # panel height
+    TW = 75  # filmstrip tile width
+    TH = 42  # filmstrip tile height
+    TILES = 12  # filmstrip tiles (TW * TILES == RW)
+    MAXCACHE = 16 * 1024 * 1024  # max bytes of filmstrips kept in memory
 
     def __init__(self, parent):
         """
@@ -187,6 +203,14 @@ class Float_TL(wx.MiniFrame):
         self.bar_x = 0
         self.pointpx = [0, 0]  # see `on_move()` `on_leftdown()`
         self.sourcedur = _('No source duration:')
+        self.index = None  # index of the selected file, None otherwise
+        self.fingerprint = None  # fingerprint of the source on track
+        self.stripthread = None  # running `FilmstripThread` if any
+        self.filmstrip = []  # tiles of the current source
+        self.wavethread = None  # running `WaveformThread` if any
+        self.peaks = None  # `PeaksFile` of the current source
+        self.wavecols = []  # waveform (min, max) for each ruler column
+        self.stripcache = OrderedDict()  # LRU cache {fingerprint: tiles}
 
         wx.MiniFrame.__init__(self, parent, -1, style=wx.CAPTION | wx.CLOSE_BOX
                               | wx.SYSTEM_MENU | wx.FRAME_FLOAT_ON_PARENT
@@ -199,9 +223,15 @@ class Float_TL(wx.MiniFrame):
                                   style=wx.BORDER_SUNKEN,
                                   )
         sizer_base.Add(self.paneltime, 0, wx.ALL | wx.CENTRE, 2)
+        self.paneltrack = wx.Panel(panel, wx.ID_ANY,
+                                   size=(Float_TL.PW, Float_TL.TH + 4),
+                                   style=wx.BORDER_SUNKEN,
+                                   )
+        sizer_base.Add(self.paneltrack, 0, wx.ALL | wx.CENTRE, 2)
 
         # ----------------------Properties ----------------------#
         self.paneltime.SetBackgroundColour(wx.Colour(Float_TL.RULER_BKGRD))
+        self.paneltrack.SetBackgroundColour(wx.Colour(Float_TL.TRACK_BKGRD))
         # panel.SetBackgroundColour(wx.Colour(Float_TL.BLACK))
         self.SetTitle("Timeline Editor")
         self.sb = self.CreateStatusBar(1)
@@ -214,30 +244,34 @@ class Float_TL(wx.MiniFrame):
         sizer_base.Fit(self)
         self.Layout()
         if self.appdata['ostype'] == 'Linux':
-            self.SetSize((920, 115))
+            self.SetSize((920, 165))
             self.font_med = wx.Font(9, wx.DEFAULT, wx.NORMAL, wx.BOLD)
         elif self.appdata['ostype'] == 'Windows':
             self.font_med = wx.Font(10, wx.DEFAULT, wx.NORMAL, wx.BOLD)
-            self.SetSize((935, 130))
+            self.SetSize((935, 180))
         elif self.appdata['ostype'] == 'Darwin':
-            self.SetSize((915, 110))
+            self.SetSize((915, 160))
             self.font_med = wx.Font(12, wx.DEFAULT, wx.NORMAL, wx.BOLD)
         else:
-            self.SetSize((930, 120))
+            self.SetSize((930, 170))
             self.font_med = wx.Font(10, wx.DEFAULT, wx.NORMAL, wx.BOLD)
         self.CentreOnScreen()
         # print(self.GetSize())
 
         # ----------------------Binding (EVT)----------------------#
         self.paneltime.Bind(wx.EVT_PAINT, self.OnPaint)
+        self.paneltrack.Bind(wx.EVT_PAINT, self.on_paint_track)
         self.paneltime.Bind(wx.EVT_LEFT_DOWN, self.on_leftdown)
         self.paneltime.Bind(wx.EVT_LEFT_UP, self.on_leftup)
         self.paneltime.Bind(wx.EVT_LEFT_DCLICK, self.on_set_pos)
         self.paneltime.Bind(wx.EVT_MOTION, self.on_move)
         self.Bind(wx.EVT_CLOSE, self.on_close)
+        self.Bind(wx.EVT_SHOW, self.on_show)
         self.paneltime.Bind(wx.EVT_CONTEXT_MENU, self.onContext)
 
         pub.subscribe(self.set_values, "RESET_ON_CHANGED_LIST")
+        pub.subscribe(self.get_filmstrip_tile, "FILMSTRIP_EVT")
+        pub.subscribe(self.get_waveform, "WAVEFORM_EVT")
 
     # ----------------------Event handler (callbacks)----------------------#
 
@@ -299,7 +333,7 @@ class Float_TL(wx.MiniFrame):
                 ).format(self.sourcedur, self.overalltime, '00:00:00.000')
         self.statusbar_msg(msg, None)
         self.parent.time_seq = ""
-        self.onRedraw(wx.ClientDC(self.paneltime))
+        self.redraw_panels()
     # ------------------------------------------------------------------#
 
     def set_values(self, msg):
@@ -310,6 +344,7 @@ class Float_TL(wx.MiniFrame):
         removing imported files (see`filedrop.py`).
         """
         self.sourcedur = _('No source duration:')
+        self.index = None
         if msg is None:
             self.milliseconds = 86399999
         else:
@@ -318,8 +353,18 @@ class Float_TL(wx.MiniFrame):
             else:
                 self.milliseconds = self.duration[msg]
                 self.sourcedur = _('Source duration:')
+                self.index = msg
 
         self.overalltime = integer_to_time(self.milliseconds)
+        self.stop_track_threads()
+        self.fingerprint = None
+        self.filmstrip = []
+        self.wavecols = []
+        if self.peaks:
+            self.peaks.close()
+            self.peaks = None
+        if self.IsShown():
+            self.make_track()
         self.on_trim_time_reset()
     # ------------------------------------------------------------------#
 
@@ -349,13 +394,13 @@ class Float_TL(wx.MiniFrame):
             self.bar_w = self.pointpx[0]
             self.mills_end = int(round(self.bar_w / self.pix))
             self.clock_end = integer_to_time(self.mills_end)
-            self.onRedraw(wx.ClientDC(self.paneltime))
+            self.redraw_panels()
 
         elif self.pointpx[1] < 30:
             self.bar_x = self.pointpx[0]
             self.mills_start = int(round(self.bar_x / self.pix))
             self.clock_start = integer_to_time(self.mills_start)
-            self.onRedraw(wx.ClientDC(self.paneltime))
+            self.redraw_panels()
     # ------------------------------------------------------------------#
 
     def on_leftdown(self, event):
@@ -421,7 +466,7 @@ class Float_TL(wx.MiniFrame):
                     self.mills_end = data[1]
                     self.clock_end = data[0]
 
-                self.onRedraw(wx.ClientDC(self.paneltime))
+                self.redraw_panels()
                 self.on_leftup(None)
     # ------------------------------------------------------------------#
 
@@ -444,6 +489,205 @@ class Float_TL(wx.MiniFrame):
             self.set_coordinates()
     # ------------------------------------------------------------------#
 
+    def on_show(self, event):
+        """
+        Builds the track of the selected source (if not yet)
+        when this frame is shown.
+        """
+        if event.IsShown() and self.fingerprint is None:
+            self.make_track()
+        event.Skip()
+    # ------------------------------------------------------------------#
+
+    def stop_track_threads(self):
+        """
+        Stops any thread still running for a previous source.
+        """
+        for thread in (self.stripthread, self.wavethread):
+            if thread and thread.is_alive():
+                thread.stop()
+        self.stripthread, self.wavethread = None, None
+    # ------------------------------------------------------------------#
+
+    def make_track(self):
+        """
+        Makes the track of the selected source: a filmstrip for
+        video sources, an audio waveform for audio-only sources.
+        """
+        if self.index is None:
+            return
+        probe = self.parent.data_files[self.index]
+        streams = probe.get('streams', [])
+        videostreams = [x for x in streams
+                        if x.get('codec_type') == 'video'
+                        and not x.get('disposition',
+                                      {}).get('attached_pic')]
+        audiostreams = [x for x in streams if x.get('codec_type') == 'audio']
+        if not videostreams and not audiostreams:
+            return
+        filename = self.parent.file_src[self.index]
+        try:
+            self.fingerprint = media_fingerprint(filename)
+        except OSError:
+            return
+
+        if videostreams:
+            self.make_filmstrip(filename)
+        else:
+            self.make_waveform(filename)
+    # ------------------------------------------------------------------#
+
+    def make_filmstrip(self, filename):
+        """
+        Gets the filmstrip of the given source from the memory
+        cache, from the `cachedir` or by starting a new
+        `FilmstripThread` which draws the tiles as they arrive.
+        """
+        if self.fingerprint in self.stripcache:
+            self.stripcache.move_to_end(self.fingerprint)
+            self.filmstrip = list(self.stripcache[self.fingerprint])
+            self.redraw_panels()
+            return
+
+        size = Float_TL.TW, Float_TL.TH
+        cachename = filmstrip_cachename(self.appdata['cachedir'],
+                                        self.fingerprint,
+                                        size, Float_TL.TILES)
+        tiles = load_filmstrip(cachename, size, Float_TL.TILES)
+        if tiles:
+            self.filmstrip = tiles
+            self.cache_filmstrip(self.fingerprint, tiles)
+            self.redraw_panels()
+            return
+
+        self.stripthread = FilmstripThread(filename,
+                                           self.milliseconds,
+                                           self.fingerprint,
+                                           cachename,
+                                           size,
+                                           Float_TL.TILES,
+                                           )
+    # ------------------------------------------------------------------#
+
+    def make_waveform(self, filename):
+        """
+        Loads the peaks file of the given source from the
+        `cachedir`, if it does not exist yet starts a new
+        `WaveformThread` to make it.
+        """
+        cachename = peaks_cachename(self.appdata['cachedir'],
+                                    self.fingerprint)
+        try:
+            self.peaks = PeaksFile(cachename)
+        except (OSError, ValueError):
+            self.wavethread = WaveformThread(filename,
+                                             self.fingerprint,
+                                             cachename,
+                                             )
+            self.redraw_panels()
+            return
+        self.wavecols = self.peaks.columns(Float_TL.RW, 0,
+                                           self.milliseconds)
+        self.redraw_panels()
+    # ------------------------------------------------------------------#
+
+    def get_waveform(self, fingerprint):
+        """
+        Receives the end of the `WaveformThread` process.
+        This method is called using pub/sub protocol subscribing
+        "WAVEFORM_EVT".
+        """
+        if fingerprint != self.fingerprint or self.index is None:
+            return
+        self.make_waveform(self.parent.file_src[self.index])
+    # ------------------------------------------------------------------#
+
+    def get_filmstrip_tile(self, fingerprint, index, tile):
+        """
+        Receives the filmstrip tiles from `FilmstripThread`.
+        This method is called using pub/sub protocol subscribing
+        "FILMSTRIP_EVT". Tiles of a source that is no longer
+        selected are discarded.
+        """
+        if fingerprint != self.fingerprint or index != len(self.filmstrip):
+            return
+        self.filmstrip.append(tile)
+        if len(self.filmstrip) == Float_TL.TILES:
+            self.cache_filmstrip(fingerprint, self.filmstrip)
+        self.onRedrawTrack(wx.ClientDC(self.paneltrack))
+    # ------------------------------------------------------------------#
+
+    def cache_filmstrip(self, fingerprint, tiles):
+        """
+        Keeps the given filmstrip in memory, discarding the least
+        recently used ones when `MAXCACHE` bytes are exceeded.
+        """
+        self.stripcache[fingerprint] = tuple(tiles)
+        self.stripcache.move_to_end(fingerprint)
+        tilebytes = Float_TL.TW * Float_TL.TH * 3
+        while (len(self.stripcache) > 1 and sum(len(x) for x in
+               self.stripcache.values()) * tilebytes > Float_TL.MAXCACHE):
+            self.stripcache.popitem(last=False)
+    # ------------------------------------------------------------------#
+
+    def redraw_panels(self):
+        """
+        Redraw both the ruler and the track panels.
+        """
+        self.onRedraw(wx.ClientDC(self.paneltime))
+        self.onRedrawTrack(wx.ClientDC(self.paneltrack))
+    # ------------------------------------------------------------------#
+
+    def on_paint_track(self, event):
+        """
+        wx.PaintDC event of the track panel
+        """
+        dc = wx.PaintDC(self.paneltrack)
+        self.onRedrawTrack(dc)
+    # ------------------------------------------------------------------#
+
+    def onRedrawTrack(self, dc):
+        """
+        Draw the filmstrip tiles or the audio waveform (if any)
+        under the ruler and darken the areas outside the current
+        selection.
+        """
+        if 'wxMSW' in wx.PlatformInfo:
+            self.paneltrack.SetDoubleBuffered(True)  # prevents flickers
+        dc.SetBackground(wx.Brush(Float_TL.TRACK_BKGRD))
+        dc.Clear()
+        if self.wavecols:
+            mid = (Float_TL.TH + 2) / 2
+            scale = mid / 32768
+            dc.SetPen(wx.Pen(Float_TL.WAVEFORM, 1, wx.PENSTYLE_SOLID))
+            for x, (low, high) in enumerate(self.wavecols):
+                dc.DrawLine(x, round(mid - high * scale),
+                            x, round(mid - low * scale) + 1)
+        elif self.filmstrip:
+            for pos, tile in enumerate(self.filmstrip):
+                bmp = wx.Bitmap.FromBuffer(Float_TL.TW, Float_TL.TH, tile)
+                dc.DrawBitmap(bmp, pos * Float_TL.TW, 1)
+        else:
+            if [x for x in (self.stripthread, self.wavethread)
+                    if x and x.is_alive()]:
+                dc.SetTextForeground(Float_TL.SELECTION)
+                dc.DrawText(_('Loading preview...'), 10, 12)
+            return
+
+        bar_w, bar_x = round(self.bar_w), round(self.bar_x)
+        if bar_w > bar_x:
+            gcdc = wx.GCDC(dc)
+            gcdc.SetPen(wx.TRANSPARENT_PEN)
+            gcdc.SetBrush(wx.Brush(wx.Colour(0, 0, 0, 150)))
+            gcdc.DrawRectangle(0, 0, bar_x, Float_TL.TH + 2)
+            gcdc.DrawRectangle(bar_w, 0, Float_TL.RW - bar_w,
+                               Float_TL.TH + 2)
+            gcdc.SetPen(wx.Pen(Float_TL.DELIMITER_COLOR, 2,
+                               wx.PENSTYLE_SOLID))
+            gcdc.DrawLine(bar_x, 0, bar_x, Float_TL.TH + 2)
+            gcdc.DrawLine(bar_w, 0, bar_w, Float_TL.TH + 2)
+    # ------------------------------------------------------------------#
+
     def OnPaint(self, event):
         """
         wx.PaintDC event
@@ -561,7 +805,11 @@ class Float_TL(wx.MiniFrame):
                 "The \"Start\"/\"End\" duration values always refer to the "
                 "initial position of the timeline: 00:00:00.000. For other "
                 "informations as the segment duration and warnings, please "
-                "refer to the status bar messages.")
+                "refer to the status bar messages.\n\n"
+                "The track below the ruler shows a preview of the selected "
+                "video source, or the waveform of the selected audio source. "
+                "It is made in the background and cached, so the next time "
+                "it will be shown immediately.")
         wx.MessageBox(msg, _('Timeline Editor Usage'),
                       wx.ICON_INFORMATION, self)
     # ------------------------------------------------------------------#
@@ -137,7 +137,9 @@ class AV_Conv(wx.Panel):
                     "OutputDir": "", "SubtitleMap": "-map 0:s?",
                     "Deinterlace": "", "Interlace": "", "ColorEQ": "",
                     "PixelFormat": "", "Orientation": ["", ""], "Crop": "",
-                    "CropColor": "", "Scale": "", "Setdar": "", "Setsar": "",
+                    "CropColor": "", "AutoCrop": False, "Scale": "",
+                    "TargetQuality": None,
+                    "Setdar": "", "Setsar": "",
                     "Denoiser": "", "Vidstabtransform": "",
                     "Vidstabdetect": "", "Unsharp": "", "Makeduo": False,
                     "VFilters": "", "CmdVideoParams": "", "CmdAudioParams": "",
@@ -543,8 +545,9 @@ class AV_Conv(wx.Panel):
         Reset all enabled filters. If default disablevidstab
         arg is True, it disable only vidstab filter values.
         """
-        if self.opt["VFilters"]:
+        if self.opt["VFilters"] or self.opt["AutoCrop"]:
             self.opt['Crop'], self.opt["Orientation"] = "", ["", ""]
+            self.opt["AutoCrop"] = False
             self.opt['Scale'], self.opt['Setdar'] = "", ""
             self.opt['Setsar'], self.opt['Deinterlace'] = "", ""
             self.opt['Interlace'], self.opt['Denoiser'] = "", ""
@@ -633,6 +636,8 @@ class AV_Conv(wx.Panel):
         else:
             self.opt["VFilters"] = ""
             self.btn_preview.Disable(), self.btn_reset.Disable()
+            if self.opt["AutoCrop"]:
+                self.btn_reset.Enable()
     # ------------------------------------------------------------------#
 
     def on_Set_scale(self, event):
@@ -699,18 +704,21 @@ class AV_Conv(wx.Panel):
         if not kwa:
             return
         with Crop(self, self.opt["Crop"], self.opt["CropColor"],
-                  self.bmpreset, **kwa) as crop:
+                  self.bmpreset, autocrop=self.opt["AutoCrop"],
+                  **kwa) as crop:
             if crop.ShowModal() == wx.ID_OK:
                 data = crop.getvalue()
                 if not data:
                     self.btn_crop.SetBackgroundColour(wx.NullColour)
                     self.opt["Crop"] = ''
                     self.opt["CropColor"] = ''
+                    self.opt["AutoCrop"] = False
                 else:
                     self.btn_crop.SetBackgroundColour(
                         wx.Colour(AV_Conv.VIOLET))
-                    self.opt["Crop"] = f'crop={data[0]}'
+                    self.opt["Crop"] = f'crop={data[0]}' if data[0] else ''
                     self.opt["CropColor"] = data[1]
+                    self.opt["AutoCrop"] = data[2]
                 self.chain_all_video_filters()
     # ------------------------------------------------------------------#
 
@@ -843,6 +851,20 @@ class AV_Conv(wx.Panel):
             else:
                 kwargs = self.video_std()
 
+            if (self.opt["AutoCrop"]
+                    and self.cmb_vencoder.GetValue() != "Copy"):
+                kwargs['autocrop'] = True
+
+            tquality = getattr(self.videopanel, 'tquality', None)
+            if (tquality and self.opt["TargetQuality"]
+                    and self.opt["Passes"] != "2"):
+                vfilters = self.opt["VFilters"].split(' ', 1)
+                kwargs['targetquality'] = {
+                    'ssim': self.opt["TargetQuality"],
+                    'range': (0, self.videopanel.slider_crf.GetMax()),
+                    'video': self.opt["CmdVideoParams"],
+                    'filters': vfilters[1] if len(vfilters) > 1 else ''}
+
         elif self.opt["Media"] == 'Audio':
 
             if self.opt["EBU"][0] == 'EBU R128 (High-Quality)':
@@ -953,6 +975,7 @@ class AV_Conv(wx.Panel):
         ending = Formula(self, (700, 250),
                          self.parent.movetotrash,
                          self.parent.emptylist,
+                         estimate=batchlist,
                          **keyval,
                          )
         if ending.ShowModal() == wx.ID_OK:
@@ -6,7 +6,7 @@ Compatibility: Python3, wxPython Phoenix
 Author: Gianluca Pernigotto <jeanlucperni@gmail.com>
 Copyleft - 2024 Gianluca Pernigotto <jeanlucperni@gmail.com>
 license: GPL3
-Rev: Mar.25.2024
+Rev: Oct.19.2026
 Code checker: flake8, pylint
 
 This file is part of Videomass.
@@ -31,6 +31,7 @@ from videomass.vdms_dialogs.widget_utils import NormalTransientPopup
 from videomass.vdms_utils.utils import integer_to_time
 from videomass.vdms_io.checkup import check_files
 from videomass.vdms_dialogs.epilogue import Formula
+from videomass.vdms_utils.concat_utils import plan_concat, normalize_args
 
 
 def compare_media_param(data):
@@ -39,8 +40,10 @@ def compare_media_param(data):
     that the indexed streams of each item in the list have
     the same codec, video size and audio sample rate in order
     to ensure correct file concatenation.
-    Returns an error message if any error found,
-    Returns None otherwise.
+    Returns a tuple ('error', message) if the files can't be
+    concatenated at all, ('mismatch', message) if they have
+    different formats (see `concat_utils.plan_concat`),
+    (None, mediatype) otherwise.
     """
     if len(data) == 1:
         return ('error',
@@ -64,7 +67,7 @@ def compare_media_param(data):
 
     totest = list(com.values())[0]
     if not all(val == totest for val in com.values()):
-        return ('error',
+        return ('mismatch',
                 _('The files do not have the same "codec_types", '
                   'same "sample_rate" or same "width" or "height". '
                   'Unable to proceed.'))
@@ -93,7 +96,10 @@ class Conc_Demuxer(wx.Panel):
               "codecs and same\n  width/height, but can be wrapped in "
               "different container formats."
               "\n\n- Audio files must have exactly the same formats, "
-              "same codecs with equal sample rate.")
+              "same codecs with equal sample rate."
+              "\n\n- Otherwise, only the files which differ from the "
+              "format of most of them\n  can be re-encoded to match it "
+              "before joining.")
 
     # ----------------------------------------------------------------#
 
@@ -109,6 +115,7 @@ class Conc_Demuxer(wx.Panel):
         self.duration = None
         self.ext = None
         self.mediatype = None
+        self.normalize = []
 
         wx.Panel.__init__(self, parent, -1, style=wx.BORDER_THEME)
 
@@ -198,11 +205,19 @@ class Conc_Demuxer(wx.Panel):
                           wx.ICON_ERROR, self)
             return
 
+        self.normalize = []
+        if diff[0] == 'mismatch':
+            if not self.plan_normalization():
+                return
+            diff = (None, self.mediatype)
+
         self.mediatype = diff[1]
         textstr = []
         self.ext = os.path.splitext(self.parent.file_src[0])[1].split('.')[1]
         self.duration = sum(self.parent.duration)
-        for f in self.parent.file_src:
+        replaced = {item['index']: item['output'] for item in self.normalize}
+        for num, f in enumerate(self.parent.file_src):
+            f = replaced.get(num, f)
             escaped = f.replace(r"'", r"'\''")  # need escaping some chars
             textstr.append(f"file '{escaped}'")
         self.args = (f'"{ftext}" -map 0:v? -map_chapters 0 '
@@ -225,6 +240,49 @@ class Conc_Demuxer(wx.Panel):
         self.build_args(self.parent.file_src, newfile[0])
     # -----------------------------------------------------------
 
+    def plan_normalization(self):
+        """
+        Plans the re-encoding of the files whose format differs
+        from the format of most of the files, so that only these
+        are re-encoded before concatenation. Sets the list of
+        files to normalize and returns True if confirmed by the
+        user, returns False otherwise.
+        """
+        data = self.parent.data_files
+        target, odd = plan_concat(data)
+        tmpdir = os.path.join(self.cachedir, 'tmp', 'concat')
+        ext = os.path.splitext(self.parent.file_src[target])[1]
+        for num in odd:
+            args = normalize_args(data[target], data[num])
+            if args is None:
+                wx.MessageBox(_('The files do not have the same "codec_'
+                                'types", same "sample_rate" or same "width"'
+                                ' or "height", and "{}" cannot be re-encoded'
+                                ' to match the others. Unable to proceed.'
+                                ).format(self.parent.file_src[num]),
+                              _('Videomass - Error!'), wx.ICON_ERROR, self)
+                return False
+            self.normalize.append({'index': num,
+                                   'source': self.parent.file_src[num],
+                                   'output': os.path.join(tmpdir,
+                                                          f'{num}{ext}'),
+                                   'args': args,
+                                   'duration': self.parent.duration[num],
+                                   })
+        msg = (_('{0} of {1} files differ from the format of the others.\n'
+                 'Do you want to re-encode only these files to match it '
+                 'before joining?').format(len(odd), len(data)))
+        if wx.MessageBox(msg, _('Videomass - Please confirm'),
+                         wx.ICON_QUESTION | wx.CENTRE | wx.YES_NO,
+                         self) != wx.YES:
+            self.normalize = []
+            return False
+
+        kinds = [s.get('codec_type') for s in data[target].get('streams')]
+        self.mediatype = 'video' if 'video' in kinds else 'audio'
+        return True
+    # -----------------------------------------------------------
+
     def build_args(self, filesrc, newfile):
         """
         Redirect to processing
@@ -236,10 +294,11 @@ class Conc_Demuxer(wx.Panel):
                   'source': filesrc, 'destination': newfile, 'args': self.args,
                   'nmax': len(filesrc), 'duration': self.duration,
                   'start-time': '', 'end-time': '',
+                  'normalize': self.normalize,
                   'preset name': 'Concatenate media files',
                   }
         keyval = self.update_dict(newfile, os.path.dirname(newfile))
-        ending = Formula(self, (700, 170),
+        ending = Formula(self, (700, 190),
                          self.parent.movetotrash,
                          self.parent.emptylist,
                          **keyval,
@@ -262,9 +321,9 @@ class Conc_Demuxer(wx.Panel):
         dest = os.path.join(destdir, newfile)
 
         keys = (_("Items to concatenate\nFile destination\nOutput Format"
-                  "\nOutput multimedia type\nDuration"
+                  "\nOutput multimedia type\nDuration\nItems to re-encode"
                   ))
         vals = (f"{lenfile}\n{dest}\n{self.ext}\n"
-                f"{self.mediatype}\n{dur}")
+                f"{self.mediatype}\n{dur}\n{len(self.normalize)}")
 
         return {'key': keys, 'val': vals}
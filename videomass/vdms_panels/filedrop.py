@@ -30,6 +30,7 @@ import wx
 from pubsub import pub
 from videomass.vdms_io.io_tools import stream_play
 from videomass.vdms_threads.ffprobe import ffprobe
+from videomass.vdms_threads.keyframes import KeyframeIndexer
 from videomass.vdms_utils.utils import time_to_integer
 from videomass.vdms_utils.utils import to_bytes
 from videomass.vdms_dialogs.renamer import Renamer
@@ -179,6 +180,7 @@ class MyListCtrl(wx.ListCtrl):
             self.data.append(probe)
             self.file_src.append(path)
             self.duration.append(probe['format']['duration'])
+            self.parent.index_keyframes(path, probe)
             # self.parent.statusbar_msg('', None)
             self.parent.changes_in_progress()
         else:
@@ -253,6 +255,7 @@ class FileDnD(wx.Panel):
         self.file_src = args[2]
         self.duration = args[3]
         self.sortingstate = None  # ascending or descending order
+        self.indexer = None  # KeyframeIndexer thread, on first use
 
         wx.Panel.__init__(self, parent, -1)
 
@@ -317,6 +320,35 @@ class FileDnD(wx.Panel):
         pub.subscribe(self.text_information, "SET_DRAG_AND_DROP_TOPIC")
     # ----------------------------------------------------------------------
 
+    def index_keyframes(self, path, probe):
+        """
+        Queues the given video file to the keyframes indexer
+        (see `keyframes.KeyframeIndexer`) which runs in background.
+        Still images, audio files and cover arts are skipped.
+        """
+        if not self.appdata['keyframe_index']:
+            return
+        if not probe['format']['duration']:
+            return
+        videos = [st for st in probe['streams']
+                  if st.get('codec_type') == 'video'
+                  and not st.get('disposition', {}).get('attached_pic')]
+        if not videos:
+            return
+        if self.indexer is None:
+            self.indexer = KeyframeIndexer()
+        self.indexer.add(path)
+    # ----------------------------------------------------------------------
+
+    def stop_indexer(self):
+        """
+        Stops the keyframes indexer, if any, i.e. on exit
+        """
+        if self.indexer is not None:
+            self.indexer.stop()
+            self.indexer = None
+    # ----------------------------------------------------------------------
+
     def onContext(self, event):
         """
         Create and show a Context Menu
@@ -6,7 +6,7 @@ Compatibility: Python3, wxPython4 Phoenix
 Author: Gianluca Pernigotto <jeanlucperni@gmail.com>
 Copyleft - 2024 Gianluca Pernigotto <jeanlucperni@gmail.com>
 license: GPL3
-Rev: Apr.20.2024
+Rev: Oct.19.2026
 Code checker: flake8, pylint
 
 This file is part of Videomass.
@@ -35,7 +35,9 @@ from videomass.vdms_threads.ffmpeg import FFmpeg
 from videomass.vdms_threads.image_extractor import PicturesFromVideo
 from videomass.vdms_threads.concat_demuxer import ConcatDemuxer
 from videomass.vdms_threads.slideshow import SlideshowMaker
+from videomass.vdms_threads.contact_sheets import ContactSheets
 from videomass.vdms_utils.utils import (time_to_integer, integer_to_time)
+from videomass.vdms_utils.quality_utils import format_report, report_to_csv
 from videomass.vdms_io import io_tools
 
 
@@ -142,6 +144,7 @@ class LogOut(wx.Panel):
         self.result = []  # result of the final process
         self.count = 0  # keeps track of the counts (see `update_count`)
         self.maxrotate = 0  # max num text rotation (see `update_count`)
+        self.qualityreport = []  # quality verification results, if any
         self.clr = self.appdata['colorscheme']
 
         wx.Panel.__init__(self, parent=parent)
@@ -153,6 +156,9 @@ class LogOut(wx.Panel):
         self.btn_viewlog = wx.Button(self, wx.ID_ANY, _("Current Log"),
                                      size=(-1, -1))
         self.btn_viewlog.Disable()
+        self.btn_report = wx.Button(self, wx.ID_ANY, _("Quality Report"),
+                                    size=(-1, -1))
+        self.btn_report.Disable()
         self.txtout = wx.TextCtrl(self, wx.ID_ANY, "",
                                   style=wx.TE_MULTILINE
                                   | wx.TE_READONLY
@@ -165,7 +171,10 @@ class LogOut(wx.Panel):
         sizer.Add((0, 10))
         sizer.Add(lbl, 0, wx.ALL, 5)
         sizer.Add(self.txtout, 1, wx.EXPAND | wx.ALL, 5)
-        sizer.Add(self.btn_viewlog, 0, wx.ALL, 5)
+        sizerbtn = wx.BoxSizer(wx.HORIZONTAL)
+        sizer.Add(sizerbtn, 0)
+        sizerbtn.Add(self.btn_viewlog, 0, wx.ALL, 5)
+        sizerbtn.Add(self.btn_report, 0, wx.ALL, 5)
         sizer.Add(self.barprog, 0, wx.EXPAND | wx.ALL, 5)
         sizer.Add(self.labprog, 0, wx.ALL, 5)
         sizer.Add(self.labffmpeg, 0, wx.ALL, 5)
@@ -179,8 +188,12 @@ class LogOut(wx.Panel):
         self.SetSizerAndFit(sizer)
         # ------------------------------------------
         self.Bind(wx.EVT_BUTTON, self.view_log, self.btn_viewlog)
+        self.Bind(wx.EVT_BUTTON, self.export_report, self.btn_report)
+        self.btn_report.SetToolTip(_('Export the quality verification '
+                                     'report to a CSV file'))
 
         pub.subscribe(self.update_display, "UPDATE_EVT")
+        pub.subscribe(self.quality_report, "QUALITY_REPORT_EVT")
         pub.subscribe(self.update_count, "COUNT_EVT")
         pub.subscribe(self.end_proc, "END_EVT")
     # ----------------------------------------------------------------------
@@ -195,9 +208,41 @@ class LogOut(wx.Panel):
                 io_tools.openpath(fname)
     # ----------------------------------------------------------------------
 
-    def topic_thread(self, args, data, previous='View', mode='w'):
+    def quality_report(self, report):
+        """
+        Receives the quality verification results from the
+        FFmpeg thread by pubsub QUALITY_REPORT_EVT protocol.
+        They are shown and can be exported at the end.
+        """
+        self.qualityreport = report
+    # ----------------------------------------------------------------------
+
+    def export_report(self, event):
+        """
+        Exports the last quality verification report to a CSV file.
+        """
+        with wx.FileDialog(self, _("Export quality report"),
+                           defaultDir=self.appdata['outputdir'],
+                           wildcard="CSV files (*.csv;)|*.csv;",
+                           style=wx.FD_SAVE
+                           | wx.FD_OVERWRITE_PROMPT) as fileDialog:
+            fileDialog.SetFilename('quality_report.csv')
+            if fileDialog.ShowModal() == wx.ID_CANCEL:
+                return
+            filename = fileDialog.GetPath()
+        try:
+            report_to_csv(self.qualityreport, filename)
+        except OSError as err:
+            wx.MessageBox(f'{err}', _('Videomass - Error!'),
+                          wx.ICON_ERROR, self)
+    # ----------------------------------------------------------------------
+
+    def topic_thread(self, args, data, previous='View', mode='w',
+                     feeding=False):
         """
         This method is resposible to create the Thread instance.
+        With `feeding`, the items of the 'Queue Processing' are
+        appended while running (see `FFmpeg.append`).
 
         """
         self.previous = previous  # stores the panel from which it starts
@@ -209,6 +254,8 @@ class LogOut(wx.Panel):
         self.labprog.SetLabel('')
         self.labffmpeg.SetLabel('')
         self.btn_viewlog.Disable()
+        self.btn_report.Disable()
+        self.qualityreport = []
 
         self.logfile = make_log_template(args[1],
                                          self.appdata['logdir'],
@@ -216,12 +263,16 @@ class LogOut(wx.Panel):
                                          )
         if args[0] in ('One pass', 'Two pass', 'Two pass EBU',
                        'Two pass VIDSTAB', 'Queue Processing'):
-            self.thread_type = FFmpeg(self.logfile, data)
+            self.thread_type = FFmpeg(self.logfile, data, feeding=feeding)
 
         elif args[0] == 'video_to_sequence':
             self.with_eta, self.maxrotate = False, None
             self.thread_type = PicturesFromVideo(self.logfile, **data)
 
+        elif args[0] == 'contact_sheets':
+            self.with_eta, self.maxrotate = False, None
+            self.thread_type = ContactSheets(self.logfile, **data)
+
         elif args[0] == 'sequence_to_video':
             self.with_eta, self.maxrotate = False, None
             self.thread_type = SlideshowMaker(self.logfile, **data)
@@ -387,6 +438,16 @@ class LogOut(wx.Panel):
             self.txtout.AppendText(f"\n{endmsg}\n")
             self.barprog.SetValue(0)
 
+            if self.qualityreport:
+                table = format_report(self.qualityreport)
+                self.txtout.SetDefaultStyle(wx.TextAttr(self.clr['TXT0']))
+                self.txtout.AppendText(f"\n{_('Quality verification:')}"
+                                       f"\n{table}\n")
+                with open(self.logfile, "a", encoding='utf-8') as log:
+                    log.write(f"\n[VIDEOMASS]: Quality verification:\n"
+                              f"{table}\n")
+                self.btn_report.Enable()
+
             if filetotrash:  # move processed files to Videomass trash folder
                 if self.parent.movetotrash:
                     trashdir = self.appdata['trashdir_loc']
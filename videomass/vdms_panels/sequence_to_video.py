@@ -100,6 +100,7 @@ class SequenceToVideo(wx.Panel):
                     "Map": "-map 0:v?", "Shortest": ["", "Disabled"],
                     "Interval": "", "Clock": "00:00:00:000",
                     "Preinput": "1/0", "Fps": ["fps=10,", "10"],
+                    "Stream": False,
                     }
 
         if 'wx.svg' in sys.modules:  # available only in wx version 4.1 to up
@@ -128,6 +129,14 @@ class SequenceToVideo(wx.Panel):
         self.ckbx_static_img = wx.CheckBox(self, wx.ID_ANY,
                                            _('Enable a single still image'))
         boxctrl.Add(self.ckbx_static_img, 0, wx.ALL | wx.EXPAND, 5)
+        self.ckbx_stream = wx.CheckBox(self, wx.ID_ANY,
+                                       _('Read images directly without '
+                                         'temporary files'))
+        tip = (_('Slideshow only. The images are read from their original '
+                 'paths through the FFmpeg concat demuxer and scaled/padded '
+                 'to the same size in a single pass.'))
+        self.ckbx_stream.SetToolTip(tip)
+        boxctrl.Add(self.ckbx_stream, 0, wx.ALL | wx.EXPAND, 5)
         siz_pict = wx.BoxSizer(wx.HORIZONTAL)
         boxctrl.Add(siz_pict)
         lbl_fps = wx.StaticText(self, wx.ID_ANY, label="FPS:")
@@ -226,6 +235,7 @@ class SequenceToVideo(wx.Panel):
         self.Bind(wx.EVT_CHECKBOX, self.on_enable_audio, self.ckbx_audio)
         self.Bind(wx.EVT_BUTTON, self.on_addaudio_track, self.btn_openaudio)
         self.Bind(wx.EVT_CHECKBOX, self.on_shortest, self.ckbx_shortest)
+        self.Bind(wx.EVT_CHECKBOX, self.on_stream, self.ckbx_stream)
         self.Bind(wx.EVT_CHECKBOX, self.on_addparams, self.ckbx_edit)
         self.Bind(wx.EVT_CHECKBOX, self.on_force_aspect_ratio, self.ckbx_far)
         self.Bind(wx.EVT_COMBOBOX, self.on_fps, self.cmb_fps)
@@ -417,6 +427,40 @@ class SequenceToVideo(wx.Panel):
             self.opt["Shortest"] = ["-shortest", "Enabled"]
     # ---------------------------------------------------------
 
+    def on_stream(self, event):
+        """
+        Enable or disable reading the images directly
+        through an ffconcat list (slideshow only).
+        """
+        self.opt["Stream"] = self.ckbx_stream.IsChecked()
+    # ---------------------------------------------------------
+
+    def stream_filters(self):
+        """
+        Returns the video filters which scale and pad all
+        the images to the same size for the streaming mode.
+        The size is taken from the Resize settings if both
+        width and height are set, from the selected image
+        otherwise.
+        """
+        size = None
+        if self.opt["Scale"]:
+            width = self.opt["Scale"].split(':', maxsplit=1)[0][8:]
+            height = self.opt["Scale"].split(':', maxsplit=1)[1][2:]
+            if width.isdigit() and height.isdigit():
+                size = int(width), int(height)
+        if not size:
+            stream = self.get_video_stream()
+            size = (stream['width'], stream['height']) if stream else None
+        if not size:
+            return None
+        width, height = size[0] - size[0] % 2, size[1] - size[1] % 2
+        aspect = [x for x in (self.opt["Setdar"], self.opt["Setsar"]) if x]
+        return (f'scale={width}:{height}:force_original_aspect_ratio='
+                f'decrease:eval=frame,pad={width}:{height}:-1:-1:'
+                f'eval=frame,{",".join(aspect) if aspect else "setsar=1"},')
+    # ---------------------------------------------------------
+
     def on_enable_audio(self, event):
         """
         Enables controls to create a video file from a
@@ -502,6 +546,15 @@ class SequenceToVideo(wx.Panel):
         framerate = '-framerate 1/1' if not sec else f'-framerate 1/{sec}'
         self.opt["Preinput"] = f'{loop} {framerate}'
         self.opt["Interval"] = sec
+        vfilters = ''
+
+        if self.opt["Stream"]:  # each image lasts its share of duration
+            vfilters = self.stream_filters()
+            if vfilters is None:
+                return None
+            self.opt["Preinput"] = '-f concat -safe 0'
+            self.opt["Interval"] = round(duration / 1000
+                                         / len(self.parent.file_src), 3)
 
         if self.txt_addparams.IsEnabled():
             addparam = self.txt_addparams.GetValue()
@@ -509,8 +562,8 @@ class SequenceToVideo(wx.Panel):
             addparam = ''
 
         cmd_2 = (f'{self.opt["AudioMerging"]} {addparam} -vf '
-                 f'"{self.opt["Fps"][0]}format=yuv420p" {self.opt["Map"]} '
-                 f'{self.opt["Shortest"][0]}')
+                 f'"{vfilters}{self.opt["Fps"][0]}format=yuv420p" '
+                 f'{self.opt["Map"]} {self.opt["Shortest"][0]}')
 
         return cmd_2, duration
     # ---------------------------------------------------------
@@ -655,11 +708,15 @@ class SequenceToVideo(wx.Panel):
             countmax = len(files)
             if self.check_to_slide(files):
                 return
-            if not self.opt["RESIZE"] and countmax != 1:
+            if (not self.opt["RESIZE"] and not self.opt["Stream"]
+                    and countmax != 1):
                 if check_images_size(self.parent.data_files):
                     return
 
         args = self.get_args_line()  # get args for command line
+        if not args:
+            return
+        stream = self.opt["Stream"] and not self.ckbx_static_img.IsChecked()
         kwargs = {'logname': 'Still Image Maker.log',
                   'type': 'sequence_to_video', 'source': files,
                   'destination': destdir, 'outputdir': outputdir,
@@ -669,6 +726,8 @@ class SequenceToVideo(wx.Panel):
                   'start-time': '', 'end-time': '',
                   'preset name': 'Still Image Maker',
                   }
+        if stream:
+            kwargs['ffconcat'] = [self.opt["Interval"]] * countmax
         keyval = self.update_dict(f"{name}.mkv", outputdir, countmax, 'mkv')
         ending = Formula(self, (700, 320),
                          self.parent.movetotrash,
@@ -26,6 +26,7 @@ This file is part of Videomass.
 """
 import wx
 import wx.lib.scrolledpanel as scrolled
+from . target_quality import TargetQuality
 
 
 def presets_aomav1(name):
@@ -113,6 +114,8 @@ class AV1_Aom(scrolled.ScrolledPanel):
         boxcrf.Add(self.labqtzmt, 0, wx.LEFT | wx.ALIGN_CENTER, 2)
         # boxcrf.Add((20, 0), 0)
         sizerbase.Add(boxcrf, 0, wx.ALL | wx.CENTER, 0)
+        self.tquality = TargetQuality(self, self.opt)
+        sizerbase.Add(self.tquality.sizer, 0, wx.TOP | wx.CENTER, 10)
         sizerbase.Add((0, 15), 0)
         boxopt = wx.BoxSizer(wx.HORIZONTAL)
         labcpu = wx.StaticText(self, wx.ID_ANY, 'CPU Used:')
@@ -342,6 +345,7 @@ class AV1_Aom(scrolled.ScrolledPanel):
         """
         Reset all controls to default
         """
+        self.tquality.reset()
         if self.opt["VidCmbxStr"] == 'AOM-AV1 10-bit':
             self.labinfo.SetLabel("AOM-AV1 (Alliance for Open Media) 10-bit")
             self.cmb_pixfrm.SetSelection(2), self.on_bit_depth(None, False)
@@ -26,6 +26,7 @@ This file is part of Videomass.
 """
 import wx
 import wx.lib.scrolledpanel as scrolled
+from . target_quality import TargetQuality
 
 
 def presets_svtav1(name):
@@ -152,6 +153,8 @@ class AV1_Svt(scrolled.ScrolledPanel):
         boxprst.Add(self.labprstmt, 0, wx.LEFT | wx.ALIGN_CENTER, 2)
 
         sizerbase.Add(boxprst, 0, wx.ALL | wx.CENTER, 0)
+        self.tquality = TargetQuality(self, self.opt)
+        sizerbase.Add(self.tquality.sizer, 0, wx.TOP | wx.CENTER, 10)
         sizerbase.Add((0, 15), 0)
         boxopt = wx.BoxSizer(wx.HORIZONTAL)
         self.ckbx_fastd = wx.CheckBox(self, wx.ID_ANY, "Fast Decode")
@@ -445,6 +448,7 @@ class AV1_Svt(scrolled.ScrolledPanel):
         """
         Reset all controls to default
         """
+        self.tquality.reset()
         if self.opt["VidCmbxStr"] == 'SVT-AV1 10-bit':
             self.labinfo.SetLabel("SVT-AV1 (Scalable Video Technology) 10-bit")
             self.cmb_pixfrm.SetSelection(2), self.on_bit_depth(None, False)
@@ -26,6 +26,7 @@ This file is part of Videomass.
 """
 import wx
 import wx.lib.scrolledpanel as scrolled
+from . target_quality import TargetQuality
 
 
 class Avc_X264(scrolled.ScrolledPanel):
@@ -122,6 +123,8 @@ class Avc_X264(scrolled.ScrolledPanel):
                                       )
         boxcrf.Add(self.cmb_preset, 0, wx.ALL | wx.ALIGN_CENTER_VERTICAL, 2)
         sizerbase.Add(boxcrf, 0, wx.ALL | wx.CENTER, 0)
+        self.tquality = TargetQuality(self, self.opt)
+        sizerbase.Add(self.tquality.sizer, 0, wx.TOP | wx.CENTER, 10)
         line1 = wx.StaticLine(self, wx.ID_ANY, pos=wx.DefaultPosition,
                               size=(-1, -1), style=wx.LI_HORIZONTAL,
                               name=wx.StaticLineNameStr
@@ -323,6 +326,7 @@ class Avc_X264(scrolled.ScrolledPanel):
         """
         Reset all controls to default
         """
+        self.tquality.reset()
         self.cmb_fps.SetSelection(0), self.on_rate_fps(None, False)
         self.cmb_vaspect.SetSelection(0), self.on_vaspect(None, False)
         if self.opt["VidCmbxStr"] == 'H.264 10-bit':
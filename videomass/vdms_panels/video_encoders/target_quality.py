@@ -0,0 +1,103 @@
+# -*- coding: UTF-8 -*-
+"""
+Name: target_quality.py
+Porpose: Target quality controls shared by the CRF based encoders
+Compatibility: Python3, wxPython Phoenix
+Author: Gianluca Pernigotto <jeanlucperni@gmail.com>
+Copyleft - 2024 Gianluca Pernigotto <jeanlucperni@gmail.com>
+license: GPL3
+Rev: Oct.19.2026
+Code checker: flake8, pylint
+
+This file is part of Videomass.
+
+   Videomass is free software: you can redistribute it and/or modify
+   it under the terms of the GNU General Public License as published by
+   the Free Software Foundation, either version 3 of the License, or
+   (at your option) any later version.
+
+   Videomass is distributed in the hope that it will be useful,
+   but WITHOUT ANY WARRANTY; without even the implied warranty of
+   MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+   GNU General Public License for more details.
+
+   You should have received a copy of the GNU General Public License
+   along with Videomass.  If not, see <http://www.gnu.org/licenses/>.
+"""
+import wx
+
+
+class TargetQuality:
+    """
+    Builds the "Target quality" controls on the given encoder
+    panel, which must have a `btn_reset` button. When enabled,
+    the CRF value of each file is searched before encoding to
+    reach the given SSIM (see `crfsearch.CRFSearch`), so the
+    CRF set on the panel is ignored.
+
+    Usage:
+        >>> self.tquality = TargetQuality(self, self.opt)
+        >>> sizerbase.Add(self.tquality.sizer, 0, wx.ALL | wx.CENTER, 5)
+        >>> self.tquality.reset()  # on the panel `default` method
+
+    """
+    DEFAULT = 0.980  # default SSIM target
+
+    def __init__(self, parent, opt):
+        """
+        Sets the "TargetQuality" key of the `opt` dict,
+        None if disabled, the target SSIM otherwise.
+        """
+        self.parent = parent
+        self.opt = opt
+        self.sizer = wx.BoxSizer(wx.HORIZONTAL)
+        self.ckbx_target = wx.CheckBox(parent, wx.ID_ANY,
+                                       _('Target quality (SSIM):'))
+        self.sizer.Add(self.ckbx_target, 0, wx.ALIGN_CENTER_VERTICAL)
+        self.spin_target = wx.SpinCtrlDouble(parent, wx.ID_ANY,
+                                             min=0.900, max=0.999,
+                                             initial=TargetQuality.DEFAULT,
+                                             inc=0.001, size=(110, -1),
+                                             )
+        self.spin_target.SetDigits(3)
+        self.spin_target.Disable()
+        self.sizer.Add(self.spin_target, 0, wx.LEFT
+                       | wx.ALIGN_CENTER_VERTICAL, 5)
+
+        tip = (_('Encodes a few short samples of each file at different '
+                 'CRF values, measures their SSIM against the source and '
+                 'uses the highest CRF that reaches the target. One-pass '
+                 'encoding only; results are cached for each file and '
+                 'encoder settings.'))
+        self.ckbx_target.SetToolTip(tip)
+        tip = (_('Minimum SSIM to reach, where 1.0 means identical '
+                 'to the source'))
+        self.spin_target.SetToolTip(tip)
+
+        parent.Bind(wx.EVT_CHECKBOX, self.on_target, self.ckbx_target)
+        parent.Bind(wx.EVT_SPINCTRLDOUBLE, self.on_target, self.spin_target)
+        self.opt["TargetQuality"] = None
+    # ------------------------------------------------------------------#
+
+    def reset(self):
+        """
+        Disables the target quality
+        """
+        self.ckbx_target.SetValue(False)
+        self.spin_target.SetValue(TargetQuality.DEFAULT)
+        self.on_target(None, False)
+    # ------------------------------------------------------------------#
+
+    def on_target(self, event, btnreset=True):
+        """
+        Enables or disables the target quality and sets its value
+        """
+        if not self.parent.btn_reset.IsEnabled() and btnreset:
+            self.parent.btn_reset.Enable()
+
+        check = self.ckbx_target.IsChecked()
+        self.spin_target.Enable(check)
+        if check:
+            self.opt["TargetQuality"] = round(self.spin_target.GetValue(), 3)
+        else:
+            self.opt["TargetQuality"] = None
@@ -26,6 +26,7 @@ This file is part of Videomass.
 """
 import wx
 import wx.lib.scrolledpanel as scrolled
+from . target_quality import TargetQuality
 
 
 def presets_vp9webm(name):
@@ -153,6 +154,8 @@ class Vp9_WebM(scrolled.ScrolledPanel):
         boxcrf.Add(self.labqtzmt, 0, wx.LEFT | wx.ALIGN_CENTER, 2)
         # boxcrf.Add((20, 0), 0)
         sizerbase.Add(boxcrf, 0, wx.ALL | wx.CENTER, 0)
+        self.tquality = TargetQuality(self, self.opt)
+        sizerbase.Add(self.tquality.sizer, 0, wx.TOP | wx.CENTER, 10)
         sizerbase.Add((0, 15), 0)
         boxopt = wx.BoxSizer(wx.HORIZONTAL)
         labcpu = wx.StaticText(self, wx.ID_ANY, 'Speed:')
@@ -388,6 +391,7 @@ class Vp9_WebM(scrolled.ScrolledPanel):
         """
         Reset all controls to default
         """
+        self.tquality.reset()
         self.labinfo.SetLabel("VP9-WebM (WebM Project open video codec)")
         prst = presets_vp9webm(self.cmb_defprst.GetStringSelection())
 
@@ -6,7 +6,7 @@ Compatibility: Python3, wxPython Phoenix
 Author: Gianluca Pernigotto <jeanlucperni@gmail.com>
 Copyleft - 2024 Gianluca Pernigotto <jeanlucperni@gmail.com>
 license: GPL3
-Rev: Mar.08.2024
+Rev: Oct.19.2026
 Code checker: flake8, pylint
 
 This file is part of Videomass.
@@ -36,6 +36,13 @@ from videomass.vdms_io.checkup import check_files
 from videomass.vdms_dialogs.epilogue import Formula
 from videomass.vdms_utils.utils import trailing_name_with_prog_digit
 from videomass.vdms_utils.utils import update_timeseq_duration
+from videomass.vdms_utils.utils import media_fingerprint
+from videomass.vdms_utils.gif_utils import (DITHERS,
+                                            gif_filters,
+                                            palette_cachename,
+                                            gif_graph,
+                                            gif_graph_cached,
+                                            )
 
 
 class VideoToSequence(wx.Panel):
@@ -126,6 +133,18 @@ class VideoToSequence(wx.Panel):
                                     )
         siz_ctrl.Add(self.cmb_frmt, 0, wx.ALL, 5)
         self.cmb_frmt.SetSelection(2)
+        self.lbl_dither = wx.StaticText(self, wx.ID_ANY,
+                                        label=_("Dithering:"))
+        siz_ctrl.Add(self.lbl_dither, 0, wx.LEFT | wx.ALIGN_CENTER_VERTICAL, 5)
+        self.cmb_dither = wx.ComboBox(self, wx.ID_ANY,
+                                      choices=list(DITHERS),
+                                      size=(160, -1), style=wx.CB_DROPDOWN
+                                      | wx.CB_READONLY,
+                                      )
+        siz_ctrl.Add(self.cmb_dither, 0, wx.ALL, 5)
+        self.cmb_dither.SetSelection(0)
+        self.lbl_dither.Disable()
+        self.cmb_dither.Disable()
         siz_tile = wx.FlexGridSizer(4, 4, 0, 0)
         boxctrl.Add(siz_tile, 0, wx.TOP | wx.BOTTOM, 10)
         self.lbl_rows = wx.StaticText(self, wx.ID_ANY, label=_("Rows:"))
@@ -166,6 +185,10 @@ class VideoToSequence(wx.Panel):
                                      )
         siz_tile.Add(self.spin_marg, 0, wx.ALL | wx.ALIGN_CENTER_VERTICAL, 5)
         self.spin_marg.Disable()
+        self.ckbx_batch = wx.CheckBox(self, wx.ID_ANY,
+                                      _('Contact sheets of all files'))
+        boxctrl.Add(self.ckbx_batch, 0, wx.ALL, 5)
+        self.ckbx_batch.Disable()
         siz_addparams = wx.BoxSizer(wx.HORIZONTAL)
         boxctrl.Add(siz_addparams, 0, wx.EXPAND, 0)
         self.ckbx_edit = wx.CheckBox(self, wx.ID_ANY, _('Edit'))
@@ -235,6 +258,15 @@ class VideoToSequence(wx.Panel):
         self.spin_pad.SetToolTip(tip)
         tip = _('Spaces around the mosaic borders. From 0 to 32 pixels')
         self.spin_marg.SetToolTip(tip)
+        tip = (_('Makes a tiled mosaic for each imported video file, '
+                 'taking each tile with a fast seek, and an index.html '
+                 'page of all of them in a folder named '
+                 '\'Contact_Sheets\''))
+        self.ckbx_batch.SetToolTip(tip)
+        tip = (_('Dithering mode of the GIF palette. The palette of each '
+                 'source, segment and size is cached, so changing the '
+                 'dithering only does not compute it again.'))
+        self.cmb_dither.SetToolTip(tip)
 
         self.Bind(wx.EVT_BUTTON, self.on_help, btn_help)
         self.Bind(wx.EVT_CHECKBOX, self.on_edit, self.ckbx_edit)
@@ -281,6 +313,10 @@ class VideoToSequence(wx.Panel):
             self.spin_cols.Disable()
             self.spin_pad.Disable()
             self.spin_marg.Disable()
+            self.ckbx_batch.SetValue(False)
+            self.ckbx_batch.Disable()
+            self.lbl_dither.Disable()
+            self.cmb_dither.Disable()
             arg = self.update_arguments(self.cmb_frmt.GetValue())
             self.txt_args.write(arg[1])
         else:
@@ -300,8 +336,11 @@ class VideoToSequence(wx.Panel):
                     self.spin_cols.Enable()
                     self.spin_pad.Enable()
                     self.spin_marg.Enable()
+                    self.ckbx_batch.Enable()
             elif self.rdbx_opt.GetSelection() == 2:
                 self.btn_resize.Enable()
+                self.lbl_dither.Enable()
+                self.cmb_dither.Enable()
 
             self.txt_args.Clear()
             self.txt_args.Disable()
@@ -311,6 +350,13 @@ class VideoToSequence(wx.Panel):
         """
         Available user options
         """
+        if self.rdbx_opt.GetSelection() != 1:
+            self.ckbx_batch.SetValue(False)
+            self.ckbx_batch.Disable()
+        if self.rdbx_opt.GetSelection() != 2:
+            self.lbl_dither.Disable()
+            self.cmb_dither.Disable()
+
         if self.rdbx_opt.GetSelection() == 0:
             self.cmb_frmt.SetSelection(2)
             self.txt_args.Clear()
@@ -432,6 +478,46 @@ class VideoToSequence(wx.Panel):
                     self.opt['Setsar'] = data['setsar']
     # ------------------------------------------------------------------#
 
+    def gif_chain(self):
+        """
+        Returns the filters chain of the GIF export
+        """
+        setf = [self.opt[key] for key in ("Setdar", "Setsar") if self.opt[key]]
+        return gif_filters(10, self.opt["Scale"], ','.join(setf))
+    # ------------------------------------------------------------------#
+
+    def gif_command(self, filename, outfilename, timeseq):
+        """
+        Returns a tuple (command, palette) for the GIF export
+        of `filename` using the cached palette of the same
+        source, segment (`timeseq`) and filters if it exists.
+        Otherwise the palette is computed by the same single
+        decode and written to a temporary file, `palette` is
+        then the tuple (temporary file, cached file) to move
+        on success, None in any other case.
+        """
+        flt = self.gif_chain()
+        dither = self.cmb_dither.GetValue()
+        try:
+            cachename = palette_cachename(self.appdata['cachedir'],
+                                          media_fingerprint(filename),
+                                          *timeseq, flt)
+        except OSError:
+            return (f'-filter_complex "{gif_graph(flt, dither)}" '
+                    f'-map "[gif]" -loop 0 -y "{outfilename}"'), None
+
+        if os.path.exists(cachename):
+            return (f'-i "{cachename}" -filter_complex '
+                    f'"{gif_graph_cached(flt, dither)}" -map "[gif]" '
+                    f'-loop 0 -y "{outfilename}"'), None
+
+        tmpname = f'{os.path.splitext(cachename)[0]}.part.png'
+        return (f'-filter_complex "{gif_graph(flt, dither, palette=True)}" '
+                f'-map "[gif]" -loop 0 -y "{outfilename}" '
+                f'-map "[palette]" -frames:v 1 -update 1 -y "{tmpname}"',
+                (tmpname, cachename))
+    # ------------------------------------------------------------------#
+
     def update_arguments(self, fmt):
         """
         Given a image format return the corresponding
@@ -452,15 +538,8 @@ class VideoToSequence(wx.Panel):
                    f'-fps_mode vfr')
 
         elif self.rdbx_opt.GetSelection() == 2:
-            setf = ''
-            if self.opt["Setdar"]:
-                setf = f',{self.opt["Setdar"]}'
-            if self.opt["Setsar"]:
-                setf = f'{setf},{self.opt["Setsar"]}'
-            flt = (f'fps=10,{self.opt["Scale"]}:flags=lanczos,split=2 '
-                   f'[a][b]; [a] palettegen [pal]; [b] fifo [b]; [b] '
-                   f'[pal] paletteuse{setf}')
-            cmd = ('', f'-vf "{flt}" -loop 0')
+            graph = gif_graph(self.gif_chain(), self.cmb_dither.GetValue())
+            cmd = ('', f'-filter_complex "{graph}" -map "[gif]" -loop 0')
 
         elif self.rdbx_opt.GetSelection() == 0:
             scale = self.opt["Scale"]
@@ -495,6 +574,9 @@ class VideoToSequence(wx.Panel):
         """
         Check before Builds FFmpeg command arguments
         """
+        if self.ckbx_batch.IsChecked():
+            self.build_contact_sheets()
+            return
         fsource = self.parent.file_src
         if len(fsource) == 1:
             clicked = fsource[0]
@@ -546,6 +628,7 @@ class VideoToSequence(wx.Panel):
 
         outfilename = os.path.join(outputdir, os.path.basename(fileout))
 
+        parallel = None
         if self.txt_args.IsEnabled():
             arg = self.update_arguments(self.cmb_frmt.GetValue())
             preargs = arg[0]
@@ -556,16 +639,28 @@ class VideoToSequence(wx.Panel):
             preargs = arg[0]
             command = " ".join(f'{arg[1]} {self.txt_args.GetValue()} -y '
                                f'"{outfilename}"'.split())
+            if (self.rdbx_opt.GetSelection() == 0
+                    and self.cmb_frmt.GetValue() != 'gif'):
+                # constant rate frames, can be split by time ranges
+                parallel = {'rate': float(self.spin_rate.GetValue()),
+                            'args': " ".join(arg[1].split()),
+                            'output': outfilename,
+                            }
 
         dur, ss, et = update_timeseq_duration(self.parent.time_seq,
                                               self.parent.duration
                                               )
+        palette = None
+        if self.rdbx_opt.GetSelection() == 2 and not self.txt_args.IsEnabled():
+            command, palette = self.gif_command(filename, outfilename,
+                                                (ss, et))
         kwargs = {'logname': 'From Movie to Pictures.log',
                   'type': 'video_to_sequence', 'duration': dur,
                   'start-time': ss, 'end-time': et, 'filename': filename,
                   'outputdir': outputdir, 'args': command,
                   'pre-input-1': preargs,
                   'preset name': 'From Movies to Pictures',
+                  'parallel': parallel, 'palette': palette,
                   }
         keyval = self.update_dict(filename, outputdir)
         ending = Formula(self, (700, 280),
@@ -593,6 +688,69 @@ class VideoToSequence(wx.Panel):
         return
     # ------------------------------------------------------------------#
 
+    def build_contact_sheets(self):
+        """
+        Makes a contact sheet (tiled mosaic) for each imported
+        video file on a pool of processes, see
+        `contact_sheets.ContactSheets`.
+        """
+        files, durations = [], []
+        for num, fname in enumerate(self.parent.file_src):
+            typemedia = self.parent.fileDnDTarget.flCtrl.GetItemText(num, 3)
+            if 'video' in typemedia and 'sequence' not in typemedia:
+                files.append(fname)
+                durations.append(self.parent.duration[num])
+        if not files:
+            wx.MessageBox(_('There are no video files to process'),
+                          'Videomass', wx.ICON_INFORMATION, self)
+            return
+
+        outputdir = trailing_name_with_prog_digit(self.appdata['outputdir'],
+                                                  'Contact_Sheets')
+        rows, cols = self.spin_rows.GetValue(), self.spin_cols.GetValue()
+        filters = self.opt["Scale"]
+        if self.opt["Setdar"]:
+            filters = f'{filters},{self.opt["Setdar"]}'
+        if self.opt["Setsar"]:
+            filters = f'{filters},{self.opt["Setsar"]}'
+        tile = (f'{rows}x{cols}:padding={self.spin_pad.GetValue()}:'
+                f'margin={self.spin_marg.GetValue()}:color=White')
+        kwargs = {'logname': 'Contact Sheets.log',
+                  'type': 'contact_sheets', 'files': files,
+                  'durations': durations, 'outputdir': outputdir,
+                  'format': self.cmb_frmt.GetValue(), 'filters': filters,
+                  'tile': tile, 'tiles': rows * cols,
+                  }
+        keys = (_("Files\nOutput Format\nDestination\nResizing\n"
+                  "Mosaic rows\nMosaic columns\nMosaic padding\n"
+                  "Mosaic margin"))
+        vals = (f"{len(files)}\n{kwargs['format']}\n{outputdir}"
+                f"\n{filters}\n{rows}\n{cols}\n{self.spin_pad.GetValue()}"
+                f"\n{self.spin_marg.GetValue()}")
+        ending = Formula(self, (700, 280),
+                         self.parent.movetotrash,
+                         self.parent.emptylist,
+                         **{'key': keys, 'val': vals},
+                         )
+        if ending.ShowModal() == wx.ID_OK:
+            (self.parent.movetotrash,
+             self.parent.emptylist) = ending.getvalue()
+        else:
+            return
+
+        try:
+            os.makedirs(outputdir, mode=0o777)
+        except (OSError, FileExistsError) as err:
+            wx.MessageBox(f"{err}", _('Videomass - Error!'),
+                          wx.ICON_ERROR, self)
+            return
+
+        self.parent.switch_to_processing(kwargs["type"],
+                                         kwargs["logname"],
+                                         datalist=kwargs
+                                         )
+    # ------------------------------------------------------------------#
+
     def update_dict(self, filename, outputdir):
         """
         Update information before send to epilogue
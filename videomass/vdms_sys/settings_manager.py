@@ -6,7 +6,7 @@ Compatibility: Python3
 Author: Gianluca Pernigotto <jeanlucperni@gmail.com>
 Copyleft - 2024 Gianluca Pernigotto <jeanlucperni@gmail.com>
 license: GPL3
-Rev: Apr.09.2024
+Rev: Oct.19.2026
 Code checker: flake8, pylint
 
  This file is part of Videomass.
@@ -164,6 +164,52 @@ class ConfigManager:
     ytdlp-module-path (str),
         Path to the yt-dlp dir
 
+    ytdlp-concurrent-downloads (int):
+        Maximum number of URLs downloaded at the same time by
+        the YouTube Downloader, default is 3.
+
+    ytdlp-info-cache-ttl (int):
+        Hours after which the metadata of the URLs extracted by
+        yt-dlp and stored in the cache directory expire, 0 to
+        disable the metadata cache, default is 24.
+
+    ytdlp-info-cache-size (int):
+        Maximum size in MiB of the metadata cache, the oldest
+        metadata are removed first, default is 100.
+
+    ytdlp-download-archive (bool):
+        If True, the media downloaded by the YouTube Downloader are
+        recorded in the download archive of the configuration dir
+        and skipped when downloaded again, default is False.
+
+    ytdlp-ratelimit (int):
+        Bandwidth limit in KiB/s shared by all the simultaneous
+        downloads, 0 for unlimited, default is 0.
+
+    ytdlp-ratelimit-schedule (str):
+        Time-of-day bandwidth limits which override the
+        `ytdlp-ratelimit`, as comma separated 'HH:MM-HH:MM=KiB/s'
+        items, e.g. '08:00-18:00=500', default is empty.
+
+    ytdlp-convert (bool):
+        Converts the downloads as soon as each one finishes,
+        with the `ytdlp-convert-profile` of the
+        `ytdlp-convert-preset`, default is False.
+
+    ytdlp-convert-preset (str):
+        Name of the preset (of the Presets Manager) which
+        converts the downloads, default is empty.
+
+    ytdlp-convert-profile (str):
+        Name of the profile of the `ytdlp-convert-preset`
+        which converts the downloads, default is empty.
+
+    ytdlp-convert-stream (bool):
+        Pipes the downloads of the yt-dlp executable into the
+        ffmpeg encode of the `ytdlp-convert-profile`, without
+        intermediate file, except those whose formats must be
+        merged, default is False.
+
     playlistsubfolder (bool):
         Auto-create subfolders when download the playlists,
         default value is True.
@@ -211,6 +257,29 @@ class ConfigManager:
         webbrowser (str),
         cookiesfrombrowser (list)
 
+    keyframe_index (bool):
+        If True, the keyframes of the imported video files are
+        indexed in background in the cache directory, default
+        is False.
+
+    scene_index (bool):
+        If True, the keyframes indexing also detects the scene
+        changes (requires decoding the whole video), default
+        is False.
+
+    verify_quality (bool):
+        If True, each output encoded by the FFmpeg thread is compared
+        with its source by the SSIM/PSNR filters after encoding,
+        default is False.
+
+    verify_subsample (int):
+        Analyze one frame every `verify_subsample` frames during
+        quality verification, default is 1 (all frames).
+
+    verify_vmaf (bool):
+        If True, also use the libvmaf filter during quality
+        verification when FFmpeg provides it, default is True.
+
     prstmng_column_width (list of int)
         column width in the Preset Manager panel.
 
@@ -221,7 +290,7 @@ class ConfigManager:
         column width in the format code panel (ytdownloader).
 
     """
-    VERSION = 8.0
+    VERSION = 8.8
     DEFAULT_OPTIONS = {"confversion": VERSION,
                        "shutdown": False,
                        "sudo_password": None,
@@ -257,6 +326,16 @@ class ConfigManager:
                        "ytdlp-executable-path": "yt-dlp",
                        "ytdlp-usemodule": False,
                        "ytdlp-module-path": "",
+                       "ytdlp-concurrent-downloads": 3,
+                       "ytdlp-info-cache-ttl": 24,
+                       "ytdlp-info-cache-size": 100,
+                       "ytdlp-download-archive": False,
+                       "ytdlp-ratelimit": 0,
+                       "ytdlp-ratelimit-schedule": "",
+                       "ytdlp-convert": False,
+                       "ytdlp-convert-preset": "",
+                       "ytdlp-convert-profile": "",
+                       "ytdlp-convert-stream": False,
                        "playlistsubfolder": True,
                        "ssl_certificate": False,
                        "add_metadata": False,
@@ -285,6 +364,11 @@ class ConfigManager:
                        "autogen_cookie_file": False,
                        "webbrowser": "firefox",
                        "cookiesfrombrowser": [None, None, None, None],
+                       "keyframe_index": False,
+                       "scene_index": False,
+                       "verify_quality": False,
+                       "verify_subsample": 1,
+                       "verify_vmaf": True,
                        "prstmng_column_width": [250, 350, 200, 220],
                        "filedrop_column_width": [30, 200, 200, 200, 150, 200],
                        "fcode_column_width": [120, 60, 200, 80, 160,
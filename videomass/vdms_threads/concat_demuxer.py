@@ -6,7 +6,7 @@ Compatibility: Python3, wxPython4 Phoenix
 Author: Gianluca Pernigotto <jeanlucperni@gmail.com>
 Copyleft - 2024 Gianluca Pernigotto <jeanlucperni@gmail.com>
 license: GPL3
-Rev: Apr.24.2024
+Rev: Oct.19.2026
 Code checker: flake8, pylint
 
 This file is part of Videomass.
@@ -24,7 +24,9 @@ This file is part of Videomass.
    You should have received a copy of the GNU General Public License
    along with Videomass.  If not, see <http://www.gnu.org/licenses/>.
 """
-from threading import Thread
+import os
+from threading import Thread, Lock
+from concurrent.futures import ThreadPoolExecutor
 import time
 import subprocess
 import platform
@@ -45,7 +47,13 @@ class ConcatDemuxer(Thread):
 
     https://stackoverflow.com/questions/1388753/how-to-get-output-
     from-subprocess-popen-proc-stdout-readline-blocks-no-dat?rq=1
+
+    The items of the optional `normalize` kwarg (the files whose
+    format differs from the others, see `concatenate.Conc_Demuxer`)
+    are re-encoded in parallel by up to `MAX_WORKERS` processes
+    before joining, the temporary files are removed at the end.
     """
+    MAX_WORKERS = 4  # maximum number of parallel re-encodings
     # ---------------------------------------------------------------
 
     def __init__(self, *args, **kwargs):
@@ -59,15 +67,146 @@ class ConcatDemuxer(Thread):
         self.stop_work_thread = False  # process terminate
         self.logfile = args[0]  # log filename
         self.kwa = kwargs
+        self.procs = []  # running re-encodings
+        self.lock = Lock()
 
         Thread.__init__(self)
 
         self.start()
+    # ---------------------------------------------------------------
+
+    def reencode(self, item):
+        """
+        Re-encodes the `item` file to match the format of
+        the others, returns None on success, the error
+        message otherwise.
+        """
+        cmd = (f'"{self.appdata["ffmpeg_cmd"]}" -y -hide_banner -nostats '
+               f'-loglevel error -i "{item["source"]}" {item["args"]} '
+               f'"{item["output"]}"')
+        logwrite(f'[COMMAND]:\n{cmd}', '', self.logfile)
+        if not platform.system() == 'Windows':
+            cmd = shlex.split(cmd)
+        with self.lock:
+            if self.stop_work_thread:
+                return None
+            try:
+                proc = Popen(cmd,
+                             stdout=subprocess.DEVNULL,
+                             stderr=subprocess.PIPE,
+                             universal_newlines=True,
+                             encoding=self.appdata['encoding'],
+                             errors='replace',
+                             )
+            except OSError as err:
+                return str(err)
+            self.procs.append(proc)
+        with proc:
+            err = proc.communicate()[1]
+        with self.lock:
+            self.procs.remove(proc)
+        if self.stop_work_thread:
+            return None
+        if proc.returncode:
+            return err.strip() or f'Exit status: {proc.returncode}'
+        wx.CallAfter(pub.sendMessage,
+                     "UPDATE_EVT",
+                     output=f'Re-encoded: "{item["source"]}"\n',
+                     duration=self.kwa['duration'],
+                     status=0,
+                     )
+        return None
+    # ---------------------------------------------------------------
+
+    def normalize(self):
+        """
+        Re-encodes in parallel the files to normalize.
+        Returns True if all of them are done, False on
+        errors or if stopped.
+        """
+        items = self.kwa['normalize']
+        count = (f'Re-encoding {len(items)} of {self.kwa["nmax"]} items '
+                 f'to match the format of the others...')
+        wx.CallAfter(pub.sendMessage,
+                     "COUNT_EVT",
+                     count=count,
+                     duration=self.kwa['duration'],
+                     end='CONTINUE',
+                     )
+        logwrite(count, '', self.logfile)
+        os.makedirs(os.path.dirname(items[0]['output']), mode=0o777,
+                    exist_ok=True)
+        workers = min(ConcatDemuxer.MAX_WORKERS, os.cpu_count() or 1,
+                      len(items))
+        with ThreadPoolExecutor(max_workers=workers) as pool:
+            results = list(pool.map(self.reencode, items))
+
+        if self.stop_work_thread:
+            return False
+        errors = [(item, err) for item, err in zip(items, results) if err]
+        for item, err in errors:
+            logwrite('', f'[VIDEOMASS]: "{item["source"]}": {err}',
+                     self.logfile)
+            wx.CallAfter(pub.sendMessage,
+                         "COUNT_EVT",
+                         count=f'"{item["source"]}": {err.splitlines()[-1]}',
+                         duration=0,
+                         end='ERROR',
+                         )
+        return not errors
+    # ---------------------------------------------------------------
+
+    def cleanup(self):
+        """
+        Removes the re-encoded temporary files
+        """
+        for item in self.kwa.get('normalize') or []:
+            if os.path.exists(item['output']):
+                try:
+                    os.remove(item['output'])
+                except OSError as err:
+                    logwrite('', f'[VIDEOMASS]: {err}', self.logfile)
+    # ---------------------------------------------------------------
 
     def run(self):
         """
         Subprocess initialize thread.
 
+        """
+        filedone = None
+        if self.kwa.get('normalize'):
+            try:
+                done = self.normalize()
+            except OSError as err:  # e.g. can't make the tmp dir
+                wx.CallAfter(pub.sendMessage,
+                             "COUNT_EVT",
+                             count=err,
+                             duration=0,
+                             end='ERROR',
+                             )
+                logwrite('', err, self.logfile)
+                done = False
+            if not done:
+                self.cleanup()
+                if self.stop_work_thread:
+                    wx.CallAfter(pub.sendMessage,
+                                 "UPDATE_EVT",
+                                 output='STOP',
+                                 duration=self.kwa['duration'],
+                                 status=1,
+                                 )
+                time.sleep(1)
+                wx.CallAfter(pub.sendMessage, "END_EVT",
+                             filetotrash=filedone)
+                return
+
+        self.concat()
+        self.cleanup()
+    # ---------------------------------------------------------------
+
+    def concat(self):
+        """
+        Runs the concat demuxer process
         """
         filedone = None
         cmd = (f'"{self.appdata["ffmpeg_cmd"]}" '
@@ -162,5 +301,9 @@ class ConcatDemuxer(Thread):
     def stop(self):
         """
         Sets the stop work thread to terminate the process
+        and the running re-encodings
         """
-        self.stop_work_thread = True
+        with self.lock:
+            self.stop_work_thread = True
+            for proc in self.procs:
+                proc.kill()
@@ -0,0 +1,229 @@
+# -*- coding: UTF-8 -*-
+"""
+Name: contact_sheets.py
+Porpose: FFmpeg long processing task to make contact sheets of many files
+Compatibility: Python3, wxPython Phoenix
+Author: Gianluca Pernigotto <jeanlucperni@gmail.com>
+Copyleft - 2024 Gianluca Pernigotto <jeanlucperni@gmail.com>
+license: GPL3
+Rev: Oct.19.2026
+Code checker: flake8, pylint
+
+This file is part of Videomass.
+
+   Videomass is free software: you can redistribute it and/or modify
+   it under the terms of the GNU General Public License as published by
+   the Free Software Foundation, either version 3 of the License, or
+   (at your option) any later version.
+
+   Videomass is distributed in the hope that it will be useful,
+   but WITHOUT ANY WARRANTY; without even the implied warranty of
+   MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+   GNU General Public License for more details.
+
+   You should have received a copy of the GNU General Public License
+   along with Videomass.  If not, see <http://www.gnu.org/licenses/>.
+"""
+import os
+from threading import Thread, Lock
+from concurrent.futures import ThreadPoolExecutor
+import time
+import subprocess
+import platform
+import wx
+from pubsub import pub
+from videomass.vdms_utils.utils import Popen, integer_to_time
+from videomass.vdms_utils.contact_utils import (tile_positions,
+                                                mosaic_graph,
+                                                sheet_names,
+                                                index_page,
+                                                )
+from videomass.vdms_io.make_filelog import logwrite
+if not platform.system() == 'Windows':
+    import shlex
+
+
+class ContactSheets(Thread):
+    """
+    Makes a contact sheet (tiled mosaic) for each of the given
+    files using a pool of up to `MAX_WORKERS` processes, then
+    writes an `index.html` page of all the sheets in the output
+    directory. Each tile is taken with a fast input seek (one
+    input for each tile) so that the sources are never decoded
+    as a whole.
+
+    The progress is sent as the number of completed sheets; a
+    failed file is reported and the others are still made.
+    """
+    MAX_WORKERS = 4  # maximum number of parallel processes
+
+    def __init__(self, *args, **kwargs):
+        """
+        Called from `long_processing_task.topic_thread`.
+        kwargs keys:
+            'files': list of source pathnames,
+            'durations': list of their durations (ms),
+            'outputdir': output directory,
+            'format': output image format,
+            'filters': the filters chain applied to each tile,
+            'tile': the tile filter options (e.g. '4x4:padding=2')
+            'tiles': the number of tiles of each sheet
+        """
+        get = wx.GetApp()  # get videomass wx.App attribute
+        self.appdata = get.appset
+        self.stop_work_thread = False  # process terminate
+        self.logfile = args[0]  # log filename
+        self.kwa = kwargs
+        self.procs = []
+        self.lock = Lock()
+        self.done = 0
+        self.duration = len(kwargs['files']) * 1000  # progress range
+
+        Thread.__init__(self)
+        self.start()  # self.run()
+    # --------------------------------------------------------------------#
+
+    def command(self, filename, duration, output):
+        """
+        Returns the command (str) which makes the sheet
+        of `filename` to `output`.
+        """
+        inputs = ' '.join(f'-noaccurate_seek -threads 1 -ss {pos} '
+                          f'-i "{filename}"' for pos in
+                          tile_positions(duration, self.kwa['tiles']))
+        graph = mosaic_graph(self.kwa['tiles'], self.kwa['filters'],
+                             self.kwa['tile'])
+        return (f'"{self.appdata["ffmpeg_cmd"]}" -y -hide_banner '
+                f'-nostats -loglevel error {inputs} '
+                f'-filter_complex "{graph}" -map "[sheet]" '
+                f'-frames:v 1 "{output}"'
+                )
+    # --------------------------------------------------------------------#
+
+    def make_sheet(self, filename, duration, output):
+        """
+        Makes the sheet of `filename`, returns None
+        on success, the error message otherwise.
+        """
+        if not duration:
+            return _('Unknown duration')
+        cmd = self.command(filename, duration, output)
+        logwrite(f'[COMMAND]:\n{cmd}', '', self.logfile)
+        if not platform.system() == 'Windows':
+            cmd = shlex.split(cmd)
+        with self.lock:
+            if self.stop_work_thread:
+                return None
+            try:
+                proc = Popen(cmd,
+                             stdout=subprocess.DEVNULL,
+                             stderr=subprocess.PIPE,
+                             universal_newlines=True,
+                             encoding=self.appdata['encoding'],
+                             errors='replace',
+                             )
+            except OSError as err:
+                return str(err)
+            self.procs.append(proc)
+        with proc:
+            err = proc.communicate()[1]
+        with self.lock:
+            self.procs.remove(proc)
+            if not self.stop_work_thread:
+                self.done += 1
+                wx.CallAfter(pub.sendMessage,
+                             "UPDATE_EVT",
+                             output=(f'sheets={self.done}/'
+                                     f'{len(self.kwa["files"])} time='
+                                     f'{integer_to_time(self.done * 1000)}'),
+                             duration=self.duration,
+                             status=0,
+                             )
+        if proc.returncode and not self.stop_work_thread:
+            return err.strip() or _('Exit status: {}').format(proc.returncode)
+        return None
+    # --------------------------------------------------------------------#
+
+    def run(self):
+        """
+        Subprocess initialize thread.
+        """
+        files = self.kwa['files']
+        names = sheet_names(files, self.kwa['format'])
+        outputs = [os.path.join(self.kwa['outputdir'], n) for n in names]
+        count = (f'Contact sheets of {len(files)} files\n'
+                 f'Destination: "{self.kwa["outputdir"]}"')
+        wx.CallAfter(pub.sendMessage,
+                     "COUNT_EVT",
+                     count=count,
+                     duration=self.duration,
+                     end='CONTINUE',
+                     )
+        logwrite(count, '', self.logfile)
+
+        workers = min(ContactSheets.MAX_WORKERS, os.cpu_count() or 1)
+        with ThreadPoolExecutor(max_workers=workers) as pool:
+            futures = [pool.submit(self.make_sheet, fname, dur, out) for
+                       fname, dur, out in zip(files, self.kwa['durations'],
+                                              outputs)]
+            results = [fut.result() for fut in futures]
+
+        if self.stop_work_thread:
+            wx.CallAfter(pub.sendMessage,
+                         "UPDATE_EVT",
+                         output='STOP',
+                         duration=self.duration,
+                         status=1,
+                         )
+            time.sleep(1)
+            wx.CallAfter(pub.sendMessage, "END_EVT", filetotrash=None)
+            return
+
+        entries, filedone = [], []
+        for fname, dur, name, err in zip(files, self.kwa['durations'],
+                                         names, results):
+            if err:
+                entries.append((fname, None, err.splitlines()[-1]))
+                logwrite('', f'[VIDEOMASS]: "{fname}": {err}', self.logfile)
+                wx.CallAfter(pub.sendMessage,
+                             "COUNT_EVT",
+                             count=f'"{fname}": {err.splitlines()[-1]}',
+                             duration=0,
+                             end='ERROR',
+                             )
+            else:
+                entries.append((fname, name,
+                                integer_to_time(round(dur), mills=False)))
+                filedone.append(fname)
+        try:
+            with open(os.path.join(self.kwa['outputdir'], 'index.html'),
+                      'w', encoding='utf-8') as page:
+                page.write(index_page(_('Contact sheets'), entries))
+        except OSError as err:
+            wx.CallAfter(pub.sendMessage,
+                         "COUNT_EVT",
+                         count=err,
+                         duration=0,
+                         end='ERROR',
+                         )
+            logwrite('', err, self.logfile)
+
+        if filedone:
+            wx.CallAfter(pub.sendMessage,
+                         "COUNT_EVT",
+                         count='',
+                         duration='',
+                         end='DONE'
+                         )
+        time.sleep(.5)
+        wx.CallAfter(pub.sendMessage, "END_EVT", filetotrash=filedone)
+    # --------------------------------------------------------------------#
+
+    def stop(self):
+        """
+        Sets the stop work thread to terminate the processes
+        """
+        with self.lock:
+            self.stop_work_thread = True
+            for proc in self.procs:
+                proc.kill()
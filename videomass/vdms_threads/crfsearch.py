@@ -0,0 +1,252 @@
+# -*- coding: UTF-8 -*-
+"""
+Name: crfsearch.py
+Porpose: Searches the CRF value which reaches a target quality
+Compatibility: Python3, wxPython Phoenix
+Author: Gianluca Pernigotto <jeanlucperni@gmail.com>
+Copyleft - 2024 Gianluca Pernigotto <jeanlucperni@gmail.com>
+license: GPL3
+Rev: Oct.19.2026
+Code checker: flake8, pylint
+
+This file is part of Videomass.
+
+   Videomass is free software: you can redistribute it and/or modify
+   it under the terms of the GNU General Public License as published by
+   the Free Software Foundation, either version 3 of the License, or
+   (at your option) any later version.
+
+   Videomass is distributed in the hope that it will be useful,
+   but WITHOUT ANY WARRANTY; without even the implied warranty of
+   MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+   GNU General Public License for more details.
+
+   You should have received a copy of the GNU General Public License
+   along with Videomass.  If not, see <http://www.gnu.org/licenses/>.
+"""
+import os
+from threading import Lock
+from concurrent.futures import ThreadPoolExecutor
+import subprocess
+import platform
+import wx
+from videomass.vdms_utils.utils import Popen, media_fingerprint
+from videomass.vdms_utils.crop_utils import sample_positions
+from videomass.vdms_utils.quality_utils import (quality_filtergraph,
+                                                parse_quality,
+                                                )
+from videomass.vdms_utils.crf_utils import (set_crf,
+                                            crf_candidates,
+                                            narrow_crf_range,
+                                            crf_cachekey,
+                                            crf_cachename,
+                                            load_crf_cache,
+                                            save_crf_cache,
+                                            )
+from videomass.vdms_io.make_filelog import logwrite
+if not platform.system() == 'Windows':
+    import shlex
+
+
+class CRFSearch:
+    """
+    Finds the highest CRF value (i.e. the smallest output)
+    whose SSIM, measured against the source, reaches a given
+    target. Short samples of `LENGTH` seconds are taken from
+    `SAMPLES` positions across the source; at each step of
+    the search `PROBES` candidate CRF values are encoded on
+    all samples in parallel and the range is narrowed until
+    a single value is left (see `crf_utils`).
+
+    Results are cached in the `crfsearch` subfolder of the
+    cache directory, keyed by file fingerprint, encoder
+    settings, filters and target.
+
+    USAGE:
+        >>> search = CRFSearch(logfile)
+        >>> crf, ssim, error, cached = search.search(filename,
+        ...                                          duration, tquality)
+        >>> search.stop()  # from another thread, to abort it
+
+    """
+    SAMPLES = 3  # number of samples to encode
+    LENGTH = 3  # seconds of each sample
+    PROBES = 2  # CRF values measured at each step
+
+    def __init__(self, logfile=None):
+        """
+        self.logfile: log pathname to write commands and errors to
+        self.procs: running FFmpeg processes
+        """
+        get = wx.GetApp()
+        self.appdata = get.appset
+        self.logfile = logfile
+        self.procs = []
+        self.lock = Lock()
+        self.stopped = False
+    # ----------------------------------------------------------------#
+
+    def params(self):
+        """
+        Returns the search parameters as str,
+        used to validate the cached results.
+        """
+        return (f'samples={CRFSearch.SAMPLES}:'
+                f'length={CRFSearch.LENGTH}:probes={CRFSearch.PROBES}')
+    # ----------------------------------------------------------------#
+
+    def execute(self, cmd):
+        """
+        Runs `cmd` and returns a tuple (stderr, returncode),
+        (None, None) if the search was stopped.
+        Raise OSError if FFmpeg can't be executed.
+        """
+        if self.logfile:
+            logwrite(cmd, '', self.logfile)
+        if not platform.system() == 'Windows':
+            cmd = shlex.split(cmd)
+
+        with self.lock:
+            if self.stopped:
+                return None, None
+            proc = Popen(cmd,
+                         stdout=subprocess.DEVNULL,
+                         stderr=subprocess.PIPE,
+                         universal_newlines=True,
+                         encoding=self.appdata['encoding'],
+                         errors='replace',
+                         )
+            self.procs.append(proc)
+        with proc:
+            output = proc.communicate()[1]
+        with self.lock:
+            self.procs.remove(proc)
+        if self.stopped:
+            return None, None
+        return output, proc.returncode
+    # ----------------------------------------------------------------#
+
+    def sample(self, filename, seek, crf, tquality, tmpname):
+        """
+        Encodes the sample at `seek` seconds with `crf` to
+        `tmpname` and measures its SSIM against the source.
+        Returns the SSIM value, None on failures.
+        """
+        filters = f'-vf {tquality["filters"]}' if tquality['filters'] else ''
+        video = set_crf([tquality['video']], crf)[0]
+        encode = (f'"{self.appdata["ffmpeg_cmd"]}" -y -hide_banner -nostats '
+                  f'-loglevel error -ss {seek} -t {CRFSearch.LENGTH} '
+                  f'-i "{filename}" {video} {filters} -an -sn -dn '
+                  f'"{tmpname}"'
+                  )
+        graph = quality_filtergraph(reffilters=tquality['filters'])
+        measure = (f'"{self.appdata["ffmpeg_cmd"]}" -hide_banner -nostats '
+                   f'-loglevel info -i "{tmpname}" -ss {seek} '
+                   f'-t {CRFSearch.LENGTH} -i "{filename}" '
+                   f'-lavfi "{graph}" -f null -'
+                   )
+        try:
+            for cmd in (encode, measure):
+                output, ret = self.execute(cmd)
+                if output is None:
+                    return None
+                if ret:
+                    if self.logfile:
+                        logwrite('', f'[VIDEOMASS]: CRF search error at '
+                                     f'{seek}s, CRF {crf}:\n{output}',
+                                 self.logfile)
+                    return None
+        finally:
+            if os.path.exists(tmpname):
+                os.remove(tmpname)
+
+        return parse_quality(output)['ssim']
+    # ----------------------------------------------------------------#
+
+    def search(self, filename, duration, tquality):
+        """
+        Searches the CRF of `filename` with `duration` in
+        milliseconds for the `tquality` dict, with keys:
+            'ssim': the target SSIM (float),
+            'range': (lowest CRF, highest CRF),
+            'video': the video encoder args including `-crf`,
+            'filters': the video filters chain (str)
+
+        Returns a tuple (crf, ssim, error, cached) where `crf`
+        is an int or None if the search failed (e.g. a sample
+        can't be measured or the target can't be reached),
+        `ssim` its measured value, `error` is a str or None
+        and `cached` is True if `crf` comes from the cache.
+        Only the CRF values reaching the target are cached.
+        """
+        try:
+            fingerprint = media_fingerprint(filename)
+            cachename = crf_cachename(self.appdata['cachedir'], fingerprint)
+        except OSError as err:
+            return None, None, str(err), False
+
+        key = crf_cachekey(set_crf([tquality['video']], 'N')[0],
+                           tquality['filters'],
+                           tquality['ssim'], tuple(tquality['range']),
+                           self.params())
+        found = load_crf_cache(cachename, key)
+        if found and found[1] is not None:  # the target was reached
+            return found[0], found[1], None, True
+
+        tmpdir = os.path.join(self.appdata['cachedir'], 'crfsearch', 'tmp')
+        os.makedirs(tmpdir, mode=0o777, exist_ok=True)
+        positions = sample_positions(duration, CRFSearch.SAMPLES,
+                                     CRFSearch.LENGTH)
+        low, high = tquality['range']
+        best, bestssim = None, None
+        workers = min(CRFSearch.PROBES * len(positions), os.cpu_count() or 1)
+
+        with ThreadPoolExecutor(max_workers=workers) as pool:
+            while low <= high and not self.stopped:
+                jobs = {}
+                for crf in crf_candidates(low, high, CRFSearch.PROBES):
+                    jobs[crf] = [pool.submit(self.sample, filename, pos,
+                                             crf, tquality,
+                                             os.path.join(tmpdir,
+                                                          f'{fingerprint}_'
+                                                          f'{crf}_{n}.mkv'))
+                                 for n, pos in enumerate(positions)]
+                try:
+                    scores = {}
+                    for crf, futures in jobs.items():
+                        values = [fut.result() for fut in futures]
+                        scores[crf] = (None if None in values
+                                       else sum(values) / len(values))
+                except OSError as err:
+                    return None, None, str(err), False
+
+                if self.stopped:
+                    break
+                if all(val is None for val in scores.values()):
+                    return None, None, _('Unable to encode samples'), False
+                try:
+                    low, high, crf = narrow_crf_range(low, high, scores,
+                                                      tquality['ssim'])
+                except ValueError as err:  # a failed probe, don't guess
+                    return None, None, str(err), False
+                if crf is not None:
+                    best, bestssim = crf, round(scores[crf], 6)
+
+        if self.stopped:
+            return None, None, None, False
+
+        if best is None:  # keeps the CRF of the profile
+            return None, None, _('target SSIM {0} not reached').format(
+                tquality['ssim']), False
+        save_crf_cache(cachename, key, best, bestssim)
+        return best, bestssim, None, False
+    # ----------------------------------------------------------------#
+
+    def stop(self):
+        """
+        Kills all running processes and prevents new ones
+        """
+        with self.lock:
+            self.stopped = True
+            for proc in self.procs:
+                proc.kill()
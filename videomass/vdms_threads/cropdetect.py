@@ -0,0 +1,226 @@
+# -*- coding: UTF-8 -*-
+"""
+Name: cropdetect.py
+Porpose: Automatic crop detection by sampling windows in parallel
+Compatibility: Python3, wxPython Phoenix
+Author: Gianluca Pernigotto <jeanlucperni@gmail.com>
+Copyleft - 2024 Gianluca Pernigotto <jeanlucperni@gmail.com>
+license: GPL3
+Rev: Oct.19.2026
+Code checker: flake8, pylint
+
+This file is part of Videomass.
+
+   Videomass is free software: you can redistribute it and/or modify
+   it under the terms of the GNU General Public License as published by
+   the Free Software Foundation, either version 3 of the License, or
+   (at your option) any later version.
+
+   Videomass is distributed in the hope that it will be useful,
+   but WITHOUT ANY WARRANTY; without even the implied warranty of
+   MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+   GNU General Public License for more details.
+
+   You should have received a copy of the GNU General Public License
+   along with Videomass.  If not, see <http://www.gnu.org/licenses/>.
+"""
+import os
+from threading import Thread, Lock
+from concurrent.futures import ThreadPoolExecutor
+import subprocess
+import platform
+import wx
+from pubsub import pub
+from videomass.vdms_utils.utils import Popen, media_fingerprint
+from videomass.vdms_utils.crop_utils import (parse_cropdetect,
+                                             crop_consensus,
+                                             sample_positions,
+                                             crop_cachename,
+                                             load_crop_cache,
+                                             save_crop_cache,
+                                             )
+from videomass.vdms_io.make_filelog import logwrite
+if not platform.system() == 'Windows':
+    import shlex
+
+
+class CropDetector:
+    """
+    Detects the black borders of a video by running the FFmpeg
+    `cropdetect` filter on `windows` short windows of `length`
+    seconds spread across the file. Each window is a separate
+    FFmpeg process using input seeking (`-ss` before `-i`), so
+    that only a few seconds are decoded for each of them, and
+    the processes run in parallel. The rectangle found by most
+    windows is taken (see `crop_utils.crop_consensus`).
+
+    Results are cached in the `cropdetect` subfolder of the
+    cache directory, keyed by file fingerprint and detection
+    parameters.
+
+    USAGE:
+        >>> detector = CropDetector(logfile)
+        >>> rect, error, cached = detector.detect(filename, duration)
+        >>> detector.stop()  # from another thread, to abort it
+
+    """
+    WINDOWS = 6  # number of windows to sample
+    LENGTH = 2  # seconds to analyze for each window
+    LIMIT = 24  # cropdetect black threshold
+    ROUND = 2  # cropdetect width/height divisor
+
+    def __init__(self, logfile=None):
+        """
+        self.logfile: log pathname to write commands and errors to
+        self.procs: running FFmpeg processes
+        """
+        get = wx.GetApp()
+        self.appdata = get.appset
+        self.logfile = logfile
+        self.procs = []
+        self.lock = Lock()
+        self.stopped = False
+    # ----------------------------------------------------------------#
+
+    def params(self):
+        """
+        Returns the detection parameters as str,
+        used to validate the cached results.
+        """
+        return (f'windows={CropDetector.WINDOWS}:'
+                f'length={CropDetector.LENGTH}:'
+                f'limit={CropDetector.LIMIT}:round={CropDetector.ROUND}')
+    # ----------------------------------------------------------------#
+
+    def window(self, filename, seek):
+        """
+        Runs `cropdetect` on a single window starting at `seek`
+        seconds. Returns the detected rectangle or None.
+        Raise OSError if FFmpeg can't be executed.
+        """
+        cmd = (f'"{self.appdata["ffmpeg_cmd"]}" -hide_banner -nostats '
+               f'-loglevel info -ss {seek} -i "{filename}" '
+               f'-t {CropDetector.LENGTH} -map 0:v:0 -an -sn -dn '
+               f'-vf cropdetect=limit={CropDetector.LIMIT}:'
+               f'round={CropDetector.ROUND}:reset=0 -f null -'
+               )
+        if self.logfile:
+            logwrite(cmd, '', self.logfile)
+        if not platform.system() == 'Windows':
+            cmd = shlex.split(cmd)
+
+        with self.lock:
+            if self.stopped:
+                return None
+            proc = Popen(cmd,
+                         stdout=subprocess.DEVNULL,
+                         stderr=subprocess.PIPE,
+                         universal_newlines=True,
+                         encoding=self.appdata['encoding'],
+                         errors='replace',
+                         )
+            self.procs.append(proc)
+        with proc:
+            output = proc.communicate()[1]
+        with self.lock:
+            self.procs.remove(proc)
+        if proc.returncode and not self.stopped:
+            if self.logfile:
+                logwrite('', f'[VIDEOMASS]: cropdetect error on window '
+                             f'{seek}s:\n{output}', self.logfile)
+            return None
+        return parse_cropdetect(output)
+    # ----------------------------------------------------------------#
+
+    def detect(self, filename, duration):
+        """
+        Detects the crop rectangle of `filename` with
+        `duration` in milliseconds.
+
+        Returns a tuple (rect, error, cached) where `rect` is
+        a tuple of int (width, height, x, y) or None, `error`
+        is a str or None and `cached` is True if `rect` comes
+        from the cache.
+        """
+        try:
+            cachename = crop_cachename(self.appdata['cachedir'],
+                                       media_fingerprint(filename))
+        except OSError as err:
+            return None, str(err), False
+
+        rect = load_crop_cache(cachename, self.params())
+        if rect:
+            return rect, None, True
+
+        positions = sample_positions(duration, CropDetector.WINDOWS,
+                                     CropDetector.LENGTH)
+        workers = min(len(positions), os.cpu_count() or 1)
+        try:
+            with ThreadPoolExecutor(max_workers=workers) as pool:
+                rects = list(pool.map(lambda pos: self.window(filename, pos),
+                                      positions))
+        except OSError as err:
+            return None, str(err), False
+
+        if self.stopped:
+            return None, None, False
+
+        rect = crop_consensus(rects)
+        if not rect:
+            return None, _('No video area detected'), False
+
+        save_crop_cache(cachename, self.params(), rect)
+        return rect, None, False
+    # ----------------------------------------------------------------#
+
+    def stop(self):
+        """
+        Kills all running processes and prevents new ones
+        """
+        with self.lock:
+            self.stopped = True
+            for proc in self.procs:
+                proc.kill()
+# ------------------------------------------------------------------------
+
+
+class CropDetectThread(Thread):
+    """
+    Runs the crop detection of a single file in a separate
+    thread, to be used with the `PopupDialog` class which
+    is closed by the "RESULT_EVT" pub/sub topic at the end.
+
+    USAGE:
+        >>> thread = CropDetectThread(filename, duration, logfile)
+        >>> thread.join()
+        >>> rect, status = thread.data, thread.status
+
+    """
+    def __init__(self, filename, duration, logfile):
+        """
+        self.data: the detected rectangle, None otherwise
+        self.status: None if no errors, str(error) otherwise.
+        """
+        self.detector = CropDetector(logfile)
+        self.filename = filename
+        self.duration = duration
+        self.data = None
+        self.status = None
+        Thread.__init__(self)
+        self.start()
+    # ----------------------------------------------------------------#
+
+    def run(self):
+        """
+        Start thread
+        """
+        self.data, self.status = self.detector.detect(self.filename,
+                                                      self.duration)[:2]
+        wx.CallAfter(pub.sendMessage, "RESULT_EVT", status='')
+    # ----------------------------------------------------------------#
+
+    def stop(self):
+        """
+        Stops the detection
+        """
+        self.detector.stop()
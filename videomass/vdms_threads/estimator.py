@@ -0,0 +1,207 @@
+# -*- coding: UTF-8 -*-
+"""
+Name: estimator.py
+Porpose: Estimates the output size and time of a batch by sampling
+Compatibility: Python3, wxPython Phoenix
+Author: Gianluca Pernigotto <jeanlucperni@gmail.com>
+Copyleft - 2024 Gianluca Pernigotto <jeanlucperni@gmail.com>
+license: GPL3
+Rev: Oct.19.2026
+Code checker: flake8, pylint
+
+This file is part of Videomass.
+
+   Videomass is free software: you can redistribute it and/or modify
+   it under the terms of the GNU General Public License as published by
+   the Free Software Foundation, either version 3 of the License, or
+   (at your option) any later version.
+
+   Videomass is distributed in the hope that it will be useful,
+   but WITHOUT ANY WARRANTY; without even the implied warranty of
+   MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+   GNU General Public License for more details.
+
+   You should have received a copy of the GNU General Public License
+   along with Videomass.  If not, see <http://www.gnu.org/licenses/>.
+"""
+import os
+from threading import Thread
+import time
+import subprocess
+import platform
+import wx
+from pubsub import pub
+from videomass.vdms_utils.utils import Popen, time_to_integer
+from videomass.vdms_utils.crop_utils import sample_positions
+from videomass.vdms_utils.estimate_utils import pick_subset, extrapolate
+from videomass.vdms_io.make_filelog import make_log_template
+if not platform.system() == 'Windows':
+    import shlex
+
+
+class BatchEstimator(Thread):
+    """
+    Estimates the total output size and encoding time of a
+    batch (the list of dict given to `ffmpeg.FFmpeg`) before
+    running it. Up to `FILES` items are picked across the
+    batch and `POSITIONS` samples of `LENGTH` seconds are
+    encoded from each of them, running all the passes with
+    the exact args chosen. Samples are encoded one at a time,
+    as the batch itself, so that their speed is comparable.
+    The totals are extrapolated over the whole batch duration
+    (see `estimate_utils.extrapolate`).
+
+    The "ESTIMATE_EVT" pub/sub topic is sent with a progress
+    message during the sampling and with `end=True` and the
+    `estimate` dict at the end (None if it failed). Nothing
+    is sent after `stop`.
+
+    USAGE:
+        >>> thread = BatchEstimator(batchlist)
+        >>> thread.stop()  # to cancel it at any time
+
+    """
+    FILES = 3  # maximum number of files to sample
+    POSITIONS = 3  # samples taken from each file
+    LENGTH = 4  # seconds of each sample
+
+    def __init__(self, batchlist, concurrency=1):
+        """
+        self.batchlist: list of kwargs dict, one for each file
+        self.concurrency: files processed at the same time
+        """
+        get = wx.GetApp()
+        self.appdata = get.appset
+        self.batchlist = batchlist
+        self.concurrency = concurrency
+        self.stop_work_thread = False
+        self.proc = None
+        self.logf = make_log_template('estimate.log',
+                                      self.appdata['logdir'], mode="w")
+        self.tmpdir = os.path.join(self.appdata['cachedir'], 'estimate')
+        Thread.__init__(self, daemon=True)
+        self.start()
+    # ----------------------------------------------------------------#
+
+    def commands(self, kwa, seek, length, output):
+        """
+        Returns the list of commands (str) which encode the
+        sample of `length` seconds at `seek` seconds of the
+        `kwa` item to `output`, one for each pass.
+        """
+        nul = 'NUL' if platform.system() == 'Windows' else '/dev/null'
+        passes = [arg for arg in kwa['args'] if arg]
+        cmds = []
+        for num, args in enumerate(passes, 1):
+            if num < len(passes):
+                extra, dest = '', nul
+            elif kwa['type'] == 'Two pass EBU' and len(passes) > 1:
+                extra = f'-filter:a:{kwa["audiomap"][1]} {kwa["EBU"]}'
+                dest = f'"{output}"'
+            else:
+                extra, dest = kwa.get('volume', ''), f'"{output}"'
+            cmds.append(f'"{self.appdata["ffmpeg_cmd"]}" -y -hide_banner '
+                        f'-nostats -loglevel error -ss {seek} -t {length} '
+                        f'-i "{kwa["source"]}" {args} {extra} {dest}'
+                        )
+        return cmds
+    # ----------------------------------------------------------------#
+
+    def execute(self, cmd):
+        """
+        Runs `cmd`, returns True if successful.
+        Raise OSError if FFmpeg can't be executed.
+        """
+        with open(self.logf, "a", encoding='utf-8') as log:
+            log.write(f"{cmd}\n")
+        if not platform.system() == 'Windows':
+            cmd = shlex.split(cmd)
+        with Popen(cmd,
+                   stdout=subprocess.DEVNULL,
+                   stderr=subprocess.PIPE,
+                   universal_newlines=True,
+                   encoding=self.appdata['encoding'],
+                   errors='replace',
+                   ) as proc:
+            self.proc = proc
+            err = proc.communicate()[1]
+        self.proc = None
+        if proc.returncode and not self.stop_work_thread:
+            with open(self.logf, "a", encoding='utf-8') as log:
+                log.write(f"\n[VIDEOMASS] ERROR:\n{err}\n")
+        return proc.returncode == 0
+    # ----------------------------------------------------------------#
+
+    def sample(self, kwa, seek, length, output):
+        """
+        Encodes a single sample, returns a tuple
+        (seconds, size, elapsed), None on failures.
+        """
+        start = time.time()
+        for cmd in self.commands(kwa, seek, length, output):
+            if not self.execute(cmd) or self.stop_work_thread:
+                return None
+        elapsed = time.time() - start
+        try:
+            size = os.path.getsize(output)
+            os.remove(output)
+        except OSError:
+            return None
+        return length, size, elapsed
+    # ----------------------------------------------------------------#
+
+    def run(self):
+        """
+        Start thread
+        """
+        durations = [kwa['duration'] for kwa in self.batchlist]
+        subset = pick_subset(durations, BatchEstimator.FILES)
+        total = len(subset) * BatchEstimator.POSITIONS
+        samples, count = [], 0
+        os.makedirs(self.tmpdir, mode=0o777, exist_ok=True)
+        try:
+            for index in subset:
+                kwa = self.batchlist[index]
+                offset = 0
+                if kwa.get('start-time'):
+                    offset = time_to_integer(kwa['start-time'].split()[1])
+                length = min(BatchEstimator.LENGTH, kwa['duration'] / 1000)
+                positions = sample_positions(kwa['duration'],
+                                             BatchEstimator.POSITIONS,
+                                             BatchEstimator.LENGTH)
+                for pos in positions:
+                    count += 1
+                    wx.CallAfter(pub.sendMessage,
+                                 "ESTIMATE_EVT",
+                                 msg=_('Sampling {0}/{1}...'
+                                       ).format(count, total),
+                                 estimate=None,
+                                 end=False,
+                                 )
+                    ext = os.path.splitext(kwa['destination'])[1]
+                    output = os.path.join(self.tmpdir, f'sample{count}{ext}')
+                    result = self.sample(kwa, round(offset / 1000 + pos, 3),
+                                         round(length, 3), output)
+                    if self.stop_work_thread:
+                        return
+                    if result:
+                        samples.append(result)
+
+        except (OSError, FileNotFoundError) as err:
+            wx.CallAfter(pub.sendMessage, "ESTIMATE_EVT", msg=str(err),
+                         estimate=None, end=True)
+            return
+
+        estimate = extrapolate(samples, durations, self.concurrency)
+        msg = '' if estimate else _('Unable to estimate, see estimate.log')
+        wx.CallAfter(pub.sendMessage, "ESTIMATE_EVT", msg=msg,
+                     estimate=estimate, end=True)
+    # ----------------------------------------------------------------#
+
+    def stop(self):
+        """
+        Sets the stop work thread to terminate the process
+        """
+        self.stop_work_thread = True
+        if self.proc:
+            self.proc.kill()
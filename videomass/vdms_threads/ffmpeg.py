@@ -6,7 +6,7 @@ Compatibility: Python3, wxPython4 Phoenix
 Author: Gianluca Pernigotto <jeanlucperni@gmail.com>
 Copyleft - 2024 Gianluca Pernigotto <jeanlucperni@gmail.com>
 license: GPL3
-Rev: Apr.20.2024
+Rev: Oct.19.2026
 Code checker: flake8, pylint
 
 This file is part of Videomass.
@@ -24,13 +24,24 @@ This file is part of Videomass.
    You should have received a copy of the GNU General Public License
    along with Videomass.  If not, see <http://www.gnu.org/licenses/>.
 """
-from threading import Thread
+import os
+from threading import Thread, Condition
 import time
 import subprocess
 import platform
 import wx
 from pubsub import pub
 from videomass.vdms_utils.utils import Popen
+from videomass.vdms_utils.crop_utils import (crop_to_filter,
+                                             insert_crop_filter,
+                                             )
+from videomass.vdms_utils.crf_utils import has_crf, set_crf
+from videomass.vdms_utils.multiout_utils import (group_outputs,
+                                                 multi_output_args,
+                                                 )
+from videomass.vdms_threads.cropdetect import CropDetector
+from videomass.vdms_threads.crfsearch import CRFSearch
+from videomass.vdms_threads.quality import QualityVerifier
 from videomass.vdms_io.make_filelog import logwrite
 if not platform.system() == 'Windows':
     import shlex
@@ -244,21 +255,64 @@ def two_pass_ebu(*args, **kwa):
 # ----------------------------------------------------------------------
 
 
+def multi_output(*args, **kwa):
+    """
+    Command builder for multiple outputs of the same source
+    (see `multiout_utils.group_outputs`), `kwa['outputs']`
+    is the list of the grouped items.
+    """
+    cmd = ffmpeg_cmd_args()
+    outputs = kwa['outputs']
+    pass1 = (f'"{cmd["ffmpeg_cmd"]}" '
+             f'{cmd["ffmpeg-default-args"]} '
+             f'{kwa.get("pre-input-1", "")} '
+             f'{kwa["start-time"]} '
+             f'-i "{kwa["source"]}" '
+             f'{multi_output_args(outputs)}'
+             )
+    dests = '\n'.join(f'Destination: "{item["destination"]}"'
+                      for item in outputs)
+    last = args[0] + len(outputs) - 1
+    count1 = (f'File {args[0]}-{last}/{args[1]} - {len(outputs)} '
+              f'outputs decoding the source once\nSource: '
+              f'"{kwa["source"]}"\n{dests}')
+    stamp1 = f'{count1}\n\n[COMMAND]:\n{pass1}'
+
+    if not platform.system() == 'Windows':
+        pass1 = shlex.split(pass1)
+
+    return {'pass1': pass1, 'count1': count1, 'stamp1': stamp1}
+# ----------------------------------------------------------------------
+
+
 class FFmpeg(Thread):
     """
     This class performs a long processing task in a separate thread.
     It is able to pipe up to two FFmpeg subprocesses to execute
     tasks in succession using command concatenation.
 
+    One pass items with the same source and time range (e.g.
+    several presets queued for the same file) are encoded by
+    a single process with multiple outputs, which decodes the
+    source once. If that process fails, its items are encoded
+    again one at a time, so that a failing output does not
+    affect the others.
+
+    In feeding mode the items are appended while running (see
+    `append`), e.g. the downloads converted as they finish, and
+    the thread waits for them until `close` is called.
+
     NOTE capturing output in real-time (Windows, Unix):
     https://stackoverflow.com/questions/1388753/how-to-get-output-
     from-subprocess-popen-proc-stdout-readline-blocks-no-dat?rq=1
 
     """
-    def __init__(self, *args):
+    def __init__(self, *args, feeding=False):
         """
         Called from `long_processing_task.topic_thread`.
         Also see `main_frame.switch_to_processing`.
+        If `feeding` is True, more items can be appended
+        to the queue while running.
 
         """
         get = wx.GetApp()  # get data from bootstrap
@@ -268,6 +322,17 @@ class FFmpeg(Thread):
         self.logfile = args[0]  # log filename
         self.kwargs = args[1]  # it is a list of dictionaries
         self.nargs = len(self.kwargs)  # how many items...
+        self.jobs = []  # items (or groups of items) to process
+        self.feeding = feeding  # wait for the items appended
+        self.cond = Condition()  # guards `jobs` in feeding mode
+        self.cropdetector = CropDetector(self.logfile)
+        self.cropreport = []  # auto crop results for each file
+        self.crfsearch = CRFSearch(self.logfile)
+        self.crfreport = []  # target quality results for each file
+        if self.appdata['verify_quality']:
+            self.verifier = QualityVerifier(self.logfile)
+        else:
+            self.verifier = None
 
         Thread.__init__(self)
         self.start()
@@ -277,8 +342,55 @@ class FFmpeg(Thread):
         Run the separated thread.
         """
         filedone = []
-        for kwa in self.kwargs:
+        with self.cond:
+            for group in group_outputs(self.kwargs):
+                if len(group) == 1:
+                    self.jobs.append(self.kwargs[group[0]])
+                else:
+                    first = self.kwargs[group[0]]
+                    self.jobs.append(dict(first, type='Multi output',
+                                          outputs=[self.kwargs[n]
+                                                   for n in group]))
+        while True:
+            kwa = self.next_job()
+            if kwa is None:
+                break
             self.count += 1
+            if kwa['type'] == 'Multi output':
+                try:
+                    result = self.multi_output(kwa, filedone)
+                except (OSError, FileNotFoundError) as err:
+                    wx.CallAfter(pub.sendMessage,
+                                 "COUNT_EVT",
+                                 count=err,
+                                 duration=0,
+                                 end='ERROR'
+                                 )
+                    logwrite('', err, self.logfile)
+                    break
+                if result == 'stopped':
+                    wx.CallAfter(pub.sendMessage, "END_EVT",
+                                 filetotrash=None)
+                    return
+                if result == 'failed':  # isolate the failing outputs
+                    self.count -= 1
+                    with self.cond:
+                        self.jobs[0:0] = kwa['outputs']
+                continue
+
+            notes = []  # messages of the analysis before encoding
+            if kwa.get('autocrop'):
+                kwa, msg = self.auto_crop(kwa)
+                notes.append(msg)
+            if kwa.get('targetquality') and not self.stop_work_thread:
+                kwa, msg = self.target_crf(kwa)
+                notes.append(msg)
+            if self.stop_work_thread:
+                wx.CallAfter(pub.sendMessage, "END_EVT",
+                             filetotrash=None)
+                return
+
+            jobstart = time.time()
             if kwa['type'] == 'One pass':
                 model = simple_one_pass(self.count, self.nargs, **kwa)
 
@@ -300,6 +412,13 @@ class FFmpeg(Thread):
                          end='CONTINUE',
                          )
             logwrite(model['stamp1'], '', self.logfile)
+            for msg in notes:
+                wx.CallAfter(pub.sendMessage,
+                             "UPDATE_EVT",
+                             output=msg,
+                             duration=kwa['duration'],
+                             status=0,
+                             )
             try:
                 with Popen(model['pass1'],
                            stderr=subprocess.PIPE,
@@ -364,6 +483,7 @@ class FFmpeg(Thread):
             if proc1.wait() == 0:  # ..Finished
                 if not kwa["args"][1]:
                     filedone.append(kwa["source"])
+                    self.verify_output(kwa, jobstart)
                 wx.CallAfter(pub.sendMessage,
                              "COUNT_EVT",
                              count='',
@@ -447,18 +567,244 @@ class FFmpeg(Thread):
 
             if proc2.wait() == 0:  # ..Finished
                 filedone.append(kwa["source"])
+                self.verify_output(kwa, jobstart)
                 wx.CallAfter(pub.sendMessage,
                              "COUNT_EVT",
                              count='',
                              duration=kwa['duration'],
                              end='DONE'
                              )
+        if self.cropreport:
+            report = '\n'.join(self.cropreport)
+            wx.CallAfter(pub.sendMessage,
+                         "UPDATE_EVT",
+                         output=f'\n[VIDEOMASS]: Auto crop report:\n'
+                                f'{report}\n',
+                         duration=0,
+                         status=0,
+                         )
+        if self.crfreport:
+            report = '\n'.join(self.crfreport)
+            wx.CallAfter(pub.sendMessage,
+                         "UPDATE_EVT",
+                         output=f'\n[VIDEOMASS]: Target quality report:\n'
+                                f'{report}\n',
+                         duration=0,
+                         status=0,
+                         )
+        if self.verifier:
+            if self.verifier.futures:
+                wx.CallAfter(pub.sendMessage,
+                             "UPDATE_EVT",
+                             output='\n[VIDEOMASS]: Waiting for the quality '
+                                    'verification to complete...\n',
+                             duration=0,
+                             status=0,
+                             )
+            report = self.verifier.results()
+            if report and not self.stop_work_thread:
+                wx.CallAfter(pub.sendMessage,
+                             "QUALITY_REPORT_EVT",
+                             report=report,
+                             )
         time.sleep(.5)
         wx.CallAfter(pub.sendMessage, "END_EVT", filetotrash=filedone)
     # --------------------------------------------------------------------#
 
+    def next_job(self):
+        """
+        Returns the next item to process, None if there are
+        no more. In feeding mode waits for the items appended
+        until `close` is called or the thread is stopped.
+        """
+        with self.cond:
+            while self.feeding and not self.jobs and not self.stop_work_thread:
+                self.cond.wait()
+            return self.jobs.pop(0) if self.jobs else None
+    # --------------------------------------------------------------------#
+
+    def append(self, kwa):
+        """
+        Appends the `kwa` item to the queue in feeding mode.
+        Returns False if the thread no longer accepts items.
+        """
+        with self.cond:
+            if not self.feeding or self.stop_work_thread:
+                return False
+            self.kwargs.append(kwa)
+            self.nargs += 1
+            self.jobs.append(kwa)
+            self.cond.notify_all()
+        return True
+    # --------------------------------------------------------------------#
+
+    def close(self):
+        """
+        Ends the feeding mode, the thread terminates
+        once the items already appended are processed.
+        """
+        with self.cond:
+            self.feeding = False
+            self.cond.notify_all()
+    # --------------------------------------------------------------------#
+
+    def multi_output(self, kwa, filedone):
+        """
+        Encodes all the grouped outputs of `kwa` by a single
+        process. Returns 'done', 'failed' (the outputs must be
+        encoded one at a time) or 'stopped'.
+        Raise OSError if FFmpeg can't be executed.
+        """
+        jobstart = time.time()
+        model = multi_output(self.count, self.nargs, **kwa)
+        wx.CallAfter(pub.sendMessage,
+                     "COUNT_EVT",
+                     count=model['count1'],
+                     duration=kwa['duration'],
+                     end='CONTINUE',
+                     )
+        logwrite(model['stamp1'], '', self.logfile)
+        with Popen(model['pass1'],
+                   stderr=subprocess.PIPE,
+                   stdin=subprocess.PIPE,
+                   bufsize=1,
+                   universal_newlines=True,
+                   encoding=self.appdata['encoding'],
+                   ) as proc:
+            for line in proc.stderr:
+                wx.CallAfter(pub.sendMessage,
+                             "UPDATE_EVT",
+                             output=line,
+                             duration=kwa['duration'],
+                             status=0
+                             )
+                if self.stop_work_thread:
+                    proc.stdin.write('q')  # stop ffmpeg
+                    out = proc.communicate()[1]
+                    proc.wait()
+                    wx.CallAfter(pub.sendMessage,
+                                 "UPDATE_EVT",
+                                 output='STOP',
+                                 duration=kwa['duration'],
+                                 status=1,
+                                 )
+                    logwrite('', out, self.logfile)
+                    time.sleep(.5)
+                    return 'stopped'
+
+            if proc.wait():  # ..Failed
+                out = proc.communicate()[1]
+                msg = (f'[VIDEOMASS]: Error Exit Status: {proc.wait()}, '
+                       f'encoding the {len(kwa["outputs"])} outputs one '
+                       f'at a time...\n')
+                wx.CallAfter(pub.sendMessage,
+                             "UPDATE_EVT",
+                             output=msg,
+                             duration=kwa['duration'],
+                             status=0,
+                             )
+                logwrite('', f'{msg}{out}', self.logfile)
+                time.sleep(1)
+                return 'failed'
+
+        self.count += len(kwa['outputs']) - 1
+        filedone.append(kwa["source"])
+        for item in kwa['outputs']:
+            self.verify_output(item, jobstart)
+            wx.CallAfter(pub.sendMessage,
+                         "UPDATE_EVT",
+                         output=f'Done: "{item["destination"]}"\n',
+                         duration=kwa['duration'],
+                         status=0,
+                         )
+        wx.CallAfter(pub.sendMessage,
+                     "COUNT_EVT",
+                     count='',
+                     duration=kwa['duration'],
+                     end='DONE'
+                     )
+        return 'done'
+    # --------------------------------------------------------------------#
+
+    def verify_output(self, kwa, jobstart):
+        """
+        Submits the quality verification of the output of
+        `kwa` if enabled (see `quality.QualityVerifier`).
+        Outputs without video or with copied video stream
+        are skipped.
+        """
+        if not self.verifier or kwa.get('abr'):  # no streaming packages
+            return
+        args = kwa['args'][1] or kwa['args'][0]
+        if ('-vn' in args.split() or '-c:v copy' in args
+                or '-vcodec copy' in args):
+            return
+        self.verifier.submit(kwa, time.time() - jobstart)
+    # --------------------------------------------------------------------#
+
+    def auto_crop(self, kwa):
+        """
+        Detects the crop area of the current source (see
+        `cropdetect.CropDetector`) and inserts the crop filter
+        on the video filters of each pass. If nothing is
+        detected the args are left unchanged.
+        Returns a tuple (new kwa dict, report message).
+        """
+        rect, error, cached = self.cropdetector.detect(kwa['source'],
+                                                       kwa['duration'])
+        name = os.path.basename(kwa['source'])
+        if rect:
+            crop = crop_to_filter(rect)
+            kwa = dict(kwa, args=insert_crop_filter(kwa['args'], rect))
+            if kwa.get('targetquality'):  # samples must be cropped too
+                tquality = kwa['targetquality']
+                chain = ','.join(f for f in (f'crop={crop}',
+                                             tquality['filters']) if f)
+                kwa['targetquality'] = dict(tquality, filters=chain)
+            msg = f'{name}: crop={crop}{" (cached)" if cached else ""}'
+        else:
+            msg = f'{name}: {error or "not detected"}, crop not applied'
+        self.cropreport.append(msg)
+        logwrite('', f'[VIDEOMASS]: Auto crop: {msg}', self.logfile)
+        return kwa, f'[VIDEOMASS]: Auto crop: {msg}\n'
+    # --------------------------------------------------------------------#
+
+    def target_crf(self, kwa):
+        """
+        Searches the CRF value reaching the target quality
+        of the current source (see `crfsearch.CRFSearch`)
+        and sets it on each pass. If the args have no CRF
+        or the search fails they are left unchanged.
+        Returns a tuple (new kwa dict, report message).
+        """
+        tquality = kwa['targetquality']
+        name = os.path.basename(kwa['source'])
+        if not has_crf(kwa['args']):
+            msg = f'{name}: no CRF to adjust, target quality not applied'
+        else:
+            crf, ssim, error, cached = self.crfsearch.search(kwa['source'],
+                                                             kwa['duration'],
+                                                             tquality)
+            if crf is None:
+                msg = (f'{name}: {error or "stopped"}, '
+                       f'target quality not applied')
+            else:
+                kwa = dict(kwa, args=set_crf(kwa['args'], crf))
+                msg = f'{name}: CRF {crf} (SSIM {ssim:.4f})'
+                msg += ' (cached)' if cached else ''
+        self.crfreport.append(msg)
+        logwrite('', f'[VIDEOMASS]: Target quality: {msg}', self.logfile)
+        return kwa, f'[VIDEOMASS]: Target quality: {msg}\n'
+    # --------------------------------------------------------------------#
+
     def stop(self):
         """
         Sets the stop work thread to terminate the process
         """
-        self.stop_work_thread = True
+        with self.cond:
+            self.stop_work_thread = True
+            self.cond.notify_all()
+        self.cropdetector.stop()
+        self.crfsearch.stop()
+        if self.verifier:
+            self.verifier.stop()
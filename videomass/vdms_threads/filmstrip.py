@@ -0,0 +1,187 @@
+# -*- coding: UTF-8 -*-
+"""
+Name: filmstrip.py
+Porpose: Makes thumbnails tiles for the timeline editor
+Compatibility: Python3, wxPython Phoenix
+Author: Gianluca Pernigotto <jeanlucperni@gmail.com>
+Copyleft - 2024 Gianluca Pernigotto <jeanlucperni@gmail.com>
+license: GPL3
+Rev: Oct.19.2026
+Code checker: flake8, pylint
+
+This file is part of Videomass.
+
+   Videomass is free software: you can redistribute it and/or modify
+   it under the terms of the GNU General Public License as published by
+   the Free Software Foundation, either version 3 of the License, or
+   (at your option) any later version.
+
+   Videomass is distributed in the hope that it will be useful,
+   but WITHOUT ANY WARRANTY; without even the implied warranty of
+   MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+   GNU General Public License for more details.
+
+   You should have received a copy of the GNU General Public License
+   along with Videomass.  If not, see <http://www.gnu.org/licenses/>.
+"""
+import os
+from threading import Thread
+import subprocess
+import platform
+import wx
+from pubsub import pub
+from videomass.vdms_utils.utils import Popen
+from videomass.vdms_io.make_filelog import make_log_template
+if not platform.system() == 'Windows':
+    import shlex
+
+
+def filmstrip_cachename(cachedir, fingerprint, size, tiles):
+    """
+    Returns the pathname of the sprite sheet file for
+    the given source `fingerprint` (see `utils.media_fingerprint`),
+    tile `size` (width, height) and number of `tiles`.
+    The sprite sheet is a raw RGB24 file holding all the tiles
+    of the filmstrip one after the other.
+    """
+    dirname = os.path.join(cachedir, 'filmstrip')
+    os.makedirs(dirname, mode=0o777, exist_ok=True)
+    return os.path.join(dirname,
+                        f'{fingerprint}-{size[0]}x{size[1]}-{tiles}.rgb')
+# ----------------------------------------------------------------#
+
+
+def load_filmstrip(cachename, size, tiles):
+    """
+    Reads a previously saved sprite sheet file.
+    Returns a list of bytes objects (one for each tile),
+    None if the file does not exist or is incomplete.
+    """
+    tilebytes = size[0] * size[1] * 3
+    if not os.path.isfile(cachename):
+        return None
+    if os.path.getsize(cachename) != tilebytes * tiles:
+        return None
+    with open(cachename, 'rb') as sheet:
+        data = sheet.read()
+    return [data[i:i + tilebytes] for i in range(0, len(data), tilebytes)]
+# ----------------------------------------------------------------#
+
+
+class FilmstripThread(Thread):
+    """
+    This class represents a separate thread that makes a filmstrip
+    (a row of thumbnails tiles equally spaced in time) of a given
+    video file by a single FFmpeg process. Only keyframes are
+    decoded (`-skip_frame nokey`) and picked up by the `fps`
+    filter, then scaled to the tile size and piped to standard
+    output as raw RGB24 frames, so that very long videos are
+    handled quickly.
+
+    Each tile is sent to the caller as soon as it arrives using
+    the pub/sub "FILMSTRIP_EVT" topic, so that the filmstrip can
+    be drawn incrementally. At the end of the process the whole
+    sprite sheet is saved to `cachename` for later re-use.
+
+    USAGE:
+        >>> thread = FilmstripThread(filename, duration, fingerprint,
+                                     cachename, (75, 42), 12)
+        >>> thread.stop()  # to stop it before its end
+
+    """
+    def __init__(self, filename, duration, fingerprint,
+                 cachename, size, tiles):
+        """
+        Attributes defined here:
+
+        self.filename: source video pathname
+        self.duration: duration of the source in milliseconds,
+                       0 or None if unknown.
+        self.fingerprint: identifies the source on received
+                          messages (see `utils.media_fingerprint`).
+        self.cachename: pathname of the sprite sheet to write.
+        self.size: tile size as tuple(width, height)
+        self.tiles: number of tiles to make
+        self.status: None if no errors, str(error) otherwise.
+        """
+        get = wx.GetApp()
+        self.appdata = get.appset
+        self.stop_work_thread = False  # process terminate
+        self.filename = filename
+        self.duration = duration
+        self.fingerprint = fingerprint
+        self.cachename = cachename
+        self.size = size
+        self.tiles = tiles
+        self.status = None
+        self.logf = make_log_template('filmstrip.log',
+                                      self.appdata['logdir'], mode="w")
+        Thread.__init__(self)
+        self.start()
+    # ----------------------------------------------------------------#
+
+    def run(self):
+        """
+        Start thread
+        """
+        width, height = self.size
+        tilebytes = width * height * 3
+        seconds = (self.duration or 0) / 1000
+        # one tile per second if the duration is unknown
+        rate = self.tiles / seconds if seconds > 0 else 1
+        scale = (f'scale={width}:{height}:force_original_aspect_ratio='
+                 f'decrease,pad={width}:{height}:(ow-iw)/2:(oh-ih)/2')
+        cmd = (f'"{self.appdata["ffmpeg_cmd"]}" -hide_banner '
+               f'-loglevel error -skip_frame nokey -i "{self.filename}" '
+               f'-an -sn -dn -vf "fps={rate:.6f},{scale}" '
+               f'-frames:v {self.tiles} -f rawvideo -pix_fmt rgb24 -'
+               )
+        with open(self.logf, "a", encoding='utf-8') as log:
+            log.write(f"{cmd}\n")
+
+        if not platform.system() == 'Windows':
+            cmd = shlex.split(cmd)
+        sheet = []
+        try:
+            with Popen(cmd,
+                       stdout=subprocess.PIPE,
+                       stderr=subprocess.PIPE,
+                       ) as proc:
+                while len(sheet) < self.tiles:
+                    tile = proc.stdout.read(tilebytes)
+                    if len(tile) < tilebytes or self.stop_work_thread:
+                        break
+                    sheet.append(tile)
+                    wx.CallAfter(pub.sendMessage,
+                                 "FILMSTRIP_EVT",
+                                 fingerprint=self.fingerprint,
+                                 index=len(sheet) - 1,
+                                 tile=tile,
+                                 )
+                if self.stop_work_thread:
+                    proc.kill()
+                error = proc.communicate()[1]
+                if proc.returncode and not self.stop_work_thread:
+                    self.status = error.decode(self.appdata['encoding'],
+                                               errors='replace')
+
+        except (OSError, FileNotFoundError) as err:
+            self.status = str(err)
+
+        if self.status:
+            with open(self.logf, "a", encoding='utf-8') as logerr:
+                logerr.write(f"\n[FFMPEG] filmstrip ERRORS:\n"
+                             f"{self.status}\n")
+
+        elif sheet and not self.stop_work_thread:
+            # pads missing tiles (i.e. short videos) with the last one
+            sheet.extend([sheet[-1]] * (self.tiles - len(sheet)))
+            with open(self.cachename, 'wb') as spritesheet:
+                spritesheet.write(b''.join(sheet))
+    # ----------------------------------------------------------------#
+
+    def stop(self):
+        """
+        Sets the stop work thread to terminate the process
+        """
+        self.stop_work_thread = True
@@ -6,7 +6,7 @@ Compatibility: Python3, wxPython4 Phoenix
 Author: Gianluca Pernigotto <jeanlucperni@gmail.com>
 Copyleft - 2024 Gianluca Pernigotto <jeanlucperni@gmail.com>
 license: GPL3
-Rev: Feb.14.2022
+Rev: Oct.19.2026
 Code checker: flake8, pylint
 
 This file is part of Videomass.
@@ -24,20 +24,23 @@ This file is part of Videomass.
    You should have received a copy of the GNU General Public License
    along with Videomass.  If not, see <http://www.gnu.org/licenses/>.
 """
-import shutil
 import ssl
 import urllib.request
 from threading import Thread
 import requests
 import wx
 from pubsub import pub
+from videomass.vdms_utils.ratelimit_utils import (configure_bandwidth,
+                                                  UPDATE_WEIGHT,
+                                                  )
 
 
 class FileDownloading(Thread):
     """
     'FileDownloading' is a generic network download operation
     via `urllib.request`. It is used to download small files
-    and save them on filesystem.
+    and save them on filesystem, within a share of the bandwidth
+    limit of the app (see `ratelimit_utils.BandwidthScheduler`).
 
     """
 
@@ -67,10 +70,19 @@ class FileDownloading(Thread):
         context = ssl._create_unverified_context()
         headers = {'User-Agent': 'Mozilla/5.0'}
         page = urllib.request.Request(self.url, headers=headers)
+        appdata = wx.GetApp().appset
+        bandwidth = configure_bandwidth(appdata['ytdlp-ratelimit'],
+                                        appdata['ytdlp-ratelimit-schedule'])
+        bandwidth.join(self, UPDATE_WEIGHT)
         try:
             with urllib.request.urlopen(page, context=context) as \
                     response, open(self.filename, 'wb') as out_file:
-                shutil.copyfileobj(response, out_file)
+                while True:
+                    chunk = response.read(65536)
+                    if not chunk:
+                        break
+                    out_file.write(chunk)
+                    bandwidth.throttle(self, len(chunk))
 
             self.status = self.url, None
 
@@ -80,6 +92,9 @@ class FileDownloading(Thread):
         except urllib.error.URLError as error:
             self.status = None, error
 
+        finally:
+            bandwidth.leave(self)
+
         self.data = self.status
 
         wx.CallAfter(pub.sendMessage,
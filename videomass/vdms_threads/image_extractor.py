@@ -6,7 +6,7 @@ Compatibility: Python3, wxPython4 Phoenix (OS Unix-like only)
 Author: Gianluca Pernigotto <jeanlucperni@gmail.com>
 Copyleft - 2024 Gianluca Pernigotto <jeanlucperni@gmail.com>
 license: GPL3
-Rev: Apr.24.2024
+Rev: Oct.19.2026
 Code checker: flake8, pylint
 
 This file is part of Videomass.
@@ -24,13 +24,20 @@ This file is part of Videomass.
    You should have received a copy of the GNU General Public License
    along with Videomass.  If not, see <http://www.gnu.org/licenses/>.
 """
-from threading import Thread
+import os
+import re
+from threading import Thread, Lock
+from concurrent.futures import ThreadPoolExecutor
 import time
 import subprocess
 import platform
 import wx
 from pubsub import pub
-from videomass.vdms_utils.utils import Popen
+from videomass.vdms_utils.utils import (Popen,
+                                        frame_ranges,
+                                        time_to_integer,
+                                        integer_to_time,
+                                        )
 from videomass.vdms_io.make_filelog import logwrite
 if not platform.system() == 'Windows':
     import shlex
@@ -41,11 +48,24 @@ class PicturesFromVideo(Thread):
     This class represents a separate thread for running simple
     single processes to save video sequences as pictures.
 
+    When the `parallel` kwarg is given (frames extracted at a
+    constant rate), the time range is split into contiguous
+    sub-ranges of whole frames (see `utils.frame_ranges`),
+    each extracted by a separate process with input seeking
+    and its own `-start_number`, so that the output numbering
+    is the same as a single process. Up to `MAX_WORKERS`
+    processes are run, each with at least `MIN_LENGTH`
+    seconds to extract.
+
     NOTE capturing output in real-time (Windows, Unix):
 
     https://stackoverflow.com/questions/1388753/how-to-get-output-
     from-subprocess-popen-proc-stdout-readline-blocks-no-dat?rq=1
     """
+    MAX_WORKERS = 8  # maximum number of parallel processes
+    MIN_LENGTH = 10  # minimum seconds of each sub-range
+    TIME = re.compile(r'time=\s*(\d+:\d+:\d+\.\d+)')
+    FRAME = re.compile(r'frame=\s*(\d+)')
     # ------------------------------------------------------
 
     def __init__(self, *args, **kwargs):
@@ -64,14 +84,210 @@ class PicturesFromVideo(Thread):
         self.count = 0  # count first for loop
         self.logfile = args[0]  # log filename
         self.kwa = kwargs
+        self.procs = []  # running processes of the parallel mode
+        self.lock = Lock()
+        self.progress = {}  # index: (frames, milliseconds)
+        self.started = None
+        self.reported = 0
 
         Thread.__init__(self)
         self.start()  # self.run()
+    # --------------------------------------------------------------------#
+
+    def split_ranges(self):
+        """
+        Returns the list of sub-ranges to extract in parallel
+        (see `utils.frame_ranges`), a single item list if the
+        extraction is too short to be split.
+        """
+        start = 0
+        if self.kwa.get('start-time'):
+            start = time_to_integer(self.kwa['start-time'].split()[1])
+        workers = min(PicturesFromVideo.MAX_WORKERS, os.cpu_count() or 1,
+                      int(self.duration / 1000 // PicturesFromVideo.MIN_LENGTH)
+                      )
+        return frame_ranges(start, self.duration,
+                            self.kwa['parallel']['rate'], workers)
+    # --------------------------------------------------------------------#
+
+    def report(self, force=False):
+        """
+        Sends the progress of all the processes as a single
+        FFmpeg-like progress line, at most twice per second.
+        """
+        with self.lock:
+            now = time.time()
+            if not force and now - self.reported < 0.5:
+                return
+            self.reported = now
+            frames = sum(val[0] for val in self.progress.values())
+            msec = sum(val[1] for val in self.progress.values())
+        elapsed = now - self.started
+        speed = f'{msec / 1000 / elapsed:.2f}x' if elapsed > 0 else 'N/A'
+        wx.CallAfter(pub.sendMessage,
+                     "UPDATE_EVT",
+                     output=(f'frame={frames} time={integer_to_time(msec)} '
+                             f'speed={speed} processes={len(self.progress)}'),
+                     duration=self.duration,
+                     status=0,
+                     )
+    # --------------------------------------------------------------------#
+
+    def extract(self, index, cmd):
+        """
+        Runs the `index` process of the parallel mode and
+        updates its progress. Returns a tuple (returncode,
+        output) where `output` are the non-progress lines.
+        Raise OSError if FFmpeg can't be executed.
+        """
+        if not platform.system() == 'Windows':
+            cmd = shlex.split(cmd)
+        with self.lock:
+            if self.stop_work_thread:
+                return None, ''
+            proc = Popen(cmd,
+                         stderr=subprocess.PIPE,
+                         stdin=subprocess.PIPE,
+                         bufsize=1,
+                         universal_newlines=True,
+                         encoding=self.appdata['encoding'],
+                         )
+            self.procs.append(proc)
+        output = []
+        with proc:
+            for line in proc.stderr:
+                clock = PicturesFromVideo.TIME.search(line)
+                if clock:
+                    frame = PicturesFromVideo.FRAME.search(line)
+                    with self.lock:
+                        self.progress[index] = (
+                            int(frame.group(1)) if frame else 0,
+                            time_to_integer(clock.group(1)))
+                    self.report()
+                else:
+                    output.append(line)
+        with self.lock:
+            self.procs.remove(proc)
+        return proc.returncode, ''.join(output)
+    # --------------------------------------------------------------------#
+
+    def run_parallel(self, ranges):
+        """
+        Extracts the `ranges` sub-ranges by parallel processes.
+        """
+        par = self.kwa['parallel']
+        cmds = []
+        for seek, length, frames, number in ranges:
+            limit = f'-frames:v {frames} ' if frames else ''
+            cmds.append(f'"{self.appdata["ffmpeg_cmd"]}" '
+                        f'{self.appdata["ffmpeg-default-args"]} '
+                        f'{self.appdata["ffmpeg_loglev"]} '
+                        f'{self.kwa["pre-input-1"]} '
+                        f'-ss {seek} -t {length} '
+                        f'-i "{self.kwa["filename"]}" '
+                        f'{par["args"]} {limit}-start_number {number} '
+                        f'-y "{par["output"]}"'
+                        )
+        count1 = (f'File 1/1\nSource: "{self.fname}"\n'
+                  f'Destination: "{self.outputdir}"')
+        com = (f'{count1}\n\n[COMMAND]: {len(cmds)} parallel processes\n'
+               + '\n'.join(cmds))
+        wx.CallAfter(pub.sendMessage,
+                     "COUNT_EVT",
+                     count=count1,
+                     duration=self.duration,
+                     end='CONTINUE',
+                     )
+        logwrite(com, '', self.logfile)
+
+        self.started = time.time()
+        self.progress = {index: (0, 0) for index in range(len(cmds))}
+        try:
+            with ThreadPoolExecutor(max_workers=len(cmds)) as pool:
+                futures = [pool.submit(self.extract, index, cmd)
+                           for index, cmd in enumerate(cmds)]
+                results = [fut.result() for fut in futures]
+        except (OSError, FileNotFoundError) as err:
+            self.stop()  # halt the other processes
+            wx.CallAfter(pub.sendMessage,
+                         "COUNT_EVT",
+                         count=err,
+                         duration=0,
+                         end='ERROR',
+                         )
+            logwrite('', err, self.logfile)
+            time.sleep(.5)
+            wx.CallAfter(pub.sendMessage, "END_EVT", filetotrash=[])
+            return
+
+        for index, (ret, out) in enumerate(results, 1):
+            if out.strip():
+                logwrite('', f'[VIDEOMASS]: process {index}:\n{out}',
+                         self.logfile)
+        if self.stop_work_thread:
+            wx.CallAfter(pub.sendMessage,
+                         "UPDATE_EVT",
+                         output='STOP',
+                         duration=self.kwa['duration'],
+                         status=1,
+                         )
+            time.sleep(1)
+            wx.CallAfter(pub.sendMessage, "END_EVT", filetotrash=None)
+            return
+
+        errors = [ret for ret, out in results if ret]
+        if errors:
+            wx.CallAfter(pub.sendMessage,
+                         "UPDATE_EVT",
+                         output='FAILED',
+                         duration=self.kwa['duration'],
+                         status=errors[0],
+                         )
+            logwrite('', (f"[VIDEOMASS]: Error Exit Status: "
+                          f"{errors[0]}"), self.logfile)
+            time.sleep(1)
+            filedone = []
+        else:
+            self.report(force=True)
+            filedone = [self.fname]
+            wx.CallAfter(pub.sendMessage,
+                         "COUNT_EVT",
+                         count='',
+                         duration='',
+                         end='DONE'
+                         )
+        time.sleep(.5)
+        wx.CallAfter(pub.sendMessage, "END_EVT", filetotrash=filedone)
+    # --------------------------------------------------------------------#
+
+    def keep_palette(self, success):
+        """
+        Moves the GIF palette computed by the process to the
+        palettes cache on success, removes it otherwise, so
+        that incomplete palettes are never cached.
+        """
+        if not self.kwa.get('palette'):
+            return
+        tmpname, cachename = self.kwa['palette']
+        try:
+            if success:
+                os.replace(tmpname, cachename)
+            elif os.path.exists(tmpname):
+                os.remove(tmpname)
+        except OSError as err:
+            logwrite('', f'[VIDEOMASS]: {err}', self.logfile)
+    # --------------------------------------------------------------------#
 
     def run(self):
         """
         Subprocess initialize thread.
         """
+        if self.kwa.get('parallel'):
+            ranges = self.split_ranges()
+            if len(ranges) > 1:
+                self.run_parallel(ranges)
+                return
+
         filedone = []
         cmd = (f'"{self.appdata["ffmpeg_cmd"]}" '
                f'{self.kwa["start-time"]} '
@@ -122,6 +338,7 @@ class PicturesFromVideo(Thread):
                                      status=1,
                                      )
                         logwrite('', out, self.logfile)
+                        self.keep_palette(False)
                         time.sleep(1)
                         wx.CallAfter(pub.sendMessage, "END_EVT",
                                      filetotrash=None)
@@ -137,10 +354,12 @@ class PicturesFromVideo(Thread):
                                  )
                     logwrite('', (f"[VIDEOMASS]: Error Exit Status: "
                                   f"{proc.wait()} {out}"), self.logfile)
+                    self.keep_palette(False)
                     time.sleep(1)
 
                 else:  # Done
                     filedone.append(self.fname)
+                    self.keep_palette(True)
                     wx.CallAfter(pub.sendMessage,
                                  "COUNT_EVT",
                                  count='',
@@ -155,6 +374,7 @@ class PicturesFromVideo(Thread):
                          end='ERROR',
                          )
             logwrite('', err, self.logfile)
+            self.keep_palette(False)
 
         time.sleep(.5)
         wx.CallAfter(pub.sendMessage, "END_EVT", filetotrash=filedone)
@@ -162,6 +382,14 @@ class PicturesFromVideo(Thread):
 
     def stop(self):
         """
-        Sets the stop work thread to terminate the process
+        Sets the stop work thread to terminate the process,
+        all the processes of the parallel mode are stopped.
         """
-        self.stop_work_thread = True
+        with self.lock:
+            self.stop_work_thread = True
+            for proc in self.procs:
+                try:
+                    proc.stdin.write('q')  # stop ffmpeg
+                    proc.stdin.flush()
+                except (OSError, ValueError):
+                    proc.kill()
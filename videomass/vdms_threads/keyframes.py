@@ -0,0 +1,190 @@
+# -*- coding: UTF-8 -*-
+"""
+Name: keyframes.py
+Porpose: Builds keyframes and scene changes indexes in background
+Compatibility: Python3, wxPython Phoenix
+Author: Gianluca Pernigotto <jeanlucperni@gmail.com>
+Copyleft - 2024 Gianluca Pernigotto <jeanlucperni@gmail.com>
+license: GPL3
+Rev: Oct.19.2026
+Code checker: flake8, pylint
+
+This file is part of Videomass.
+
+   Videomass is free software: you can redistribute it and/or modify
+   it under the terms of the GNU General Public License as published by
+   the Free Software Foundation, either version 3 of the License, or
+   (at your option) any later version.
+
+   Videomass is distributed in the hope that it will be useful,
+   but WITHOUT ANY WARRANTY; without even the implied warranty of
+   MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+   GNU General Public License for more details.
+
+   You should have received a copy of the GNU General Public License
+   along with Videomass.  If not, see <http://www.gnu.org/licenses/>.
+"""
+import os
+from threading import Thread
+from queue import Queue
+import subprocess
+import platform
+import wx
+from pubsub import pub
+from videomass.vdms_utils.utils import Popen, media_fingerprint
+from videomass.vdms_utils.keyframe_utils import (SCENE_THRESHOLD,
+                                                 index_cachename,
+                                                 parse_keyframes,
+                                                 parse_scenes,
+                                                 write_index,
+                                                 )
+from videomass.vdms_io.make_filelog import make_log_template
+if not platform.system() == 'Windows':
+    import shlex
+
+
+class KeyframeIndexer(Thread):
+    """
+    This class represents a long-lived daemon thread which
+    builds the keyframes index (see `keyframe_utils`) of the
+    video files added by `add` one after the other, so that
+    importing files is never slowed down.
+
+    Keyframes are read from the packet flags by ffprobe, which
+    only demuxes the source without decoding anything. If the
+    `scene_index` option is enabled, scene changes scores are
+    also detected by FFmpeg on a downscaled copy of the video.
+
+    Indexes already in the cache directory are not built again.
+    When an index is ready, the "KEYFRAME_INDEX_EVT" pub/sub
+    topic is sent with the source filename and the index
+    pathname.
+
+    USAGE:
+        >>> indexer = KeyframeIndexer()
+        >>> indexer.add(filename)
+        >>> indexer.stop()  # at the end
+
+    """
+    def __init__(self):
+        """
+        self.queue: the pending filenames
+        self.proc: the running subprocess if any
+        """
+        get = wx.GetApp()
+        self.appdata = get.appset
+        self.stop_work_thread = False  # process terminate
+        self.queue = Queue()
+        self.proc = None
+        self.logf = make_log_template('keyframes.log',
+                                      self.appdata['logdir'], mode="w")
+        Thread.__init__(self, daemon=True)
+        self.start()
+    # ----------------------------------------------------------------#
+
+    def add(self, filename):
+        """
+        Adds `filename` to the queue of files to index
+        """
+        self.queue.put(filename)
+    # ----------------------------------------------------------------#
+
+    def run(self):
+        """
+        Start thread
+        """
+        while not self.stop_work_thread:
+            filename = self.queue.get()
+            if filename is None:  # sentinel by `stop`
+                break
+            try:
+                cachename = index_cachename(self.appdata['cachedir'],
+                                            media_fingerprint(filename))
+            except OSError as err:
+                self.logerror(filename, str(err))
+                continue
+            if os.path.isfile(cachename):
+                continue
+            self.make_index(filename, cachename)
+    # ----------------------------------------------------------------#
+
+    def execute(self, cmd):
+        """
+        Runs `cmd` and returns a tuple (stdout, stderr, returncode).
+        Raise OSError if the executable can't be run.
+        """
+        with open(self.logf, "a", encoding='utf-8') as log:
+            log.write(f"{cmd}\n")
+        if not platform.system() == 'Windows':
+            cmd = shlex.split(cmd)
+        with Popen(cmd,
+                   stdout=subprocess.PIPE,
+                   stderr=subprocess.PIPE,
+                   universal_newlines=True,
+                   encoding=self.appdata['encoding'],
+                   errors='replace',
+                   ) as proc:
+            self.proc = proc
+            out, err = proc.communicate()
+        self.proc = None
+        return out, err, proc.returncode
+    # ----------------------------------------------------------------#
+
+    def make_index(self, filename, cachename):
+        """
+        Builds and writes the index of `filename`
+        """
+        probe = (f'"{self.appdata["ffprobe_cmd"]}" -v error '
+                 f'-select_streams v:0 -show_entries packet=pts_time,flags '
+                 f'-of csv=print_section=0 "{filename}"'
+                 )
+        scenes = (f'"{self.appdata["ffmpeg_cmd"]}" -hide_banner -nostats '
+                  f'-loglevel info -i "{filename}" -map 0:v:0 -an -sn -dn '
+                  f'-vf "scale=160:-2,select=\'gt(scene,{SCENE_THRESHOLD})\''
+                  f',metadata=print" -f null -'
+                  )
+        try:
+            out, err, ret = self.execute(probe)
+            if ret or self.stop_work_thread:
+                self.logerror(filename, err)
+                return
+            keyframes = parse_keyframes(out)
+            cuts, scores = (), ()
+            if self.appdata.get('scene_index'):
+                err, ret = self.execute(scenes)[1:]
+                if ret or self.stop_work_thread:
+                    self.logerror(filename, err)
+                    return
+                cuts, scores = parse_scenes(err)
+
+        except (OSError, FileNotFoundError) as error:
+            self.logerror(filename, str(error))
+            return
+
+        write_index(cachename, keyframes, cuts, scores)
+        wx.CallAfter(pub.sendMessage,
+                     "KEYFRAME_INDEX_EVT",
+                     filename=filename,
+                     cachename=cachename,
+                     )
+    # ----------------------------------------------------------------#
+
+    def logerror(self, filename, error):
+        """
+        Writes errors to the log file
+        """
+        if self.stop_work_thread:
+            return
+        with open(self.logf, "a", encoding='utf-8') as logerr:
+            logerr.write(f"\n[VIDEOMASS] keyframes index ERRORS on "
+                         f"\"{filename}\":\n{error}\n")
+    # ----------------------------------------------------------------#
+
+    def stop(self):
+        """
+        Sets the stop work thread to terminate the process
+        """
+        self.stop_work_thread = True
+        self.queue.put(None)
+        if self.proc:
+            self.proc.kill()
@@ -0,0 +1,196 @@
+# -*- coding: UTF-8 -*-
+"""
+Name: quality.py
+Porpose: Objective quality verification of the encoded outputs
+Compatibility: Python3, wxPython Phoenix
+Author: Gianluca Pernigotto <jeanlucperni@gmail.com>
+Copyleft - 2024 Gianluca Pernigotto <jeanlucperni@gmail.com>
+license: GPL3
+Rev: Oct.19.2026
+Code checker: flake8, pylint
+
+This file is part of Videomass.
+
+   Videomass is free software: you can redistribute it and/or modify
+   it under the terms of the GNU General Public License as published by
+   the Free Software Foundation, either version 3 of the License, or
+   (at your option) any later version.
+
+   Videomass is distributed in the hope that it will be useful,
+   but WITHOUT ANY WARRANTY; without even the implied warranty of
+   MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+   GNU General Public License for more details.
+
+   You should have received a copy of the GNU General Public License
+   along with Videomass.  If not, see <http://www.gnu.org/licenses/>.
+"""
+import os
+from threading import Lock
+from concurrent.futures import ThreadPoolExecutor
+import subprocess
+import platform
+import wx
+from videomass.vdms_utils.utils import Popen
+from videomass.vdms_utils.quality_utils import (quality_command,
+                                                parse_quality,
+                                                )
+from videomass.vdms_io.make_filelog import logwrite
+if not platform.system() == 'Windows':
+    import shlex
+
+
+def has_libvmaf(ffmpeg_cmd):
+    """
+    Returns True if the given FFmpeg executable
+    provides the `libvmaf` filter.
+    """
+    cmd = f'"{ffmpeg_cmd}" -hide_banner -filters'
+    if not platform.system() == 'Windows':
+        cmd = shlex.split(cmd)
+    try:
+        with Popen(cmd,
+                   stdout=subprocess.PIPE,
+                   stderr=subprocess.DEVNULL,
+                   universal_newlines=True,
+                   errors='replace',
+                   ) as proc:
+            out = proc.communicate()[0]
+    except OSError:
+        return False
+    return ' libvmaf ' in out
+# ------------------------------------------------------------------------
+
+
+class QualityVerifier:
+    """
+    Compares each encoded output with its source using the
+    FFmpeg `ssim` and `psnr` filters (and `libvmaf` if enabled
+    and available) in a single decoding pass. The source goes
+    through the video filters of the encode first; outputs
+    with other frames than their source are not compared.
+
+    Verifications are submitted as soon as each encoding is
+    finished and run on a small pool of worker threads, each
+    driving an FFmpeg process, so they overlap with the next
+    encodings. Set `verify_subsample` in the app settings to
+    analyze only one frame every N to bound the cost.
+
+    USAGE:
+        >>> verifier = QualityVerifier(logfile)
+        >>> verifier.submit(kwa, enctime)  # for each encoded file
+        >>> report = verifier.results()  # blocks until all are done
+        >>> verifier.stop()  # from another thread, to abort it
+
+    """
+    WORKERS = 2  # concurrent verifications
+    VMAF = None  # libvmaf availability, detected on first use
+
+    def __init__(self, logfile):
+        """
+        self.futures: the submitted verifications
+        self.procs: running FFmpeg processes
+        """
+        get = wx.GetApp()
+        self.appdata = get.appset
+        self.logfile = logfile
+        self.lock = Lock()
+        self.procs = []
+        self.futures = []
+        self.stopped = False
+        self.pool = ThreadPoolExecutor(max_workers=QualityVerifier.WORKERS)
+        if self.appdata['verify_vmaf'] and QualityVerifier.VMAF is None:
+            QualityVerifier.VMAF = has_libvmaf(self.appdata['ffmpeg_cmd'])
+    # ----------------------------------------------------------------#
+
+    def submit(self, kwa, enctime):
+        """
+        Queues the verification of the output of the `kwa`
+        task (see `ffmpeg.FFmpeg`) which took `enctime` seconds.
+        """
+        self.futures.append(self.pool.submit(self.verify, kwa, enctime))
+    # ----------------------------------------------------------------#
+
+    def verify(self, kwa, enctime):
+        """
+        Runs the verification of a single output file.
+        Returns a dict of data (see `quality_utils.COLUMNS`).
+        """
+        dest = kwa['destination']
+        item = {'source': kwa['source'], 'destination': dest,
+                'size': None, 'enctime': round(enctime, 2),
+                'ssim': None, 'psnr': None, 'vmaf': None,
+                'status': 'OK'}
+        try:
+            item['size'] = os.path.getsize(dest)
+        except OSError as err:
+            item['status'] = str(err)
+            return item
+
+        vmaf = bool(self.appdata['verify_vmaf'] and QualityVerifier.VMAF)
+        cmd = quality_command(self.appdata['ffmpeg_cmd'], kwa,
+                              self.appdata['verify_subsample'], vmaf)
+        if cmd is None:  # the frames of the source can't be matched
+            item['status'] = 'Not comparable'
+            logwrite('', f'[VIDEOMASS]: Quality verification skipped, '
+                         f'the frame rate or count of "{dest}" differs '
+                         f'from its source', self.logfile)
+            return item
+        logwrite(f'\n[VIDEOMASS]: Quality verification:\n{cmd}',
+                 '', self.logfile)
+        if not platform.system() == 'Windows':
+            cmd = shlex.split(cmd)
+
+        with self.lock:
+            if self.stopped:
+                item['status'] = 'Stopped'
+                return item
+            try:
+                proc = Popen(cmd,
+                             stdout=subprocess.DEVNULL,
+                             stderr=subprocess.PIPE,
+                             universal_newlines=True,
+                             encoding=self.appdata['encoding'],
+                             errors='replace',
+                             )
+            except OSError as err:
+                item['status'] = str(err)
+                return item
+            self.procs.append(proc)
+        with proc:
+            output = proc.communicate()[1]
+        with self.lock:
+            self.procs.remove(proc)
+
+        if self.stopped:
+            item['status'] = 'Stopped'
+        elif proc.returncode:
+            item['status'] = 'Failed'
+            logwrite('', f'[VIDEOMASS]: Quality verification error on '
+                         f'"{dest}":\n{output}', self.logfile)
+        else:
+            item.update(parse_quality(output))
+        return item
+    # ----------------------------------------------------------------#
+
+    def results(self):
+        """
+        Waits for all verifications to end and returns
+        their data as list of dict in submission order.
+        """
+        report = [future.result() for future in self.futures
+                  if not future.cancelled()]
+        self.pool.shutdown()
+        return report
+    # ----------------------------------------------------------------#
+
+    def stop(self):
+        """
+        Kills all running processes and cancels the pending ones
+        """
+        with self.lock:
+            self.stopped = True
+            for proc in self.procs:
+                proc.kill()
+        for future in self.futures:
+            future.cancel()
+        self.pool.shutdown(wait=False)
@@ -6,7 +6,7 @@ Compatibility: Python3, wxPython4 Phoenix
 Author: Gianluca Pernigotto <jeanlucperni@gmail.com>
 Copyleft - 2024 Gianluca Pernigotto <jeanlucperni@gmail.com>
 license: GPL3
-Rev: Mar.08.2024
+Rev: Oct.19.2026
 Code checker: flake8, pylint
 
 This file is part of Videomass.
@@ -25,163 +25,111 @@ This file is part of Videomass.
    along with Videomass.  If not, see <http://www.gnu.org/licenses/>.
 """
 import os
+import shutil
 import tempfile
-from threading import Thread
+from threading import Thread, Lock
+from concurrent.futures import ThreadPoolExecutor
 import time
 import subprocess
 import platform
 import wx
 from pubsub import pub
-from videomass.vdms_utils.utils import Popen
+from videomass.vdms_utils.utils import Popen, format_bytes, ffconcat_list
 from videomass.vdms_io.make_filelog import logwrite
 if not platform.system() == 'Windows':
     import shlex
 
+TMP_RESERVE = 512 * 1024 * 1024  # bytes to leave free for temporary files
 
-def convert_images(*varargs, **kwargs):
+
+def convert_image(src, dest, resize, **kwargs):
     """
-    Convert images to PNG format and assign
-    progressive digits to them.
+    Converts the `src` image to a lossless PNG `dest` file,
+    applying the optional `resize` video filters. PNG files
+    are written as RGB24, the same pixel format of the former
+    BMP files whatever the source, with the fastest compression
+    level, which takes a fraction of the disk space of
+    uncompressed bitmaps at a low cost.
+    Returns None if successful, the error message otherwise.
+    Raise OSError if FFmpeg can't be executed.
     """
-    flist = varargs[0]
-    tmpdir = varargs[1]
-    logname = varargs[2]
-    imagenames = varargs[3]
-
-    count1 = (f'Preparing temporary files...\nSource: Imported file list\n'
-              f'Destination: "{tmpdir}"\n')
-    wx.CallAfter(pub.sendMessage,
-                 "COUNT_EVT",
-                 count=count1,
-                 duration=len(flist),
-                 end='CONTINUE',
-                 )
-    prognum = 0
-    args = (f'"{kwargs["ffmpeg_cmd"]}" '
-            f'{kwargs["ffmpeg-default-args"]} '
-            f'{kwargs["ffmpeg_loglev"]} ')
-    logwrite(f'Preparing temporary files...\n'
-             f'\n[COMMAND:]\n{args}', '', logname)
-
-    for files in flist:
-        prognum += 1
-        tmpf = os.path.join(tmpdir, f'{imagenames}{prognum}.bmp')
-        cmd_1 = f'{args} -i "{files}" "{tmpf}"'
-
-        if not platform.system() == 'Windows':
-            cmd_1 = shlex.split(cmd_1)
-        try:
-            with Popen(cmd_1,
-                       stderr=subprocess.PIPE,
-                       bufsize=1,
-                       universal_newlines=True,
-                       encoding=kwargs['encoding'],
-                       ) as proc1:
-                error = proc1.communicate()[1]
-
-            if proc1.returncode:  # ffmpeg error
-                if error:
-                    wx.CallAfter(pub.sendMessage,
-                                 "UPDATE_EVT",
-                                 output='FAILED',
-                                 duration=0,
-                                 status=proc1.wait(),
-                                 )
-                    logwrite('', (f"[VIDEOMASS]: Error Exit Status: "
-                                  f"{proc1.wait()} {error}"), logname)
-                    time.sleep(1)
-                    return error
-
-            else:  # ok
-                wx.CallAfter(pub.sendMessage,
-                             "UPDATE_EVT",
-                             output=f' |{prognum}|  {files}  >  {tmpf}\n',
-                             duration=0,
-                             status=0,
-                             )
-        except (OSError, FileNotFoundError) as err:  # cmd not found
-            wx.CallAfter(pub.sendMessage,
-                         "COUNT_EVT",
-                         count=err,
-                         duration=0,
-                         end='ERROR',
-                         )
-            return err
-
-    time.sleep(.5)
-    wx.CallAfter(pub.sendMessage,
-                 "COUNT_EVT",
-                 count='',
-                 duration=0,
-                 end='DONE'
-                 )
-    return None
-
-
-def resizing_process(*varargs, **kwargs):
+    cmd = (f'"{kwargs["ffmpeg_cmd"]}" -y -hide_banner -nostats '
+           f'{kwargs["ffmpeg_loglev"]} -i "{src}" {resize} '
+           f'-frames:v 1 -pix_fmt rgb24 -compression_level 1 "{dest}"'
+           )
+    if not platform.system() == 'Windows':
+        cmd = shlex.split(cmd)
+    with Popen(cmd,
+               stderr=subprocess.PIPE,
+               universal_newlines=True,
+               encoding=kwargs['encoding'],
+               errors='replace',
+               ) as proc:
+        error = proc.communicate()[1]
+    return error if proc.returncode else None
+# ------------------------------------------------------------------------
+
+
+def prepare_images(*varargs, **kwargs):
     """
-    After the images have been converted to the required format,
-    this process performs the resizing using ffmpeg filters.
-    This is a necessary workaround for proper video playback.
+    Converts and resizes all the images to the temporary
+    directory on a pool of worker threads, one FFmpeg process
+    for each image, assigning them progressive digits (see
+    `convert_image`).
+
+    The temporary disk usage is bounded: the preparation
+    fails if the written files would leave less than
+    `TMP_RESERVE` bytes free on the temporary file system.
+    The temporary files size is reported at the end.
+
+    varargs: file list, temporary dir, log pathname, resize
+             filters (str), a callable returning True to stop.
+    Returns None if successful, the error otherwise.
     """
-    flist = varargs[0]
-    tmpdir = varargs[1]
-    cmdargs = varargs[2]
-    logname = varargs[3]
-
-    count1 = (f'\n\nFile resizing...\nSource: Temporary directory\n'
-              f'Destination: "{tmpdir}"')
-
+    flist, tmpdir, logname, resize, stopped = varargs
+    count1 = (f'Preparing temporary files...\nSource: Imported file list\n'
+              f'Destination: "{tmpdir}"\n')
     wx.CallAfter(pub.sendMessage,
                  "COUNT_EVT",
                  count=count1,
                  duration=len(flist),
                  end='CONTINUE',
                  )
-
-    tmpf = os.path.join(tmpdir, 'TMP_%d.bmp')
-    tmpfout = os.path.join(tmpdir, 'IMAGE_%d.bmp')
-    cmd_1 = (f'"{kwargs["ffmpeg_cmd"]}" '
-             f'{kwargs["ffmpeg-default-args"]} '
-             f'{kwargs["ffmpeg_loglev"]} '
-             f'-i "{tmpf}" {cmdargs} "{tmpfout}"'
-             )
-    logwrite(f'\nFile resizing...\n\n[COMMAND]:\n{cmd_1}', '', logname)
-
-    if not platform.system() == 'Windows':
-        cmd_1 = shlex.split(cmd_1)
-    try:
-        with Popen(cmd_1,
-                   stderr=subprocess.PIPE,
-                   bufsize=1,
-                   universal_newlines=True,
-                   encoding=kwargs['encoding'],
-                   ) as proc1:
-            error = proc1.communicate()[1]
-
-        if proc1.returncode:  # ffmpeg error
+    logwrite(f'Preparing temporary files...\n\n[COMMAND:]\n'
+             f'"{kwargs["ffmpeg_cmd"]}" -i "SOURCE" {resize} '
+             f'-frames:v 1 -pix_fmt rgb24 -compression_level 1 '
+             f'"IMAGE_N.png"', '', logname)
+
+    budget = shutil.disk_usage(tmpdir).free - TMP_RESERVE
+    lock = Lock()
+    state = {'used': 0, 'failed': False}
+
+    def task(prognum, src):
+        if stopped() or state['failed']:
+            return None
+        tmpf = os.path.join(tmpdir, f'IMAGE_{prognum}.png')
+        error = convert_image(src, tmpf, resize, **kwargs)
+        with lock:
+            if not error:
+                state['used'] += os.path.getsize(tmpf)
+                if state['used'] > budget:
+                    error = (f'Not enough temporary disk space on "{tmpdir}"'
+                             f' ({format_bytes(float(state["used"]))} used)')
             if error:
-                wx.CallAfter(pub.sendMessage,
-                             "UPDATE_EVT",
-                             output='FAILED',
-                             duration=0,
-                             status=proc1.wait(),
-                             )
-                logwrite('', (f"[VIDEOMASS]: Error Exit Status: "
-                              f"{proc1.wait()} {error}"), logname)
-                time.sleep(1)
+                state['failed'] = True
                 return error
+        wx.CallAfter(pub.sendMessage,
+                     "UPDATE_EVT",
+                     output=f' |{prognum}|  {src}  >  {tmpf}\n',
+                     duration=0,
+                     status=0,
+                     )
+        return None
 
-        else:  # ok
-            wx.CallAfter(pub.sendMessage,
-                         "UPDATE_EVT",
-                         output='',
-                         duration=0,
-                         status=0,
-                         )
-            logwrite('', error, logname)
-            time.sleep(1)
-
+    try:
+        with ThreadPoolExecutor(max_workers=os.cpu_count() or 1) as pool:
+            results = list(pool.map(task, range(1, len(flist) + 1), flist))
+        error = next((err for err in results if err), None)
     except (OSError, FileNotFoundError) as err:  # cmd not found
         wx.CallAfter(pub.sendMessage,
                      "COUNT_EVT",
@@ -191,6 +139,29 @@ def resizing_process(*varargs, **kwargs):
                      )
         return err
 
+    if error:
+        wx.CallAfter(pub.sendMessage,
+                     "UPDATE_EVT",
+                     output='FAILED',
+                     duration=0,
+                     status=1,
+                     )
+        logwrite('', f"[VIDEOMASS]: Error: {error}", logname)
+        time.sleep(1)
+        return error
+
+    if stopped():
+        return 'STOP'
+
+    report = (f'\n[VIDEOMASS]: Temporary files: {len(flist)} images, '
+              f'{format_bytes(float(state["used"]))}\n')
+    wx.CallAfter(pub.sendMessage,
+                 "UPDATE_EVT",
+                 output=report,
+                 duration=0,
+                 status=0,
+                 )
+    logwrite('', report, logname)
     time.sleep(.5)
     wx.CallAfter(pub.sendMessage,
                  "COUNT_EVT",
@@ -206,6 +177,12 @@ class SlideshowMaker(Thread):
     Represents the ffmpeg subprocess to produce a video in
     mkv format from a sequence of images already converted
     and resized in a temporary context.
+
+    If the `ffconcat` keyword argument is given (the list of
+    durations in seconds of each image), the original images
+    are read directly by the concat demuxer through an ffconcat
+    list instead, and scaling/padding must be done by the
+    filters of `args`: no images are written to disk.
     """
 
     def __init__(self, *args, **kwargs):
@@ -231,34 +208,24 @@ class SlideshowMaker(Thread):
         """
         Subprocess initialize thread.
         """
-        imgtmpnames = 'TMP_' if self.kwa["resize"] else 'IMAGE_'
         filedone = []
         with tempfile.TemporaryDirectory() as tempdir:  # make tmp dir
-            tmpproc1 = convert_images(self.kwa['source'],
-                                      tempdir,
-                                      self.logfile,
-                                      imgtmpnames,
-                                      **self.appdata,
-                                      )
-            if tmpproc1 is not None or self.stop_work_thread:
-                wx.CallAfter(pub.sendMessage,
-                             "UPDATE_EVT",
-                             output='ERROR',
-                             duration=self.kwa['duration'],
-                             status=1,
-                             )
-                self.end_process(None)
-                return
-
-            if imgtmpnames == 'TMP_':
-                tmpproc2 = resizing_process(self.kwa['source'],
-                                            tempdir,
-                                            self.kwa["resize"],
-                                            self.logfile,
-                                            **self.appdata,
-                                            )
-
-                if tmpproc2 is not None or self.stop_work_thread:
+            if self.kwa.get('ffconcat'):  # streaming from the sources
+                tmpgroup = os.path.join(tempdir, 'slideshow.ffconcat')
+                with open(tmpgroup, 'w', encoding='utf-8') as fconcat:
+                    fconcat.write(ffconcat_list(self.kwa['source'],
+                                                self.kwa['ffconcat']))
+                logwrite(f'Image list for the concat demuxer:\n'
+                         f'{tmpgroup}\n', '', self.logfile)
+            else:
+                tmpproc = prepare_images(self.kwa['source'],
+                                         tempdir,
+                                         self.logfile,
+                                         self.kwa["resize"],
+                                         lambda: self.stop_work_thread,
+                                         **self.appdata,
+                                         )
+                if tmpproc is not None or self.stop_work_thread:
                     wx.CallAfter(pub.sendMessage,
                                  "UPDATE_EVT",
                                  output='ERROR',
@@ -267,9 +234,9 @@ class SlideshowMaker(Thread):
                                  )
                     self.end_process(None)
                     return
+                tmpgroup = os.path.join(tempdir, 'IMAGE_%d.png')
 
             # ------------------------------- make video
-            tmpgroup = os.path.join(tempdir, 'IMAGE_%d.bmp')
             cmd_2 = (f'"{self.appdata["ffmpeg_cmd"]}" '
                      f'{self.appdata["ffmpeg-default-args"]} '
                      f'{self.appdata["ffmpeg_loglev"]} '
@@ -0,0 +1,145 @@
+# -*- coding: UTF-8 -*-
+"""
+Name: waveform.py
+Porpose: Makes audio peaks files for the timeline editor
+Compatibility: Python3, wxPython Phoenix
+Author: Gianluca Pernigotto <jeanlucperni@gmail.com>
+Copyleft - 2024 Gianluca Pernigotto <jeanlucperni@gmail.com>
+license: GPL3
+Rev: Oct.19.2026
+Code checker: flake8, pylint
+
+This file is part of Videomass.
+
+   Videomass is free software: you can redistribute it and/or modify
+   it under the terms of the GNU General Public License as published by
+   the Free Software Foundation, either version 3 of the License, or
+   (at your option) any later version.
+
+   Videomass is distributed in the hope that it will be useful,
+   but WITHOUT ANY WARRANTY; without even the implied warranty of
+   MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+   GNU General Public License for more details.
+
+   You should have received a copy of the GNU General Public License
+   along with Videomass.  If not, see <http://www.gnu.org/licenses/>.
+"""
+import sys
+from threading import Thread
+import subprocess
+import platform
+from array import array
+import wx
+from pubsub import pub
+from videomass.vdms_utils.utils import Popen
+from videomass.vdms_utils.waveform_utils import (SAMPLERATE,
+                                                 PAIRS_PER_SEC,
+                                                 pcm_to_peaks,
+                                                 write_peaks,
+                                                 )
+from videomass.vdms_io.make_filelog import make_log_template
+if not platform.system() == 'Windows':
+    import shlex
+
+
+class WaveformThread(Thread):
+    """
+    This class represents a separate thread that makes the
+    audio peaks file of a given media file. The first audio
+    stream is decoded once by FFmpeg to mono, low-rate PCM which
+    is read as a stream from the standard output and reduced to
+    min/max pairs on the fly, so the whole audio is never kept
+    in memory. At the end, the peaks are saved to `cachename`
+    and the "WAVEFORM_EVT" pub/sub topic is sent to the caller.
+
+    USAGE:
+        >>> thread = WaveformThread(filename, fingerprint, cachename)
+        >>> thread.stop()  # to stop it before its end
+
+    """
+    BUCKET = SAMPLERATE // PAIRS_PER_SEC  # samples per peaks pair
+    CHUNK = BUCKET * 2 * 1000  # bytes to read at a time (10 sec.)
+
+    def __init__(self, filename, fingerprint, cachename):
+        """
+        Attributes defined here:
+
+        self.filename: source media pathname
+        self.fingerprint: identifies the source on received
+                          messages (see `utils.media_fingerprint`).
+        self.cachename: pathname of the peaks file to write.
+        self.status: None if no errors, str(error) otherwise.
+        """
+        get = wx.GetApp()
+        self.appdata = get.appset
+        self.stop_work_thread = False  # process terminate
+        self.filename = filename
+        self.fingerprint = fingerprint
+        self.cachename = cachename
+        self.status = None
+        self.logf = make_log_template('waveform.log',
+                                      self.appdata['logdir'], mode="w")
+        Thread.__init__(self)
+        self.start()
+    # ----------------------------------------------------------------#
+
+    def run(self):
+        """
+        Start thread
+        """
+        endian = 'le' if sys.byteorder == 'little' else 'be'
+        cmd = (f'"{self.appdata["ffmpeg_cmd"]}" -hide_banner '
+               f'-loglevel error -i "{self.filename}" -map 0:a:0 '
+               f'-vn -sn -dn -ac 1 -ar {SAMPLERATE} '
+               f'-f s16{endian} -acodec pcm_s16{endian} -'
+               )
+        with open(self.logf, "a", encoding='utf-8') as log:
+            log.write(f"{cmd}\n")
+
+        if not platform.system() == 'Windows':
+            cmd = shlex.split(cmd)
+        peaks = array('h')
+        try:
+            with Popen(cmd,
+                       stdout=subprocess.PIPE,
+                       stderr=subprocess.PIPE,
+                       ) as proc:
+                while not self.stop_work_thread:
+                    pcm = proc.stdout.read(WaveformThread.CHUNK)
+                    if len(pcm) % 2:  # drop a truncated sample
+                        pcm = pcm[:-1]
+                    if not pcm:
+                        break
+                    peaks.extend(pcm_to_peaks(pcm, WaveformThread.BUCKET))
+
+                if self.stop_work_thread:
+                    proc.kill()
+                error = proc.communicate()[1]
+                if proc.returncode and not self.stop_work_thread:
+                    self.status = error.decode(self.appdata['encoding'],
+                                               errors='replace')
+
+        except (OSError, FileNotFoundError) as err:
+            self.status = str(err)
+
+        if self.status:
+            with open(self.logf, "a", encoding='utf-8') as logerr:
+                logerr.write(f"\n[FFMPEG] waveform ERRORS:\n"
+                             f"{self.status}\n")
+            return
+
+        if self.stop_work_thread:
+            return
+
+        write_peaks(self.cachename, peaks)
+        wx.CallAfter(pub.sendMessage,
+                     "WAVEFORM_EVT",
+                     fingerprint=self.fingerprint,
+                     )
+    # ----------------------------------------------------------------#
+
+    def stop(self):
+        """
+        Sets the stop work thread to terminate the process
+        """
+        self.stop_work_thread = True
@@ -0,0 +1,126 @@
+# -*- coding: UTF-8 -*-
+"""
+Name: abr_utils.py
+Porpose: Adaptive bitrate ladder and HLS/DASH packaging arguments
+Compatibility: Python3
+Author: Gianluca Pernigotto <jeanlucperni@gmail.com>
+Copyleft - 2024 Gianluca Pernigotto <jeanlucperni@gmail.com>
+license: GPL3
+Rev: Oct.19.2026
+Code checker: flake8, pylint
+
+This file is part of Videomass.
+
+   Videomass is free software: you can redistribute it and/or modify
+   it under the terms of the GNU General Public License as published by
+   the Free Software Foundation, either version 3 of the License, or
+   (at your option) any later version.
+
+   Videomass is distributed in the hope that it will be useful,
+   but WITHOUT ANY WARRANTY; without even the implied warranty of
+   MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+   GNU General Public License for more details.
+
+   You should have received a copy of the GNU General Public License
+   along with Videomass.  If not, see <http://www.gnu.org/licenses/>.
+"""
+import os
+import re
+
+LADDER = '1080:5000k, 720:2800k, 480:1400k, 360:800k'
+PACKAGES = ('HLS', 'DASH', 'HLS + DASH')
+RUNG = re.compile(r'^(\d+)\s*:\s*(\d+)([kKmM]?)$')
+
+
+def parse_ladder(text):
+    """
+    Parses the ABR ladder `text`, a comma separated list of
+    `height:bitrate` rungs (e.g. '720:2800k'), and returns a
+    list of tuples (height, bitrate) from the highest rung,
+    where bitrate is a str with its unit (e.g. '2800k').
+    Raise ValueError on invalid rungs.
+    """
+    ladder = []
+    for rung in text.split(','):
+        match = RUNG.match(rung.strip())
+        if not match or int(match.group(1)) < 2:
+            raise ValueError(f'Invalid rung: "{rung.strip()}"')
+        height = int(match.group(1)) // 2 * 2  # must be even
+        ladder.append((height, f'{match.group(2)}{match.group(3).lower()}'))
+    if not ladder:
+        raise ValueError('Empty ladder')
+    return sorted(set(ladder), key=lambda rung: rung[0], reverse=True)
+# ------------------------------------------------------------------------
+
+
+def fit_ladder(ladder, height):
+    """
+    Returns the rungs of the `ladder` not higher than the
+    source `height`, so that no rendition is upscaled. The
+    lowest rung is always kept.
+    """
+    fitted = [rung for rung in ladder if rung[0] <= height]
+    return fitted or ladder[-1:]
+# ------------------------------------------------------------------------
+
+
+def double_rate(bitrate):
+    """
+    Returns the double of the `bitrate` str (e.g. '800k'),
+    used as the rate control buffer size.
+    """
+    num, unit = re.match(r'(\d+)(\D*)', bitrate).groups()
+    return f'{int(num) * 2}{unit}'
+# ------------------------------------------------------------------------
+
+
+def abr_args(ladder, outdir, **opts):
+    """
+    Returns a tuple (args, destination) of a single process
+    which decodes the source once, splits it into all the
+    `ladder` renditions with keyframes aligned on segment
+    boundaries and writes the HLS and/or DASH package into
+    `outdir`. `opts` keys:
+        'codec': video encoder (e.g. 'libx264'),
+        'preset': encoder preset,
+        'audio': audio bitrate or None if no audio,
+        'segment': segment duration in seconds,
+        'package': one of `PACKAGES`
+    """
+    count, seg = len(ladder), opts['segment']
+    splits = ''.join(f'[s{n}]' for n in range(count))
+    chains = [f'[0:v]split={count}{splits}']
+    chains += [f'[s{n}]scale=-2:{height}[v{n}]'
+               for n, (height, _) in enumerate(ladder)]
+    args = [f'-filter_complex "{";".join(chains)}"']
+    for num, (_, rate) in enumerate(ladder):
+        args.append(f'-map "[v{num}]" -b:v:{num} {rate} -maxrate:v:{num} '
+                    f'{rate} -bufsize:v:{num} {double_rate(rate)}')
+    args.append(f'-c:v {opts["codec"]} -preset {opts["preset"]} '
+                f'-pix_fmt yuv420p -sc_threshold 0 '
+                f'-force_key_frames "expr:gte(t,n_forced*{seg})"')
+    if opts['audio']:
+        args.append(f'-map 0:a:0 -c:a aac -b:a {opts["audio"]} -ac 2')
+
+    if opts['package'] == 'HLS':
+        if opts['audio']:
+            streams = ' '.join([f'v:{n},agroup:aud' for n in range(count)]
+                               + ['a:0,agroup:aud'])
+        else:
+            streams = ' '.join(f'v:{n}' for n in range(count))
+        segname = os.path.join(outdir, 'stream_%v_%05d.ts')
+        args.append(f'-f hls -hls_time {seg} -hls_playlist_type vod '
+                    f'-hls_flags independent_segments '
+                    f'-hls_segment_filename "{segname}" '
+                    f'-master_pl_name master.m3u8 '
+                    f'-var_stream_map "{streams}"')
+        return ' '.join(args), os.path.join(outdir, 'stream_%v.m3u8')
+
+    sets = 'id=0,streams=v'
+    if opts['audio']:
+        sets += ' id=1,streams=a'
+    args.append(f'-f dash -seg_duration {seg} -use_template 1 '
+                f'-use_timeline 1 -adaptation_sets "{sets}"')
+    if opts['package'] == 'HLS + DASH':
+        args.append('-hls_playlist 1')  # HLS playlists of the same segments
+    return ' '.join(args), os.path.join(outdir, 'manifest.mpd')
@@ -0,0 +1,168 @@
+# -*- coding: UTF-8 -*-
+"""
+Name: archive_utils.py
+Porpose: Download archive of the YouTube Downloader
+Compatibility: Python3
+Author: Gianluca Pernigotto <jeanlucperni@gmail.com>
+Copyleft - 2024 Gianluca Pernigotto <jeanlucperni@gmail.com>
+license: GPL3
+Rev: Oct.19.2026
+Code checker: flake8, pylint
+
+This file is part of Videomass.
+
+   Videomass is free software: you can redistribute it and/or modify
+   it under the terms of the GNU General Public License as published by
+   the Free Software Foundation, either version 3 of the License, or
+   (at your option) any later version.
+
+   Videomass is distributed in the hope that it will be useful,
+   but WITHOUT ANY WARRANTY; without even the implied warranty of
+   MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+   GNU General Public License for more details.
+
+   You should have received a copy of the GNU General Public License
+   along with Videomass.  If not, see <http://www.gnu.org/licenses/>.
+"""
+import os
+import re
+from threading import Lock
+
+ARCHIVE_NAME = 'ytdlp_archive.txt'  # in the configuration directory
+YOUTUBE_ID = re.compile(r'(?:youtube\.com/(?:watch\?(?:\S*&)?v=|shorts/|'
+                        r'embed/|live/|v/)|youtu\.be/)([0-9A-Za-z_-]{11})'
+                        r'(?![0-9A-Za-z_-])')
+
+
+def archive_filename(confdir):
+    """
+    Returns the pathname of the download archive
+    inside the `confdir` of the application.
+    """
+    return os.path.join(confdir, ARCHIVE_NAME)
+# ------------------------------------------------------------------------
+
+
+def make_archive_id(extractor, video_id):
+    """
+    Returns the entry of the download archive of the media
+    `video_id` of the `extractor` (the yt-dlp extractor key),
+    in the same format as yt-dlp, e.g. 'youtube dQw4w9WgXcQ'.
+    """
+    return f'{extractor.lower()} {video_id}'
+# ------------------------------------------------------------------------
+
+
+def youtube_archive_id(url):
+    """
+    Returns the archive entry of the YouTube video `url`
+    without extracting it, None if `url` is not the URL
+    of a YouTube video.
+    """
+    match = YOUTUBE_ID.search(url)
+    return make_archive_id('youtube', match.group(1)) if match else None
+# ------------------------------------------------------------------------
+
+
+class DownloadArchive:
+    """
+    The download archive of the YouTube Downloader, the text file
+    given to the yt-dlp `download_archive` option, with a line for
+    each media downloaded (see `make_archive_id`). yt-dlp appends
+    the new entries to the file by itself.
+
+    The entries are indexed in a dict, so that the lookups do not
+    depend on the size of the archive; only the lines appended to
+    the file since the last lookup are read again.
+
+    USAGE:
+        >>> archive = DownloadArchive(filename)
+        >>> 'youtube dQw4w9WgXcQ' in archive
+        False
+
+    """
+    def __init__(self, filename):
+        """
+        self.entries: {entry: None} of the archive, in file order
+        self.offset: bytes of the file already read
+        """
+        self.filename = filename
+        self.entries = {}
+        self.offset = 0
+        self.lock = Lock()
+
+    def refresh(self):
+        """
+        Reads the entries appended to the file since the last
+        time, or all of them if the file has been rewritten.
+        """
+        with self.lock:
+            try:
+                size = os.path.getsize(self.filename)
+            except OSError:
+                self.entries, self.offset = {}, 0
+                return
+            if size < self.offset:
+                self.entries, self.offset = {}, 0
+            if size == self.offset:
+                return
+            with open(self.filename, 'rb') as fobj:
+                fobj.seek(self.offset)
+                data = fobj.read(size - self.offset)
+            end = data.rfind(b'\n') + 1  # skips the unfinished line
+            self.offset += end
+            for line in data[:end].decode('utf-8', 'replace').splitlines():
+                line = line.strip()
+                if line:
+                    self.entries[line] = None
+
+    def __contains__(self, entry):
+        """
+        Returns True if `entry` is in the archive
+        """
+        self.refresh()
+        return entry in self.entries
+
+    def __len__(self):
+        """
+        Returns the number of entries
+        """
+        self.refresh()
+        return len(self.entries)
+
+    def getlist(self):
+        """
+        Returns the list of the entries, in file order
+        """
+        self.refresh()
+        return list(self.entries)
+
+    def add(self, entry):
+        """
+        Appends `entry` to the archive if not found
+        """
+        if entry in self:
+            return
+        os.makedirs(os.path.dirname(self.filename) or '.', exist_ok=True)
+        with open(self.filename, 'a', encoding='utf-8') as fobj:
+            fobj.write(f'{entry}\n')
+
+    def remove(self, entries):
+        """
+        Removes `entries` (iterable) from the archive,
+        so that their media will be downloaded again.
+        Returns the number of entries removed.
+        """
+        entries = set(entries)
+        self.refresh()
+        keep = [line for line in self.entries if line not in entries]
+        removed = len(self.entries) - len(keep)
+        if not removed:
+            return 0
+        tmpname = f'{self.filename}.part'
+        with open(tmpname, 'w', encoding='utf-8') as fobj:
+            fobj.write(''.join(f'{line}\n' for line in keep))
+        os.replace(tmpname, self.filename)
+        with self.lock:
+            self.entries, self.offset = {}, 0
+        return removed
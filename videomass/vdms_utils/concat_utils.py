@@ -0,0 +1,119 @@
+# -*- coding: UTF-8 -*-
+"""
+Name: concat_utils.py
+Porpose: Concatenation planner to normalize mismatched inputs only
+Compatibility: Python3
+Author: Gianluca Pernigotto <jeanlucperni@gmail.com>
+Copyleft - 2024 Gianluca Pernigotto <jeanlucperni@gmail.com>
+license: GPL3
+Rev: Oct.19.2026
+Code checker: flake8, pylint
+
+This file is part of Videomass.
+
+   Videomass is free software: you can redistribute it and/or modify
+   it under the terms of the GNU General Public License as published by
+   the Free Software Foundation, either version 3 of the License, or
+   (at your option) any later version.
+
+   Videomass is distributed in the hope that it will be useful,
+   but WITHOUT ANY WARRANTY; without even the implied warranty of
+   MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+   GNU General Public License for more details.
+
+   You should have received a copy of the GNU General Public License
+   along with Videomass.  If not, see <http://www.gnu.org/licenses/>.
+"""
+from collections import Counter
+
+# FFmpeg encoder and options to re-encode to a given codec name
+ENCODERS = {'h264': '-c:{0} libx264 -crf 18 -preset fast',
+            'hevc': '-c:{0} libx265 -crf 20 -preset fast',
+            'vp8': '-c:{0} libvpx -crf 8 -b:{0} 0',
+            'vp9': '-c:{0} libvpx-vp9 -crf 24 -b:{0} 0',
+            'av1': '-c:{0} libsvtav1 -crf 28',
+            'mpeg4': '-c:{0} mpeg4 -q:{0} 2',
+            'mpeg2video': '-c:{0} mpeg2video -q:{0} 2',
+            'aac': '-c:{0} aac -b:{0} 192k',
+            'mp3': '-c:{0} libmp3lame -b:{0} 192k',
+            'opus': '-c:{0} libopus -b:{0} 160k',
+            'vorbis': '-c:{0} libvorbis -q:{0} 6',
+            'ac3': '-c:{0} ac3 -b:{0} 448k',
+            'flac': '-c:{0} flac',
+            'alac': '-c:{0} alac',
+            'pcm_s16le': '-c:{0} pcm_s16le',
+            'pcm_s24le': '-c:{0} pcm_s24le',
+            }
+
+
+def media_signature(probe):
+    """
+    Returns the concatenation signature of the given FFprobe
+    data, a tuple of the codec type, codec name and video size
+    or audio sample rate of each audio and video stream. Inputs
+    with the same signature can be joined by the concat demuxer.
+    """
+    sign = []
+    for stream in probe.get('streams', []):
+        if stream.get('codec_type') == 'video':
+            sign.append(('video', stream.get('codec_name'),
+                         f"{stream.get('width')}x{stream.get('height')}"))
+        elif stream.get('codec_type') == 'audio':
+            sign.append(('audio', stream.get('codec_name'),
+                         stream.get('sample_rate')))
+    return tuple(sign)
+# ------------------------------------------------------------------------
+
+
+def plan_concat(data):
+    """
+    Finds the majority format of the FFprobe `data` list.
+    Returns a tuple (target, odd) where `target` is the index
+    of the first item with the majority format and `odd` the
+    list of indexes of the items to normalize to it. On a tie
+    the format of the earliest item wins.
+    """
+    signs = [media_signature(probe) for probe in data]
+    major = Counter(signs).most_common(1)[0][0]
+    return signs.index(major), [n for n, s in enumerate(signs) if s != major]
+# ------------------------------------------------------------------------
+
+
+def normalize_args(target, source):
+    """
+    Returns the FFmpeg output args (str) to re-encode the
+    `source` FFprobe data to the streams layout of the
+    `target` FFprobe data, None if it is not possible (e.g.
+    different number of streams or unsupported codecs).
+    """
+    tstreams = [s for s in target.get('streams', [])
+                if s.get('codec_type') in ('video', 'audio')]
+    sstreams = [s for s in source.get('streams', [])
+                if s.get('codec_type') in ('video', 'audio')]
+    if ([s['codec_type'] for s in tstreams]
+            != [s['codec_type'] for s in sstreams]):
+        return None
+
+    args, count = [], {'video': 0, 'audio': 0}
+    for stream in tstreams:
+        kind = stream['codec_type']
+        spec = f'{kind[0]}:{count[kind]}'
+        count[kind] += 1
+        encoder = ENCODERS.get(stream.get('codec_name'))
+        if not encoder:
+            return None
+        args.append(f'-map 0:{spec} {encoder.format(spec)}')
+        if kind == 'video':
+            width, height = stream.get('width'), stream.get('height')
+            args.append(f'-filter:{spec} "scale={width}:{height}:'
+                        f'force_original_aspect_ratio=decrease,'
+                        f'pad={width}:{height}:(ow-iw)/2:(oh-ih)/2,setsar=1"')
+            if stream.get('pix_fmt'):
+                args.append(f'-pix_fmt:{spec} {stream["pix_fmt"]}')
+            if stream.get('r_frame_rate') not in (None, '0/0'):
+                args.append(f'-r:{spec} {stream["r_frame_rate"]}')
+        else:
+            args.append(f'-ar:{spec} {stream.get("sample_rate")}')
+            if stream.get('channels'):
+                args.append(f'-ac:{spec} {stream["channels"]}')
+    return ' '.join(args)
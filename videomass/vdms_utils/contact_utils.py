@@ -0,0 +1,104 @@
+# -*- coding: UTF-8 -*-
+"""
+Name: contact_utils.py
+Porpose: Helpers to build contact sheets of many video files
+Compatibility: Python3
+Author: Gianluca Pernigotto <jeanlucperni@gmail.com>
+Copyleft - 2024 Gianluca Pernigotto <jeanlucperni@gmail.com>
+license: GPL3
+Rev: Oct.19.2026
+Code checker: flake8, pylint
+
+This file is part of Videomass.
+
+   Videomass is free software: you can redistribute it and/or modify
+   it under the terms of the GNU General Public License as published by
+   the Free Software Foundation, either version 3 of the License, or
+   (at your option) any later version.
+
+   Videomass is distributed in the hope that it will be useful,
+   but WITHOUT ANY WARRANTY; without even the implied warranty of
+   MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+   GNU General Public License for more details.
+
+   You should have received a copy of the GNU General Public License
+   along with Videomass.  If not, see <http://www.gnu.org/licenses/>.
+"""
+import os
+import html
+from urllib.parse import quote
+
+
+def tile_positions(duration, count):
+    """
+    Returns `count` seek positions in seconds equally
+    spread across a source of `duration` milliseconds,
+    each at the middle of its own slice of time.
+    """
+    seconds = duration / 1000
+    return [round(seconds * (i + 0.5) / count, 3) for i in range(count)]
+# ------------------------------------------------------------------------
+
+
+def mosaic_graph(count, filters, tile):
+    """
+    Returns the filtergraph (str) that takes the first frame
+    of each of the `count` inputs, applies the `filters` chain
+    (e.g. scale) and joins them with the `tile` filter options
+    (e.g. '4x4:padding=2') to the `[sheet]` output pad.
+    """
+    chains = [f'[{n}:v]trim=end_frame=1,setpts=PTS-STARTPTS,{filters}[v{n}]'
+              for n in range(count)]
+    pads = ''.join(f'[v{n}]' for n in range(count))
+    return ';'.join(chains + [f'{pads}concat=n={count}:v=1:a=0,'
+                              f'tile={tile}[sheet]'])
+# ------------------------------------------------------------------------
+
+
+def sheet_names(files, ext):
+    """
+    Returns the list of the output names (without path) of
+    the contact sheets of `files`, named after their sources
+    with a progressive digit on duplicate names.
+    """
+    names, seen = [], set()
+    for fname in files:
+        base = os.path.splitext(os.path.basename(fname))[0]
+        name, num = f'{base}.{ext}', 1
+        while name.lower() in seen:
+            num += 1
+            name = f'{base}_{num}.{ext}'
+        seen.add(name.lower())
+        names.append(name)
+    return names
+# ------------------------------------------------------------------------
+
+
+def index_page(title, entries):
+    """
+    Returns the HTML index page (str) of the contact sheets.
+    `entries` is a list of tuples (source, sheet, info) where
+    `sheet` is the file name of the sheet relative to the
+    page (quoted in the links, e.g. '#', '?', '%'), None if
+    it could not be created, and `info` a short description
+    (e.g. the duration or the error).
+    """
+    rows = []
+    for source, sheet, info in entries:
+        src = html.escape(source)
+        if sheet:
+            link = html.escape(quote(sheet), quote=True)
+            rows.append(f'<figure><a href="{link}"><img src="{link}" '
+                        f'alt="{src}"></a><figcaption>{src}<br>'
+                        f'{html.escape(info)}</figcaption></figure>')
+        else:
+            rows.append(f'<figure class="failed"><figcaption>{src}<br>'
+                        f'{html.escape(info)}</figcaption></figure>')
+    return ('<!DOCTYPE html>\n<html>\n<head>\n<meta charset="utf-8">\n'
+            f'<title>{html.escape(title)}</title>\n<style>\n'
+            'img {max-width: 100%;}\n'
+            'figure {display: inline-block; width: 30%; '
+            'vertical-align: top;}\n'
+            '.failed {color: red;}\n</style>\n</head>\n<body>\n'
+            f'<h1>{html.escape(title)}</h1>\n' + '\n'.join(rows)
+            + '\n</body>\n</html>\n')
@@ -0,0 +1,153 @@
+# -*- coding: UTF-8 -*-
+"""
+Name: crf_utils.py
+Porpose: Helpers for the target quality CRF search
+Compatibility: Python3
+Author: Gianluca Pernigotto <jeanlucperni@gmail.com>
+Copyleft - 2024 Gianluca Pernigotto <jeanlucperni@gmail.com>
+license: GPL3
+Rev: Oct.19.2026
+Code checker: flake8, pylint
+
+This file is part of Videomass.
+
+   Videomass is free software: you can redistribute it and/or modify
+   it under the terms of the GNU General Public License as published by
+   the Free Software Foundation, either version 3 of the License, or
+   (at your option) any later version.
+
+   Videomass is distributed in the hope that it will be useful,
+   but WITHOUT ANY WARRANTY; without even the implied warranty of
+   MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+   GNU General Public License for more details.
+
+   You should have received a copy of the GNU General Public License
+   along with Videomass.  If not, see <http://www.gnu.org/licenses/>.
+"""
+import os
+import re
+import json
+import hashlib
+
+CRF = re.compile(r'(?<!\S)-crf\s+\d+(?:\.\d+)?')
+
+
+def has_crf(args):
+    """
+    Returns True if any FFmpeg args string of
+    the `args` list sets the `-crf` option.
+    """
+    return any(CRF.search(arg) for arg in args)
+# ------------------------------------------------------------------------
+
+
+def set_crf(args, crf):
+    """
+    Replaces the value of the `-crf` option with `crf`
+    in each FFmpeg args string of the `args` list.
+    Args strings without `-crf` are left unchanged.
+    Returns a new list.
+    """
+    return [CRF.sub(f'-crf {crf}', arg) for arg in args]
+# ------------------------------------------------------------------------
+
+
+def crf_candidates(low, high, probes):
+    """
+    Returns up to `probes` CRF values evenly spaced
+    within the `low` and `high` bounds (both included),
+    to be measured together in a single search step.
+    Returns an empty list if the range is empty.
+    """
+    if low > high or probes < 1:
+        return []
+    count = min(probes, high - low + 1)
+    span = high - low + 1
+    return sorted({low + (i + 1) * span // (count + 1)
+                   for i in range(count)})
+# ------------------------------------------------------------------------
+
+
+def narrow_crf_range(low, high, scores, target):
+    """
+    Narrows the search range given the measured `scores`
+    (dict of {crf: ssim}, None for failed measurements)
+    assuming that quality decreases as the CRF increases.
+
+    Returns a tuple (low, high, best) where `best` is the
+    highest measured CRF reaching the `target` SSIM, None
+    if none of them reached it.
+    Raise ValueError if any measurement failed, since the
+    range can't be narrowed without it.
+    """
+    failed = sorted(crf for crf, ssim in scores.items() if ssim is None)
+    if failed:
+        raise ValueError(f'Unable to measure the quality at CRF '
+                         f'{failed[0]}')
+    best = None
+    for crf in sorted(scores):
+        ssim = scores[crf]
+        if ssim >= target:
+            low, best = max(low, crf + 1), crf
+        else:
+            high = min(high, crf - 1)
+            break
+    return low, high, best
+# ------------------------------------------------------------------------
+
+
+def crf_cachekey(*params):
+    """
+    Returns a short hash of the encoder settings, the
+    target and the search `params` (any str), used to
+    key the results in the cache file of each source.
+    """
+    data = '|'.join(str(p) for p in params)
+    return hashlib.sha1(data.encode('utf-8')).hexdigest()[:16]
+# ------------------------------------------------------------------------
+
+
+def crf_cachename(cachedir, fingerprint):
+    """
+    Returns the pathname of the CRF search cache file
+    for the given source `fingerprint` (see
+    `utils.media_fingerprint`).
+    """
+    dirname = os.path.join(cachedir, 'crfsearch')
+    os.makedirs(dirname, mode=0o777, exist_ok=True)
+    return os.path.join(dirname, f'{fingerprint}.json')
+# ------------------------------------------------------------------------
+
+
+def load_crf_cache(cachename, key):
+    """
+    Returns the cached tuple (crf, ssim) found for the
+    given `key` (see `crf_cachekey`), None otherwise.
+    """
+    try:
+        with open(cachename, 'r', encoding='utf-8') as fcache:
+            data = json.load(fcache)
+    except (OSError, ValueError):
+        return None
+    item = data.get(key) if isinstance(data, dict) else None
+    if not item or 'crf' not in item:
+        return None
+    return item['crf'], item.get('ssim')
+# ------------------------------------------------------------------------
+
+
+def save_crf_cache(cachename, key, crf, ssim):
+    """
+    Adds the `crf` found for `key` and its measured
+    `ssim` to `cachename`, keeping the other results.
+    """
+    try:
+        with open(cachename, 'r', encoding='utf-8') as fcache:
+            data = json.load(fcache)
+    except (OSError, ValueError):
+        data = {}
+    if not isinstance(data, dict):
+        data = {}
+    data[key] = {'crf': crf, 'ssim': ssim}
+    with open(cachename, 'w', encoding='utf-8') as fcache:
+        json.dump(data, fcache)
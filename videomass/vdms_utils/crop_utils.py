@@ -0,0 +1,150 @@
+# -*- coding: UTF-8 -*-
+"""
+Name: crop_utils.py
+Porpose: Helpers for the automatic crop detection
+Compatibility: Python3
+Author: Gianluca Pernigotto <jeanlucperni@gmail.com>
+Copyleft - 2024 Gianluca Pernigotto <jeanlucperni@gmail.com>
+license: GPL3
+Rev: Oct.19.2026
+Code checker: flake8, pylint
+
+This file is part of Videomass.
+
+   Videomass is free software: you can redistribute it and/or modify
+   it under the terms of the GNU General Public License as published by
+   the Free Software Foundation, either version 3 of the License, or
+   (at your option) any later version.
+
+   Videomass is distributed in the hope that it will be useful,
+   but WITHOUT ANY WARRANTY; without even the implied warranty of
+   MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+   GNU General Public License for more details.
+
+   You should have received a copy of the GNU General Public License
+   along with Videomass.  If not, see <http://www.gnu.org/licenses/>.
+"""
+import os
+import re
+import json
+from collections import Counter
+
+CROPDETECT = re.compile(r'crop=(\d+):(\d+):(\d+):(\d+)')
+
+
+def parse_cropdetect(output):
+    """
+    Given the FFmpeg `cropdetect` filter output (str),
+    returns the last detected rectangle as tuple of
+    int (width, height, x, y), None if nothing was found.
+    With `reset=0` the last one is the widest area found
+    in the analyzed window.
+    """
+    found = CROPDETECT.findall(output)
+    if not found:
+        return None
+    return tuple(int(n) for n in found[-1])
+# ------------------------------------------------------------------------
+
+
+def crop_consensus(rects):
+    """
+    Returns the rectangle found most often in the `rects`
+    list, ignoring None items. Ties are broken in favor of
+    the largest area, so that a dark scene never cuts away
+    a part of the picture. Returns None if `rects` is empty.
+    """
+    count = Counter(r for r in rects if r)
+    if not count:
+        return None
+    return max(count, key=lambda r: (count[r], r[0] * r[1]))
+# ------------------------------------------------------------------------
+
+
+def sample_positions(duration, windows, length):
+    """
+    Returns a list of `windows` seek positions in seconds,
+    equally spread across a source of `duration` milliseconds,
+    each leaving room for a window of `length` seconds.
+    Short sources get a single position at the beginning.
+    """
+    seconds = duration / 1000
+    if seconds <= length * 2 or windows < 2:
+        return [0.0]
+    span = seconds - length
+    return [round(span * (i + 0.5) / windows, 3) for i in range(windows)]
+# ------------------------------------------------------------------------
+
+
+def crop_to_filter(rect):
+    """
+    Converts a rectangle tuple (width, height, x, y) to
+    the crop filter options as used by the Crop dialog.
+    """
+    return 'w={0}:h={1}:x={2}:y={3}'.format(*rect)
+# ------------------------------------------------------------------------
+
+
+def insert_crop_filter(args, rect):
+    """
+    Inserts the crop filter of the given `rect` into each
+    FFmpeg args string of the `args` list, placing it at the
+    beginning of the existing video filter chain (`-vf` or
+    `-filter:v`) or adding a new `-vf` option. Args strings
+    that are empty, disable video or copy the video stream
+    are returned unchanged.
+    Returns a new list.
+    """
+    crop = f'crop={crop_to_filter(rect)}'
+    newargs = []
+    for arg in args:
+        opts = arg.split()
+        if (not arg or '-vn' in opts
+                or '-c:v copy' in arg or '-vcodec copy' in arg):
+            newargs.append(arg)
+            continue
+        for flag in ('-vf ', '-filter:v '):
+            if f' {flag}' in f' {arg}':
+                pos = f' {arg}'.index(f' {flag}') + len(flag)
+                newargs.append(f'{arg[:pos]}{crop},{arg[pos:]}')
+                break
+        else:
+            newargs.append(f'{arg} -vf {crop}')
+    return newargs
+# ------------------------------------------------------------------------
+
+
+def crop_cachename(cachedir, fingerprint):
+    """
+    Returns the pathname of the crop detection cache
+    file for the given source `fingerprint` (see
+    `utils.media_fingerprint`).
+    """
+    dirname = os.path.join(cachedir, 'cropdetect')
+    os.makedirs(dirname, mode=0o777, exist_ok=True)
+    return os.path.join(dirname, f'{fingerprint}.json')
+# ------------------------------------------------------------------------
+
+
+def load_crop_cache(cachename, params):
+    """
+    Returns the cached rectangle as tuple of int if it was
+    detected with the same `params` (str), None otherwise.
+    """
+    try:
+        with open(cachename, 'r', encoding='utf-8') as fcache:
+            data = json.load(fcache)
+    except (OSError, ValueError):
+        return None
+    if data.get('params') != params or not data.get('crop'):
+        return None
+    return tuple(data['crop'])
+# ------------------------------------------------------------------------
+
+
+def save_crop_cache(cachename, params, rect):
+    """
+    Writes the detected `rect` and its `params` to `cachename`
+    """
+    with open(cachename, 'w', encoding='utf-8') as fcache:
+        json.dump({'params': params, 'crop': list(rect)}, fcache)
@@ -0,0 +1,76 @@
+# -*- coding: UTF-8 -*-
+"""
+Name: estimate_utils.py
+Porpose: Helpers for the sample based output size and time estimates
+Compatibility: Python3
+Author: Gianluca Pernigotto <jeanlucperni@gmail.com>
+Copyleft - 2024 Gianluca Pernigotto <jeanlucperni@gmail.com>
+license: GPL3
+Rev: Oct.19.2026
+Code checker: flake8, pylint
+
+This file is part of Videomass.
+
+   Videomass is free software: you can redistribute it and/or modify
+   it under the terms of the GNU General Public License as published by
+   the Free Software Foundation, either version 3 of the License, or
+   (at your option) any later version.
+
+   Videomass is distributed in the hope that it will be useful,
+   but WITHOUT ANY WARRANTY; without even the implied warranty of
+   MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+   GNU General Public License for more details.
+
+   You should have received a copy of the GNU General Public License
+   along with Videomass.  If not, see <http://www.gnu.org/licenses/>.
+"""
+from videomass.vdms_utils.utils import format_bytes, integer_to_time
+
+
+def pick_subset(durations, count):
+    """
+    Returns the indexes of up to `count` items of the
+    `durations` list (milliseconds) evenly spread across
+    it, skipping items without duration.
+    """
+    valid = [n for n, dur in enumerate(durations) if dur and dur > 0]
+    if len(valid) <= count:
+        return valid
+    step = len(valid) / count
+    return [valid[int(step * i + step / 2)] for i in range(count)]
+# ------------------------------------------------------------------------
+
+
+def extrapolate(samples, durations, concurrency=1):
+    """
+    Extrapolates the totals of a batch from the measured
+    `samples`, a list of tuples (seconds, size, elapsed)
+    where `seconds` is the length of the encoded sample,
+    `size` the output size in bytes and `elapsed` the wall
+    clock time in seconds. `durations` are the durations in
+    milliseconds of all the batch items, `concurrency` the
+    number of items processed at the same time.
+
+    Returns a dict with `size` (bytes) and `time` (seconds),
+    None if there are no usable samples.
+    """
+    seconds = sum(s[0] for s in samples if s[0] > 0)
+    if not seconds:
+        return None
+    bitrate = sum(s[1] for s in samples if s[0] > 0) / seconds
+    speed = sum(s[2] for s in samples if s[0] > 0) / seconds
+    total = sum(dur for dur in durations if dur and dur > 0) / 1000
+    return {'size': round(bitrate * total),
+            'time': speed * total / max(1, concurrency)}
+# ------------------------------------------------------------------------
+
+
+def format_estimate(estimate):
+    """
+    Returns the `estimate` dict (see `extrapolate`)
+    as human readable str.
+    """
+    size = format_bytes(float(estimate['size']))
+    clock = integer_to_time(round(estimate['time'] * 1000), mills=False,
+                            rnd=True)
+    return f'~{size}, ~{clock}'
@@ -0,0 +1,85 @@
+# -*- coding: UTF-8 -*-
+"""
+Name: gif_utils.py
+Porpose: Helpers for the animated GIF export with cached palettes
+Compatibility: Python3
+Author: Gianluca Pernigotto <jeanlucperni@gmail.com>
+Copyleft - 2024 Gianluca Pernigotto <jeanlucperni@gmail.com>
+license: GPL3
+Rev: Oct.19.2026
+Code checker: flake8, pylint
+
+This file is part of Videomass.
+
+   Videomass is free software: you can redistribute it and/or modify
+   it under the terms of the GNU General Public License as published by
+   the Free Software Foundation, either version 3 of the License, or
+   (at your option) any later version.
+
+   Videomass is distributed in the hope that it will be useful,
+   but WITHOUT ANY WARRANTY; without even the implied warranty of
+   MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+   GNU General Public License for more details.
+
+   You should have received a copy of the GNU General Public License
+   along with Videomass.  If not, see <http://www.gnu.org/licenses/>.
+"""
+import os
+import hashlib
+
+DITHERS = ('sierra2_4a', 'floyd_steinberg', 'sierra2', 'bayer', 'none')
+
+
+def gif_filters(fps, scale, extra=''):
+    """
+    Returns the filters chain (str) applied to the source
+    before the palette is computed or used, where `scale`
+    is the scale filter and `extra` other filters (e.g.
+    setdar) appended to the chain.
+    """
+    chain = f'fps={fps},{scale}:flags=lanczos'
+    return f'{chain},{extra}' if extra else chain
+# ------------------------------------------------------------------------
+
+
+def palette_cachename(cachedir, fingerprint, *params):
+    """
+    Returns the pathname of the cached palette of the
+    source `fingerprint` (see `utils.media_fingerprint`)
+    for the given `params` (segment, filters, etc.).
+    The dithering and loop options are not part of the
+    key as they do not change the palette.
+    """
+    data = '|'.join(str(p) for p in params)
+    key = hashlib.sha1(data.encode('utf-8')).hexdigest()[:16]
+    dirname = os.path.join(cachedir, 'palettes')
+    os.makedirs(dirname, mode=0o777, exist_ok=True)
+    return os.path.join(dirname, f'{fingerprint}_{key}.png')
+# ------------------------------------------------------------------------
+
+
+def gif_graph(filters, dither, palette=False):
+    """
+    Returns the filtergraph (str) of a single decode GIF
+    export to the `[gif]` output pad with the given `dither`
+    mode. The palette is computed from the `filters` output;
+    if `palette` is True the computed palette is also sent
+    to the `[palette]` output pad, to be cached.
+    """
+    if palette:
+        gen = '[a]palettegen,split=2[pal][palette]'
+    else:
+        gen = '[a]palettegen[pal]'
+    return (f'[0:v]{filters},split=2[a][b];{gen};[b]fifo[b];'
+            f'[b][pal]paletteuse=dither={dither}[gif]')
+# ------------------------------------------------------------------------
+
+
+def gif_graph_cached(filters, dither):
+    """
+    Returns the filtergraph (str) of a GIF export to the
+    `[gif]` output pad using the palette of the second
+    input (a cached palette). The frames are not buffered
+    until the palette is ready, as with `gif_graph`.
+    """
+    return f'[0:v]{filters}[x];[x][1:v]paletteuse=dither={dither}[gif]'
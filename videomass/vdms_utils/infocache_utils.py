@@ -0,0 +1,187 @@
+# -*- coding: UTF-8 -*-
+"""
+Name: infocache_utils.py
+Porpose: On-disk cache of the metadata extracted by yt-dlp
+Compatibility: Python3
+Author: Gianluca Pernigotto <jeanlucperni@gmail.com>
+Copyleft - 2024 Gianluca Pernigotto <jeanlucperni@gmail.com>
+license: GPL3
+Rev: Oct.19.2026
+Code checker: flake8, pylint
+
+This file is part of Videomass.
+
+   Videomass is free software: you can redistribute it and/or modify
+   it under the terms of the GNU General Public License as published by
+   the Free Software Foundation, either version 3 of the License, or
+   (at your option) any later version.
+
+   Videomass is distributed in the hope that it will be useful,
+   but WITHOUT ANY WARRANTY; without even the implied warranty of
+   MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+   GNU General Public License for more details.
+
+   You should have received a copy of the GNU General Public License
+   along with Videomass.  If not, see <http://www.gnu.org/licenses/>.
+"""
+import os
+import json
+import time
+import hashlib
+from urllib.parse import urlsplit, urlunsplit, parse_qsl, urlencode
+
+# yt-dlp options which change the extracted metadata
+INFO_OPTIONS = ('noplaylist', 'playlist_items', 'extract_flat',
+                'cookiefile', 'cookiesfrombrowser', 'username',
+                'videopassword', 'proxy', 'geo_verification_proxy',
+                'geo_bypass', 'geo_bypass_country', 'geo_bypass_ip_block',
+                'nocheckcertificate',
+                )
+# query parameters which do not change the media of an URL
+TRACKING = ('feature', 'si', 'pp', 'fbclid', 'gclid')
+# the media URLs of the formats expire, the download step
+# does not use metadata older than this (seconds)
+FORMATS_TTL = 3600
+
+
+def normalize_url(url):
+    """
+    Returns `url` without fragment, tracking query parameters
+    (see `TRACKING`, and any `utm_*`), trailing slash, with
+    lowercase scheme and host and sorted query, so that the
+    same media gets the same cache key.
+    """
+    parts = urlsplit(url.strip())
+    query = sorted((key, val) for key, val
+                   in parse_qsl(parts.query, keep_blank_values=True)
+                   if key not in TRACKING and not key.startswith('utm_'))
+    path = parts.path.rstrip('/') if len(parts.path) > 1 else parts.path
+    return urlunsplit((parts.scheme.lower(), parts.netloc.lower(), path,
+                       urlencode(query), ''))
+# ------------------------------------------------------------------------
+
+
+def info_cachekey(url, opts):
+    """
+    Returns the cache key of the metadata of `url`
+    extracted with the yt-dlp `opts` dict: a hash of the
+    normalized URL and of the options in `INFO_OPTIONS`
+    that are set.
+    """
+    relevant = {key: opts[key] for key in INFO_OPTIONS if opts.get(key)}
+    data = json.dumps([normalize_url(url), relevant], sort_keys=True,
+                      default=str)
+    return hashlib.sha1(data.encode('utf-8')).hexdigest()
+# ------------------------------------------------------------------------
+
+
+def info_cachedir(cachedir):
+    """
+    Returns the directory of the metadata cache
+    inside the `cachedir` of the application.
+    """
+    return os.path.join(cachedir, 'ytdlp_info')
+# ------------------------------------------------------------------------
+
+
+def info_cachename(cachedir, key):
+    """
+    Returns the pathname of the cache file of `key` (see
+    `info_cachekey`). The file is the metadata as JSON, the
+    same written by the yt-dlp `--write-info-json` option,
+    so that it can be given to `--load-info-json`.
+    """
+    dirname = info_cachedir(cachedir)
+    os.makedirs(dirname, mode=0o777, exist_ok=True)
+    return os.path.join(dirname, f'{key}.json')
+# ------------------------------------------------------------------------
+
+
+def is_fresh(cachename, ttl, now=None):
+    """
+    Returns True if `cachename` exists and is not older
+    than `ttl` seconds.
+    """
+    try:
+        mtime = os.path.getmtime(cachename)
+    except OSError:
+        return False
+    now = time.time() if now is None else now
+    return ttl > 0 and now - mtime <= ttl
+# ------------------------------------------------------------------------
+
+
+def load_info(cachename, ttl, now=None):
+    """
+    Returns the metadata dict cached in `cachename` if
+    it is not older than `ttl` seconds, None otherwise.
+    Expired or unreadable files are removed.
+    """
+    if not os.path.isfile(cachename):
+        return None
+    if is_fresh(cachename, ttl, now):
+        try:
+            with open(cachename, 'r', encoding='utf-8') as fcache:
+                info = json.load(fcache)
+            if isinstance(info, dict):
+                return info
+        except (OSError, ValueError):
+            pass
+    try:
+        os.remove(cachename)
+    except OSError:
+        pass
+    return None
+# ------------------------------------------------------------------------
+
+
+def prune_info_cache(dirname, maxsize):
+    """
+    Removes the oldest files of the `dirname` cache
+    until their total size is at most `maxsize` bytes.
+    Returns the number of files removed.
+    """
+    try:
+        entries = []
+        for name in os.listdir(dirname):
+            path = os.path.join(dirname, name)
+            if name.endswith('.json') and os.path.isfile(path):
+                stat = os.stat(path)
+                entries.append((stat.st_mtime, stat.st_size, path))
+    except OSError:
+        return 0
+    total = sum(entry[1] for entry in entries)
+    removed = 0
+    for _mtime, size, path in sorted(entries):
+        if total <= maxsize:
+            break
+        try:
+            os.remove(path)
+        except OSError:
+            continue
+        total -= size
+        removed += 1
+    return removed
+# ------------------------------------------------------------------------
+
+
+def save_info(cachename, info, maxsize):
+    """
+    Writes the `info` metadata dict (JSON serializable)
+    to `cachename`, then prunes the cache to `maxsize`
+    bytes (see `prune_info_cache`).
+    """
+    tmpname = f'{cachename}.part'
+    with open(tmpname, 'w', encoding='utf-8') as fcache:
+        json.dump(info, fcache)
+    os.replace(tmpname, cachename)
+    prune_info_cache(os.path.dirname(cachename), maxsize)
+# ------------------------------------------------------------------------
+
+
+def clear_info_cache(cachedir):
+    """
+    Removes all the cached metadata from `cachedir`.
+    Returns the number of files removed.
+    """
+    return prune_info_cache(info_cachedir(cachedir), -1)
@@ -0,0 +1,208 @@
+# -*- coding: UTF-8 -*-
+"""
+Name: keyframe_utils.py
+Porpose: Keyframes and scene changes index files handling
+Compatibility: Python3
+Author: Gianluca Pernigotto <jeanlucperni@gmail.com>
+Copyleft - 2024 Gianluca Pernigotto <jeanlucperni@gmail.com>
+license: GPL3
+Rev: Oct.19.2026
+Code checker: flake8, pylint
+
+This file is part of Videomass.
+
+   Videomass is free software: you can redistribute it and/or modify
+   it under the terms of the GNU General Public License as published by
+   the Free Software Foundation, either version 3 of the License, or
+   (at your option) any later version.
+
+   Videomass is distributed in the hope that it will be useful,
+   but WITHOUT ANY WARRANTY; without even the implied warranty of
+   MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+   GNU General Public License for more details.
+
+   You should have received a copy of the GNU General Public License
+   along with Videomass.  If not, see <http://www.gnu.org/licenses/>.
+"""
+import os
+import re
+import sys
+import struct
+from bisect import bisect_left, bisect_right
+from array import array
+
+# Index file layout (little-endian):
+#   header: magic (4s), version (H), keyframes count (I), scenes count (I)
+#   data: keyframes times (int32 ms), scene cuts times (int32 ms),
+#         scene scores (float32), all sorted by time.
+MAGIC = b'VMKI'
+VERSION = 1
+HEADER = struct.Struct('<4sHII')
+SCENE_THRESHOLD = 0.3  # minimum score to detect a scene change
+PTS_TIME = re.compile(r'pts_time:(\d+(?:\.\d+)?)')
+SCENE_SCORE = re.compile(r'lavfi\.scene_score=(\d+(?:\.\d+)?)')
+
+
+def index_cachename(cachedir, fingerprint):
+    """
+    Returns the pathname of the keyframes index file for
+    the given source `fingerprint` (see `utils.media_fingerprint`).
+    """
+    dirname = os.path.join(cachedir, 'keyframes')
+    os.makedirs(dirname, mode=0o777, exist_ok=True)
+    return os.path.join(dirname, f'{fingerprint}.kfi')
+# ------------------------------------------------------------------------
+
+
+def parse_keyframes(output):
+    """
+    Parses the ffprobe output of `-show_entries packet=pts_time,flags`
+    in csv format (one `pts_time,flags` line for each packet) and
+    returns a sorted `array('i')` of keyframes times in milliseconds.
+    Packets without timestamps are ignored.
+    """
+    times = set()
+    for line in output.splitlines():
+        pts, flags = line.strip().partition(',')[::2]
+        if 'K' not in flags:
+            continue
+        try:
+            times.add(round(float(pts) * 1000))
+        except ValueError:  # i.e. N/A
+            continue
+    return array('i', sorted(times))
+# ------------------------------------------------------------------------
+
+
+def parse_scenes(output):
+    """
+    Parses the FFmpeg output of the `metadata=print` filter
+    placed after `select='gt(scene,N)'` and returns a tuple
+    of arrays (times, scores) sorted by time, where `times`
+    are in milliseconds.
+    """
+    found = {}
+    pts = None
+    for line in output.splitlines():
+        match = PTS_TIME.search(line)
+        if match:
+            pts = round(float(match.group(1)) * 1000)
+            continue
+        match = SCENE_SCORE.search(line)
+        if match and pts is not None:
+            found[pts] = float(match.group(1))
+            pts = None
+    times = sorted(found)
+    return array('i', times), array('f', [found[t] for t in times])
+# ------------------------------------------------------------------------
+
+
+def write_index(filename, keyframes, scenes=(), scores=()):
+    """
+    Writes the `keyframes` and optional `scenes` times (ms)
+    and their `scores` to `filename` as a compact binary
+    index file.
+    """
+    data = (array('i', keyframes), array('i', scenes), array('f', scores))
+    with open(filename, 'wb') as findex:
+        findex.write(HEADER.pack(MAGIC, VERSION,
+                                 len(data[0]), len(data[1])))
+        for arr in data:
+            if sys.byteorder != 'little':
+                arr.byteswap()
+            arr.tofile(findex)
+# ------------------------------------------------------------------------
+
+
+class KeyframeIndex:
+    """
+    Read access to an index file written by `write_index`.
+    All queries run in O(log n) by binary search on the sorted
+    arrays of times (milliseconds).
+
+    Usage:
+        >>> index = KeyframeIndex(filename)
+        >>> index.previous_keyframe(61000)
+        60060
+        >>> index.nearest_scene(61000)
+        58392
+
+    Raise `ValueError` if the file is not a valid index file,
+    `OSError` if it does not exist.
+    """
+    def __init__(self, filename):
+        """
+        self.keyframes: array of keyframes times
+        self.scenes: array of scene changes times
+        self.scores: array of scene changes scores
+        """
+        self.keyframes, self.scenes = array('i'), array('i')
+        self.scores = array('f')
+        with open(filename, 'rb') as findex:
+            head = findex.read(HEADER.size)
+            if len(head) != HEADER.size:
+                raise ValueError(f'Invalid index file: {filename}')
+            magic, version, nkeys, nscenes = HEADER.unpack(head)
+            if magic != MAGIC or version != VERSION:
+                raise ValueError(f'Invalid index file: {filename}')
+            try:
+                self.keyframes.fromfile(findex, nkeys)
+                self.scenes.fromfile(findex, nscenes)
+                self.scores.fromfile(findex, nscenes)
+            except EOFError as err:
+                raise ValueError(f'Invalid index file: {filename}') from err
+        if sys.byteorder != 'little':
+            for arr in (self.keyframes, self.scenes, self.scores):
+                arr.byteswap()
+
+    @staticmethod
+    def nearest(times, msec):
+        """
+        Returns the item of the sorted `times` array
+        nearest to `msec`, None if `times` is empty.
+        """
+        pos = bisect_left(times, msec)
+        near = [times[i] for i in (pos - 1, pos) if 0 <= i < len(times)]
+        if not near:
+            return None
+        return min(near, key=lambda t: abs(t - msec))
+
+    def nearest_keyframe(self, msec):
+        """
+        Returns the keyframe time nearest to `msec`
+        """
+        return KeyframeIndex.nearest(self.keyframes, msec)
+
+    def previous_keyframe(self, msec):
+        """
+        Returns the time of the last keyframe at or before
+        `msec` (i.e. where a stream copy cut really starts),
+        None if there are no keyframes before it.
+        """
+        pos = bisect_right(self.keyframes, msec)
+        return self.keyframes[pos - 1] if pos else None
+
+    def next_keyframe(self, msec):
+        """
+        Returns the time of the first keyframe at or after
+        `msec`, None if there are no keyframes after it.
+        """
+        pos = bisect_left(self.keyframes, msec)
+        return self.keyframes[pos] if pos < len(self.keyframes) else None
+
+    def nearest_scene(self, msec):
+        """
+        Returns the scene change time nearest to `msec`,
+        None if scene changes were not detected.
+        """
+        return KeyframeIndex.nearest(self.scenes, msec)
+
+    def scene_score(self, msec):
+        """
+        Returns the score of the scene change at `msec`
+        exactly, None if there is no scene change there.
+        """
+        pos = bisect_left(self.scenes, msec)
+        if pos < len(self.scenes) and self.scenes[pos] == msec:
+            return self.scores[pos]
+        return None
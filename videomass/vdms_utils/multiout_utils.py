@@ -0,0 +1,81 @@
+# -*- coding: UTF-8 -*-
+"""
+Name: multiout_utils.py
+Porpose: Groups the conversions of the same source into one process
+Compatibility: Python3
+Author: Gianluca Pernigotto <jeanlucperni@gmail.com>
+Copyleft - 2024 Gianluca Pernigotto <jeanlucperni@gmail.com>
+license: GPL3
+Rev: Oct.19.2026
+Code checker: flake8, pylint
+
+This file is part of Videomass.
+
+   Videomass is free software: you can redistribute it and/or modify
+   it under the terms of the GNU General Public License as published by
+   the Free Software Foundation, either version 3 of the License, or
+   (at your option) any later version.
+
+   Videomass is distributed in the hope that it will be useful,
+   but WITHOUT ANY WARRANTY; without even the implied warranty of
+   MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+   GNU General Public License for more details.
+
+   You should have received a copy of the GNU General Public License
+   along with Videomass.  If not, see <http://www.gnu.org/licenses/>.
+"""
+
+
+def can_share_input(item):
+    """
+    Returns True if the conversion `item` (a kwargs dict
+    as given to `ffmpeg.FFmpeg`) can be one of the outputs
+    of a multiple outputs process: one pass only, without
+    analysis of the source before encoding.
+    """
+    return (item.get('type') == 'One pass'
+            and not item.get('autocrop')
+            and not item.get('targetquality'))
+# ------------------------------------------------------------------------
+
+
+def group_outputs(items):
+    """
+    Groups the conversion `items` which have the same source,
+    time range and input options, so that each group can be
+    encoded by a single process decoding the source once.
+    Returns a list of lists of indexes of `items`, each
+    group placed at the position of its first item.
+    """
+    groups, keys = [], {}
+    for num, item in enumerate(items):
+        if not can_share_input(item):
+            groups.append([num])
+            continue
+        key = (item['source'], item.get('start-time', ''),
+               item.get('end-time', ''), item.get('pre-input-1', ''))
+        if key in keys:
+            keys[key].append(num)
+        else:
+            keys[key] = [num]
+            groups.append(keys[key])
+    return groups
+# ------------------------------------------------------------------------
+
+
+def multi_output_args(items):
+    """
+    Returns the output part (str) of the command line of a
+    multiple outputs process for the grouped `items`. Each
+    output gets its own time range, args and filters, FFmpeg
+    then decodes the source once and feeds all the encoders.
+    The args are given as they are (see `ffmpeg.simple_one_pass`),
+    so that their quoted values keep their own spaces.
+    """
+    outputs = []
+    for item in items:
+        outputs.append(f'{item.get("end-time", "")} '
+                       f'{item["args"][0]} '
+                       f'{item.get("volume", "")} '
+                       f'"{item["destination"]}"')
+    return ' '.join(outputs)
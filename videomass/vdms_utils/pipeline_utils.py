@@ -0,0 +1,199 @@
+# -*- coding: UTF-8 -*-
+"""
+Name: pipeline_utils.py
+Porpose: Helpers for the conversion of the downloads as they finish
+Compatibility: Python3
+Author: Gianluca Pernigotto <jeanlucperni@gmail.com>
+Copyleft - 2024 Gianluca Pernigotto <jeanlucperni@gmail.com>
+license: GPL3
+Rev: Oct.19.2026
+Code checker: flake8, pylint
+
+This file is part of Videomass.
+
+   Videomass is free software: you can redistribute it and/or modify
+   it under the terms of the GNU General Public License as published by
+   the Free Software Foundation, either version 3 of the License, or
+   (at your option) any later version.
+
+   Videomass is distributed in the hope that it will be useful,
+   but WITHOUT ANY WARRANTY; without even the implied warranty of
+   MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+   GNU General Public License for more details.
+
+   You should have received a copy of the GNU General Public License
+   along with Videomass.  If not, see <http://www.gnu.org/licenses/>.
+"""
+import os
+import json
+
+PIPELINE_LOG = 'Download Conversions.log'  # log of the conversions
+PIPELINE_SUFFIX = '_converted'  # if the output would replace the source
+
+
+def preset_profiles(filename):
+    """
+    Returns the list of the profiles (dict) of the
+    `filename` preset (see `presets_manager_utils.json_data`),
+    an empty list if the file is missing or invalid.
+    """
+    try:
+        with open(filename, 'r', encoding='utf-8') as fln:
+            data = json.load(fln)
+    except (OSError, ValueError):
+        return []
+    if not isinstance(data, list):
+        return []
+    return [prof for prof in data if isinstance(prof, dict)]
+# ------------------------------------------------------------------------
+
+
+def find_profile(profiles, name):
+    """
+    Returns the profile dict named `name` of the
+    `profiles` list, None if not found.
+    """
+    for prof in profiles:
+        if prof.get('Name') == name:
+            return prof
+    return None
+# ------------------------------------------------------------------------
+
+
+def profile_args(preset, profile):
+    """
+    Returns the arguments of the queue items converted
+    with the `profile` dict of the `preset` name, the same
+    given by `presets_manager.queue_mode`, without the
+    'source', 'destination' and 'duration' keys (see
+    `pipeline_item`).
+    """
+    pass1 = ' '.join(profile.get('First_pass', '').split())
+    pass2 = ' '.join(profile.get('Second_pass', '').split())
+    ext = profile.get('Output_extension', '').strip()
+    return {'type': 'Two pass' if pass2 else 'One pass',
+            'args': [pass1, pass2],
+            'pre-input-1': ' '.join(profile.get('Preinput_1', '').split()),
+            'pre-input-2': ' '.join(profile.get('Preinput_2', '').split()),
+            'preset name': f'Presets Manager - {preset}',
+            'start-time': '',
+            'end-time': '',
+            'logname': PIPELINE_LOG,
+            'extension': '' if ext == 'copy' else ext,
+            }
+# ------------------------------------------------------------------------
+
+
+def is_supported(supported, filename):
+    """
+    Returns True if the extension of `filename` is in the
+    `supported` str (the comma separated 'Supported_list'
+    of a profile), which supports all if empty.
+    """
+    items = [x for x in ''.join(supported.split()).split(',') if x]
+    ext = os.path.splitext(filename)[1].lstrip('.')
+    return not items or ext in items
+# ------------------------------------------------------------------------
+
+
+def pipeline_destination(source, extension, outputdir=None, suffix=''):
+    """
+    Returns the output pathname of the conversion of
+    `source` to `extension` ('' to keep that of `source`),
+    in `outputdir`, or with `suffix` in the directory of
+    `source` if `outputdir` is None, like `checkup.check_files`.
+    The output never replaces `source` (see `PIPELINE_SUFFIX`).
+    """
+    dirname, basename = os.path.split(source)
+    fname, ext = os.path.splitext(basename)
+    ext = f'.{extension}' if extension else ext
+    if outputdir is None:
+        destination = os.path.join(dirname, f'{fname}{suffix}{ext}')
+    else:
+        destination = os.path.join(outputdir, f'{fname}{ext}')
+    if os.path.abspath(destination) == os.path.abspath(source):
+        destination = os.path.join(os.path.dirname(destination),
+                                   f'{fname}{suffix}{PIPELINE_SUFFIX}{ext}')
+    return destination
+# ------------------------------------------------------------------------
+
+
+def probe_duration(probe):
+    """
+    Returns the duration in milliseconds of the media
+    of the `probe` data (see `ffprobe.ffprobe`), 0 if
+    not available.
+    """
+    try:
+        return round(float(probe['format']['duration']) * 1000)
+    except (KeyError, TypeError, ValueError):
+        return 0
+# ------------------------------------------------------------------------
+
+
+def pipeline_item(args, source, destination, duration):
+    """
+    Returns the queue item which converts `source` to
+    `destination` with the `args` (see `profile_args`),
+    `duration` is the duration of `source` in milliseconds.
+    """
+    return dict(args, source=source, destination=destination,
+                duration=duration)
+# ------------------------------------------------------------------------
+
+
+def can_stream(data):
+    """
+    Returns True if the download with the yt-dlp options
+    `data` can be piped into ffmpeg (see `stream_command`):
+    a single media, without post-processing and without any
+    file written beside it (subtitles, thumbnails).
+    """
+    return bool(data.get('noplaylist')
+                and not data.get('extractaudio')
+                and not data.get('postprocessors')
+                and not data.get('writesubtitles')
+                and not data.get('writethumbnail')
+                )
+# ------------------------------------------------------------------------
+
+
+def can_stream_profile(args):
+    """
+    Returns True if the `args` of a profile (see
+    `profile_args`) can encode a stream, i.e. in one
+    pass and to a given output format.
+    """
+    return args['type'] == 'One pass' and bool(args['extension'])
+# ------------------------------------------------------------------------
+
+
+def needs_merge(info):
+    """
+    Returns True if the formats selected in the `info`
+    metadata dict (as given by the yt-dlp `--dump-json`
+    option) must be merged, i.e. they can't be streamed.
+    """
+    return len(info.get('requested_formats') or ()) > 1
+# ------------------------------------------------------------------------
+
+
+def info_filename(info):
+    """
+    Returns the pathname of the download of the `info`
+    metadata dict (as given by the yt-dlp `--dump-json`
+    option), an empty str if not available.
+    """
+    return info.get('filename') or info.get('_filename') or ''
+# ------------------------------------------------------------------------
+
+
+def stream_command(ffmpeg, defargs, args, destination):
+    """
+    Returns the command line str which encodes the media
+    read from stdin to `destination` with the `args` of a
+    profile (see `profile_args`). `ffmpeg` is the pathname
+    of the executable and `defargs` its default arguments.
+    """
+    return (f'"{ffmpeg}" {defargs} {args["pre-input-1"]} -i pipe:0 '
+            f'{args["args"][0]} "{destination}"')
@@ -0,0 +1,217 @@
+# -*- coding: UTF-8 -*-
+"""
+Name: progress_utils.py
+Porpose: Progress of the downloads of the YouTube Downloader
+Compatibility: Python3
+Author: Gianluca Pernigotto <jeanlucperni@gmail.com>
+Copyleft - 2024 Gianluca Pernigotto <jeanlucperni@gmail.com>
+license: GPL3
+Rev: Oct.19.2026
+Code checker: flake8, pylint
+
+This file is part of Videomass.
+
+   Videomass is free software: you can redistribute it and/or modify
+   it under the terms of the GNU General Public License as published by
+   the Free Software Foundation, either version 3 of the License, or
+   (at your option) any later version.
+
+   Videomass is distributed in the hope that it will be useful,
+   but WITHOUT ANY WARRANTY; without even the implied warranty of
+   MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+   GNU General Public License for more details.
+
+   You should have received a copy of the GNU General Public License
+   along with Videomass.  If not, see <http://www.gnu.org/licenses/>.
+"""
+import json
+import time
+from threading import Lock
+from videomass.vdms_utils.utils import format_bytes
+
+PROGRESS_INTERVAL = 0.25  # min seconds between the progress of a download
+PROGRESS_MARK = '[videomass-progress]'  # prefix of the progress lines
+# fields of the progress of yt-dlp, both of the hooks and of the template
+PROGRESS_FIELDS = ('status', 'downloaded_bytes', 'total_bytes',
+                   'total_bytes_estimate', 'speed', 'eta',
+                   'fragment_index', 'fragment_count')
+# `--progress-template` of the yt-dlp executable, a JSON line per update
+PROGRESS_TEMPLATE = (f'download:{PROGRESS_MARK} '
+                     f'%(progress.{{{",".join(PROGRESS_FIELDS)}}})j')
+
+
+def number(value):
+    """
+    Returns `value` if it is a number (not a bool),
+    None otherwise.
+    """
+    if isinstance(value, (int, float)) and not isinstance(value, bool):
+        return value
+    return None
+# ------------------------------------------------------------------------
+
+
+def format_eta(seconds):
+    """
+    Returns the `seconds` as 'MM:SS', or 'H:MM:SS' from an
+    hour, 'N/A' if `seconds` is None.
+    """
+    if seconds is None:
+        return 'N/A'
+    mins, secs = divmod(int(seconds), 60)
+    hours, mins = divmod(mins, 60)
+    if hours:
+        return f'{hours}:{mins:02d}:{secs:02d}'
+    return f'{mins:02d}:{secs:02d}'
+# ------------------------------------------------------------------------
+
+
+class DownloadProgress:
+    """
+    The progress of a download, from the data of the
+    progress hooks of the yt-dlp module (see `from_dict`)
+    or from the progress lines of the yt-dlp executable
+    given the `PROGRESS_TEMPLATE` (see `from_line`), so
+    that both are shown the same way (see `columns`).
+
+    """
+    def __init__(self, status='downloading', downloaded=None, total=None,
+                 estimated=False, speed=None, eta=None, fragment=None,
+                 fragments=None):
+        """
+        status: (str) the yt-dlp status of the download
+        downloaded, total: (int) bytes, None if unknown
+        estimated: (bool) if `total` is an estimate
+        speed: (float) bytes per second, None if unknown
+        eta: (int) seconds left, None if unknown
+        fragment, fragments: (int) index and count of the
+                             fragments, None if not fragmented
+        """
+        self.status = status
+        self.downloaded = downloaded
+        self.total = total
+        self.estimated = estimated
+        self.speed = speed
+        self.eta = eta
+        self.fragment = fragment
+        self.fragments = fragments
+
+    def __eq__(self, other):
+        return (isinstance(other, DownloadProgress)
+                and vars(self) == vars(other))
+
+    def __repr__(self):
+        return f'DownloadProgress({vars(self)})'
+
+    @classmethod
+    def from_dict(cls, data):
+        """
+        Returns the progress of the `data` dict with the
+        `PROGRESS_FIELDS` keys, as given to the progress
+        hooks of yt-dlp.
+        """
+        total = number(data.get('total_bytes'))
+        estimate = number(data.get('total_bytes_estimate'))
+        return cls(status=data.get('status') or 'downloading',
+                   downloaded=number(data.get('downloaded_bytes')),
+                   total=total if total is not None else estimate,
+                   estimated=total is None and estimate is not None,
+                   speed=number(data.get('speed')),
+                   eta=number(data.get('eta')),
+                   fragment=number(data.get('fragment_index')),
+                   fragments=number(data.get('fragment_count')),
+                   )
+
+    @classmethod
+    def from_line(cls, line):
+        """
+        Returns the progress of an output `line` of the
+        yt-dlp executable given the `PROGRESS_TEMPLATE`,
+        None if `line` is not a progress line.
+        """
+        line = line.strip()
+        if not line.startswith(PROGRESS_MARK):
+            return None
+        try:
+            data = json.loads(line[len(PROGRESS_MARK):])
+        except ValueError:
+            return None
+        if not isinstance(data, dict):
+            return None
+        return cls.from_dict(data)
+
+    def percent(self):
+        """
+        Returns the percentage done, from the bytes or
+        else from the fragments, None if unknown.
+        """
+        if self.status == 'finished':
+            return 100.0
+        if self.total and self.downloaded is not None:
+            return min(100.0, self.downloaded * 100 / self.total)
+        if self.fragments and self.fragment is not None:
+            return min(100.0, self.fragment * 100 / self.fragments)
+        return None
+
+    def columns(self):
+        """
+        Returns a dict of str with the 'percent', 'size',
+        'speed' and 'eta' of the download, 'N/A' if unknown.
+        """
+        percent = self.percent()
+        size = 'N/A' if self.total is None else format_bytes(self.total)
+        return {'percent': 'N/A' if percent is None else f'{percent:.1f}%',
+                'size': f'~{size}' if self.estimated else size,
+                'speed': ('N/A' if self.speed is None
+                          else f'{format_bytes(self.speed)}/s'),
+                'eta': format_eta(self.eta),
+                }
+# ------------------------------------------------------------------------
+
+
+class ProgressThrottle:
+    """
+    Keeps the latest progress of each download (by key)
+    and tells when it is due to be shown, at most once every
+    `interval` seconds per download, so that the thousands
+    of callbacks of the fragment downloads do not flood the
+    GUI. The state transitions (e.g. finished, error) are
+    not throttled, see `flush`. Thread safe.
+
+    """
+    def __init__(self, interval=PROGRESS_INTERVAL, clock=time.monotonic):
+        """
+        self.latest: progress not shown yet, by key
+        self.shown: when the progress was last shown, by key
+        """
+        self.interval = interval
+        self.clock = clock
+        self.latest = {}
+        self.shown = {}
+        self.lock = Lock()
+
+    def update(self, key, progress):
+        """
+        Stores the `progress` of the `key` download.
+        Returns it if it is due to be shown now, None
+        if it is kept until the next update.
+        """
+        now = self.clock()
+        with self.lock:
+            last = self.shown.get(key)
+            if last is not None and now - last < self.interval:
+                self.latest[key] = progress
+                return None
+            self.shown[key] = now
+            self.latest.pop(key, None)
+            return progress
+
+    def flush(self, key):
+        """
+        Ends the throttling of the `key` download, e.g.
+        on its state transitions, which are shown at once.
+        Returns its progress not shown yet, None if none.
+        """
+        with self.lock:
+            self.shown.pop(key, None)
+            return self.latest.pop(key, None)
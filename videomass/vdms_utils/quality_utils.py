@@ -0,0 +1,185 @@
+# -*- coding: UTF-8 -*-
+"""
+Name: quality_utils.py
+Porpose: Helpers for the objective quality verification of outputs
+Compatibility: Python3
+Author: Gianluca Pernigotto <jeanlucperni@gmail.com>
+Copyleft - 2024 Gianluca Pernigotto <jeanlucperni@gmail.com>
+license: GPL3
+Rev: Oct.19.2026
+Code checker: flake8, pylint
+
+This file is part of Videomass.
+
+   Videomass is free software: you can redistribute it and/or modify
+   it under the terms of the GNU General Public License as published by
+   the Free Software Foundation, either version 3 of the License, or
+   (at your option) any later version.
+
+   Videomass is distributed in the hope that it will be useful,
+   but WITHOUT ANY WARRANTY; without even the implied warranty of
+   MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+   GNU General Public License for more details.
+
+   You should have received a copy of the GNU General Public License
+   along with Videomass.  If not, see <http://www.gnu.org/licenses/>.
+"""
+import os
+import re
+import csv
+
+SSIM = re.compile(r'SSIM .*All:(\d+(?:\.\d+)?)')
+PSNR = re.compile(r'PSNR .*average:(\d+(?:\.\d+)?|inf)')
+VMAF = re.compile(r'VMAF score[:=]\s*(\d+(?:\.\d+)?)')
+# video filters option of the FFmpeg args, its chain unquoted
+VFILTERS = re.compile(r'(?:^|\s)-(?:vf|filter:v)\s+'
+                      r'(?:"(?P<a>[^"]*)"|\'(?P<b>[^\']*)\'|(?P<c>\S+))')
+# filters which change the number or the timing of the frames
+RETIMING = ('fps', 'framerate', 'framestep', 'select', 'decimate',
+            'mpdecimate', 'minterpolate', 'interlace', 'tinterlace',
+            'w3fdif', 'telecine', 'pullup', 'fieldmatch', 'setpts',
+            'trim', 'loop', 'tpad', 'reverse')
+# deinterlacers, which output a frame per field in these modes
+FIELD_MODES = {'yadif': ('1', '3', 'send_field', 'send_field_nospatial'),
+               'bwdif': ('1', 'send_field'),
+               }
+# report columns as (key, header)
+COLUMNS = (('destination', 'Output file'), ('size', 'Size (bytes)'),
+           ('enctime', 'Encode time (s)'), ('ssim', 'SSIM'),
+           ('psnr', 'PSNR (dB)'), ('vmaf', 'VMAF'), ('status', 'Status'))
+
+
+def quality_filtergraph(subsample=1, vmaf=False, threads=0, reffilters=''):
+    """
+    Returns the `-lavfi` filtergraph comparing the first input
+    (the encoded output) with the second input (the source).
+    Both are aligned to zero timestamps, optionally reduced to
+    one frame every `subsample` frames, converted to the same
+    pixel format and the source is scaled to the output size.
+    The `ssim` and `psnr` filters always run, `libvmaf` only if
+    `vmaf` is True (using `threads`, 0 for auto).
+    The optional `reffilters` chain is applied to the source
+    first, i.e. the same filters used for the encoding.
+    """
+    ref = f'{reffilters},' if reffilters else ''
+    sel = f',select=not(mod(n\\,{subsample}))' if subsample > 1 else ''
+    metrics = ['ssim', 'psnr']
+    if vmaf:
+        metrics.append(f'libvmaf=n_threads={threads}' if threads
+                       else 'libvmaf')
+    count = len(metrics)
+    dists = ''.join(f'[d{n}]' for n in range(count))
+    refs = ''.join(f'[r{n}]' for n in range(count))
+    graph = [f'[0:v]setpts=PTS-STARTPTS{sel},format=yuv420p[dist]',
+             f'[1:v]{ref}setpts=PTS-STARTPTS{sel},format=yuv420p[ref]',
+             '[ref][dist]scale2ref=flags=bicubic[refs][dists]',
+             f'[dists]split={count}{dists}',
+             f'[refs]split={count}{refs}',
+             ]
+    graph.extend(f'[d{n}][r{n}]{m}' for n, m in enumerate(metrics))
+    return ';'.join(graph)
+# ------------------------------------------------------------------------
+
+
+def video_filters(args):
+    """
+    Returns the video filters chain (str) of the FFmpeg
+    `args` string (`-vf` or `-filter:v`), '' if none.
+    """
+    found = VFILTERS.findall(args)
+    return ''.join(found[-1]) if found else ''  # the last one wins
+# ------------------------------------------------------------------------
+
+
+def is_retimed(args):
+    """
+    Returns True if the FFmpeg `args` string changes the
+    number or the timing of the frames (`-r`, a complex
+    filtergraph or any filter of `RETIMING`, see also
+    `FIELD_MODES`), so that the output frames no longer
+    match those of the source.
+    """
+    opts = args.split()
+    if '-r' in opts or '-filter_complex' in opts or '-lavfi' in opts:
+        return True
+    for flt in video_filters(args).split(','):
+        name, _sep, params = flt.strip().partition('=')
+        if name in RETIMING:
+            return True
+        if name in FIELD_MODES:
+            mode = params.split(':')[0].replace('mode=', '')
+            if mode in FIELD_MODES[name]:
+                return True
+    return False
+# ------------------------------------------------------------------------
+
+
+def quality_command(ffmpeg_cmd, kwa, subsample=1, vmaf=False):
+    """
+    Returns the command line (str) comparing the output of
+    the `kwa` task (see `ffmpeg.FFmpeg`) with its source,
+    which first goes through the video filters of the encode
+    (e.g. crop, deinterlace, rotate), see `quality_filtergraph`.
+    Returns None if the output is not comparable with its
+    source (see `is_retimed`).
+    """
+    encode = kwa['args'][1] or kwa['args'][0]  # the last pass
+    if is_retimed(encode):
+        return None
+    graph = quality_filtergraph(subsample, vmaf,
+                                reffilters=video_filters(encode))
+    return (f'"{ffmpeg_cmd}" -hide_banner -nostats -loglevel info '
+            f'-i "{kwa["destination"]}" {kwa["start-time"]} '
+            f'{kwa["end-time"]} -i "{kwa["source"]}" '
+            f'-lavfi "{graph}" -f null -')
+# ------------------------------------------------------------------------
+
+
+def parse_quality(output):
+    """
+    Parses the FFmpeg output of the filtergraph given by
+    `quality_filtergraph` and returns a dict with `ssim`,
+    `psnr` and `vmaf` keys. Missing values are None, an
+    infinite PSNR (identical pictures) is float('inf').
+    """
+    scores = {}
+    for key, regex in (('ssim', SSIM), ('psnr', PSNR), ('vmaf', VMAF)):
+        found = regex.findall(output)
+        scores[key] = float(found[-1]) if found else None
+    return scores
+# ------------------------------------------------------------------------
+
+
+def format_report(report):
+    """
+    Returns the `report` (list of dicts, see `COLUMNS`) as
+    a plain text table, one line for each file.
+    """
+    def fmt(key, val):
+        if val is None:
+            return 'N/A'
+        if key == 'destination':
+            return os.path.basename(val)
+        if isinstance(val, float):
+            return f'{val:.4f}' if key == 'ssim' else f'{val:.2f}'
+        return str(val)
+
+    lines = [' | '.join(head for key, head in COLUMNS)]
+    for item in report:
+        lines.append(' | '.join(fmt(key, item.get(key))
+                                for key, head in COLUMNS))
+    return '\n'.join(lines)
+# ------------------------------------------------------------------------
+
+
+def report_to_csv(report, filename):
+    """
+    Exports the `report` (list of dicts, see `COLUMNS`)
+    to `filename` in CSV format.
+    """
+    with open(filename, 'w', newline='', encoding='utf-8') as fcsv:
+        writer = csv.writer(fcsv)
+        writer.writerow([head for key, head in COLUMNS])
+        for item in report:
+            writer.writerow(['' if item.get(key) is None else item[key]
+                             for key, head in COLUMNS])
@@ -0,0 +1,254 @@
+# -*- coding: UTF-8 -*-
+"""
+Name: ratelimit_utils.py
+Porpose: Bandwidth scheduler shared by the simultaneous downloads
+Compatibility: Python3
+Author: Gianluca Pernigotto <jeanlucperni@gmail.com>
+Copyleft - 2024 Gianluca Pernigotto <jeanlucperni@gmail.com>
+license: GPL3
+Rev: Oct.19.2026
+Code checker: flake8, pylint
+
+This file is part of Videomass.
+
+   Videomass is free software: you can redistribute it and/or modify
+   it under the terms of the GNU General Public License as published by
+   the Free Software Foundation, either version 3 of the License, or
+   (at your option) any later version.
+
+   Videomass is distributed in the hope that it will be useful,
+   but WITHOUT ANY WARRANTY; without even the implied warranty of
+   MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+   GNU General Public License for more details.
+
+   You should have received a copy of the GNU General Public License
+   along with Videomass.  If not, see <http://www.gnu.org/licenses/>.
+"""
+import re
+import time
+from threading import Lock
+
+DOWNLOAD_WEIGHT = 1.0  # weight of a media download
+UPDATE_WEIGHT = 0.25  # weight of the small downloads of the app
+SCHEDULE = re.compile(r'^(\d{1,2}):(\d{2})-(\d{1,2}):(\d{2})=(\d+)$')
+
+
+def parse_schedule(string):
+    """
+    Parses a time-of-day schedule of bandwidth limits, i.e.
+    a comma separated list of 'HH:MM-HH:MM=KiB/s' items, e.g.
+    '08:00-18:00=500, 23:00-06:00=0', where 0 is unlimited
+    and the intervals can cross midnight.
+    Returns a list of (begin, end, bytes/s) tuples, with
+    begin and end in minutes from midnight.
+    Raise ValueError if `string` is invalid.
+    """
+    schedule = []
+    for item in ''.join(string.split()).split(','):
+        if not item:
+            continue
+        match = SCHEDULE.match(item)
+        if not match:
+            raise ValueError(f'Invalid schedule: "{item}"')
+        bhour, bmin, ehour, emin, rate = (int(x) for x in match.groups())
+        if bhour > 23 or ehour > 24 or bmin > 59 or emin > 59:
+            raise ValueError(f'Invalid schedule: "{item}"')
+        schedule.append((bhour * 60 + bmin, ehour * 60 + emin,
+                         rate * 1024))
+    return schedule
+# ------------------------------------------------------------------------
+
+
+def scheduled_rate(schedule, default, minute):
+    """
+    Returns the bandwidth limit (bytes/s, 0 unlimited) of
+    the `minute` of the day from the `schedule` (see
+    `parse_schedule`), the `default` if not scheduled.
+    The first matching interval wins.
+    """
+    for begin, end, rate in schedule:
+        if begin <= end:
+            if begin <= minute < end:
+                return rate
+        elif minute >= begin or minute < end:  # crosses midnight
+            return rate
+    return default
+# ------------------------------------------------------------------------
+
+
+class TokenBucket:
+    """
+    A token bucket of `rate` bytes per second (0 unlimited)
+    which can hold up to a second of tokens, so that short
+    bursts are allowed while the average rate is kept.
+    The rate can be changed at any time with `set_rate`.
+
+    """
+    def __init__(self, rate, clock=time.monotonic):
+        """
+        self.tokens: bytes which can be transferred now,
+                     negative if in debt
+        """
+        self.clock = clock
+        self.rate = rate
+        self.tokens = rate
+        self.stamp = clock()
+
+    def set_rate(self, rate):
+        """
+        Changes the rate, the tokens are kept
+        within a second of the new rate.
+        """
+        self.fill()
+        self.rate = rate
+        self.tokens = min(self.tokens, rate)
+
+    def fill(self):
+        """
+        Adds the tokens accumulated since the last time
+        """
+        now = self.clock()
+        self.tokens = min(self.rate,
+                          self.tokens + (now - self.stamp) * self.rate)
+        self.stamp = now
+
+    def reserve(self, nbytes):
+        """
+        Takes the tokens for `nbytes` just transferred.
+        Returns the seconds to wait to keep the rate.
+        """
+        if self.rate <= 0:
+            return 0.0
+        self.fill()
+        self.tokens -= nbytes
+        return -self.tokens / self.rate if self.tokens < 0 else 0.0
+# ------------------------------------------------------------------------
+
+
+class BandwidthScheduler:
+    """
+    Shares a global bandwidth limit among the downloads running
+    at the same time, in proportion to their weights: each job
+    has its own `TokenBucket` with its share of the limit, which
+    is updated whenever a job starts or ends and whenever the
+    limit changes (see `configure` and `parse_schedule`).
+
+    USAGE:
+        >>> bandwidth = BandwidthScheduler()
+        >>> bandwidth.configure(1024 * 1024, [])
+        >>> bandwidth.join('job', DOWNLOAD_WEIGHT)
+        >>> time.sleep(bandwidth.reserve('job', nbytes))
+        >>> bandwidth.leave('job')
+
+    """
+    def __init__(self, clock=time.monotonic, localtime=time.localtime):
+        """
+        self.limit: bytes/s, 0 unlimited, out of the schedule
+        self.schedule: see `parse_schedule`
+        self.jobs: {job: (weight, TokenBucket)}
+        """
+        self.clock = clock
+        self.localtime = localtime
+        self.limit = 0
+        self.schedule = []
+        self.rate = 0  # limit in effect
+        self.checked = None  # minute of the day of the last check
+        self.jobs = {}
+        self.lock = Lock()
+
+    def current_rate(self):
+        """
+        Returns the limit in effect now (bytes/s, 0 unlimited)
+        """
+        now = self.localtime()
+        return scheduled_rate(self.schedule, self.limit,
+                              now.tm_hour * 60 + now.tm_min)
+
+    def reallocate(self):
+        """
+        Updates the buckets of the jobs with their
+        shares of the current limit. Call with the lock.
+        """
+        self.rate = self.current_rate()
+        total = sum(weight for weight, _bucket in self.jobs.values())
+        for weight, bucket in self.jobs.values():
+            bucket.set_rate(self.rate * weight / total if self.rate else 0)
+
+    def configure(self, limit, schedule):
+        """
+        Sets the global `limit` (bytes/s, 0 unlimited) and the
+        `schedule`, applied at once to the running jobs.
+        """
+        with self.lock:
+            self.limit = limit
+            self.schedule = schedule
+            self.reallocate()
+
+    def join(self, job, weight=DOWNLOAD_WEIGHT):
+        """
+        Adds the `job` (any hashable) with its `weight`
+        """
+        with self.lock:
+            self.jobs[job] = (weight, TokenBucket(0, self.clock))
+            self.reallocate()
+
+    def leave(self, job):
+        """
+        Removes the `job`, the others get its share
+        """
+        with self.lock:
+            if self.jobs.pop(job, None):
+                self.reallocate()
+
+    def share(self, job):
+        """
+        Returns the share of the limit of `job`
+        (bytes/s, 0 unlimited)
+        """
+        with self.lock:
+            return self.jobs[job][1].rate if job in self.jobs else 0
+
+    def reserve(self, job, nbytes):
+        """
+        Takes the tokens for `nbytes` just transferred by
+        the `job`. Returns the seconds to wait to keep the
+        limit. The schedule is checked once a minute.
+        """
+        with self.lock:
+            minute = int(self.clock() // 60)
+            if minute != self.checked:
+                self.checked = minute
+                if self.current_rate() != self.rate:
+                    self.reallocate()
+            if job not in self.jobs:
+                return 0.0
+            return self.jobs[job][1].reserve(nbytes)
+
+    def throttle(self, job, nbytes, cancelled=None):
+        """
+        Waits as long as `reserve` says, in steps of half
+        a second, stopping early if `cancelled()` is True.
+        """
+        wait = self.reserve(job, nbytes)
+        while wait > 0 and not (cancelled and cancelled()):
+            step = min(wait, 0.5)
+            time.sleep(step)
+            wait -= step
+# ------------------------------------------------------------------------
+
+
+BANDWIDTH = BandwidthScheduler()  # shared by all the downloads of the app
+
+
+def configure_bandwidth(limit, schedule):
+    """
+    Configures the `BANDWIDTH` scheduler with the `limit`
+    (KiB/s, 0 unlimited) and the `schedule` str (see
+    `parse_schedule`, ignored if invalid). Returns it.
+    """
+    try:
+        schedule = parse_schedule(schedule)
+    except ValueError:
+        schedule = []
+    BANDWIDTH.configure(limit * 1024, schedule)
+    return BANDWIDTH
@@ -31,6 +31,7 @@ import shutil
 import os
 import glob
 import math
+import hashlib
 
 
 class Popen(subprocess.Popen):
@@ -587,3 +588,72 @@ def detect_binaries(name, extradir=None):
         if os.path.isfile(execpath):
             return 'provided', execpath
     return 'not installed', None
+
+
+def media_fingerprint(filename) -> str:
+    """
+    Returns a hexadecimal string that identifies the current
+    state of the given media `filename`. It is computed from the
+    absolute path name, size and modification time of the file,
+    so it changes as soon as the file is replaced or modified.
+    This string is used as the key name of the data cached per
+    source in the `cachedir` (e.g. filmstrips, waveforms, etc).
+
+    Raise `OSError` if the file does not exist.
+    Returns str(hexdigest)
+    """
+    stat = os.stat(filename)
+    key = f'{os.path.abspath(filename)}|{stat.st_size}|{stat.st_mtime_ns}'
+    return hashlib.sha1(key.encode('utf-8')).hexdigest()
+# ------------------------------------------------------------------------
+
+
+def ffconcat_list(files, durations) -> str:
+    """
+    Returns the content of an ffconcat script (see the FFmpeg
+    concat demuxer) listing the `files` pathnames, each shown
+    for the corresponding item of `durations` (seconds).
+    The last file is listed again without duration, since
+    the concat demuxer ignores the duration of the last entry.
+    Single quotes in pathnames are escaped.
+    """
+    lines = ['ffconcat version 1.0']
+    for name, dur in zip(files, durations):
+        escaped = os.path.abspath(name).replace("'", "'\\''")
+        lines.append(f"file '{escaped}'")
+        lines.append(f'duration {dur}')
+    if len(lines) > 1:
+        lines.append(lines[-2])
+    return '\n'.join(lines) + '\n'
+# ------------------------------------------------------------------------
+
+
+def frame_ranges(start, duration, rate, workers) -> list:
+    """
+    Splits a constant frame `rate` extraction of `duration`
+    milliseconds starting at `start` milliseconds into up to
+    `workers` contiguous sub-ranges of whole frames, so that
+    they can be extracted by separate processes with the
+    same output numbering of a single process.
+
+    Returns a list of tuples (seek, length, frames, number)
+    where `seek` and `length` are in seconds, `frames` is the
+    number of frames to extract (None for the last range,
+    which runs until the end) and `number` the number of its
+    first output file (for the `-start_number` option).
+    """
+    total = int(duration / 1000 * rate)
+    workers = max(1, min(workers, total))
+    bounds = [total * i // workers for i in range(workers + 1)]
+    ranges = []
+    for i in range(workers):
+        first, end = bounds[i], bounds[i + 1]
+        seek = round(start / 1000 + first / rate, 6)
+        if i == workers - 1:
+            length = round(duration / 1000 - first / rate, 6)
+            frames = None
+        else:  # one more frame time as margin, frames are capped
+            length = round((end - first + 1) / rate, 6)
+            frames = end - first
+        ranges.append((seek, length, frames, first + 1))
+    return ranges
@@ -0,0 +1,161 @@
+# -*- coding: UTF-8 -*-
+"""
+Name: waveform_utils.py
+Porpose: Audio peaks computing and peaks file handling
+Compatibility: Python3
+Author: Gianluca Pernigotto <jeanlucperni@gmail.com>
+Copyleft - 2024 Gianluca Pernigotto <jeanlucperni@gmail.com>
+license: GPL3
+Rev: Oct.19.2026
+Code checker: flake8, pylint
+
+This file is part of Videomass.
+
+   Videomass is free software: you can redistribute it and/or modify
+   it under the terms of the GNU General Public License as published by
+   the Free Software Foundation, either version 3 of the License, or
+   (at your option) any later version.
+
+   Videomass is distributed in the hope that it will be useful,
+   but WITHOUT ANY WARRANTY; without even the implied warranty of
+   MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+   GNU General Public License for more details.
+
+   You should have received a copy of the GNU General Public License
+   along with Videomass.  If not, see <http://www.gnu.org/licenses/>.
+"""
+import os
+import sys
+import mmap
+import struct
+from array import array
+
+# Peaks file layout (little-endian):
+#   header: magic (4s), version (H), pairs per second (I), pairs count (I)
+#   data: `count` pairs of signed 16-bit integers (min, max)
+MAGIC = b'VMPK'
+VERSION = 1
+HEADER = struct.Struct('<4sHII')
+SAMPLERATE = 8000  # PCM sample rate to decode (mono, s16le)
+PAIRS_PER_SEC = 100  # peaks resolution stored on file
+
+
+def peaks_cachename(cachedir, fingerprint):
+    """
+    Returns the pathname of the peaks file for the given
+    source `fingerprint` (see `utils.media_fingerprint`).
+    """
+    dirname = os.path.join(cachedir, 'waveform')
+    os.makedirs(dirname, mode=0o777, exist_ok=True)
+    return os.path.join(dirname, f'{fingerprint}.peaks')
+# ------------------------------------------------------------------------
+
+
+def pcm_to_peaks(pcm, bucket):
+    """
+    Given a bytes-like object of signed 16-bit native-endian
+    PCM samples, returns an `array('h')` of interleaved min/max
+    pairs, one pair for each `bucket` samples (the last bucket
+    may be shorter). The min/max reductions run at C level on
+    memoryview slices, never iterating samples in Python.
+    """
+    samples = memoryview(pcm).cast('h')
+    peaks = array('h')
+    for pos in range(0, len(samples), bucket):
+        chunk = samples[pos:pos + bucket]
+        peaks.append(min(chunk))
+        peaks.append(max(chunk))
+    return peaks
+# ------------------------------------------------------------------------
+
+
+def write_peaks(filename, peaks, rate=PAIRS_PER_SEC):
+    """
+    Writes the `peaks` array (see `pcm_to_peaks`) to
+    `filename` as a compact binary peaks file.
+    """
+    data = array('h', peaks)
+    if sys.byteorder != 'little':
+        data.byteswap()
+    with open(filename, 'wb') as fpeaks:
+        fpeaks.write(HEADER.pack(MAGIC, VERSION, rate, len(data) // 2))
+        data.tofile(fpeaks)
+# ------------------------------------------------------------------------
+
+
+class PeaksFile:
+    """
+    Read-only, memory-mapped access to a peaks file written by
+    `write_peaks`. Only the pages actually needed are read from
+    disk, so even very long sources are drawn at any zoom level
+    without loading or decoding anything else.
+
+    Usage:
+        >>> with PeaksFile(filename) as peaks:
+        >>>     cols = peaks.columns(900)
+
+    Raise `ValueError` if the file is not a valid peaks file,
+    `OSError` if it does not exist.
+    """
+    def __init__(self, filename):
+        """
+        self.rate: peaks pairs per second
+        self.count: number of peaks pairs on file
+        """
+        with open(filename, 'rb') as fpeaks:
+            head = fpeaks.read(HEADER.size)
+            if len(head) != HEADER.size:
+                raise ValueError(f'Invalid peaks file: {filename}')
+            magic, version, self.rate, self.count = HEADER.unpack(head)
+            if magic != MAGIC or version != VERSION:
+                raise ValueError(f'Invalid peaks file: {filename}')
+            if not self.count:
+                self.mmap, self.view, self.data = None, None, array('h')
+                return
+            self.mmap = mmap.mmap(fpeaks.fileno(), 0,
+                                  access=mmap.ACCESS_READ)
+        self.view = memoryview(self.mmap)[HEADER.size:]
+        if sys.byteorder != 'little':  # data is little-endian on file
+            data = array('h', self.view.tobytes())
+            data.byteswap()
+            self.data = memoryview(data)
+        else:
+            self.data = self.view.cast('h')
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc_value, traceback):
+        self.close()
+
+    def close(self):
+        """
+        Releases the memory map
+        """
+        if self.mmap is not None:
+            self.data.release()
+            self.view.release()
+            self.mmap.close()
+            self.mmap = None
+
+    def columns(self, width, start=0, end=None):
+        """
+        Returns a list of `width` (min, max) tuples, one for
+        each pixel column, covering the time range from `start`
+        to `end` milliseconds (the whole source by default).
+        Columns with no data return (0, 0).
+        """
+        first = min(self.count, start * self.rate // 1000)
+        last = self.count if end is None else min(self.count,
+                                                  end * self.rate // 1000)
+        span = max(last - first, 0)
+        cols = []
+        for col in range(width):
+            beg = first + span * col // width
+            stop = max(first + span * (col + 1) // width, beg + 1)
+            if beg >= last:
+                cols.append((0, 0))
+                continue
+            pairs = self.data[beg * 2:min(stop, last) * 2]
+            cols.append((min(pairs[::2]), max(pairs[1::2])))
+        return cols
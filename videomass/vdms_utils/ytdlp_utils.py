@@ -0,0 +1,165 @@
+# -*- coding: UTF-8 -*-
+"""
+Name: ytdlp_utils.py
+Porpose: Helpers for the downloads and the playlists of the YouTube
+         Downloader
+Compatibility: Python3
+Author: Gianluca Pernigotto <jeanlucperni@gmail.com>
+Copyleft - 2024 Gianluca Pernigotto <jeanlucperni@gmail.com>
+license: GPL3
+Rev: Oct.19.2026
+Code checker: flake8, pylint
+
+This file is part of Videomass.
+
+   Videomass is free software: you can redistribute it and/or modify
+   it under the terms of the GNU General Public License as published by
+   the Free Software Foundation, either version 3 of the License, or
+   (at your option) any later version.
+
+   Videomass is distributed in the hope that it will be useful,
+   but WITHOUT ANY WARRANTY; without even the implied warranty of
+   MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+   GNU General Public License for more details.
+
+   You should have received a copy of the GNU General Public License
+   along with Videomass.  If not, see <http://www.gnu.org/licenses/>.
+"""
+import re
+
+MAX_DOWNLOADS = 16  # upper bound of the simultaneous downloads
+PLAYLIST_PAGE = 50  # playlist entries sent to the UI at a time
+PLAYLIST_MARKS = ('/playlist', '/channel/')  # URLs with many media
+
+# output lines of the executable which name the downloaded file
+OUTPUT_FILE = re.compile(r'^\[(?:download|ExtractAudio|VideoConvertor|'
+                         r'VideoRemuxer)\] (?:.*; )?Destination: (?P<a>.+)$'
+                         r'|^\[Merger\] Merging formats into "(?P<b>.+)"$'
+                         r'|^\[MoveFiles\] Moving file ".+" to "(?P<c>.+)"$'
+                         r'|^\[download\] (?P<d>.+) has already been '
+                         r'downloaded')
+# files written beside the media (subtitles, thumbnails, metadata)
+SIDECARS = ('.vtt', '.srt', '.ass', '.lrc', '.ttml', '.json3', '.srv1',
+            '.srv2', '.srv3', '.jpg', '.jpeg', '.png', '.webp', '.json',
+            '.description')
+# output line of the executable at the start of each media
+NEW_ITEM = re.compile(r'^\[info\] \S+: Downloading \d+ format')
+
+
+def pool_size(limit, count):
+    """
+    Returns the number of workers to download `count`
+    URLs with at most `limit` simultaneous downloads,
+    at least 1 and never more than `MAX_DOWNLOADS`.
+    """
+    try:
+        limit = int(limit)
+    except (TypeError, ValueError):
+        limit = 1
+    return max(1, min(limit, count, MAX_DOWNLOADS))
+# ------------------------------------------------------------------------
+
+
+def is_playlist_url(url):
+    """
+    Returns True if `url` refers to a playlist or to
+    a channel, i.e. it can be expanded to its entries.
+    """
+    return any(mark in url for mark in PLAYLIST_MARKS)
+# ------------------------------------------------------------------------
+
+
+def flat_entry(entry):
+    """
+    Returns the dict with the 'id', 'title', 'url' and
+    'duration' (seconds, None if unknown) of a playlist
+    `entry` as returned by yt-dlp with `extract_flat`,
+    i.e. without the extraction of its media. An empty
+    `entry` (unavailable media) gives empty 'id', 'title'
+    and 'url'.
+    """
+    duration = entry.get('duration')
+    return {'id': entry.get('id') or '',
+            'title': entry.get('title') or entry.get('url') or '',
+            'url': entry.get('url') or entry.get('webpage_url') or '',
+            'duration': duration if isinstance(duration, (int, float))
+            else None,
+            }
+# ------------------------------------------------------------------------
+
+
+def media_formats(meta):
+    """
+    Returns the list of the formats of a media `meta` data
+    as extracted by yt-dlp, i.e. its 'formats' or `meta`
+    itself for media with a single format. Returns an empty
+    list if they have no format code (unsupported URL).
+    """
+    formats = meta.get('formats', [meta]) or []
+    if not formats or not formats[0].get('format_id'):
+        return []
+    return formats
+# ------------------------------------------------------------------------
+
+
+def format_indexes(indexes):
+    """
+    Returns the `indexes` (iterable of int, starting from 1)
+    as str for the yt-dlp `playlist_items` option, with the
+    consecutive indexes collapsed into intervals, e.g.
+    [1, 2, 3, 7] returns '1-3,7'.
+    """
+    items = []
+    for index in sorted(set(indexes)):
+        if items and index == items[-1][1] + 1:
+            items[-1][1] = index
+        else:
+            items.append([index, index])
+    return ','.join(str(beg) if beg == end else f'{beg}-{end}'
+                    for beg, end in items)
+# ------------------------------------------------------------------------
+
+
+def parse_indexes(string):
+    """
+    Returns the set of int indexes of a `playlist_items`
+    str like '1-3,7' (see `format_indexes`), an empty set
+    if `string` is empty or invalid.
+    """
+    indexes = set()
+    for item in ''.join(string.split()).split(','):
+        beg, _sep, end = item.partition('-')
+        if not beg.isdigit() or (end and not end.isdigit()):
+            return set()
+        beg, end = int(beg), int(end or beg)
+        indexes.update(range(min(beg, end), max(beg, end) + 1))
+    return indexes
+# ------------------------------------------------------------------------
+
+
+def output_filename(line):
+    """
+    Returns the pathname of the file named by an output
+    `line` of the yt-dlp executable (the destination of the
+    download, of the merge or of a post-processor), None
+    if `line` does not name any. The last one named for
+    a media is its final file. The subtitles, thumbnails
+    and metadata files (see `SIDECARS`) are not returned.
+    """
+    match = OUTPUT_FILE.match(line.strip())
+    if not match:
+        return None
+    filename = next(val for val in match.groups() if val)
+    if filename.lower().endswith(SIDECARS):
+        return None
+    return filename
+# ------------------------------------------------------------------------
+
+
+def is_new_item(line):
+    """
+    Returns True if the output `line` of the yt-dlp
+    executable starts the download of another media
+    (e.g. the next entry of a playlist).
+    """
+    return NEW_ITEM.match(line.strip()) is not None
@@ -0,0 +1,190 @@
+# -*- coding: UTF-8 -*-
+"""
+Name: archive_browser.py
+Porpose: Shows the download archive of the YouTube Downloader
+Compatibility: Python3, wxPython Phoenix
+Author: Gianluca Pernigotto <jeanlucperni@gmail.com>
+Copyleft - 2024 Gianluca Pernigotto <jeanlucperni@gmail.com>
+license: GPL3
+Rev: Oct.19.2026
+Code checker: flake8, pylint
+
+This file is part of Videomass.
+
+   Videomass is free software: you can redistribute it and/or modify
+   it under the terms of the GNU General Public License as published by
+   the Free Software Foundation, either version 3 of the License, or
+   (at your option) any later version.
+
+   Videomass is distributed in the hope that it will be useful,
+   but WITHOUT ANY WARRANTY; without even the implied warranty of
+   MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+   GNU General Public License for more details.
+
+   You should have received a copy of the GNU General Public License
+   along with Videomass.  If not, see <http://www.gnu.org/licenses/>.
+"""
+import wx
+from videomass.vdms_utils.archive_utils import DownloadArchive
+
+
+class ArchiveList(wx.ListCtrl):
+    """
+    A virtual listctrl of the archive entries, so that
+    archives of any size are shown without delay.
+    """
+    def __init__(self, parent):
+        """
+        self.rows: list of the entries shown
+        """
+        self.rows = []
+        wx.ListCtrl.__init__(self, parent, wx.ID_ANY,
+                             style=wx.LC_REPORT
+                             | wx.LC_VIRTUAL
+                             | wx.SUNKEN_BORDER
+                             | wx.LC_HRULES
+                             )
+        self.InsertColumn(0, '#', width=70)
+        self.InsertColumn(1, _('Site'), width=150)
+        self.InsertColumn(2, _('Media ID'), width=300)
+
+    def set_rows(self, rows):
+        """
+        Shows the `rows` entries, with no selection
+        """
+        item = self.GetFirstSelected()
+        while item != -1:
+            self.Select(item, on=False)
+            item = self.GetNextSelected(item)
+        self.rows = rows
+        self.SetItemCount(len(rows))
+        self.Refresh()
+
+    def OnGetItemText(self, item, col):
+        """
+        Returns the text of the `col` column of the row
+        `item`, called by the wx.LC_VIRTUAL listctrl.
+        """
+        if col == 0:
+            return str(item + 1)
+        extractor, _sep, video_id = self.rows[item].partition(' ')
+        return extractor if col == 1 else video_id
+
+    def get_selected(self):
+        """
+        Returns the list of the selected entries
+        """
+        selected, item = [], self.GetFirstSelected()
+        while item != -1:
+            selected.append(self.rows[item])
+            item = self.GetNextSelected(item)
+        return selected
+
+
+class ArchiveBrowser(wx.Dialog):
+    """
+    Shows the entries of the download archive (the media
+    already downloaded), which can be searched and removed,
+    so that their media will be downloaded again.
+    See ``main_ytdlp.py`` -> ``on_download_archive`` method
+    for how to use this class.
+    """
+    def __init__(self, parent, filename):
+        """
+        self.archive: the `DownloadArchive` of `filename`
+        """
+        self.archive = DownloadArchive(filename)
+        wx.Dialog.__init__(self, parent, -1, style=wx.DEFAULT_DIALOG_STYLE
+                           | wx.RESIZE_BORDER)
+
+        sizer_base = wx.BoxSizer(wx.VERTICAL)
+        self.search = wx.SearchCtrl(self, wx.ID_ANY, "",
+                                    style=wx.TE_PROCESS_ENTER)
+        self.search.ShowCancelButton(True)
+        sizer_base.Add(self.search, 0, wx.ALL | wx.EXPAND, 5)
+        self.entries = ArchiveList(self)
+        self.entries.SetMinSize((550, 350))
+        sizer_base.Add(self.entries, 1, wx.ALL | wx.EXPAND, 5)
+        self.lbl_count = wx.StaticText(self, label='')
+        sizer_base.Add(self.lbl_count, 0, wx.ALL, 5)
+        # buttons:
+        grid_btn = wx.GridSizer(1, 2, 0, 0)
+        self.btn_remove = wx.Button(self, wx.ID_REMOVE, _("Remove"))
+        self.btn_remove.Disable()
+        grid_btn.Add(self.btn_remove, 0, wx.ALL, 5)
+        btn_close = wx.Button(self, wx.ID_CLOSE, "")
+        grid_btn.Add(btn_close, 0, wx.ALL | wx.ALIGN_RIGHT, 5)
+        sizer_base.Add(grid_btn, 0, wx.EXPAND)
+        # tooltips:
+        self.search.SetToolTip(_('Search by site or media ID'))
+        self.btn_remove.SetToolTip(_('Remove the selected entries from the '
+                                     'archive, so that their media will be '
+                                     'downloaded again.'))
+        # final settings:
+        self.SetTitle(_("Download archive"))
+        self.SetEscapeId(wx.ID_CLOSE)
+        self.SetSizer(sizer_base)
+        sizer_base.Fit(self)
+        self.Layout()
+        self.on_search(None)
+        # ----------------------Binding (EVT)--------------------------#
+        self.Bind(wx.EVT_TEXT, self.on_search, self.search)
+        self.Bind(wx.EVT_SEARCHCTRL_CANCEL_BTN, self.on_cancel_search,
+                  self.search)
+        self.Bind(wx.EVT_LIST_ITEM_SELECTED, self.on_select, self.entries)
+        self.Bind(wx.EVT_LIST_ITEM_DESELECTED, self.on_select, self.entries)
+        self.Bind(wx.EVT_BUTTON, self.on_remove, self.btn_remove)
+        self.Bind(wx.EVT_BUTTON, self.on_close, btn_close)
+    # ------------------------------------------------------------------#
+
+    def on_search(self, event):
+        """
+        Shows the entries which contain the searched text
+        """
+        text = self.search.GetValue().strip().lower()
+        entries = self.archive.getlist()
+        rows = [entry for entry in entries if text in entry.lower()]
+        self.entries.set_rows(rows)
+        self.btn_remove.Disable()
+        self.lbl_count.SetLabel(_('Entries: {0} of {1}'
+                                  ).format(len(rows), len(entries)))
+    # ------------------------------------------------------------------#
+
+    def on_cancel_search(self, event):
+        """
+        Clears the search text
+        """
+        self.search.SetValue('')
+    # ------------------------------------------------------------------#
+
+    def on_select(self, event):
+        """
+        Enables the removal if there are selected entries
+        """
+        self.btn_remove.Enable(self.entries.GetSelectedItemCount() > 0)
+    # ------------------------------------------------------------------#
+
+    def on_remove(self, event):
+        """
+        Removes the selected entries from the archive
+        """
+        selected = self.entries.get_selected()
+        if wx.MessageBox(_('Are you sure you want to remove {0} entries '
+                           'from the download archive?'
+                           ).format(len(selected)),
+                         _('Please confirm'), wx.ICON_QUESTION | wx.CANCEL
+                         | wx.YES_NO, self) != wx.YES:
+            return
+        try:
+            self.archive.remove(selected)
+        except OSError as err:
+            wx.MessageBox(str(err), _('Videomass - Error!'),
+                          wx.ICON_ERROR, self)
+        self.on_search(None)
+    # ------------------------------------------------------------------#
+
+    def on_close(self, event):
+        """
+        Close this dialog
+        """
+        self.EndModal(wx.ID_CLOSE)
@@ -6,7 +6,7 @@ Compatibility: Python3, wxPython Phoenix
 Author: Gianluca Pernigotto <jeanlucperni@gmail.com>
 Copyleft - 2024 Gianluca Pernigotto <jeanlucperni@gmail.com>
 license: GPL3
-Rev: Feb.07.2024
+Rev: Oct.19.2026
 Code checker: flake8, pylint
 
 This file is part of Videomass.
@@ -25,8 +25,8 @@ This file is part of Videomass.
    along with Videomass.  If not, see <http://www.gnu.org/licenses/>.
 """
 import wx
-from videomass.vdms_io.io_tools import youtubedl_getstatistics
 from videomass.vdms_utils.utils import format_bytes
+from videomass.vdms_utils.ytdlp_utils import media_formats
 
 
 if not hasattr(wx, 'EVT_LIST_ITEM_CHECKED'):
@@ -200,57 +200,46 @@ class FormatCode(wx.Panel):
                             self.format_dict[url].append('Video: ' + dispv)
     # ----------------------------------------------------------------------
 
-    def set_formatcode(self, data_url, kwargs):
+    def add_formatcodes(self, link, meta):
         """
-        Get URLs data and format codes by generator object
-        `youtubedl_getstatistics`. Return `True` if `meta[1]`
-        (error), otherwise return None as exit status.
+        Appends the format codes of the `link` URL found in
+        its `meta` data, which may arrive in any order (see
+        `YdlInfoPool`). Returns an error message if the URL
+        is unsupported, None otherwise.
         """
-        self.urls = data_url.copy()
-        meta = None, None
-        index = 0
-        for link in data_url:
-            data = youtubedl_getstatistics(link,
-                                           kwargs,
-                                           parent=self.GetParent(),
-                                           )
-            for meta in data:
-                if meta[1]:
-                    return meta[1]
-
-            formats = iter(meta[0].get('formats', [meta[0]]))
-            for n, f in enumerate(formats):
-                if f.get('vcodec'):
-                    vcodec, fps = f['vcodec'], f"{f.get('fps')}"
-                else:
-                    vcodec, fps = '', ''
-                if f.get('acodec'):
-                    acodec = f['acodec']
-                else:
-                    acodec = 'Video only'
-                if f.get('filesize'):
-                    size = format_bytes(float(f['filesize']))
-                else:
-                    size = 'N/A'
-
-                formatid = f.get('format_id', 'UNSUPPORTED')
-                self.fcode.InsertItem(index, formatid)
-                self.fcode.SetItem(index, 1, link)
-                self.fcode.SetItem(index, 2, meta[0].get('title', 'N/A'))
-                self.fcode.SetItem(index, 3, f.get('ext', 'N/A'))
-                self.fcode.SetItem(index, 4, f.get('format',
-                                                   '-N/A').split('-')[1])
-                self.fcode.SetItem(index, 5, vcodec)
-                self.fcode.SetItem(index, 6, fps)
-                self.fcode.SetItem(index, 7, acodec)
-                self.fcode.SetItem(index, 8, size)
-                if n == 0:
-                    if formatid == 'UNSUPPORTED':
-                        return _("ERROR: Unable to get format codes.\n\n"
-                                 "Unsupported URL:\n'{0}'").format(link)
-
-                    self.fcode.SetItemBackgroundColour(index, FormatCode.GREEN)
-                index += 1
+        formats = media_formats(meta)
+        if not formats:
+            return _("ERROR: Unable to get format codes.\n\n"
+                     "Unsupported URL:\n'{0}'").format(link)
+
+        for n, f in enumerate(formats):
+            if f.get('vcodec'):
+                vcodec, fps = f['vcodec'], f"{f.get('fps')}"
+            else:
+                vcodec, fps = '', ''
+            if f.get('acodec'):
+                acodec = f['acodec']
+            else:
+                acodec = 'Video only'
+            if f.get('filesize'):
+                size = format_bytes(float(f['filesize']))
+            else:
+                size = 'N/A'
+
+            index = self.fcode.GetItemCount()
+            formatid = f.get('format_id', 'UNSUPPORTED')
+            self.fcode.InsertItem(index, formatid)
+            self.fcode.SetItem(index, 1, link)
+            self.fcode.SetItem(index, 2, meta.get('title', 'N/A'))
+            self.fcode.SetItem(index, 3, f.get('ext', 'N/A'))
+            self.fcode.SetItem(index, 4, f.get('format',
+                                               '-N/A').split('-')[1])
+            self.fcode.SetItem(index, 5, vcodec)
+            self.fcode.SetItem(index, 6, fps)
+            self.fcode.SetItem(index, 7, acodec)
+            self.fcode.SetItem(index, 8, size)
+            if n == 0:
+                self.fcode.SetItemBackgroundColour(index, FormatCode.GREEN)
         return None
     # ----------------------------------------------------------------------
 
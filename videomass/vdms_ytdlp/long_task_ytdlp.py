@@ -6,7 +6,7 @@ Compatibility: Python3, wxPython4 Phoenix
 Author: Gianluca Pernigotto <jeanlucperni@gmail.com>
 Copyleft - 2024 Gianluca Pernigotto <jeanlucperni@gmail.com>
 license: GPL3
-Rev: March.17.2023
+Rev: Oct.19.2026
 Code checker: flake8, pylint
 
 This file is part of Videomass.
@@ -25,6 +25,7 @@ This file is part of Videomass.
    along with Videomass.  If not, see <http://www.gnu.org/licenses/>.
 """
 import os
+from collections import Counter
 from pubsub import pub
 import wx
 from videomass.vdms_dialogs.widget_utils import notification_area
@@ -35,21 +36,32 @@ from videomass.vdms_io import io_tools
 
 class LogOut(wx.Panel):
     """
-    displays a text control for the output logging and a
-    progressive percentage text label. This panel is used
-    in combination with separated threads for long processing
-    tasks.
+    displays a list with a row for each URL, a text control
+    for the output logging and a text label with the number
+    of URLs for each state. This panel is used in combination
+    with separated threads for long processing tasks, which
+    download several URLs at the same time and send messages
+    with the `index` of the URL they refer to.
 
     """
     MSG_stop = '[Videomass]: STOP command received.'
     MSG_done = _('[Videomass]: SUCCESS !')
     MSG_failed = _('[Videomass]: FAILED !')
+    MSG_archived = _('[Videomass]: Already in the download archive, '
+                     'skipped.')
     MSG_taskfailed = _('Sorry, all task failed !')
     MSG_fatalerror = _("The process was stopped due to a fatal error.")
     MSG_interrupted = _('Interrupted Process !')
     MSG_completed = _('Successfully completed !')
     MSG_unfinished = _('Not everything was successful.')
-
+    # states of the URLs rows:
+    STATES = {'queued': _('Queued'),
+              'active': _('Downloading'),
+              'done': _('Completed'),
+              'failed': _('Failed'),
+              'stopped': _('Stopped'),
+              'archived': _('Already downloaded'),
+              }
     WHITE = '#fbf4f4'  # white for background status bar
     BLACK = '#060505'  # black for background status bar
     YELLOW = '#bd9f00'
@@ -68,9 +80,8 @@ class LogOut(wx.Panel):
         self.abort = False  # if True set to abort current process
         self.error = False  # if True, all the tasks was failed
         self.logfile = None  # full path log file
-        self.result = []  # result of the final process
-        self.count = 0  # keeps track of the counts (see `update_count`)
-        self.maxrotate = 0  # max num text rotation (see `update_count`)
+        self.states = []  # state of each URL (see `STATES`)
+        self.urls = []  # URLs of the current process
         self.clr = self.appdata['colorscheme']
 
         wx.Panel.__init__(self, parent=parent)
@@ -83,6 +94,17 @@ class LogOut(wx.Panel):
         sizer.Add((0, 25))
         sizer.Add(lbl, 0, wx.ALL, 5)
         sizer.Add((0, 10))
+        self.urlrows = wx.ListCtrl(self, wx.ID_ANY, style=wx.LC_REPORT
+                                   | wx.SUNKEN_BORDER | wx.LC_SINGLE_SEL
+                                   )
+        self.urlrows.InsertColumn(0, ('#'), width=40)
+        self.urlrows.InsertColumn(1, (_('Url')), width=400)
+        self.urlrows.InsertColumn(2, (_('Status')), width=120)
+        self.urlrows.InsertColumn(3, (_('Progress')), width=90)
+        self.urlrows.InsertColumn(4, (_('Size')), width=100)
+        self.urlrows.InsertColumn(5, (_('Speed')), width=110)
+        self.urlrows.InsertColumn(6, (_('ETA')), width=80)
+        sizer.Add(self.urlrows, 1, wx.EXPAND | wx.ALL, 5)
         self.btn_viewlog = wx.Button(self, wx.ID_ANY, _("Current Log"),
                                      size=(-1, -1))
         self.btn_viewlog.Disable()
@@ -137,13 +159,77 @@ class LogOut(wx.Panel):
                                          mode="w",
                                          )
         self.btn_viewlog.Disable()
+        self.urls = list(urls)
+        self.states = ['queued'] * len(self.urls)
+        self.urlrows.DeleteAllItems()
+        for index, url in enumerate(self.urls):
+            self.urlrows.InsertItem(index, str(index + 1))
+            self.urlrows.SetItem(index, 1, url)
+            self.urlrows.SetItem(index, 2, LogOut.STATES['queued'])
+        self.show_states()
+
         if self.appdata['ytdlp-useexec']:
-            self.thread_type = YtdlExecDL(args[1], urls, self.logfile)
+            self.thread_type = YtdlExecDL(args[1], urls, self.logfile,
+                                          args[2], args[3])
         else:
-            self.thread_type = YdlDownloader(args[1], urls, self.logfile)
+            self.thread_type = YdlDownloader(args[1], urls, self.logfile,
+                                             args[2])
+    # ----------------------------------------------------------------------
+
+    def tag(self, index):
+        """
+        Returns the prefix of the output lines of the URL
+        at `index`, needed to tell apart the output of the
+        simultaneous downloads.
+        """
+        if index is None or len(self.states) < 2:
+            return ''
+        return f'[{index + 1}] '
+    # ----------------------------------------------------------------------
+
+    def show_states(self):
+        """
+        Shows the number of URLs for each state
+        """
+        states = Counter(self.states)
+        self.labprog.SetLabel(_('Downloading: {0}  |  Completed: {1}  |  '
+                                'Failed: {2}  |  Queued: {3}  |  '
+                                'Skipped: {4}'
+                                ).format(states['active'], states['done'],
+                                         states['failed'], states['queued'],
+                                         states['archived']))
+    # ----------------------------------------------------------------------
+
+    def update_row(self, index, state=None, progress=None):
+        """
+        Updates the row of the URL at `index` with the new
+        `state` (a key of `STATES`) and/or the `progress` dict
+        with 'percent', 'size', 'speed' and 'eta' keys.
+        """
+        if index is None or index >= len(self.states):
+            return
+        if state:
+            self.states[index] = state
+            self.urlrows.SetItem(index, 2, LogOut.STATES[state])
+            colors = {'done': self.clr['SUCCESS'],
+                      'failed': self.clr['ERR1'],
+                      'stopped': self.clr['ABORT'],
+                      'archived': self.clr['INFO'],
+                      }
+            if state in colors:
+                self.urlrows.SetItemTextColour(index, colors[state])
+                for col in (5, 6):
+                    self.urlrows.SetItem(index, col, '')
+            if state == 'done':
+                self.urlrows.SetItem(index, 3, '100%')
+            self.show_states()
+        if progress and self.states[index] == 'active':
+            for col, key in ((3, 'percent'), (4, 'size'),
+                             (5, 'speed'), (6, 'eta')):
+                self.urlrows.SetItem(index, col, progress[key].strip())
     # ----------------------------------------------------------------------
 
-    def youtubedl_exec(self, output, duration, status):
+    def youtubedl_exec(self, index, output, duration, status):
         """
         Receiving output messages from yt-dlp command line execution
         via pubsub "UPDATE_YDL_EXECUTABLE_EVT" .
@@ -155,100 +241,108 @@ class LogOut(wx.Panel):
             else:
                 msg, color = LogOut.MSG_failed, self.clr['ERR1']
             self.txtout.SetDefaultStyle(wx.TextAttr(color))
-            self.txtout.AppendText(f"\n{msg}\n")
-            self.result.append('failed')
+            self.txtout.AppendText(f"\n{self.tag(index)}{msg}\n")
             return  # must be return here
 
-        if '[download] Destination:' in output:
+        if status == 'DOWNLOAD':  # a `DownloadProgress`
+            self.update_row(index, progress=duration.columns())
+
+        elif '[download] Destination:' in output:
             self.txtout.SetDefaultStyle(wx.TextAttr(self.clr['DEBUG']))
-            self.txtout.AppendText(f'{output}')
+            self.txtout.AppendText(f'{self.tag(index)}{output}')
 
-        elif '[download]' in output:
-            self.labprog.SetLabel(output)
+        elif 'recorded in the archive' in output:
+            self.txtout.SetDefaultStyle(wx.TextAttr(self.clr['INFO']))
+            self.txtout.AppendText(f'{self.tag(index)}{output}')
 
         else:
             if 'WARNING:' in output:
                 self.txtout.SetDefaultStyle(wx.TextAttr(self.clr['WARN']))
-                self.txtout.AppendText(f'{output}')
             elif '[info]' in output:
                 self.txtout.SetDefaultStyle(wx.TextAttr(self.clr['INFO']))
-                self.txtout.AppendText(f'{output}')
             elif 'ERROR:' in output:
                 self.txtout.SetDefaultStyle(wx.TextAttr(self.clr['ERR0']))
-                self.txtout.AppendText(f'{output}')
             else:
                 self.txtout.SetDefaultStyle(wx.TextAttr(self.clr['TXT1']))
-                self.txtout.AppendText(f'{output}')
+            self.txtout.AppendText(f'{self.tag(index)}{output}')
 
             with open(self.logfile, "a", encoding='utf-8') as logerr:
-                logerr.write(f"[YT_DLP]: {output}")
+                logerr.write(f"[YT_DLP]: {self.tag(index)}{output}")
     # ---------------------------------------------------------------------#
 
-    def downloader_activity(self, output, duration, status):
+    def downloader_activity(self, index, output, duration, status):
         """
         Receiving output messages from youtube_dl library via
         pubsub "UPDATE_YDL_EVT" .
         """
+        tag = self.tag(index)
         if status == 'ERROR':
             self.txtout.SetDefaultStyle(wx.TextAttr(self.clr['ERR0']))
-            self.txtout.AppendText(f'{output}\n')
+            self.txtout.AppendText(f'{tag}{output}\n')
             self.txtout.SetDefaultStyle(wx.TextAttr(self.clr['FAILED']))
-            self.txtout.AppendText(f"{LogOut.MSG_failed}\n")
-            self.result.append('failed')
+            self.txtout.AppendText(f"{tag}{LogOut.MSG_failed}\n")
 
         elif status == 'WARNING':
             self.txtout.SetDefaultStyle(wx.TextAttr(self.clr['WARN']))
-            self.txtout.AppendText(f'{output}\n')
+            self.txtout.AppendText(f'{tag}{output}\n')
 
         elif status == 'DEBUG':
             if '[download] Destination' in output:
                 self.txtout.SetDefaultStyle(wx.TextAttr(self.clr['DEBUG']))
-                self.txtout.AppendText(f'{output}\n')
+                self.txtout.AppendText(f'{tag}{output}\n')
 
-            elif '[info]' in output:
+            elif ('[info]' in output
+                  or 'recorded in the archive' in output):
                 self.txtout.SetDefaultStyle(wx.TextAttr(self.clr['INFO']))
-                self.txtout.AppendText(f'{output}\n')
+                self.txtout.AppendText(f'{tag}{output}\n')
 
             elif '[download]' not in output:
                 self.txtout.SetDefaultStyle(wx.TextAttr(self.clr['TXT1']))
-                self.txtout.AppendText(f'{output}\n')
+                self.txtout.AppendText(f'{tag}{output}\n')
                 with open(self.logfile, "a", encoding='utf-8') as logerr:
-                    logerr.write(f"[YT_DLP]: {status} > {output}\n")
+                    logerr.write(f"[YT_DLP]: {status} > {tag}{output}\n")
 
-        elif status == 'DOWNLOAD':
-            perc = duration['_percent_str'].strip()
-            tbytes = duration['_total_bytes_str'].strip()
-            speed = duration['_speed_str'].strip()
-            eta = duration['_eta_str'].strip()
-            self.labprog.SetLabel(f'Downloading: {perc}  |  Size: {tbytes}  '
-                                  f'|  Speed: {speed} |  ETA: {eta}')
+        elif status == 'DOWNLOAD':  # a `DownloadProgress`
+            self.update_row(index, progress=duration.columns())
 
         elif status == 'FINISHED':
             self.txtout.SetDefaultStyle(wx.TextAttr(self.clr['TXT1']))
-            self.txtout.AppendText(f'{duration}\n')
+            self.txtout.AppendText(f'{tag}{duration}\n')
 
         if status in ['ERROR', 'WARNING']:
             with open(self.logfile, "a", encoding='utf-8') as logerr:
-                logerr.write(f"[YT_DLP]: {output}\n")
+                logerr.write(f"[YT_DLP]: {tag}{output}\n")
     # ---------------------------------------------------------------------#
 
-    def update_count(self, count, fsource, destination, duration, end):
+    def update_count(self, index, count, fsource, destination, duration, end):
         """
         Receive messages from file count, loop or non-loop thread.
+        `end` is 'CONTINUE' when the download of the URL at `index`
+        starts, 'DONE' or 'FAILED' when it ends, 'ARCHIVED' if it
+        is skipped as already downloaded, 'ERROR' on fatal errors,
+        with `index` set to None.
         """
+        if end == 'ARCHIVED':
+            self.update_row(index, 'archived')
+            self.txtout.SetDefaultStyle(wx.TextAttr(self.clr['INFO']))
+            self.txtout.AppendText(f'\n{count}\n{fsource}\n'
+                                   f'{self.tag(index)}{LogOut.MSG_archived}'
+                                   f'\n')
+            return
         if end == 'DONE':
+            self.update_row(index, 'done')
             self.txtout.SetDefaultStyle(wx.TextAttr(self.clr['SUCCESS']))
-            self.txtout.AppendText(f"{LogOut.MSG_done}\n")
+            self.txtout.AppendText(f"{self.tag(index)}{LogOut.MSG_done}\n")
+            return
+        if end == 'FAILED':
+            self.update_row(index, 'failed')
             return
         if end == 'ERROR':
             self.txtout.SetDefaultStyle(wx.TextAttr(self.clr['ERR1']))
             self.txtout.AppendText(f'\n{count}\n')
             self.error = True
         else:
-            if self.maxrotate == 1:
-                self.maxrotate = 0
-                self.txtout.Clear()
-            self.maxrotate += 1
+            self.update_row(index, 'active')
             self.txtout.SetDefaultStyle(wx.TextAttr(self.clr['TXT0']))
             self.txtout.AppendText(f'\n{count}\n')
             self.txtout.SetDefaultStyle(wx.TextAttr(self.clr['DEBUG']))
@@ -256,14 +350,39 @@ class LogOut(wx.Panel):
             if destination:
                 self.txtout.SetDefaultStyle(wx.TextAttr(self.clr['DEBUG']))
                 self.txtout.AppendText(f'{destination}\n')
+    # ----------------------------------------------------------------------
 
-        self.count += 1
+    def summary(self):
+        """
+        Writes the number of completed, failed and stopped
+        URLs and the list of the failed ones to the output
+        and to the log file.
+        """
+        states = Counter(self.states)
+        msg = _('Summary: {0} completed, {1} failed, {2} stopped, '
+                '{3} already downloaded of {4} URLs'
+                ).format(states['done'], states['failed'],
+                         states['stopped'], states['archived'],
+                         len(self.states))
+        failed = [f'{num + 1}: {url}' for num, (url, state)
+                  in enumerate(zip(self.urls, self.states))
+                  if state == 'failed']
+        if failed:
+            msg += '\n' + _('Failed URLs:') + '\n' + '\n'.join(failed)
+        self.txtout.SetDefaultStyle(wx.TextAttr(self.clr['TXT0']))
+        self.txtout.AppendText(f'\n{msg}\n')
+        with open(self.logfile, "a", encoding='utf-8') as log:
+            log.write(f"\n[VIDEOMASS]: {msg}\n")
     # ----------------------------------------------------------------------
 
     def end_proc(self):
         """
         At the end of the process
         """
+        for index, state in enumerate(self.states):
+            if state in ('queued', 'active'):
+                self.update_row(index, 'stopped')
+        failed = self.states.count('failed')
         if self.error:
             self.txtout.SetDefaultStyle(wx.TextAttr(self.clr['TXT0']))
             self.txtout.AppendText(f"\n{LogOut.MSG_fatalerror}\n")
@@ -273,7 +392,7 @@ class LogOut(wx.Panel):
             self.txtout.SetDefaultStyle(wx.TextAttr(self.clr['ABORT']))
             self.txtout.AppendText(f"\n{LogOut.MSG_interrupted}\n")
         else:
-            if not self.result:
+            if not failed:
                 endmsg = LogOut.MSG_completed
                 self.txtout.SetDefaultStyle(wx.TextAttr(self.clr['TXT0']))
                 notification_area(endmsg, _("Get your files at the "
@@ -281,7 +400,7 @@ class LogOut(wx.Panel):
                                   wx.ICON_INFORMATION,
                                   )
             else:
-                if len(self.result) == self.count:
+                if failed == len(self.states):
                     endmsg = LogOut.MSG_taskfailed
                     self.txtout.SetDefaultStyle(wx.TextAttr(self.clr['TXT0']))
                     notification_area(endmsg, _("Check the current output "
@@ -299,6 +418,7 @@ class LogOut(wx.Panel):
             self.parent.statusbar_msg(_('...Finished'), None)
             self.txtout.AppendText(f"{endmsg}\n")
 
+        self.summary()
         self.txtout.AppendText('\n')
         self.reset_all()
         pub.sendMessage("PROCESS_TERMINATED_YTDLP", msg='Terminated')
@@ -322,9 +442,6 @@ class LogOut(wx.Panel):
         self.thread_type = None
         self.abort = False
         self.error = False
-        self.result.clear()
-        self.count = 0
-        self.maxrotate = 0
         self.parent.statusbar_msg(_('Done'), None)
         self.btn_viewlog.Enable()
     # ----------------------------------------------------------------------
@@ -6,7 +6,7 @@ Compatibility: Python3, wxPython Phoenix
 Author: Gianluca Pernigotto <jeanlucperni@gmail.com>
 Copyleft - 2024 Gianluca Pernigotto <jeanlucperni@gmail.com>
 license: GPL3
-Rev: Apr.09.2024
+Rev: Oct.19.2026
 Code checker: flake8, pylint
 
 This file is part of Videomass.
@@ -36,6 +36,9 @@ from videomass.vdms_ytdlp.long_task_ytdlp import LogOut
 from videomass.vdms_io import io_tools
 from videomass.vdms_sys.settings_manager import ConfigManager
 from videomass.vdms_ytdlp.ydl_preferences import Ytdlp_Options
+from videomass.vdms_utils.infocache_utils import clear_info_cache
+from videomass.vdms_utils.archive_utils import archive_filename
+from videomass.vdms_ytdlp.archive_browser import ArchiveBrowser
 if wx.GetApp().appset['yt_dlp'] is True:
     import yt_dlp
 
@@ -180,10 +183,8 @@ class MainYtdl(wx.Frame):
         info = []
         if self.data_url:
             info = self.ytDownloader.on_show_statistics()
-            if not info:
-                return
 
-        self.infomediadlg = YdlMediaInfo(info)
+        self.infomediadlg = YdlMediaInfo(list(info))
         self.infomediadlg.Show()
     # ------------------------------------------------------------------#
 
@@ -305,6 +306,14 @@ class MainYtdl(wx.Frame):
         dscrp = (_("Work notes\tCtrl+N"),
                  _("Read and write useful notes and reminders."))
         notepad = toolsButton.Append(wx.ID_ANY, dscrp[0], dscrp[1])
+        dscrp = (_("Clear metadata cache"),
+                 _("Delete the stored metadata of the URLs, so that "
+                   "they will be extracted again"))
+        self.clearinfo = toolsButton.Append(wx.ID_ANY, dscrp[0], dscrp[1])
+        dscrp = (_("Download archive"),
+                 _("View and edit the list of the media already "
+                   "downloaded"))
+        self.archive = toolsButton.Append(wx.ID_ANY, dscrp[0], dscrp[1])
         self.menuBar.Append(toolsButton, _("Tools"))
 
         # ------------------ View menu
@@ -332,6 +341,8 @@ class MainYtdl(wx.Frame):
         self.Bind(wx.EVT_MENU, self.on_options, self.setupItem)
         # ----TOOLS----
         self.Bind(wx.EVT_MENU, self.reminder, notepad)
+        self.Bind(wx.EVT_MENU, self.on_clear_infocache, self.clearinfo)
+        self.Bind(wx.EVT_MENU, self.on_download_archive, self.archive)
         # ---- VIEW ----
         self.Bind(wx.EVT_MENU, self.ydl_used, self.ydlused)
         self.Bind(wx.EVT_MENU, self.ydl_latest, self.ydllatest)
@@ -361,6 +372,28 @@ class MainYtdl(wx.Frame):
             io_tools.openpath(fname)
     # ------------------------------------------------------------------#
 
+    def on_clear_infocache(self, event):
+        """
+        Deletes the metadata cache and the data already
+        retrieved for the current URLs.
+        """
+        removed = clear_info_cache(self.appdata['cachedir'])
+        self.destroy_orphaned_window()
+        self.ytDownloader.clear_data_list(True)
+        self.statusbar_msg(_('Metadata cache cleared, {0} items '
+                             'deleted').format(removed), None)
+    # ------------------------------------------------------------------#
+
+    def on_download_archive(self, event):
+        """
+        Shows the download archive
+        """
+        with ArchiveBrowser(self,
+                            archive_filename(self.appdata['confdir'])
+                            ) as browser:
+            browser.ShowModal()
+    # ------------------------------------------------------------------#
+
     def ydl_used(self, event, msgbox=True):
         """
         check version of youtube-dl used from
@@ -584,10 +617,15 @@ class MainYtdl(wx.Frame):
             (self.delete.Enable(False),
              self.paste.Enable(False),
              self.clearall.Enable(False),
-             self.setupItem.Enable(False)
+             self.clearinfo.Enable(False),
+             self.archive.Enable(False),
              )
             [self.toolbar.EnableTool(x, False) for x in (20, 21, 23, 26)]
             [self.toolbar.EnableTool(x, True) for x in (22, 24)]
+            if self.appdata['ytdlp-convert']:  # see `ydl_downloader.hand_off`
+                self.parent.pipeline_open(
+                    self.appdata['ytdlp-convert-preset'],
+                    self.appdata['ytdlp-convert-profile'])
 
         self.SetTitle(_('Videomass - Downloader Message Monitoring'))
         self.textDnDTarget.Hide()
@@ -630,6 +668,9 @@ class MainYtdl(wx.Frame):
         self.toolbar.EnableTool(26, True)
         self.toolbar.EnableTool(23, True)
         self.setupItem.Enable(True)
+        self.clearinfo.Enable(True)
+        self.archive.Enable(True)
+        self.parent.pipeline_close()
 
         if self.appdata['shutdown']:
             self.parent.auto_shutdown()
@@ -6,7 +6,7 @@ Compatibility: Python3, wxPython Phoenix
 Author: Gianluca Pernigotto <jeanlucperni@gmail.com>
 Copyleft - 2024 Gianluca Pernigotto <jeanlucperni@gmail.com>
 license: GPL3
-Rev: July.17.2022
+Rev: Oct.19.2026
 Code checker: flake8, pylint
 
 This file is part of Videomass.
@@ -27,6 +27,13 @@ This file is part of Videomass.
 import re
 import wx
 import wx.lib.mixins.listctrl as listmix
+from pubsub import pub
+from videomass.vdms_utils.utils import integer_to_time
+from videomass.vdms_utils.ytdlp_utils import (is_playlist_url,
+                                              format_indexes,
+                                              parse_indexes,
+                                              )
+from videomass.vdms_ytdlp.ydl_extractinfo import YdlPlaylistPager
 
 
 class ListCtrl(wx.ListCtrl,
@@ -75,16 +82,27 @@ class Indexing(wx.Dialog):
                 'you want to download the indexed media at 1, 2, 5, 8 of the '
                 'playlist.\nIt is also possible to specify intervals, e.g. '
                 '"1-3,7,10-13" with which the media at index 1, 2, 3, 7, 10, '
-                '11, 12 and 13 will be downloaded.\n'))
+                '11, 12 and 13 will be downloaded.\n'
+                'Selecting a URL marked green lists its entries as they are '
+                'found, the selected entries are indexed for download.\n'))
 
-    def __init__(self, parent, url, data):
+    def __init__(self, parent, url, data, kwargs):
         """
         NOTE Use 'parent, -1' param. to make parent, use 'None' otherwise
 
+        self.pages: {url: [entries]} of the expanded playlists
+        self.pagers: {url: YdlPlaylistPager} of the running expansions
+        self.shown: the URL whose entries are listed
         """
         self.clrs = Indexing.appdata['colorscheme']
         self.urls = url
         self.data = data
+        self.kwargs = kwargs
+        self.pages = {}
+        self.pagers = {}
+        self.shown = None
+        self.selecting = False  # True while entries are selected by code
+        self.pending = False  # True while the indexing is scheduled
 
         wx.Dialog.__init__(self, parent, -1, style=wx.DEFAULT_DIALOG_STYLE)
 
@@ -97,6 +115,15 @@ class Indexing(wx.Dialog):
                               | wx.LC_HRULES
                               | wx.LC_VRULES
                               )
+        self.entries = wx.ListCtrl(self,
+                                   wx.ID_ANY,
+                                   style=wx.LC_REPORT
+                                   | wx.SUNKEN_BORDER
+                                   | wx.LC_HRULES
+                                   )
+        self.entries.InsertColumn(0, '#', width=50)
+        self.entries.InsertColumn(1, _('Title'), width=600)
+        self.entries.InsertColumn(2, _('Duration'), width=100)
         self.tctrl = wx.TextCtrl(self,
                                  wx.ID_ANY, "",
                                  style=wx.TE_MULTILINE
@@ -107,12 +134,16 @@ class Indexing(wx.Dialog):
         # ------ Properties
         self.SetTitle(_('Playlist Editor'))
         self.SetMinSize((800, 400))
-        self.lctrl.SetMinSize((800, 200))
-        self.tctrl.SetMinSize((800, 200))
+        self.lctrl.SetMinSize((800, 150))
+        self.entries.SetMinSize((800, 200))
+        self.tctrl.SetMinSize((800, 120))
 
         # ------ set Layout
         sizer_1 = wx.BoxSizer(wx.VERTICAL)
         sizer_1.Add(self.lctrl, 0, wx.ALL | wx.EXPAND, 5)
+        self.lbl_entries = wx.StaticText(self, label=_('Playlist entries'))
+        sizer_1.Add(self.lbl_entries, 0, wx.LEFT, 5)
+        sizer_1.Add(self.entries, 1, wx.ALL | wx.EXPAND, 5)
 
         labtstr = _('Help viewer')
         lab = wx.StaticText(self, label=labtstr)
@@ -147,7 +178,7 @@ class Indexing(wx.Dialog):
         for link in url:
             self.lctrl.InsertItem(index, str(index + 1))
             self.lctrl.SetItem(index, 1, link)
-            if '/playlist' in link:
+            if is_playlist_url(link):
                 self.lctrl.SetItemBackgroundColour(index, Indexing.GREEN)
 
             if not self.data == {'': ''}:
@@ -158,9 +189,12 @@ class Indexing(wx.Dialog):
 
         if Indexing.OS == 'Darwin':
             self.lctrl.SetFont(wx.Font(12, wx.MODERN, wx.NORMAL, wx.NORMAL))
+            self.entries.SetFont(wx.Font(12, wx.MODERN, wx.NORMAL,
+                                         wx.NORMAL))
             self.tctrl.SetFont(wx.Font(12, wx.MODERN, wx.NORMAL, wx.NORMAL))
         else:
             self.lctrl.SetFont(wx.Font(9, wx.MODERN, wx.NORMAL, wx.NORMAL))
+            self.entries.SetFont(wx.Font(9, wx.MODERN, wx.NORMAL, wx.NORMAL))
             self.tctrl.SetFont(wx.Font(9, wx.MODERN, wx.NORMAL, wx.NORMAL))
             lab.SetLabelMarkup(f"<b>{labtstr}</b>")
 
@@ -169,9 +203,17 @@ class Indexing(wx.Dialog):
         # ----------------------Binding (EVT)----------------------#
         self.lctrl.Bind(wx.EVT_LIST_BEGIN_LABEL_EDIT, self.on_edit_begin)
         self.lctrl.Bind(wx.EVT_LIST_END_LABEL_EDIT, self.on_edit_end)
+        self.lctrl.Bind(wx.EVT_LIST_ITEM_SELECTED, self.on_url_selected)
+        self.entries.Bind(wx.EVT_LIST_ITEM_SELECTED, self.on_entry_selected)
+        self.entries.Bind(wx.EVT_LIST_ITEM_DESELECTED,
+                          self.on_entry_selected)
         self.Bind(wx.EVT_BUTTON, self.on_close, btn_cancel)
         self.Bind(wx.EVT_BUTTON, self.on_ok, btn_ok)
         self.Bind(wx.EVT_BUTTON, self.on_reset, btn_reset)
+        self.Bind(wx.EVT_CLOSE, self.on_close)
+
+        pub.subscribe(self.on_entries, "PLAYLIST_ENTRIES_EVT")
+        pub.subscribe(self.on_entries_end, "PLAYLIST_END_EVT")
 
         self.textstyle()
 
@@ -196,13 +238,166 @@ class Indexing(wx.Dialog):
                 diz[url] = ''.join(txt.split())
         return diz
 
+    def stop_pagers(self):
+        """
+        Stops the playlist expansions still running
+        and the pub/sub messages they send
+        """
+        pub.unsubscribe(self.on_entries, "PLAYLIST_ENTRIES_EVT")
+        pub.unsubscribe(self.on_entries_end, "PLAYLIST_END_EVT")
+        for thread in self.pagers.values():
+            thread.stop()
+        self.pagers = {}
+    # ------------------------------------------------------------------#
+
+    def append_entries(self, entries, first):
+        """
+        Appends the `entries` rows to the entries list,
+        numbered from `first` (playlist index).
+        """
+        for num, entry in enumerate(entries, first):
+            row = self.entries.GetItemCount()
+            self.entries.InsertItem(row, str(num))
+            self.entries.SetItem(row, 1, entry['title']
+                                 or _('[Unavailable entry]'))
+            if entry['duration'] is not None:
+                duration = integer_to_time(int(entry['duration'] * 1000),
+                                           mills=False)
+                self.entries.SetItem(row, 2, duration)
+    # ------------------------------------------------------------------#
+
+    def select_entries(self, indexes, first=1):
+        """
+        Selects the rows of the entries list with the
+        playlist `indexes`, starting from row `first` - 1.
+        """
+        self.selecting = True
+        for row in range(first - 1, self.entries.GetItemCount()):
+            self.entries.Select(row, on=row + 1 in indexes)
+        self.selecting = False
+    # ------------------------------------------------------------------#
+
+    def show_entries(self, url):
+        """
+        Lists the entries of the playlist `url`, expanding
+        it on a `YdlPlaylistPager` the first time.
+        """
+        self.shown = url
+        self.entries.DeleteAllItems()
+        if url not in self.pages:
+            self.pages[url] = []
+            self.pagers[url] = YdlPlaylistPager(url, self.kwargs)
+        self.append_entries(self.pages[url], 1)
+        row = self.urls.index(url)
+        self.select_entries(parse_indexes(self.lctrl.GetItemText(row, 2)))
+        self.set_entries_label()
+    # ------------------------------------------------------------------#
+
+    def set_entries_label(self):
+        """
+        Shows the number of entries of the listed
+        playlist and if they are still being fetched.
+        """
+        count = len(self.pages.get(self.shown, []))
+        if self.shown in self.pagers:
+            msg = _('Playlist entries: {0} found, searching for more...'
+                    ).format(count)
+        else:
+            msg = _('Playlist entries: {0}').format(count)
+        self.lbl_entries.SetLabel(msg)
+    # ------------------------------------------------------------------#
+
     # ----------------------Event handler (callback)----------------------#
 
+    def on_entries(self, thread, url, entries):
+        """
+        Receives a page of entries from the "PLAYLIST_ENTRIES_EVT"
+        pub/sub topic and lists them if their playlist is shown.
+        """
+        if self.pagers.get(url) is not thread:
+            return
+        first = len(self.pages[url]) + 1
+        self.pages[url].extend(entries)
+        if url == self.shown:
+            self.append_entries(entries, first)
+            row = self.urls.index(url)
+            self.select_entries(parse_indexes(self.lctrl.GetItemText(row,
+                                                                     2)),
+                                first)
+            self.set_entries_label()
+    # ------------------------------------------------------------------#
+
+    def on_entries_end(self, thread, url, count, error):
+        """
+        Receives the end of the expansion of a playlist
+        from the "PLAYLIST_END_EVT" pub/sub topic.
+        """
+        if self.pagers.get(url) is not thread:
+            return
+        del self.pagers[url]
+        date = wx.DateTime.Now().Format('%H:%M:%S')
+        if error:
+            if not count:
+                del self.pages[url]  # try again on next selection
+            self.tctrl.SetDefaultStyle(wx.TextAttr(self.clrs['ERR1']))
+            self.tctrl.AppendText(f'\n{date}: {url}: {error}\n')
+        else:
+            self.tctrl.SetDefaultStyle(wx.TextAttr(self.clrs['TXT3']))
+            self.tctrl.AppendText(f'\n{date}: {url}: '
+                                  + _('{0} entries found').format(count)
+                                  + '\n')
+        if url == self.shown:
+            self.set_entries_label()
+    # ------------------------------------------------------------------#
+
+    def on_url_selected(self, event):
+        """
+        Lists the entries of the selected URL
+        if it is marked green.
+        """
+        url = self.urls[event.GetIndex()]
+        if not is_playlist_url(url):
+            self.shown = None
+            self.entries.DeleteAllItems()
+            self.lbl_entries.SetLabel(_('Playlist entries'))
+            return
+        if url != self.shown:
+            self.show_entries(url)
+    # ------------------------------------------------------------------#
+
+    def on_entry_selected(self, event):
+        """
+        Indexes the selected entries of the listed playlist
+        once the current selection changes are done.
+        """
+        if self.selecting or self.shown is None:
+            return
+        if not self.pending:
+            self.pending = True
+            wx.CallAfter(self.index_selected)
+    # ------------------------------------------------------------------#
+
+    def index_selected(self):
+        """
+        Sets the "Playlist Items" of the listed playlist
+        to the indexes of the selected entries.
+        """
+        self.pending = False
+        if self.shown is None:
+            return
+        indexes, row = [], self.entries.GetFirstSelected()
+        while row != -1:
+            indexes.append(row + 1)
+            row = self.entries.GetNextSelected(row)
+        self.lctrl.SetItem(self.urls.index(self.shown), 2,
+                           format_indexes(indexes))
+    # ------------------------------------------------------------------#
+
     def on_edit_end(self, event):
         """
         Checking event-entered strings using REGEX:
 
-            Allows min 0 to max 999 digits and does not allow
+            Allows numbers of any digits and does not allow
             numbers with leading zeroes like 07 or 005, allows
             a number separated by hyphen like 22-33 and supports
             comma followed by a white space. Note that all white
@@ -229,9 +424,9 @@ class Indexing(wx.Dialog):
         if string == '':
             event.Veto()
             return
-        check = bool(re.search(r"^(?:[1-9]\d\d|[1-9]?\d)(?:-(?:[1-9]\d\d"
-                               r"|[1-9]?\d))?(?:,\s?(?:[1-9]\d\d|[1-9]?\d)"
-                               r"(?:-(?:[1-9]\d\d|[1-9]?\d))?)*$", string))
+        check = bool(re.search(r"^(?:[1-9]\d*|0)(?:-(?:[1-9]\d*|0))?"
+                               r"(?:,\s?(?:[1-9]\d*|0)(?:-(?:[1-9]\d*|0))?)*$",
+                               string))
         if check is not True:
             self.tctrl.SetDefaultStyle(wx.TextAttr(self.clrs['ERR1']))
             self.tctrl.AppendText(f'\n{date}: {errbeg}: '
@@ -241,6 +436,8 @@ class Indexing(wx.Dialog):
 
         self.tctrl.SetDefaultStyle(wx.TextAttr(self.clrs['TXT3']))
         self.tctrl.AppendText(f'\n{date}: {assign}: "{string}"\n')
+        if self.urls[event.GetIndex()] == self.shown:
+            self.select_entries(parse_indexes(string))
     # ------------------------------------------------------------------#
 
     def on_edit_begin(self, event):
@@ -278,6 +475,7 @@ class Indexing(wx.Dialog):
         rows = self.lctrl.GetItemCount()  # Get the total number of rows
         for row in range(rows):
             self.lctrl.SetItem(row, 2, '')
+        self.select_entries(set())
 
         self.textstyle()
     # ------------------------------------------------------------------#
@@ -286,6 +484,7 @@ class Indexing(wx.Dialog):
         """
         Close this dialog without saving anything
         """
+        self.stop_pagers()
         event.Skip()
     # ------------------------------------------------------------------#
 
@@ -293,4 +492,5 @@ class Indexing(wx.Dialog):
         """
         Don't use self.Destroy() in this dialog
         """
+        self.stop_pagers()
         event.Skip()
@@ -6,7 +6,7 @@ Compatibility: Python3, wxPython4 Phoenix
 Author: Gianluca Pernigotto <jeanlucperni@gmail.com>
 Copyleft - 2024 Gianluca Pernigotto <jeanlucperni@gmail.com>
 license: GPL3
-Rev: Apr.29.2024
+Rev: Oct.19.2026
 Code checker: flake8, pylint
 
 This file is part of Videomass.
@@ -25,8 +25,11 @@ This file is part of Videomass.
    along with Videomass.  If not, see <http://www.gnu.org/licenses/>.
 """
 import os
-from threading import Thread
+import json
 import signal
+import tempfile
+from threading import Thread, Lock
+from concurrent.futures import ThreadPoolExecutor
 import time
 import itertools
 import platform
@@ -34,133 +37,539 @@ import subprocess
 import wx
 from pubsub import pub
 from videomass.vdms_utils.utils import Popen
+from videomass.vdms_utils.ytdlp_utils import (pool_size,
+                                              is_playlist_url,
+                                              output_filename,
+                                              is_new_item,
+                                              )
+from videomass.vdms_utils.pipeline_utils import (probe_duration,
+                                                 is_supported,
+                                                 info_filename,
+                                                 needs_merge,
+                                                 pipeline_destination,
+                                                 stream_command,
+                                                 )
+from videomass.vdms_utils.archive_utils import (DownloadArchive,
+                                                archive_filename,
+                                                make_archive_id,
+                                                youtube_archive_id,
+                                                )
+from videomass.vdms_utils.infocache_utils import is_fresh, FORMATS_TTL
+from videomass.vdms_utils.ratelimit_utils import (configure_bandwidth,
+                                                  DOWNLOAD_WEIGHT,
+                                                  )
+from videomass.vdms_utils.progress_utils import (ProgressThrottle,
+                                                 DownloadProgress,
+                                                 )
 from videomass.vdms_io.make_filelog import logwrite
+from videomass.vdms_threads.ffprobe import ffprobe
+from videomass.vdms_threads.ffmpeg import ffmpeg_cmd_args
 if not platform.system() == 'Windows':
     import shlex
 if wx.GetApp().appset['yt_dlp'] is True:
     import yt_dlp
 
 
-def killbill(pid):
+def killbill(proc):
     """
-    kill the process sending a Ctrl+C event to yt-dlp
+    Interrupts the yt-dlp process `proc` as Ctrl+C does,
+    so that yt-dlp can clean up its partial files. On
+    Windows, where there is no SIGINT, the process is
+    terminated.
     """
-    lambda: os.kill(pid, signal.CTRL_C_EVENT)
+    if platform.system() == 'Windows':
+        proc.terminate()
+    else:
+        proc.send_signal(signal.SIGINT)
+
+
+def usable_infofile(infofiles, index):
+    """
+    Returns the metadata cache file of the URL at `index`
+    if it can be used to download, i.e. if it is newer than
+    both the cache lifetime and `FORMATS_TTL`, since the
+    media URLs of the formats expire. None otherwise.
+    """
+    infofile = infofiles[index] if index < len(infofiles) else None
+    ttl = min(wx.GetApp().appset['ytdlp-info-cache-ttl'] * 3600,
+              FORMATS_TTL)
+    if infofile and is_fresh(infofile, ttl):
+        return infofile
+    return None
+# ------------------------------------------------------------------------#
+
+
+def bandwidth():
+    """
+    Returns the bandwidth scheduler shared by the downloads,
+    configured by the `ytdlp-ratelimit` and the
+    `ytdlp-ratelimit-schedule` app settings.
+    """
+    appdata = wx.GetApp().appset
+    return configure_bandwidth(appdata['ytdlp-ratelimit'],
+                               appdata['ytdlp-ratelimit-schedule'])
+# ------------------------------------------------------------------------#
+
+
+def download_archive():
+    """
+    Returns the `DownloadArchive` of the app, None if
+    disabled (see app settings `ytdlp-download-archive`).
+    """
+    appdata = wx.GetApp().appset
+    if not appdata['ytdlp-download-archive']:
+        return None
+    return DownloadArchive(archive_filename(appdata['confdir']))
+# ------------------------------------------------------------------------#
+
+
+def url_archive_id(url):
+    """
+    Returns the download archive entry of the media `url`
+    from the URL only, i.e. without any network access,
+    by the yt-dlp extractors if the yt_dlp module is
+    available, for YouTube URLs only otherwise. Returns
+    None if the entry can't be known before extraction.
+    """
+    if wx.GetApp().appset['yt_dlp'] is not True:
+        return youtube_archive_id(url)
+    for extractor in yt_dlp.extractor.gen_extractor_classes():
+        if not extractor.suitable(url):
+            continue
+        if extractor.ie_key() == 'Generic':
+            return None
+        try:
+            temp_id = extractor.get_temp_id(url)
+        except Exception:  # pylint: disable=broad-except
+            return None
+        if not temp_id:
+            return None
+        return make_archive_id(extractor.ie_key(), temp_id)
+    return None
+# ------------------------------------------------------------------------#
+
+
+def hand_off(filename):
+    """
+    Hands the downloaded `filename` off to the conversion
+    of the downloads (see `main_frame.pipeline_add`), with
+    its duration probed here, out of the GUI thread. Does
+    nothing if the conversion is disabled (see app settings
+    `ytdlp-convert`) or if `filename` does not exist.
+    """
+    appdata = wx.GetApp().appset
+    if not appdata['ytdlp-convert'] or not filename:
+        return
+    if not os.path.isfile(filename):
+        return
+    probe = ffprobe(filename, cmd=appdata['ffprobe_cmd'],
+                    txtenc=appdata['encoding'], hide_banner=None)
+    wx.CallAfter(pub.sendMessage,
+                 "PIPELINE_ADD_EVT",
+                 filename=filename,
+                 duration=probe_duration(probe[0]),
+                 )
+# ------------------------------------------------------------------------#
+
+
+def archived(archive, url, index, count, logfile):
+    """
+    Returns True if the media `url` (at `index`) is in
+    the download `archive`, in which case it is reported
+    as already downloaded. Playlists are left to yt-dlp,
+    which skips their archived entries by itself.
+    """
+    if archive is None or is_playlist_url(url):
+        return False
+    entry = url_archive_id(url)
+    if not entry or entry not in archive:
+        return False
+    wx.CallAfter(pub.sendMessage,
+                 "COUNT_YTDL_EVT",
+                 index=index,
+                 count=count,
+                 fsource=f'Source: {url}',
+                 destination='',
+                 duration=100,
+                 end='ARCHIVED',
+                 )
+    logwrite(f'{count}\n[VIDEOMASS]: {entry}: already in the download '
+             f'archive, skipped.\n', '', logfile)
+    return True
+# ------------------------------------------------------------------------#
 
 
 class YtdlExecDL(Thread):
     """
     YtdlExecDL represents a separate thread for running
-    youtube-dl executable with subprocess class to download
-    media and capture its stdout/stderr output in real time .
+    yt-dlp executable with subprocess class to download
+    media and capture its stdout/stderr output in real time.
+    Up to `ytdlp-concurrent-downloads` URLs (see app settings)
+    are downloaded at the same time, each by its own yt-dlp
+    process; all messages carry the `index` of their URL.
+    Each process is given an equal share of the bandwidth
+    limit in effect when it starts (`--limit-rate`).
+    URLs with recent metadata in the cache are downloaded
+    from them, without extracting them again.
+    URLs already in the download archive are skipped before
+    any extraction.
+    The files downloaded, named by the yt-dlp output, are
+    handed off to the conversion as soon as each one is
+    complete (see `hand_off`).
+    The progress is given by yt-dlp as JSON lines (see
+    `progress_utils.PROGRESS_TEMPLATE`), parsed here and sent
+    at a bounded rate.
+    The URLs with a stream profile are piped into ffmpeg
+    instead, without intermediate file, unless their formats
+    must be merged (see `stream_download`).
 
     """
     STOP = '[Videomass]: STOP command received.'
     # -----------------------------------------------------------------------#
 
-    def __init__(self, args, urls, logfile):
+    def __init__(self, args, urls, logfile, infofiles=None, streams=None):
         """
         Attributes defined here:
         self.stop_work_thread -  boolean process terminate value
         self.urls - type list
         self.logfile - str path object to log file
         self.arglist - option arguments list
+        self.infofiles - metadata cache files of the URLs
+        self.streams - profiles which encode the URLs streamed
+        self.archive - the download archive, None if disabled
+        self.procs - running yt-dlp and ffmpeg processes
+        self.throttle - bounds the rate of the progress messages
         """
+        get = wx.GetApp()
+        self.appdata = get.appset
         self.stop_work_thread = False  # process terminate
+        self.fatal = False  # yt-dlp can't be executed
         self.urls = urls
         self.logfile = logfile
         self.arglist = args
+        self.infofiles = infofiles or []
+        self.streams = streams or []
         self.countmax = len(self.arglist)
-        self.count = 0
+        self.workers = pool_size(self.appdata['ytdlp-concurrent-downloads'],
+                                 self.countmax)
+        self.archive = download_archive()
+        self.bandwidth = bandwidth()
+        self.throttle = ProgressThrottle()
+        self.procs = []
+        self.lock = Lock()
 
         Thread.__init__(self)
         self.start()  # start the thread (va in self.run())
 
+    def download(self, index, url, opts):
+        """
+        Downloads the URL at `index` in a yt-dlp subprocess.
+        Returns True if successful, False otherwise.
+        Raise OSError if yt-dlp can't be executed.
+        """
+        if self.stop_work_thread:
+            return False
+        count = f"URL {index + 1}/{self.countmax}"
+        if archived(self.archive, url, index, count, self.logfile):
+            return True
+        wx.CallAfter(pub.sendMessage,
+                     "COUNT_YTDL_EVT",
+                     index=index,
+                     count=count,
+                     fsource=f'Source: {url}',
+                     destination='',
+                     duration=100,
+                     end='CONTINUE',
+                     )
+        limit = int(self.bandwidth.current_rate() // self.workers)
+        if limit:
+            opts = f'{opts} --limit-rate {limit}'
+        infofile = usable_infofile(self.infofiles, index)
+        if infofile:
+            source = f'--load-info-json "{infofile}"'
+        else:
+            source = f'"{url}"'
+        stream = self.streams[index] if index < len(self.streams) else None
+        returncode = None
+        if stream:
+            returncode = self.stream_download(index, opts, source, count,
+                                              stream)
+        if returncode is None:
+            returncode = self.file_download(index, f'{opts} {source}', count)
+
+        if self.stop_work_thread:
+            return False
+        if returncode:
+            wx.CallAfter(pub.sendMessage,
+                         "UPDATE_YDL_EXECUTABLE_EVT",
+                         index=index,
+                         output='FAILED',
+                         duration=100,
+                         status='ERROR',
+                         )
+            logwrite('', (f"[VIDEOMASS]: {count} Error Exit Status: "
+                          f"{returncode}"), self.logfile)
+        wx.CallAfter(pub.sendMessage,
+                     "COUNT_YTDL_EVT",
+                     index=index,
+                     count='',
+                     fsource='',
+                     destination='',
+                     duration=100,
+                     end='FAILED' if returncode else 'DONE',
+                     )
+        return returncode == 0
+    # --------------------------------------------------------------------#
+
+    def popen(self, cmd, **kwargs):
+        """
+        Starts the `cmd` str process, which is interrupted
+        on stop (see `release` when it ends). Returns None
+        if the thread is stopped.
+        Raise OSError if `cmd` can't be executed.
+        """
+        if not platform.system() == 'Windows':
+            cmd = shlex.split(cmd)
+        with self.lock:
+            if self.stop_work_thread:
+                return None
+            proc = Popen(cmd,
+                         universal_newlines=True,
+                         encoding='utf-8',
+                         **kwargs,
+                         )
+            self.procs.append(proc)
+        return proc
+    # --------------------------------------------------------------------#
+
+    def release(self, proc):
+        """
+        The `proc` process started by `popen` has ended
+        """
+        with self.lock:
+            self.procs.remove(proc)
+    # --------------------------------------------------------------------#
+
+    def output(self, index, line):
+        """
+        Sends an output `line` of the URL at `index`.
+        The progress lines (see `progress_utils.PROGRESS_TEMPLATE`)
+        are parsed here and sent as `DownloadProgress` at a
+        bounded rate, but for the state transitions, which
+        come after the latest progress held back.
+        """
+        progress = DownloadProgress.from_line(line)
+        if progress:
+            if progress.status != 'downloading':
+                pending = self.throttle.flush(index)
+                if pending is not None:
+                    self.output_progress(index, pending)
+            elif self.throttle.update(index, progress) is None:
+                return
+            self.output_progress(index, progress)
+            return
+        wx.CallAfter(pub.sendMessage,
+                     "UPDATE_YDL_EXECUTABLE_EVT",
+                     index=index,
+                     output=line,
+                     duration=100,
+                     status=0,
+                     )
+    # --------------------------------------------------------------------#
+
+    def output_progress(self, index, progress):
+        """
+        Sends the `progress` of the URL at `index`
+        """
+        wx.CallAfter(pub.sendMessage,
+                     "UPDATE_YDL_EXECUTABLE_EVT",
+                     index=index,
+                     output='',
+                     duration=progress,
+                     status='DOWNLOAD',
+                     )
+    # --------------------------------------------------------------------#
+
+    def file_download(self, index, cmd, count):
+        """
+        Downloads the URL at `index` to file with the `cmd`
+        command line and hands the files off to the conversion,
+        the last one only if yt-dlp succeeded.
+        Returns the exit status of yt-dlp.
+        """
+        logwrite(f'{count}\n{cmd}\n', '', self.logfile)  # write log cmd
+        proc = self.popen(cmd,
+                          stdout=subprocess.PIPE,
+                          stderr=subprocess.STDOUT,
+                          bufsize=1,
+                          )
+        if proc is None:
+            return 1
+        filename = None  # the last file named for the current media
+        with proc:
+            for line in proc.stdout:
+                self.output(index, line)
+                if is_new_item(line):  # the previous one is complete
+                    hand_off(filename)
+                    filename = None
+                filename = output_filename(line) or filename
+            returncode = proc.wait()
+        self.release(proc)
+        if returncode == 0 and not self.stop_work_thread:
+            hand_off(filename)  # else it may be incomplete
+        return returncode
+    # --------------------------------------------------------------------#
+
+    def stream_download(self, index, opts, source, count, stream):
+        """
+        Downloads the URL at `index` to the stdout of yt-dlp,
+        piped into ffmpeg which encodes it with the `stream`
+        profile (args, supported formats), so that no
+        intermediate file is written. The metadata are
+        extracted first, to name the output and to know if
+        the formats must be merged, which can't be streamed.
+        Returns the exit status, None to download to file.
+        """
+        cmd = f'{opts} --dump-json {source}'
+        logwrite(f'{count}\n{cmd}\n', '', self.logfile)  # write log cmd
+        proc = self.popen(cmd, stdout=subprocess.PIPE, stderr=subprocess.PIPE)
+        if proc is None:
+            return 1
+        with proc:
+            out, err = proc.communicate()
+        self.release(proc)
+        for line in err.splitlines():
+            self.output(index, f'{line}\n')
+        if proc.returncode or self.stop_work_thread:
+            return proc.returncode or 1
+        lines = out.strip().splitlines()
+        try:
+            info = json.loads(lines[-1])
+        except (ValueError, IndexError):
+            info = {}
+        args, supported = stream
+        filename = info_filename(info)
+        if not filename:  # e.g. already in the download archive
+            return None
+        if needs_merge(info) or not is_supported(supported, filename):
+            msg = ('[VIDEOMASS]: Can not stream the formats of this media, '
+                   'downloading to file.\n')
+            self.output(index, msg)
+            logwrite(msg, '', self.logfile)
+            return None
+        if self.appdata['outputdir_asinput']:
+            outputdir = None
+        else:
+            outputdir = self.appdata['outputdir']
+        destination = pipeline_destination(filename, args['extension'],
+                                           outputdir,
+                                           self.appdata['filesuffix'])
+        ffargs = ffmpeg_cmd_args()
+        ffcmd = stream_command(ffargs['ffmpeg_cmd'],
+                               ffargs['ffmpeg-default-args'],
+                               args,
+                               destination,
+                               )
+        fdesc, infojson = tempfile.mkstemp(suffix='.info.json')
+        try:
+            with os.fdopen(fdesc, 'w', encoding='utf-8') as finfo:
+                finfo.write(lines[-1])
+            cmd = (f'{opts} --format "{info.get("format_id")}" '
+                   f'--load-info-json "{infojson}" --output -')
+            return self.pipe(index, cmd, ffcmd, count)
+        finally:
+            os.remove(infojson)
+    # --------------------------------------------------------------------#
+
+    def pipe(self, index, cmd, ffcmd, count):
+        """
+        Runs the `cmd` yt-dlp command line piped into the
+        `ffcmd` ffmpeg command line, sending the messages
+        of both. Returns the exit status, non-zero if any
+        of them failed.
+        """
+        logwrite(f'{count}\n{cmd} | {ffcmd}\n', '', self.logfile)
+        ydl = self.popen(cmd,
+                         stdout=subprocess.PIPE,
+                         stderr=subprocess.PIPE,
+                         bufsize=1,
+                         )
+        if ydl is None:
+            return 1
+        try:
+            ffmpeg = self.popen(ffcmd,
+                                stdin=ydl.stdout,
+                                stderr=subprocess.PIPE,
+                                bufsize=1,
+                                )
+        except OSError:
+            killbill(ydl)
+            ydl.communicate()
+            self.release(ydl)
+            raise
+        ydl.stdout.close()  # ffmpeg is the only reader of the pipe
+        if ffmpeg is None:
+            killbill(ydl)
+            ydl.communicate()
+            self.release(ydl)
+            return 1
+
+        def relay():
+            for line in ydl.stderr:
+                self.output(index, line)
+        reader = Thread(target=relay)
+        reader.start()
+        with ffmpeg:
+            for line in ffmpeg.stderr:
+                if 'time=' not in line:  # not the encoding stats
+                    self.output(index, f'[ffmpeg] {line}')
+            ffstatus = ffmpeg.wait()
+        if ffstatus and ydl.poll() is None:  # nobody reads the stream
+            killbill(ydl)
+        reader.join()
+        ydlstatus = ydl.wait()
+        ydl.stderr.close()
+        self.release(ffmpeg)
+        self.release(ydl)
+        return ydlstatus or ffstatus
+    # --------------------------------------------------------------------#
+
     def run(self):
         """
         Subprocess run thread.
         """
-        for url, opts in itertools.zip_longest(self.urls,
-                                               self.arglist,
-                                               fillvalue='',
-                                               ):
-            self.count += 1
-            count = f"URL {self.count}/{self.countmax}"
-
+        jobs = itertools.zip_longest(self.urls, self.arglist, fillvalue='')
+        with ThreadPoolExecutor(max_workers=self.workers) as pool:
+            futures = [pool.submit(self.download, index, url, opts)
+                       for index, (url, opts) in enumerate(jobs)]
+            for fut in futures:
+                try:
+                    fut.result()
+                except OSError as err:
+                    if self.fatal:
+                        continue
+                    self.fatal = True
+                    self.stop()
+                    wx.CallAfter(pub.sendMessage,
+                                 "COUNT_YTDL_EVT",
+                                 index=None,
+                                 count=err,
+                                 fsource='',
+                                 destination='',
+                                 duration=0,
+                                 end='ERROR'
+                                 )
+                    logwrite('', err, self.logfile)
+
+        if self.stop_work_thread and not self.fatal:
             wx.CallAfter(pub.sendMessage,
-                         "COUNT_YTDL_EVT",
-                         count=count,
-                         fsource=f'Source: {url}',
-                         destination='',
+                         "UPDATE_YDL_EXECUTABLE_EVT",
+                         index=None,
+                         output='STOP',
                          duration=100,
-                         end='CONTINUE',
+                         status='ERROR',
                          )
-            cmd = f'{opts} "{url}"'
-            logwrite(f'{count}\n{cmd}\n', '', self.logfile)  # write log cmd
-            if not platform.system() == 'Windows':
-                cmd = shlex.split(cmd)
-            try:
-                with Popen(cmd,
-                           stdout=subprocess.PIPE,
-                           stderr=subprocess.STDOUT,
-                           bufsize=1,
-                           universal_newlines=True,
-                           encoding='utf-8',
-                           ) as proc:
-                    for line in proc.stdout:
-                        wx.CallAfter(pub.sendMessage,
-                                     "UPDATE_YDL_EXECUTABLE_EVT",
-                                     output=line,
-                                     duration=100,
-                                     status=0,
-                                     )
-                        if self.stop_work_thread:
-                            killbill(proc.pid)
-                            wx.CallAfter(pub.sendMessage,
-                                         "UPDATE_YDL_EXECUTABLE_EVT",
-                                         output='STOP',
-                                         duration=100,
-                                         status='ERROR',
-                                         )
-                            logwrite('', YtdlExecDL.STOP, self.logfile)
-                            time.sleep(.5)
-                            wx.CallAfter(pub.sendMessage, "END_YTDL_EVT")
-                            return
-
-                    if proc.wait():
-                        wx.CallAfter(pub.sendMessage,
-                                     "UPDATE_YDL_EXECUTABLE_EVT",
-                                     output='FAILED',
-                                     duration=100,
-                                     status='ERROR',
-                                     )
-                        logwrite('', (f"[VIDEOMASS]: Error Exit Status: "
-                                      f"{proc.wait()}"), self.logfile)
-                        time.sleep(1)
-                        continue
-
-            except (OSError, FileNotFoundError) as err:
-                wx.CallAfter(pub.sendMessage,
-                             "COUNT_YTDL_EVT",
-                             count=err,
-                             fsource='',
-                             destination='',
-                             duration=0,
-                             end='ERROR'
-                             )
-                logwrite('', err, self.logfile)
-                break
-
-            if proc.wait() == 0:  # ..Finished
-                wx.CallAfter(pub.sendMessage,
-                             "COUNT_YTDL_EVT",
-                             count='',
-                             fsource='',
-                             destination='',
-                             duration=100,
-                             end='DONE',
-                             )
-                time.sleep(1)
+            logwrite('', YtdlExecDL.STOP, self.logfile)
         time.sleep(.5)
         wx.CallAfter(pub.sendMessage, "END_YTDL_EVT")
     # --------------------------------------------------------------------#
@@ -168,8 +577,12 @@ class YtdlExecDL(Thread):
     def stop(self):
         """
         Sets the stop work thread to terminate the process
+        and interrupts all the running downloads.
         """
-        self.stop_work_thread = True
+        with self.lock:
+            self.stop_work_thread = True
+            for proc in self.procs:
+                killbill(proc)
 # ------------------------------------------------------------------------#
 
 
@@ -181,20 +594,28 @@ class MyLogger:
     7df2457df7274d0c842421945#embedding-youtube-dl>
     """
 
-    def __init__(self):
+    def __init__(self, index=0, throttle=None):
         """
-        define instace attributes
+        define instace attributes, `index` is
+        the index of the URL being downloaded,
+        `throttle` the `ProgressThrottle` of its
+        progress hook, if any.
         """
         self.msg = None
+        self.index = index
+        self.throttle = throttle
 
     def debug(self, msg):
         """
         Get debug messages. Note, both debug and info
         are passed into debug. You can distinguish them
-        by the prefix '[debug] '
+        by the prefix '[debug] '. The progress lines are
+        not given (`noprogress` option), the progress comes
+        from the progress hook only (see `my_hook`).
         """
         wx.CallAfter(pub.sendMessage,
                      "UPDATE_YDL_EVT",
+                     index=self.index,
                      output=msg,
                      duration='',
                      status='DEBUG',
@@ -208,6 +629,7 @@ class MyLogger:
         msg = f'WARNING: {msg}'
         wx.CallAfter(pub.sendMessage,
                      "UPDATE_YDL_EVT",
+                     index=self.index,
                      output=msg,
                      duration='',
                      status='WARNING',
@@ -215,10 +637,14 @@ class MyLogger:
 
     def error(self, msg):
         """
-        Get error messages
+        Get error messages, after the latest
+        progress held back by the throttle.
         """
+        if self.throttle:
+            send_progress(self.index, self.throttle.flush(self.index))
         wx.CallAfter(pub.sendMessage,
                      "UPDATE_YDL_EVT",
+                     index=self.index,
                      output=msg,
                      duration='',
                      status='ERROR',
@@ -226,31 +652,45 @@ class MyLogger:
 # -------------------------------------------------------------------------#
 
 
-def my_hook(data):
+def send_progress(index, progress):
+    """
+    Sends the `progress` of the URL at `index`
+    downloaded by the yt-dlp module, if any.
+    """
+    if progress is None:
+        return
+    wx.CallAfter(pub.sendMessage,
+                 "UPDATE_YDL_EVT",
+                 index=index,
+                 output='',
+                 duration=progress,
+                 status='DOWNLOAD',
+                 )
+# -------------------------------------------------------------------------#
+
+
+def my_hook(data, index=0, throttle=None):
     """
     progress_hooks is A list of functions that get called on
-    download progress. See  `help(youtube_dl.YoutubeDL)`
+    download progress. See  `help(youtube_dl.YoutubeDL)`.
+    `index` is the index of the URL being downloaded.
+    If a `ProgressThrottle` is given, the 'downloading'
+    progress is sent at a bounded rate, while 'finished'
+    and 'error' are sent at once, after the latest
+    progress held back.
     """
     if data['status'] == 'downloading':
-        keys = ('_percent_str', '_total_bytes_str', '_speed_str', '_eta_str')
-
-        wx.CallAfter(pub.sendMessage,
-                     "UPDATE_YDL_EVT",
-                     output='',
-                     duration={x: data.get(x, 'N/A') for x in keys},
-                     status='DOWNLOAD',
-                     )
+        progress = DownloadProgress.from_dict(data)
+        if throttle and throttle.update(index, progress) is None:
+            return
+        send_progress(index, progress)
+        return
+    if throttle:
+        send_progress(index, throttle.flush(index))
     if data['status'] == 'finished':
-        wx.CallAfter(pub.sendMessage,
-                     "COUNT_YTDL_EVT",
-                     count='',
-                     fsource='',
-                     destination='',
-                     duration='',
-                     end='DONE',
-                     )
         wx.CallAfter(pub.sendMessage,
                      "UPDATE_YDL_EVT",
+                     index=index,
                      output='',
                      duration='Done downloading, now converting ...',
                      status='FINISHED',
@@ -262,6 +702,21 @@ class YdlDownloader(Thread):
     """
     Embed youtube-dl as module into a separated thread in order
     to get output in real time during downloading and conversion .
+    Up to `ytdlp-concurrent-downloads` URLs (see app settings)
+    are downloaded at the same time, each by its own YoutubeDL
+    instance; all messages carry the `index` of their URL.
+    The progress messages of each download are sent at most
+    every `progress_utils.PROGRESS_INTERVAL` seconds, the
+    others at once.
+    The downloads share the bandwidth limit by their progress
+    hooks, the changes of the limit apply at once.
+    URLs with recent metadata in the cache are downloaded
+    from them, without extracting them again.
+    URLs already in the download archive are skipped before
+    any extraction.
+    The files downloaded are handed off to the conversion by
+    a post hook (see `hand_off`), since the 'finished' status
+    of the progress hook comes before merging the formats.
     For a list of available options see:
 
     <https://github.com/ytdl-org/youtube-dl/blob/master/youtube_dl/YoutubeDL.py#L129-L279>
@@ -270,66 +725,153 @@ class YdlDownloader(Thread):
     or by help(youtube_dl.YoutubeDL)
 
     """
-    def __init__(self, args, urls, logfile):
+    def __init__(self, args, urls, logfile, infofiles=None):
         """
         Attributes defined here:
         self.stop_work_thread -  boolean process terminate value
         self.urls - type list
         self.logfile - str path object to log file
         self.arglist - option arguments list
+        self.infofiles - metadata cache files of the URLs
+        self.archive - the download archive, None if disabled
+        self.throttle - bounds the rate of the progress messages
         """
+        get = wx.GetApp()
+        self.appdata = get.appset
         self.stop_work_thread = False  # process terminate
         self.urls = urls
         self.logfile = logfile
         self.arglist = args
+        self.infofiles = infofiles or []
         self.countmax = len(self.arglist)
-        self.count = 0
+        self.workers = pool_size(self.appdata['ytdlp-concurrent-downloads'],
+                                 self.countmax)
+        self.archive = download_archive()
+        self.bandwidth = bandwidth()
+        self.throttle = ProgressThrottle()
 
         Thread.__init__(self)
         self.start()  # run()
 
+    def progress_hook(self, index, ydl):
+        """
+        Returns the progress hook of the URL at `index`
+        downloaded by `ydl`, which also cancels the download
+        on stop and keeps it within its share of the bandwidth:
+        it waits for the bytes transferred and updates the
+        yt-dlp `ratelimit` to the share, so that yt-dlp also
+        adapts its block size.
+        """
+        job, done = (self, index), [0]
+
+        def hook(data):
+            if self.stop_work_thread:
+                raise yt_dlp.utils.DownloadCancelled()
+            if data['status'] == 'downloading':
+                nbytes = data.get('downloaded_bytes') or 0
+                delta = nbytes - done[0] if nbytes >= done[0] else nbytes
+                done[0] = nbytes
+                self.bandwidth.throttle(job, delta,
+                                        lambda: self.stop_work_thread)
+                ydl.params['ratelimit'] = self.bandwidth.share(job) or None
+            else:
+                done[0] = 0
+            my_hook(data, index, self.throttle)
+        return hook
+    # --------------------------------------------------------------------#
+
+    def download(self, index, url, opts):
+        """
+        Downloads the URL at `index` with its own YoutubeDL
+        instance. Returns True if successful, False otherwise.
+        """
+        if self.stop_work_thread:
+            return False
+        count = f"URL {index + 1}/{self.countmax}"
+        if archived(self.archive, url, index, count, self.logfile):
+            return True
+        wx.CallAfter(pub.sendMessage,
+                     "COUNT_YTDL_EVT",
+                     index=index,
+                     count=count,
+                     fsource=f'Source: {url}',
+                     destination='',
+                     duration=100,
+                     end='CONTINUE',
+                     )
+        ydl_opts = {**{key: val for key, val in opts.items()
+                       if key != 'format' or val},
+                    'logger': MyLogger(index, self.throttle),
+                    'noprogress': True,  # see `my_hook`
+                    }
+        logtxt = f'{count}\n{ydl_opts}'
+        logwrite(logtxt, '', self.logfile)  # write log cmd
+        if self.appdata['yt_dlp'] is not True:
+            self.finish(index)
+            return False
+        infofile = usable_infofile(self.infofiles, index)
+        self.bandwidth.join((self, index), DOWNLOAD_WEIGHT)
+        try:
+            with yt_dlp.YoutubeDL(ydl_opts) as ydl:
+                ydl.add_progress_hook(self.progress_hook(index, ydl))
+                ydl.add_post_hook(hand_off)
+                if infofile:
+                    returncode = ydl.download_with_info_file(infofile)
+                else:
+                    returncode = ydl.download([f"{url}"])
+        except yt_dlp.utils.DownloadCancelled:
+            return False
+        except Exception as err:  # pylint: disable=broad-except
+            logwrite('', f"[VIDEOMASS]: {count} {err}", self.logfile)
+            returncode = 1
+        finally:
+            self.bandwidth.leave((self, index))
+
+        if self.stop_work_thread:
+            return False
+        self.finish(index, 'FAILED' if returncode else 'DONE')
+        return returncode == 0
+    # --------------------------------------------------------------------#
+
+    def finish(self, index, end='FAILED'):
+        """
+        Sends the final status `end` of the download
+        of the URL at `index`, 'FAILED' by default.
+        """
+        wx.CallAfter(pub.sendMessage,
+                     "COUNT_YTDL_EVT",
+                     index=index,
+                     count='',
+                     fsource='',
+                     destination='',
+                     duration=100,
+                     end=end,
+                     )
+    # --------------------------------------------------------------------#
+
     def run(self):
         """
         Apply the option arguments passed by
         the user for the download process.
         """
-        for url, opts in itertools.zip_longest(self.urls,
-                                               self.arglist,
-                                               fillvalue='',
-                                               ):
-            if not opts['format']:
-                del opts['format']
-            self.count += 1
-            count = f"URL {self.count}/{self.countmax}"
-
-            wx.CallAfter(pub.sendMessage,
-                         "COUNT_YTDL_EVT",
-                         count=count,
-                         fsource=f'Source: {url}',
-                         destination='',
-                         duration=100,
-                         end='CONTINUE',
-                         )
-            if self.stop_work_thread:
-                break
-            ydl_opts = {**opts,
-                        'logger': MyLogger(),
-                        'progress_hooks': [my_hook],
-                        }
-            logtxt = f'{count}\n{ydl_opts}'
-            logwrite(logtxt, '', self.logfile)  # write log cmd
-            if wx.GetApp().appset['yt_dlp'] is True:
+        jobs = itertools.zip_longest(self.urls, self.arglist, fillvalue='')
+        with ThreadPoolExecutor(max_workers=self.workers) as pool:
+            futures = [pool.submit(self.download, index, url, opts)
+                       for index, (url, opts) in enumerate(jobs)]
+            for index, fut in enumerate(futures):
                 try:
-                    with yt_dlp.YoutubeDL(ydl_opts) as ydl:
-                        ydl.download([f"{url}"])
-                except Exception:
-                    break
+                    fut.result()
+                except OSError as err:
+                    logwrite('', f"[VIDEOMASS]: URL {index + 1}/"
+                                 f"{self.countmax} {err}", self.logfile)
+                    self.finish(index)
 
         wx.CallAfter(pub.sendMessage, "END_YTDL_EVT")
 
     def stop(self):
         """
-        Sets the stop work thread to
-        terminate the current process
+        Sets the stop work thread to terminate all the
+        current downloads, which are cancelled by their
+        progress hook.
         """
         self.stop_work_thread = True
@@ -6,7 +6,7 @@ Compatibility: Python3, wxPython Phoenix
 Author: Gianluca Pernigotto <jeanlucperni@gmail.com>
 Copyleft - 2024 Gianluca Pernigotto <jeanlucperni@gmail.com>
 license: GPL3
-Rev: March.17.2023
+Rev: Oct.19.2026
 Code checker: flake8, pylint
 
 This file is part of Videomass.
@@ -25,8 +25,15 @@ This file is part of Videomass.
    along with Videomass.  If not, see <http://www.gnu.org/licenses/>.
 """
 from threading import Thread
+from concurrent.futures import ThreadPoolExecutor
 import wx
 from pubsub import pub
+from videomass.vdms_utils.infocache_utils import (info_cachekey,
+                                                  info_cachename,
+                                                  load_info,
+                                                  save_info,
+                                                  )
+from videomass.vdms_utils.ytdlp_utils import PLAYLIST_PAGE, flat_entry
 if wx.GetApp().appset['yt_dlp'] is True:
     import yt_dlp
 
@@ -68,10 +75,86 @@ class MyLogger:
         return None if len(self.msg_error) == 0 else self.msg_error.pop()
 
 
+def info_cachefile(url, kwargs):
+    """
+    Returns the pathname of the cache file of the metadata
+    of `url` extracted with the `kwargs` options, None if
+    the metadata cache is disabled (see app settings
+    `ytdlp-info-cache-ttl`).
+    """
+    appdata = wx.GetApp().appset
+    if not appdata['ytdlp-info-cache-ttl']:
+        return None
+    return info_cachename(appdata['cachedir'], info_cachekey(url, kwargs))
+# ------------------------------------------------------------------------
+
+
+def load_cached_info(url, kwargs):
+    """
+    Returns the cached metadata of `url` extracted with
+    the `kwargs` options, None if not found or expired.
+    """
+    cachename = info_cachefile(url, kwargs)
+    if not cachename:
+        return None
+    return load_info(cachename,
+                     wx.GetApp().appset['ytdlp-info-cache-ttl'] * 3600)
+# ------------------------------------------------------------------------
+
+
+def extract_info(url, kwargs):
+    """
+    Extracts the metadata of `url` with the `kwargs`
+    options and stores them in the metadata cache.
+    Returns a tuple (meta, error), where `meta` is the
+    sanitized metadata dict (None on errors) and `error`
+    the error message (None if successful).
+    """
+    if wx.GetApp().appset['yt_dlp'] is not True:
+        return None, _('yt_dlp module is not available')
+    mylogger = MyLogger()
+    ydl_opts = {**kwargs, 'logger': mylogger}
+    try:
+        with yt_dlp.YoutubeDL(ydl_opts) as ydl:
+            meta = ydl.extract_info(url, download=False)
+            if meta:
+                meta = ydl.sanitize_info(meta)
+    except Exception as err:  # pylint: disable=broad-except
+        return None, str(err)
+    error = mylogger.get_message()
+
+    if error:
+        return None, error
+    if not meta:
+        return None, _('Unable to get data from this URL')
+    store_info(url, kwargs, meta)
+    return meta, None
+# ------------------------------------------------------------------------
+
+
+def store_info(url, kwargs, meta):
+    """
+    Writes the `meta` of `url` to the metadata cache,
+    keeping its size within the `ytdlp-info-cache-size`
+    app setting (MiB).
+    """
+    cachename = info_cachefile(url, kwargs)
+    if not cachename:
+        return
+    try:
+        save_info(cachename, meta,
+                  wx.GetApp().appset['ytdlp-info-cache-size'] * 1048576)
+    except (OSError, TypeError, ValueError):
+        pass
+# ------------------------------------------------------------------------
+
+
 class YdlExtractInfo(Thread):
     """
     Embed youtube-dl as module into a separated thread in order
     to get output during process (see help(youtube_dl.YoutubeDL) ) .
+    The metadata extracted are stored in the metadata cache (see
+    `load_cached_info`).
 
     """
     def __init__(self, url, kwargs):
@@ -93,19 +176,204 @@ class YdlExtractInfo(Thread):
         """
         Defines options to extract_info with youtube_dl
         """
-        if wx.GetApp().appset['yt_dlp'] is True:
-            mylogger = MyLogger()
-            ydl_opts = {**self.kwargs, 'logger': mylogger}
-            with yt_dlp.YoutubeDL(ydl_opts) as ydl:
-                meta = ydl.extract_info(self.url, download=False)
-            error = mylogger.get_message()
-
-            if error:
-                self.data = (None, error)
-            elif meta:
-                self.data = (meta, None)
+        if self.appdata['yt_dlp'] is True:
+            self.data = extract_info(self.url, self.kwargs)
 
         wx.CallAfter(pub.sendMessage,
                      "RESULT_EVT",
                      status=''
                      )
+# ------------------------------------------------------------------------
+
+
+class YdlInfoPool(Thread):
+    """
+    Resolves the metadata of several URLs at the same time
+    on a pool of up to `MAX_WORKERS` threads, taking them
+    from the metadata cache when available.
+
+    The "INFO_RESULT_EVT" pub/sub topic is sent for each URL
+    as soon as its metadata are available, with this `thread`,
+    the `index` and the `url`, plus `meta` (None on errors)
+    and `error` (None if successful). "INFO_END_EVT" is sent
+    at the end. Nothing is sent after `stop`.
+
+    USAGE:
+        >>> thread = YdlInfoPool(urls, kwargs, 'statistics')
+        >>> thread.stop()  # to discard the pending URLs
+
+    """
+    MAX_WORKERS = 4
+
+    def __init__(self, urls, kwargs, caller):
+        """
+        self.urls: list of URLs
+        self.kwargs: yt-dlp options to extract with
+        self.caller: str, tells apart the threads which
+                     are running at the same time
+        """
+        self.urls = urls
+        self.kwargs = kwargs
+        self.caller = caller
+        self.stopped = False
+
+        Thread.__init__(self, daemon=True)
+        self.start()
+    # ----------------------------------------------------------------#
+
+    def resolve(self, index, url):
+        """
+        Gets the metadata of the URL at `index`
+        and sends them to the caller.
+        """
+        if self.stopped:
+            return
+        meta, error = load_cached_info(url, self.kwargs), None
+        if not meta:
+            meta, error = extract_info(url, self.kwargs)
+        if self.stopped:
+            return
+        wx.CallAfter(pub.sendMessage,
+                     "INFO_RESULT_EVT",
+                     thread=self,
+                     index=index,
+                     url=url,
+                     meta=meta,
+                     error=error,
+                     )
+    # ----------------------------------------------------------------#
+
+    def run(self):
+        """
+        Start thread
+        """
+        workers = max(1, min(YdlInfoPool.MAX_WORKERS, len(self.urls)))
+        with ThreadPoolExecutor(max_workers=workers) as pool:
+            for index, url in enumerate(self.urls):
+                pool.submit(self.resolve, index, url)
+        if not self.stopped:
+            wx.CallAfter(pub.sendMessage, "INFO_END_EVT", thread=self)
+    # ----------------------------------------------------------------#
+
+    def stop(self):
+        """
+        Discards the URLs not yet resolved
+        """
+        self.stopped = True
+# ------------------------------------------------------------------------
+
+
+class YdlPlaylistPager(Thread):
+    """
+    Expands a playlist or channel URL to its entries without
+    extracting their media (yt-dlp `extract_flat` with a lazy
+    playlist), so that the entries are available page by page
+    while yt-dlp is still fetching the next ones.
+
+    The "PLAYLIST_ENTRIES_EVT" pub/sub topic is sent with this
+    `thread`, the `url` and a list of up to `PLAYLIST_PAGE`
+    `entries` (see `ytdlp_utils.flat_entry`), as soon as they
+    are found. "PLAYLIST_END_EVT" is sent at the end with the
+    total `count` of entries and the `error` (None if
+    successful). Nothing is sent after `stop`.
+
+    USAGE:
+        >>> thread = YdlPlaylistPager(url, kwargs)
+        >>> thread.stop()  # to stop the expansion
+
+    """
+    def __init__(self, url, kwargs):
+        """
+        self.url: the URL of the playlist
+        self.kwargs: yt-dlp options to extract with
+        """
+        self.url = url
+        self.kwargs = kwargs
+        self.stopped = False
+
+        Thread.__init__(self, daemon=True)
+        self.start()
+    # ----------------------------------------------------------------#
+
+    def send(self, entries):
+        """
+        Sends a page of `entries` to the caller
+        """
+        wx.CallAfter(pub.sendMessage,
+                     "PLAYLIST_ENTRIES_EVT",
+                     thread=self,
+                     url=self.url,
+                     entries=entries,
+                     )
+    # ----------------------------------------------------------------#
+
+    def expand(self):
+        """
+        Sends the entries of the playlist as they are found.
+        Returns the number of entries.
+        """
+        mylogger = MyLogger()
+        ydl_opts = {**self.kwargs,
+                    'logger': mylogger,
+                    'noplaylist': False,
+                    'playlist_items': None,
+                    'extract_flat': 'in_playlist',
+                    'lazy_playlist': True,
+                    }
+        count, page = 0, []
+        with yt_dlp.YoutubeDL(ydl_opts) as ydl:
+            info = ydl.extract_info(self.url, download=False, process=False)
+            # follows the redirections to the playlist extractor
+            for _redirect in range(3):
+                if not info or info.get('_type') not in ('url',
+                                                         'url_transparent'):
+                    break
+                info = ydl.extract_info(info['url'], download=False,
+                                        ie_key=info.get('ie_key'),
+                                        process=False)
+            if not info or info.get('_type') != 'playlist':
+                raise ValueError(mylogger.get_message()
+                                 or _('The URL does not refer to a '
+                                      'playlist'))
+            for entry in info.get('entries') or []:
+                if self.stopped:
+                    break
+                # unavailable entries keep their row, so that the
+                # rows stay numbered as the playlist indexes
+                page.append(flat_entry(entry or {}))
+                count += 1
+                if len(page) == PLAYLIST_PAGE:
+                    self.send(page)
+                    page = []
+        if page and not self.stopped:
+            self.send(page)
+        return count
+    # ----------------------------------------------------------------#
+
+    def run(self):
+        """
+        Start thread
+        """
+        count, error = 0, None
+        if wx.GetApp().appset['yt_dlp'] is not True:
+            error = _('yt_dlp module is not available')
+        else:
+            try:
+                count = self.expand()
+            except Exception as err:  # pylint: disable=broad-except
+                error = str(err)
+        if not self.stopped:
+            wx.CallAfter(pub.sendMessage,
+                         "PLAYLIST_END_EVT",
+                         thread=self,
+                         url=self.url,
+                         count=count,
+                         error=error,
+                         )
+    # ----------------------------------------------------------------#
+
+    def stop(self):
+        """
+        Stops fetching the next entries
+        """
+        self.stopped = True
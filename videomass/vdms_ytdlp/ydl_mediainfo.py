@@ -6,7 +6,7 @@ Compatibility: Python3, wxPython Phoenix
 Author: Gianluca Pernigotto <jeanlucperni@gmail.com>
 Copyleft - 2024 Gianluca Pernigotto <jeanlucperni@gmail.com>
 license: GPL3
-Rev: Apr.09.2024
+Rev: Oct.19.2026
 Code checker: flake8, pylint
 
 This file is part of Videomass.
@@ -41,6 +41,7 @@ class YdlMediaInfo(wx.Dialog):
         self.data = data
         get = wx.GetApp()  # get data from bootstrap
         colorscheme = get.appset['colorscheme']
+        self.red = colorscheme['ERR1']
         appicon = get.iconset['videomass']
 
         wx.Dialog.__init__(self, None,
@@ -99,11 +100,9 @@ class YdlMediaInfo(wx.Dialog):
         sizer_1.Fit(self)
         self.Layout()
 
-        index = 0
-        for url in self.data:
+        for index, url in enumerate(self.data):
             self.url_select.InsertItem(index, str(url['title']))
             self.url_select.SetItem(index, 1, url['url'])
-            index += 1
 
         # ----------------------Binding (EVT)----------------------#
         self.Bind(wx.EVT_LIST_ITEM_SELECTED, self.on_select, self.url_select)
@@ -123,27 +122,44 @@ class YdlMediaInfo(wx.Dialog):
         self.textctrl.Clear()  # delete previous append:
 
         index = self.url_select.GetFocusedItem()
-        item = self.url_select.GetItemText(index)
+        info = self.data[index] if 0 <= index < len(self.data) else {}
         text = ('An error has occurred.\n'
                 'Unable to parse data from provided URL.')
 
-        for info in self.data:
-            if info['title'] == item:
-                text = (f"Categories:      {info.get('categories', 'N/A')}\n"
-                        f"License:         {info.get('license', 'N/A')}\n"
-                        f"Upload Date:     {info.get('upload_date', 'N/A')}\n"
-                        f"Uploader:        {info.get('uploader', 'N/A')}\n"
-                        f"View Count:      {info.get('view', 'N/A')}\n"
-                        f"Like Count:      {info.get('like', 'N/A')}\n"
-                        f"Dislike Count:   {info.get('dislike', 'N/A')}\n"
-                        f"Average Rating:  {info.get('avr_rat', 'N/A')}\n"
-                        f"ID:              {info.get('id', 'N/A')}\n"
-                        f"Duration:        {info.get('duration', 'N/A')}\n"
-                        f"Description:     {info.get('description', 'N/A')}\n"
-                        )
+        if info.get('error'):
+            text += f"\n\n{info['error']}\n"
+        elif info:
+            text = (f"Categories:      {info.get('categories', 'N/A')}\n"
+                    f"License:         {info.get('license', 'N/A')}\n"
+                    f"Upload Date:     {info.get('upload_date', 'N/A')}\n"
+                    f"Uploader:        {info.get('uploader', 'N/A')}\n"
+                    f"View Count:      {info.get('view', 'N/A')}\n"
+                    f"Like Count:      {info.get('like', 'N/A')}\n"
+                    f"Dislike Count:   {info.get('dislike', 'N/A')}\n"
+                    f"Average Rating:  {info.get('avr_rat', 'N/A')}\n"
+                    f"ID:              {info.get('id', 'N/A')}\n"
+                    f"Duration:        {info.get('duration', 'N/A')}\n"
+                    f"Description:     {info.get('description', 'N/A')}\n"
+                    )
         self.textctrl.AppendText(text)
     # ------------------------------------------------------------------#
 
+    def add_item(self, item):
+        """
+        Appends the data `item` of an URL (see
+        `youtubedl_ui.Downloader.on_info_result`).
+        """
+        index = len(self.data)
+        self.data.append(item)
+        self.url_select.InsertItem(index, str(item['title']))
+        self.url_select.SetItem(index, 1, item['url'])
+        if item.get('error'):
+            self.url_select.SetItemTextColour(index, self.red)
+        if index == 0:
+            self.url_select.Focus(0)
+            self.url_select.Select(0, on=1)
+    # ------------------------------------------------------------------#
+
     def on_close(self, event):
         """
         Destroy mini frame
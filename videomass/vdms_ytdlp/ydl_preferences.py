@@ -6,7 +6,7 @@ Compatibility: Python3, wxPython Phoenix
 Author: Gianluca Pernigotto <jeanlucperni@gmail.com>
 Copyleft - 2024 Gianluca Pernigotto <jeanlucperni@gmail.com>
 license: GPL3
-Rev: Apr.13.2024
+Rev: Oct.19.2026
 Code checker: flake8, pylint
 
 This file is part of Videomass.
@@ -29,6 +29,11 @@ import webbrowser
 import wx
 import wx.lib.agw.hyperlink as hpl
 from videomass.vdms_sys.settings_manager import ConfigManager
+from videomass.vdms_utils.ytdlp_utils import MAX_DOWNLOADS
+from videomass.vdms_utils.ratelimit_utils import (parse_schedule,
+                                                  configure_bandwidth,
+                                                  )
+from videomass.vdms_utils.pipeline_utils import preset_profiles
 
 
 class Ytdlp_Options(wx.Dialog):
@@ -161,6 +166,119 @@ class Ytdlp_Options(wx.Dialog):
         self.txtctrl_extdw_args = wx.TextCtrl(tabThree, wx.ID_ANY, args)
         sizerextdown.Add(self.txtctrl_extdw_args, 0, wx.EXPAND | wx.LEFT
                          | wx.RIGHT | wx.BOTTOM, 5)
+        sizerextdown.Add((0, 20))
+        boxconcur = wx.BoxSizer(wx.HORIZONTAL)
+        sizerextdown.Add(boxconcur, 0)
+        labconcur = wx.StaticText(tabThree, wx.ID_ANY,
+                                  _("Simultaneous downloads"))
+        boxconcur.Add(labconcur, 0, wx.ALL | wx.ALIGN_CENTER_VERTICAL, 5)
+        self.spin_concur = wx.SpinCtrl(tabThree, wx.ID_ANY, "",
+                                       min=1, max=MAX_DOWNLOADS,
+                                       size=(-1, -1))
+        self.spin_concur.SetValue(self.appdata['ytdlp-concurrent-downloads'])
+        boxconcur.Add(self.spin_concur, 0, wx.ALL, 5)
+        self.spin_concur.SetToolTip(_('Maximum number of URLs downloaded '
+                                      'at the same time'))
+        labrate = wx.StaticText(tabThree, wx.ID_ANY,
+                                _("Bandwidth limit (KiB/s)"))
+        boxconcur.Add(labrate, 0, wx.LEFT | wx.ALIGN_CENTER_VERTICAL, 20)
+        self.spin_rate = wx.SpinCtrl(tabThree, wx.ID_ANY, "",
+                                     min=0, max=1000000, size=(-1, -1))
+        self.spin_rate.SetValue(self.appdata['ytdlp-ratelimit'])
+        boxconcur.Add(self.spin_rate, 0, wx.ALL, 5)
+        self.spin_rate.SetToolTip(_('Total bandwidth shared by the '
+                                    'simultaneous downloads, 0 for '
+                                    'unlimited. Changes apply at once to '
+                                    'the running downloads, except those '
+                                    'of the yt-dlp executable.'))
+        boxsched = wx.BoxSizer(wx.HORIZONTAL)
+        sizerextdown.Add(boxsched, 0, wx.EXPAND)
+        labsched = wx.StaticText(tabThree, wx.ID_ANY,
+                                 _("Bandwidth schedule"))
+        boxsched.Add(labsched, 0, wx.ALL | wx.ALIGN_CENTER_VERTICAL, 5)
+        sched = self.appdata['ytdlp-ratelimit-schedule']
+        self.txtctrl_sched = wx.TextCtrl(tabThree, wx.ID_ANY, sched)
+        boxsched.Add(self.txtctrl_sched, 1, wx.ALL, 5)
+        self.txtctrl_sched.SetToolTip(_('Bandwidth limits by time of day, '
+                                        'which override the bandwidth '
+                                        'limit, e.g. "08:00-18:00=500, '
+                                        '23:00-06:00=0" (KiB/s, 0 for '
+                                        'unlimited).'))
+        boxcache = wx.BoxSizer(wx.HORIZONTAL)
+        sizerextdown.Add(boxcache, 0)
+        labttl = wx.StaticText(tabThree, wx.ID_ANY,
+                               _("Keep metadata of URLs for (hours)"))
+        boxcache.Add(labttl, 0, wx.ALL | wx.ALIGN_CENTER_VERTICAL, 5)
+        self.spin_ttl = wx.SpinCtrl(tabThree, wx.ID_ANY, "",
+                                    min=0, max=720, size=(-1, -1))
+        self.spin_ttl.SetValue(self.appdata['ytdlp-info-cache-ttl'])
+        boxcache.Add(self.spin_ttl, 0, wx.ALL, 5)
+        labcsize = wx.StaticText(tabThree, wx.ID_ANY,
+                                 _("Maximum cache size (MiB)"))
+        boxcache.Add(labcsize, 0, wx.LEFT | wx.ALIGN_CENTER_VERTICAL, 20)
+        self.spin_csize = wx.SpinCtrl(tabThree, wx.ID_ANY, "",
+                                      min=1, max=10000, size=(-1, -1))
+        self.spin_csize.SetValue(self.appdata['ytdlp-info-cache-size'])
+        boxcache.Add(self.spin_csize, 0, wx.ALL, 5)
+        self.spin_ttl.SetToolTip(_('Metadata of URLs (statistics, format '
+                                   'codes) are stored in the cache directory '
+                                   'and reused until they expire. Set to 0 '
+                                   'to disable the metadata cache.'))
+        descr = _("Skip the media already downloaded (download archive)")
+        self.ckbx_archive = wx.CheckBox(tabThree, wx.ID_ANY, (descr))
+        self.ckbx_archive.SetValue(self.appdata['ytdlp-download-archive'])
+        sizerextdown.Add(self.ckbx_archive, 0, wx.ALL, 5)
+        self.ckbx_archive.SetToolTip(_('The media downloaded are recorded '
+                                       'in the download archive, those '
+                                       'already recorded are not '
+                                       'downloaded again. The archive can '
+                                       'be viewed from the "Tools" menu.'))
+        boxconv = wx.BoxSizer(wx.HORIZONTAL)
+        sizerextdown.Add(boxconv, 0)
+        descr = _("Convert the downloads as they finish with")
+        self.ckbx_convert = wx.CheckBox(tabThree, wx.ID_ANY, (descr))
+        self.ckbx_convert.SetValue(self.appdata['ytdlp-convert'])
+        boxconv.Add(self.ckbx_convert, 0, wx.ALL | wx.ALIGN_CENTER_VERTICAL, 5)
+        self.prstdir = os.path.join(self.appdata['confdir'], 'presets')
+        try:
+            presets = sorted(os.path.splitext(x)[0] for x in
+                             os.listdir(self.prstdir) if x.endswith('.json'))
+        except OSError:
+            presets = []
+        self.cmbx_convpreset = wx.ComboBox(tabThree, wx.ID_ANY,
+                                           choices=presets,
+                                           size=(160, -1),
+                                           style=wx.CB_DROPDOWN
+                                           | wx.CB_READONLY,
+                                           )
+        boxconv.Add(self.cmbx_convpreset, 0, wx.ALL, 5)
+        self.cmbx_convprofile = wx.ComboBox(tabThree, wx.ID_ANY,
+                                            choices=[],
+                                            size=(200, -1),
+                                            style=wx.CB_DROPDOWN
+                                            | wx.CB_READONLY,
+                                            )
+        boxconv.Add(self.cmbx_convprofile, 0, wx.ALL, 5)
+        self.cmbx_convpreset.SetValue(self.appdata['ytdlp-convert-preset'])
+        self.on_convert_preset(None)
+        self.cmbx_convprofile.SetValue(self.appdata['ytdlp-convert-profile'])
+        descr = _("Pipe the downloads into the conversion, without "
+                  "intermediate file")
+        self.ckbx_stream = wx.CheckBox(tabThree, wx.ID_ANY, (descr))
+        self.ckbx_stream.SetValue(self.appdata['ytdlp-convert-stream'])
+        sizerextdown.Add(self.ckbx_stream, 0, wx.LEFT, 25)
+        self.ckbx_stream.SetToolTip(_('Only with the yt-dlp executable and '
+                                      'one pass profiles with an output '
+                                      'format. The media whose formats '
+                                      'must be merged, the playlists and '
+                                      'the audio extraction are downloaded '
+                                      'to file first.'))
+        self.on_convert(None)
+        self.ckbx_convert.SetToolTip(_('Each download is converted with '
+                                       'the profile of the preset (see '
+                                       'the Presets Manager) as soon as '
+                                       'it finishes, while the other '
+                                       'downloads go on.'))
         tabThree.SetSizer(sizerextdown)
         notebook.AddPage(tabThree, _("Download Options"))
 
@@ -419,6 +537,9 @@ class Ytdlp_Options(wx.Dialog):
         self.Bind(wx.EVT_CHECKBOX, self.on_autogen_cookie, self.ckbx_autocook)
         self.Bind(wx.EVT_COMBOBOX, self.on_autogen_cookie, self.cmbx_browser)
         self.Bind(wx.EVT_CHECKBOX, self.on_enable_cookie, self.ckbx_usecook)
+        self.Bind(wx.EVT_CHECKBOX, self.on_convert, self.ckbx_convert)
+        self.Bind(wx.EVT_COMBOBOX, self.on_convert_preset,
+                  self.cmbx_convpreset)
         # --------------------------------------------#
 
     def on_enable_cookie(self, event):
@@ -530,6 +651,33 @@ class Ytdlp_Options(wx.Dialog):
         self.sett["external_downloader_args"] = args
     # -------------------------------------------------------------------#
 
+    def on_convert(self, event):
+        """
+        Enables the preset and the profile which
+        convert the downloads, if checked
+        """
+        enable = self.ckbx_convert.GetValue()
+        self.cmbx_convpreset.Enable(enable)
+        self.cmbx_convprofile.Enable(enable)
+        self.ckbx_stream.Enable(enable)
+    # -------------------------------------------------------------------#
+
+    def on_convert_preset(self, event):
+        """
+        Lists the profiles of the preset selected
+        """
+        self.cmbx_convprofile.Clear()
+        preset = self.cmbx_convpreset.GetValue()
+        if not preset:
+            return
+        profiles = preset_profiles(os.path.join(self.prstdir,
+                                                f'{preset}.json'))
+        self.cmbx_convprofile.AppendItems([prof.get('Name', '')
+                                           for prof in profiles])
+        if profiles:
+            self.cmbx_convprofile.SetSelection(0)
+    # -------------------------------------------------------------------#
+
     def on_help(self, event):
         """
         Open default web browser via Python Web-browser controller.
@@ -552,6 +700,19 @@ class Ytdlp_Options(wx.Dialog):
         Writes the new changes to configuration file
         aka `settings.json` and updates `appdata` dict.
         """
+        schedule = self.txtctrl_sched.GetValue().strip()
+        try:
+            parse_schedule(schedule)
+        except ValueError as err:
+            wx.MessageBox(str(err), _('Videomass - Error!'),
+                          wx.ICON_ERROR, self)
+            return
+        if (self.ckbx_convert.GetValue()
+                and not self.cmbx_convprofile.GetValue()):
+            wx.MessageBox(_('Please select the preset and the profile '
+                            'which convert the downloads.'),
+                          _('Videomass - Error!'), wx.ICON_ERROR, self)
+            return
         if not self.sett['trashdir_loc'].strip():
             self.sett['trashdir_loc'] = self.appdata['trashdir_default']
         self.sett['username'] = self.txtctrl_username.GetValue()
@@ -568,6 +729,17 @@ class Ytdlp_Options(wx.Dialog):
         self.sett['geo_bypass_country'] = self.txtctrl_geocountry.GetValue()
         self.sett['geo_bypass_ip_block'] = self.txtctrl_geoipblock.GetValue()
         self.sett['cookiefile'] = self.txtctrl_cook.GetValue()
+        self.sett['ytdlp-concurrent-downloads'] = self.spin_concur.GetValue()
+        self.sett['ytdlp-info-cache-ttl'] = self.spin_ttl.GetValue()
+        self.sett['ytdlp-info-cache-size'] = self.spin_csize.GetValue()
+        self.sett['ytdlp-download-archive'] = self.ckbx_archive.GetValue()
+        self.sett['ytdlp-ratelimit'] = self.spin_rate.GetValue()
+        self.sett['ytdlp-ratelimit-schedule'] = schedule
+        self.sett['ytdlp-convert'] = self.ckbx_convert.GetValue()
+        self.sett['ytdlp-convert-preset'] = self.cmbx_convpreset.GetValue()
+        self.sett['ytdlp-convert-profile'] = self.cmbx_convprofile.GetValue()
+        self.sett['ytdlp-convert-stream'] = self.ckbx_stream.GetValue()
+        configure_bandwidth(self.sett['ytdlp-ratelimit'], schedule)
         self.confmanager.write_options(**self.sett)
         self.appdata.update(self.sett)
         # do not store this data in the configuration file
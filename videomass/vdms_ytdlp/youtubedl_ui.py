@@ -6,7 +6,7 @@ Compatibility: Python3, wxPython Phoenix
 Author: Gianluca Pernigotto <jeanlucperni@gmail.com>
 Copyleft - 2024 Gianluca Pernigotto <jeanlucperni@gmail.com>
 license: GPL3
-Rev: Apr.29.2024
+Rev: Oct.19.2026
 Code checker: flake8, pylint
 
 This file is part of Videomass.
@@ -24,15 +24,28 @@ This file is part of Videomass.
    You should have received a copy of the GNU General Public License
    along with Videomass.  If not, see <http://www.gnu.org/licenses/>.
 """
+import os
 import sys
 import itertools
 import wx
-from videomass.vdms_io.io_tools import youtubedl_getstatistics
+from pubsub import pub
 from videomass.vdms_utils.utils import integer_to_time as totimesec
 from videomass.vdms_utils.get_bmpfromsvg import get_bmp
+from videomass.vdms_utils.ytdlp_utils import is_playlist_url
+from videomass.vdms_utils.archive_utils import archive_filename
+from videomass.vdms_utils.progress_utils import PROGRESS_TEMPLATE
+from videomass.vdms_utils.pipeline_utils import (preset_profiles,
+                                                 find_profile,
+                                                 profile_args,
+                                                 can_stream,
+                                                 can_stream_profile,
+                                                 )
 from videomass.vdms_ytdlp.playlist_indexing import Indexing
 from videomass.vdms_ytdlp.subtitles_editor import SubtitleEditor
 from videomass.vdms_ytdlp.formatcode import FormatCode
+from videomass.vdms_ytdlp.ydl_extractinfo import (info_cachefile,
+                                                   YdlInfoPool,
+                                                   )
 from videomass.vdms_sys.settings_manager import ConfigManager
 
 
@@ -46,6 +59,7 @@ def from_api_to_cli(data, execpath):
         dformat = f'--format "{data["format"]}"'
     opt = (f'"{execpath}" {dformat} --progress-template '
            f'"download-title:%(info.id)s-%(progress.eta)s" '
+           f'--progress-template "{PROGRESS_TEMPLATE}" '
            f'--newline --compat-options "{data["compat_opts"]}" '
            f'--ignore-errors --ignore-config --no-color ')
 
@@ -68,11 +82,13 @@ def from_api_to_cli(data, execpath):
         dwargs = ' '.join(data["external_downloader_args"])
         opt += (f'--downloader-args "{data["external_downloader"]}:{dwargs}" ')
     if data['noplaylist'] is False:
-        opt += '--yes-playlist '
+        opt += '--yes-playlist --lazy-playlist '
         if data['playlist_items']:
             opt += f'--playlist-items "{data["playlist_items"]}" '
     else:
         opt += '--no-playlist '
+    if data.get('download_archive'):
+        opt += f'--download-archive "{data["download_archive"]}" '
     if data['writesubtitles']:
         opt += '--write-subs '
         if data['subtitleslangs'][0]:
@@ -185,6 +201,7 @@ class Downloader(wx.Panel):
                     }
         self.plidx = {'': ''}
         self.info = []  # has data information for Statistics button
+        self.pools = {}  # running `YdlInfoPool` threads by caller
         self.format_dict = {}  # format codes order with URL matching
         self.quality = 'best'
         self.oldwx = None  # test result of hasattr EVT_LIST_ITEM_CHECKED
@@ -289,6 +306,9 @@ class Downloader(wx.Panel):
         self.btn_plidx.Bind(wx.EVT_BUTTON, self.on_playlist_idx)
         self.btn_subeditor.Bind(wx.EVT_BUTTON, self.on_subtitles_editor)
 
+        pub.subscribe(self.on_info_result, "INFO_RESULT_EVT")
+        pub.subscribe(self.on_info_end, "INFO_END_EVT")
+
     # ----------------------------------------------------------------------
     def on_subtitles_editor(self, event):
         """
@@ -311,12 +331,14 @@ class Downloader(wx.Panel):
         delete data and set to Disable otherwise.
         """
         if not self.parent.data_url:
+            self.stop_info_pools()
             del self.info[:]
             self.format_dict.clear()
             self.panel_cod.fcode.DeleteAllItems()
             self.on_choicebox(self, statusmsg=False)
         else:
             if changed:
+                self.stop_info_pools()
                 self.ckbx_pl.SetValue(False)
                 self.on_playlist(self)
                 self.panel_cod.fcode.DeleteAllItems()
@@ -326,80 +348,147 @@ class Downloader(wx.Panel):
                 self.format_dict.clear()
     # -----------------------------------------------------------------#
 
-    def get_statistics(self, link):
-        """
-        Get media URLs informations by generator object
-        `youtubedl_getstatistics`: This method `Return` a
-        two elements list ['ERROR', (message error)]
-        if `meta[1]` (error), [None, dictobject] otherwise.
-        Check the first item of list to recognize the exit
-        status, which is 'ERROR' or None.
-        """
-        kwa = self.default_statistics_options()
-        data = youtubedl_getstatistics(link,
-                                       kwa,
-                                       parent=self.GetParent(),
-                                       )
-        for meta in data:
-            if meta[1]:
-                return ('ERROR', meta[1])
-
-            if 'entries' in meta[0]:
-                try:
-                    meta[0]['entries'][0]  # don't parse all playlist
-                except IndexError:
-                    pass
-            if 'duration' in meta[0]:
-
-                ftime = (f"{totimesec(round(meta[0]['duration'] * 1000))} "
-                         f"({meta[0]['duration']} sec.)")
+    def statistics_data(self, link, meta):
+        """
+        Returns the dict of the `link` URL data shown
+        in the statistics viewer, from its `meta` data.
+        """
+        if 'duration' in meta and meta['duration']:
+            ftime = (f"{totimesec(round(meta['duration'] * 1000))} "
+                     f"({meta['duration']} sec.)")
+        else:
+            ftime = 'N/A'
+
+        return {'url': link,
+                'title': meta.get('title'),
+                'categories': meta.get('categories'),
+                'license': meta.get('license'),
+                'format': meta.get('format'),
+                'upload_date': meta.get('upload_date'),
+                'uploader': meta.get('uploader'),
+                'view': meta.get('view_count'),
+                'like': meta.get('like_count'),
+                'dislike': meta.get('dislike_count'),
+                'avr_rat': meta.get('average_rating'),
+                'id': meta.get('id'),
+                'duration': ftime,
+                'description': meta.get('description'),
+                }
+    # -----------------------------------------------------------------#
+
+    def start_info_pool(self, caller, urls):
+        """
+        Starts retrieving the data of `urls` concurrently,
+        results are received by `on_info_result`.
+        `caller` is one of 'statistics' or 'formatcode'.
+        """
+        thread = YdlInfoPool(urls, self.default_statistics_options(),
+                             caller)
+        self.pools[caller] = {'thread': thread,
+                              'total': len(urls),
+                              'done': 0,
+                              'errors': [],
+                              }
+        self.parent.statusbar_msg(_('Retrieving data of {0} URLs...'
+                                    ).format(len(urls)), None)
+    # -----------------------------------------------------------------#
+
+    def stop_info_pools(self):
+        """
+        Discards the data being retrieved
+        """
+        for job in self.pools.values():
+            job['thread'].stop()
+        self.pools.clear()
+    # -----------------------------------------------------------------#
+
+    def on_info_result(self, thread, index, url, meta, error):
+        """
+        Receives the data of an URL from the `YdlInfoPool`
+        thread via pubsub "INFO_RESULT_EVT", as soon as they
+        are available.
+        """
+        job = self.pools.get(thread.caller)
+        if not job or job['thread'] is not thread:
+            return  # discarded
+
+        if thread.caller == 'statistics':
+            if error:
+                item = {'url': url, 'title': _('Error'), 'error': error}
             else:
-                ftime = 'N/A'
-
-            date = meta[0].get('upload_date')
-            return (None, {'url': link,
-                           'title': meta[0].get('title'),
-                           'categories': meta[0].get('categories'),
-                           'license': meta[0].get('license'),
-                           'format': meta[0].get('format'),
-                           'upload_date': date,
-                           'uploader': meta[0].get('uploader'),
-                           'view': meta[0].get('view_count'),
-                           'like': meta[0].get('like_count'),
-                           'dislike': meta[0].get('dislike_count'),
-                           'avr_rat': meta[0].get('average_rating'),
-                           'id': meta[0].get('id'),
-                           'duration': ftime,
-                           'description': meta[0].get('description'),
-                           })
+                item = self.statistics_data(url, meta)
+                self.info.append(item)
+            if self.parent.infomediadlg:
+                self.parent.infomediadlg.add_item(item)
+
+        elif thread.caller == 'formatcode':
+            if not error:
+                error = self.panel_cod.add_formatcodes(url, meta)
+
+        if error:
+            job['errors'].append(f'{url}\n{error}')
+        job['done'] += 1
+        self.parent.statusbar_msg(_('Retrieving data... {0}/{1}'
+                                    ).format(job['done'], job['total']),
+                                  None)
+    # -----------------------------------------------------------------#
+
+    def on_info_end(self, thread):
+        """
+        Receives the end of the `YdlInfoPool` thread
+        via pubsub "INFO_END_EVT" and reports the URLs
+        that failed.
+        """
+        job = self.pools.get(thread.caller)
+        if not job or job['thread'] is not thread:
+            return  # discarded
+        del self.pools[thread.caller]
+        errors = job['errors']
+        if not errors:
+            self.parent.statusbar_msg(_('Ready'), None)
+            return
+
+        self.parent.statusbar_msg(_('Unable to get data of {0} of {1} '
+                                    'URLs').format(len(errors),
+                                                   job['total']),
+                                  self.red, Downloader.WHITE)
+        if thread.caller == 'formatcode':
+            if not self.panel_cod.fcode.GetItemCount():
+                self.choice.SetSelection(0)
+                self.on_choicebox(self, False)
+            wx.MessageBox('\n\n'.join(errors), _('Videomass - Error!'),
+                          wx.ICON_ERROR, self)
     # -----------------------------------------------------------------#
 
     def on_show_statistics(self):
         """
         show URL data information. This method is called by
         main frame when the 'Statistics' button is pressed.
+        Returns the data already retrieved; the missing ones
+        are retrieved concurrently and added to the statistics
+        viewer as they arrive.
         """
-        if not self.info:
-            for link in self.parent.data_url:
-                ret = self.get_statistics(link)
-                if ret[0] == 'ERROR':
-                    wx.MessageBox(ret[1], _('Videomass - Error!'),
-                                  wx.ICON_ERROR)
-                    del self.info[:]
-                    return None
-                self.info.append(ret[1])
+        if 'statistics' not in self.pools:
+            done = [item['url'] for item in self.info]
+            missing = [url for url in self.parent.data_url
+                       if url not in done]
+            if missing:
+                self.start_info_pool('statistics', missing)
 
         return self.info
     # -----------------------------------------------------------------#
 
     def on_format_codes(self):
         """
-        Check data given from `self.panel_cod.set_formatcode()` method
-        which allow to enabling download by "Format Code".
+        Starts retrieving the format codes of all the URLs
+        concurrently, which are added to `self.panel_cod` as
+        they arrive (see `on_info_result`). This allow to
+        enabling download by "Format Code".
         """
         if self.panel_cod.fcode.GetItemCount():  # not changed, already set
             return None
-        kwa = self.default_statistics_options()
+        if 'formatcode' in self.pools:  # already in progress
+            return None
 
         def _error(msg, icon, cap):
             wx.MessageBox(msg, cap, icon, self)
@@ -421,9 +510,8 @@ class Downloader(wx.Panel):
                     return _error(msg, wx.ICON_WARNING,
                                   _('Videomass - Warning!'))
 
-        ret = self.panel_cod.set_formatcode(self.parent.data_url, kwa)
-        if ret:
-            return _error(ret, wx.ICON_ERROR, _('Videomass - Error!'))
+        self.panel_cod.urls = self.parent.data_url.copy()
+        self.start_info_pool('formatcode', self.parent.data_url)
         return None
     # -----------------------------------------------------------------#
 
@@ -563,7 +651,7 @@ class Downloader(wx.Panel):
 
         if self.ckbx_pl.IsChecked():
             playlist = [url for url in self.parent.data_url
-                        if '/playlist' in url]
+                        if is_playlist_url(url)]
             if not playlist:
                 wx.MessageBox(_("URLs have no playlist references"),
                               "Videomass", wx.ICON_INFORMATION, self)
@@ -585,7 +673,8 @@ class Downloader(wx.Panel):
         """
         with Indexing(self,
                       self.parent.data_url,
-                      self.plidx) as idxdialog:
+                      self.plidx,
+                      self.default_statistics_options()) as idxdialog:
             if idxdialog.ShowModal() == wx.ID_OK:
                 data = idxdialog.getvalue()
                 if not data:
@@ -617,9 +706,11 @@ class Downloader(wx.Panel):
     def check_for_channels(self):
         """
         Check for channels and warn the user before continue.
+        Channels with indexed entries are not checked.
         """
         urls = self.parent.data_url
-        if [url for url in urls if 'channel' in url]:
+        if [url for url in urls if 'channel' in url
+                and not (self.ckbx_pl.IsChecked() and self.plidx.get(url))]:
             if wx.MessageBox(_('The URLs contain channels. '
                                'Are you sure you want to continue?'),
                              _('Please confirm'), wx.ICON_QUESTION
@@ -713,6 +804,9 @@ class Downloader(wx.Panel):
         data["geo_bypass_ip_block"] = self.appdata["geo_bypass_ip_block"]
         data['ffmpeg_location'] = f'{self.appdata["ffmpeg_cmd"]}'
         data['postprocessors'] = postprocessors
+        if self.appdata['ytdlp-download-archive']:
+            data['download_archive'] = archive_filename(
+                self.appdata['confdir'])
 
         return data
     # -----------------------------------------------------------------#
@@ -736,7 +830,7 @@ class Downloader(wx.Panel):
                                                fillvalue='',
                                                ):
             if not self.opt["NO_PLAYLIST"]:
-                if '/playlist' in url:
+                if is_playlist_url(url):
                     template = subdir + args[0]
                     playlistitems = self.plidx.get(url, None)
                     noplaylist = False
@@ -756,6 +850,7 @@ class Downloader(wx.Panel):
                  'outtmpl': f"{self.appdata['ydlp-outputdir']}/{template}",
                  'noplaylist': noplaylist,
                  'playlist_items': playlistitems,
+                 'lazy_playlist': not noplaylist,
                  'postprocessors': data['postprocessors'],
                  **data
                  })
@@ -817,13 +912,45 @@ class Downloader(wx.Panel):
 
     def to_processing(self, datalist):
         """
-        Call `main_ytdlp.switch_to_processing`
+        Call `main_ytdlp.switch_to_processing` with the
+        options and the metadata cache files of the URLs.
         """
+        infofiles = [info_cachefile(url, args) for url, args
+                     in zip(self.parent.data_url, datalist)]
         if self.appdata['ytdlp-useexec']:
             execlist = []
             execpath = self.appdata['ytdlp-executable-path']
             for args in datalist:
                 execlist.append(from_api_to_cli(args, execpath))
-            self.parent.switch_to_processing('YouTube Downloader', execlist)
+            stream = self.stream_profile()
+            streams = [stream if stream and can_stream(args) else None
+                       for args in datalist]
+            self.parent.switch_to_processing('YouTube Downloader', execlist,
+                                             infofiles, streams)
         else:
-            self.parent.switch_to_processing('YouTube Downloader', datalist)
+            self.parent.switch_to_processing('YouTube Downloader', datalist,
+                                             infofiles, None)
+    # -----------------------------------------------------------------#
+
+    def stream_profile(self):
+        """
+        Returns the profile (args, supported formats) which
+        encodes the downloads piped into ffmpeg, None if the
+        streaming is disabled (see app settings
+        `ytdlp-convert-stream`) or the profile can't encode
+        a stream (see `pipeline_utils.can_stream_profile`).
+        """
+        if not (self.appdata['ytdlp-convert']
+                and self.appdata['ytdlp-convert-stream']):
+            return None
+        preset = self.appdata['ytdlp-convert-preset']
+        prstfile = os.path.join(self.appdata['confdir'], 'presets',
+                                f'{preset}.json')
+        prof = find_profile(preset_profiles(prstfile),
+                            self.appdata['ytdlp-convert-profile'])
+        if not prof:
+            return None
+        args = profile_args(preset, prof)
+        if not can_stream_profile(args):
+            return None
+        return args, prof.get('Supported_list', '')